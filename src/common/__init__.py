@@ -0,0 +1,37 @@
+"""Common - Shared runtime infrastructure for Planner, Worker and Judge
+
+Spec: specs/technical.md - Sections 9 & 12
+"""
+
+from src.common.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerClient,
+    CircuitMonitor,
+)
+from src.common.dead_letter import DeadLetterQueue
+from src.common.image_cache import ImageCache
+from src.common.mcp_pool import LocalMCPServer, MCPClientPool, ServerEndpoint
+from src.common.prefetch import Prefetcher, WarmCache
+from src.common.rate_limiter import RateLimitedClient, RateLimiter
+from src.common.task_queue import Deadline, Lease, TaskQueue
+from src.common.timer_wheel import Timer, TimerWheel
+
+__all__ = [
+    "CircuitBreaker",
+    "CircuitBreakerClient",
+    "CircuitMonitor",
+    "DeadLetterQueue",
+    "Deadline",
+    "ImageCache",
+    "Lease",
+    "LocalMCPServer",
+    "MCPClientPool",
+    "Prefetcher",
+    "RateLimitedClient",
+    "RateLimiter",
+    "ServerEndpoint",
+    "TaskQueue",
+    "Timer",
+    "TimerWheel",
+    "WarmCache",
+]
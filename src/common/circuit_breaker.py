@@ -0,0 +1,437 @@
+"""Circuit Breaker - Fleet-wide per-tool breakers for MCP server outages
+
+Spec: specs/functional.md - Story 10.2
+Spec: specs/technical.md - Section 8.1, Section 8.2 (/health probes)
+
+Each MCP tool has a breaker, grouped under the server that hosts it, and its
+state is shared by every pod in Redis:
+
+    closed     calls flow. Connection failures and timeouts are counted
+               over ``window_seconds``; ``failure_threshold`` of them open
+               the breaker.
+    open       no call is made. Workers park tasks that need the tool
+               instead of running them into the timeout.
+    half_open  after ``open_seconds`` the CircuitMonitor probes the server's
+               /health. If healthy, at most ``trial_calls`` calls are let
+               through fleet-wide; the rest fail fast as if open. The first
+               success closes the breaker and the first failure re-opens it.
+
+Tool errors (MCPToolError) and rate limits say nothing about the server
+being down and are not counted.
+
+Parked tasks wait in per-tool holding lists in the TaskQueue. Once a breaker
+is no longer open, the monitor releases them back into their lanes in waves
+of at most ``wave_size`` per tick: a single trial wave while half-open, then
+full waves once closed. The outage alert ("Twitter MCP server down - 25
+agents affected") is computed from those lists.
+
+The open and half-open sets are cached per process for ``refresh_seconds``.
+A call to a closed tool costs no extra Redis round-trip. Trial calls and the
+success that closes a breaker go to Redis for the current state, never to
+the cache.
+
+Key layout (``prefix`` defaults to ``{chimera}:circuit``):
+    {prefix}:tool:{tool}        hash state, retry_at (ms), opened_at (ms),
+                                trials (calls let through while half-open)
+    {prefix}:failures:{tool}    failures in the current window (PX window)
+    {prefix}:open               tools whose breaker is open
+    {prefix}:half_open          tools whose breaker is half-open
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+import structlog
+
+from src.common.mcp_pool import TOOL_SERVERS
+from src.common.redis_text import decode
+
+logger = structlog.get_logger(__name__)
+
+CIRCUIT_PREFIX = "{chimera}:circuit"
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_FAILURE_WINDOW_SECONDS = 30.0
+DEFAULT_OPEN_SECONDS = 30.0
+DEFAULT_REFRESH_SECONDS = 1.0
+DEFAULT_WAVE_SIZE = 50
+DEFAULT_TRIAL_WAVE_SIZE = 1
+DEFAULT_TRIAL_CALLS = 1
+DEFAULT_MONITOR_INTERVAL_SECONDS = 1.0
+DEFAULT_PROBE_TIMEOUT_SECONDS = 2.0
+
+# KEYS[1] = tool hash, KEYS[2] = failure counter, KEYS[3] = open set,
+# KEYS[4] = half-open set, ARGV[1] = now (ms), ARGV[2] = threshold,
+# ARGV[3] = window (ms), ARGV[4] = open time (ms), ARGV[5] = tool
+# Returns the breaker's state after counting the failure.
+_FAILURE_SCRIPT = """
+local state = redis.call('HGET', KEYS[1], 'state') or 'closed'
+if state == 'open' then
+    return state
+end
+local failures = redis.call('INCR', KEYS[2])
+if failures == 1 then
+    redis.call('PEXPIRE', KEYS[2], ARGV[3])
+end
+if state == 'half_open' or failures >= tonumber(ARGV[2]) then
+    local now = tonumber(ARGV[1])
+    redis.call('HSET', KEYS[1], 'state', 'open',
+        'retry_at', now + tonumber(ARGV[4]), 'opened_at', now)
+    redis.call('SADD', KEYS[3], ARGV[5])
+    redis.call('SREM', KEYS[4], ARGV[5])
+    redis.call('DEL', KEYS[2])
+    return 'open'
+end
+return state
+"""
+
+# KEYS/ARGV as above. A success closes a half-open breaker.
+_SUCCESS_SCRIPT = """
+local state = redis.call('HGET', KEYS[1], 'state') or 'closed'
+if state == 'half_open' then
+    redis.call('HSET', KEYS[1], 'state', 'closed', 'trials', 0)
+    redis.call('SREM', KEYS[4], ARGV[5])
+    redis.call('DEL', KEYS[2])
+    return 'closed'
+end
+return state
+"""
+
+# KEYS[1] = tool hash, ARGV[1] = trial calls allowed while half-open
+# Returns the state, or 'trial' / 'busy' for a half-open breaker depending on
+# whether this call got one of its trial slots.
+_TRIAL_SCRIPT = """
+local state = redis.call('HGET', KEYS[1], 'state') or 'closed'
+if state ~= 'half_open' then
+    return state
+end
+if redis.call('HINCRBY', KEYS[1], 'trials', 1) <= tonumber(ARGV[1]) then
+    return 'trial'
+end
+redis.call('HINCRBY', KEYS[1], 'trials', -1)
+return 'busy'
+"""
+
+# KEYS[1] = tool hash. Gives back a trial slot if the breaker is still
+# half-open (a re-open or close has already reset the count).
+_END_TRIAL_SCRIPT = """
+if redis.call('HGET', KEYS[1], 'state') == 'half_open'
+        and tonumber(redis.call('HGET', KEYS[1], 'trials') or 0) > 0 then
+    redis.call('HINCRBY', KEYS[1], 'trials', -1)
+end
+return 0
+"""
+
+
+class CircuitOpenError(ConnectionError):
+    """A tool was called while its breaker is open"""
+
+    def __init__(self, tool: str):
+        super().__init__(f"Circuit open for MCP tool {tool}")
+        self.tool = tool
+
+
+class CircuitBreaker:
+    """
+    Redis-backed closed/open/half-open breaker per MCP tool
+    """
+
+    def __init__(
+        self,
+        redis_client: Any,
+        prefix: str = CIRCUIT_PREFIX,
+        tool_servers: Optional[Dict[str, str]] = None,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        window_seconds: float = DEFAULT_FAILURE_WINDOW_SECONDS,
+        open_seconds: float = DEFAULT_OPEN_SECONDS,
+        refresh_seconds: float = DEFAULT_REFRESH_SECONDS,
+        trial_calls: int = DEFAULT_TRIAL_CALLS,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.redis = redis_client
+        self.prefix = prefix
+        self.tool_servers = dict(TOOL_SERVERS if tool_servers is None else tool_servers)
+        self.failure_threshold = failure_threshold
+        self.window_seconds = window_seconds
+        self.open_seconds = open_seconds
+        self.refresh_seconds = refresh_seconds
+        self.trial_calls = trial_calls
+        self.clock = clock
+        self._failure = redis_client.register_script(_FAILURE_SCRIPT)
+        self._success = redis_client.register_script(_SUCCESS_SCRIPT)
+        self._trial = redis_client.register_script(_TRIAL_SCRIPT)
+        self._end_trial = redis_client.register_script(_END_TRIAL_SCRIPT)
+        self._open: Set[str] = set()
+        self._half_open: Set[str] = set()
+        self._refreshed_at: Optional[float] = None
+
+    def server_for(self, tool: str) -> str:
+        return self.tool_servers.get(tool, "mcp")
+
+    def state(self, tool: str) -> str:
+        """
+        Current state as this process sees it (cached up to refresh_seconds)
+        """
+        self._refresh()
+        if tool in self._open:
+            return "open"
+        return "half_open" if tool in self._half_open else "closed"
+
+    def is_open(self, tool: str) -> bool:
+        return self.state(tool) == "open"
+
+    def record_failure(self, tool: str) -> str:
+        state = decode(self._failure(keys=self._keys(tool), args=self._args(tool)))
+        if state == "open" and tool not in self._open:
+            logger.warning("circuit_opened", tool=tool, server=self.server_for(tool))
+        self._apply(tool, state)
+        return state
+
+    def try_call(self, tool: str) -> Optional[str]:
+        """
+        Admits a call: "closed", "trial" for one of a half-open tool's trial
+        calls, or None if the call must fail fast
+        """
+        state = self.state(tool)
+        if state == "half_open":
+            state = decode(
+                self._trial(keys=[self._tool_key(tool)], args=[self.trial_calls])
+            )
+            if state in ("closed", "open"):
+                self._apply(tool, state)
+        return state if state in ("closed", "trial") else None
+
+    def end_trial(self, tool: str) -> None:
+        """
+        Frees a trial slot whose call neither succeeded nor failed the server
+        """
+        self._end_trial(keys=[self._tool_key(tool)])
+
+    def record_success(self, tool: str) -> str:
+        if self.state(tool) == "closed":
+            return "closed"
+        # The cache may be stale; only a breaker that is half-open now closes.
+        self._refresh(force=True)
+        if self.state(tool) != "half_open":
+            return self.state(tool)
+        state = decode(self._success(keys=self._keys(tool), args=self._args(tool)))
+        if state == "closed":
+            logger.info("circuit_closed", tool=tool, server=self.server_for(tool))
+        self._apply(tool, state)
+        return state
+
+    def open_tools(self) -> List[str]:
+        """
+        Tools whose breaker is open, read fresh from Redis
+        """
+        self._refresh(force=True)
+        return sorted(self._open)
+
+    def half_open_tools(self) -> List[str]:
+        self._refresh(force=True)
+        return sorted(self._half_open)
+
+    def retry_at(self, tool: str) -> float:
+        """
+        When (epoch seconds) an open breaker is due for a health probe
+        """
+        retry_at = self.redis.hget(self._tool_key(tool), "retry_at")
+        return int(retry_at) / 1000 if retry_at is not None else 0.0
+
+    def half_open(self, tool: str) -> None:
+        """
+        Lets traffic back to an open tool on trial (after a healthy probe)
+        """
+        self.redis.hset(
+            self._tool_key(tool), mapping={"state": "half_open", "trials": 0}
+        )
+        self.redis.smove(f"{self.prefix}:open", f"{self.prefix}:half_open", tool)
+        self._apply(tool, "half_open")
+
+    def reopen(self, tool: str) -> None:
+        """
+        Keeps a tool open for another ``open_seconds`` (after a failed probe)
+        """
+        retry_at = int((self.clock() + self.open_seconds) * 1000)
+        self.redis.hset(self._tool_key(tool), "retry_at", retry_at)
+
+    def _refresh(self, force: bool = False) -> None:
+        now = self.clock()
+        if (
+            not force
+            and self._refreshed_at is not None
+            and now - self._refreshed_at < self.refresh_seconds
+        ):
+            return
+        self._open = {decode(t) for t in self.redis.smembers(f"{self.prefix}:open")}
+        self._half_open = {
+            decode(t) for t in self.redis.smembers(f"{self.prefix}:half_open")
+        }
+        self._refreshed_at = now
+
+    def _apply(self, tool: str, state: str) -> None:
+        self._open.discard(tool)
+        self._half_open.discard(tool)
+        if state == "open":
+            self._open.add(tool)
+        elif state == "half_open":
+            self._half_open.add(tool)
+
+    def _tool_key(self, tool: str) -> str:
+        return f"{self.prefix}:tool:{tool}"
+
+    def _keys(self, tool: str) -> List[str]:
+        return [
+            self._tool_key(tool),
+            f"{self.prefix}:failures:{tool}",
+            f"{self.prefix}:open",
+            f"{self.prefix}:half_open",
+        ]
+
+    def _args(self, tool: str) -> List[Any]:
+        return [
+            int(self.clock() * 1000),
+            self.failure_threshold,
+            int(self.window_seconds * 1000),
+            int(self.open_seconds * 1000),
+            tool,
+        ]
+
+
+class CircuitBreakerClient:
+    """
+    Wraps an MCP client: fails fast on open tools and feeds the breakers
+    """
+
+    def __init__(self, mcp_client: Any, breaker: CircuitBreaker):
+        self.mcp = mcp_client
+        self.breaker = breaker
+
+    async def call_tool(self, name: str, arguments: Dict[str, Any]) -> Any:
+        admitted = self.breaker.try_call(name)
+        if admitted is None:
+            raise CircuitOpenError(name)
+        try:
+            result = await self.mcp.call_tool(name, arguments)
+        except (ConnectionError, TimeoutError, asyncio.TimeoutError):
+            self.breaker.record_failure(name)
+            raise
+        except BaseException:
+            if admitted == "trial":
+                self.breaker.end_trial(name)
+            raise
+        self.breaker.record_success(name)
+        return result
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.mcp, name)
+
+
+async def http_health_probe(
+    host: str,
+    port: int,
+    path: str = "/health",
+    timeout_seconds: float = DEFAULT_PROBE_TIMEOUT_SECONDS,
+) -> bool:
+    """
+    True if ``GET path`` answers 2xx within the timeout
+    """
+    import httpx
+
+    try:
+        async with httpx.AsyncClient(timeout=timeout_seconds) as client:
+            response = await client.get(f"http://{host}:{port}{path}")
+    except httpx.HTTPError:
+        return False
+    return response.is_success
+
+
+class CircuitMonitor:
+    """
+    Probes open servers and releases parked tasks in waves on recovery
+    """
+
+    def __init__(
+        self,
+        breaker: CircuitBreaker,
+        task_queue: Any,
+        probes: Optional[Dict[str, Callable[[], Awaitable[bool]]]] = None,
+        wave_size: int = DEFAULT_WAVE_SIZE,
+        trial_wave_size: int = DEFAULT_TRIAL_WAVE_SIZE,
+        interval_seconds: float = DEFAULT_MONITOR_INTERVAL_SECONDS,
+    ):
+        self.breaker = breaker
+        self.task_queue = task_queue
+        self.probes = dict(probes or {})
+        self.wave_size = wave_size
+        self.trial_wave_size = trial_wave_size
+        self.interval_seconds = interval_seconds
+        self._running = False
+
+    async def tick(self) -> Dict[str, int]:
+        """
+        One probe-and-release pass; returns tasks released per tool
+        """
+        now = self.breaker.clock()
+        for tool in self.breaker.open_tools():
+            if now < self.breaker.retry_at(tool):
+                continue
+            probe = self.probes.get(self.breaker.server_for(tool))
+            if probe is None or await probe():
+                self.breaker.half_open(tool)
+            else:
+                self.breaker.reopen(tool)
+
+        released = {}
+        for tool in self.task_queue.parked_tools():
+            state = self.breaker.state(tool)
+            if state == "open":
+                continue
+            wave = self.wave_size if state == "closed" else self.trial_wave_size
+            count = self.task_queue.release_parked(tool, wave)
+            if count:
+                released[tool] = count
+                logger.info("parked_tasks_released", tool=tool, count=count)
+        return released
+
+    def outages(self) -> List[Dict[str, Any]]:
+        """
+        One alert per server with a non-closed breaker, from the parked tasks
+        """
+        by_server: Dict[str, Dict[str, Any]] = {}
+        tools = self.breaker.open_tools() + self.breaker.half_open_tools()
+        for tool in tools:
+            server = self.breaker.server_for(tool)
+            outage = by_server.setdefault(
+                server, {"server": server, "tools": [], "parked": 0, "agents": set()}
+            )
+            parked = self.task_queue.parked(tool)
+            outage["tools"].append(tool)
+            outage["parked"] += parked["tasks"]
+            outage["agents"].update(parked["agents"])
+        alerts = []
+        for outage in by_server.values():
+            name = outage["server"].removeprefix("mcp-server-").capitalize()
+            agents = sorted(outage["agents"])
+            alerts.append(
+                {
+                    **outage,
+                    "agents": agents,
+                    "message": (
+                        f"{name} MCP server down - {len(agents)} agents affected"
+                    ),
+                }
+            )
+        return alerts
+
+    async def run(self) -> None:
+        self._running = True
+        while self._running:
+            try:
+                await self.tick()
+            except Exception as e:
+                logger.warning("circuit_monitor_tick_failed", error=repr(e))
+            await asyncio.sleep(self.interval_seconds)
+
+    def stop(self) -> None:
+        self._running = False
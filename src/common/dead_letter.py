@@ -0,0 +1,383 @@
+"""Dead Letter Queue - Indexed store of failed tasks with bulk replay
+
+Spec: specs/functional.md - Story 10.1, Story 10.2
+Spec: specs/technical.md - Section 7.2
+
+A task that fails for good (a fatal error, or a retryable one after its
+retries are spent) is dead-lettered: stored with its error class, the
+history of its attempts and its last TaskResult. Each dead task is also
+added to sorted-set indexes by agent_id, task_type and error class, scored
+by failure time. Triage therefore reads an index page instead of scanning
+the store. A query on several filters intersects their indexes into a
+short-lived cached set, rebuilt for every first page so new arrivals show
+up, and pages on through that. Per-dimension counters keep
+summary() at O(distinct values) after an outage leaves hundreds of
+thousands of dead tasks.
+
+Replay takes dead tasks matching a filter, oldest first, in batches, and
+sleeps between batches to stay under ``rate_per_second``. One Lua script
+per batch removes each entry from the store and every index and pushes it
+back into its TaskQueue lane with a fresh retry budget. An entry already
+replayed is skipped, so running the same replay twice, or two replays at
+once, re-queues each task exactly once. A replay on several filters intersects
+their indexes into a set of its own, which no expiry can cut short, and
+deletes it when the replay ends.
+
+Replay pushes into the TaskQueue lanes from its script and intersects
+indexes server-side, so ``prefix`` must carry the queue's Redis Cluster
+hash tag.
+
+Key layout (``prefix`` defaults to ``{chimera}:dlq``):
+    {prefix}:task:{id}             hash agent, type, error, route, record (JSON)
+    {prefix}:all                   zset id -> failed_at (ms)
+    {prefix}:agent:{agent_id}      zset id -> failed_at (ms)
+    {prefix}:type:{task_type}      zset id -> failed_at (ms)
+    {prefix}:error:{error_class}   zset id -> failed_at (ms)
+    {prefix}:count:{dimension}     hash value -> dead tasks, dimension is
+                                   agent/type/error
+    {prefix}:query:{filters}       cached index intersection (expires)
+    {prefix}:replay:{run}          one replay's index intersection
+    {prefix}:replayed              number of dead tasks replayed
+    {prefix}:seq                   ids for tasks without a task_id
+"""
+
+import asyncio
+import json
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+import structlog
+
+from src.common.redis_text import decode
+from src.common.task_queue import (
+    PUSH_ROUTE_LUA,
+    TaskQueue,
+    hash_tag,
+    require_hash_tag,
+)
+
+logger = structlog.get_logger(__name__)
+
+DLQ_PREFIX = "{chimera}:dlq"
+DEFAULT_PAGE_SIZE = 100
+DEFAULT_REPLAY_BATCH = 100
+DEFAULT_REPLAY_RATE = 50.0
+DEFAULT_QUERY_TTL_SECONDS = 60
+DIMENSIONS = ("agent", "type", "error")
+# Payload fields dropped on replay so the task gets a fresh retry budget.
+RETRY_FIELDS = ("attempt", "attempts")
+
+# KEYS[1] = all-ids zset, KEYS[2] = the task's hash, KEYS[3..5] = its
+# agent/type/error index, KEYS[6..8] = agent/type/error counters,
+# ARGV[1] = id, ARGV[2] = failed_at (ms), ARGV[3] = agent, ARGV[4] = task_type,
+# ARGV[5] = error class, ARGV[6] = route, ARGV[7] = record.
+# Returns 0 if the id is already dead-lettered.
+_ADD_SCRIPT = """
+local id, now = ARGV[1], ARGV[2]
+if redis.call('ZSCORE', KEYS[1], id) then
+    return 0
+end
+redis.call('HSET', KEYS[2], 'agent', ARGV[3], 'type', ARGV[4],
+    'error', ARGV[5], 'route', ARGV[6], 'record', ARGV[7])
+redis.call('ZADD', KEYS[1], now, id)
+for i = 0, 2 do
+    redis.call('ZADD', KEYS[3 + i], now, id)
+    redis.call('HINCRBY', KEYS[6 + i], ARGV[3 + i], 1)
+end
+return 1
+"""
+
+# KEYS[1] = all-ids zset, KEYS[2] = replayed counter,
+# ARGV[1] = prefix, ARGV[2] = now (ms), ARGV[3..] = ids
+# Returns the number of ids re-queued; ids no longer dead-lettered are skipped.
+_REPLAY_SCRIPT = PUSH_ROUTE_LUA + """
+local prefix, now = ARGV[1], tonumber(ARGV[2])
+local replayed = 0
+for i = 3, #ARGV do
+    local id = ARGV[i]
+    if redis.call('ZREM', KEYS[1], id) == 1 then
+        local key = prefix .. ':task:' .. id
+        local fields = redis.call('HMGET', key, 'agent', 'type', 'error', 'route')
+        local values = {agent = fields[1], type = fields[2], error = fields[3]}
+        for dimension, value in pairs(values) do
+            redis.call('ZREM', prefix .. ':' .. dimension .. ':' .. value, id)
+            local counts = prefix .. ':count:' .. dimension
+            if redis.call('HINCRBY', counts, value, -1) <= 0 then
+                redis.call('HDEL', counts, value)
+            end
+        end
+        push_route(fields[4], now, false)
+        redis.call('DEL', key)
+        replayed = replayed + 1
+    end
+end
+if replayed > 0 then
+    redis.call('INCRBY', KEYS[2], replayed)
+end
+return replayed
+"""
+
+
+def error_class(error: Optional[str]) -> str:
+    """
+    Exception class name from a TaskResult error (``repr`` of the exception)
+    """
+    if not error:
+        return "unknown"
+    return error.split("(", 1)[0].strip() or "unknown"
+
+
+@dataclass(frozen=True)
+class DeadLetter:
+    """A dead task as stored for triage"""
+
+    dlq_id: str
+    agent_id: str
+    task_type: str
+    error_class: str
+    failed_at: str
+    task: Dict[str, Any]
+    attempts: List[Dict[str, Any]]
+    result: Dict[str, Any]
+
+
+class DeadLetterQueue:
+    """
+    Failed tasks indexed by agent, task type and error class
+    """
+
+    def __init__(
+        self,
+        redis_client: Any,
+        task_queue: TaskQueue,
+        prefix: str = DLQ_PREFIX,
+        clock: Callable[[], float] = time.time,
+        query_ttl_seconds: int = DEFAULT_QUERY_TTL_SECONDS,
+    ):
+        require_hash_tag(prefix, hash_tag(task_queue.prefix))
+        self.redis = redis_client
+        self.task_queue = task_queue
+        self.prefix = prefix
+        self.clock = clock
+        self.query_ttl_seconds = query_ttl_seconds
+        self._add = redis_client.register_script(_ADD_SCRIPT)
+        self._replay = redis_client.register_script(_REPLAY_SCRIPT)
+
+    def add(self, task: Dict[str, Any], result: Any) -> Optional[str]:
+        """
+        Dead-letters a failed task with its last TaskResult
+
+        Returns its DLQ id, or None if it was already dead-lettered.
+        """
+        result = result.model_dump() if hasattr(result, "model_dump") else result
+        dlq_id = str(task.get("task_id") or self.redis.incr(f"{self.prefix}:seq"))
+        agent_id = str(task.get("agent_id") or "unknown")
+        task_type = str(task.get("task_type") or "unknown")
+        cls = error_class(result.get("error"))
+        fresh = {k: v for k, v in task.items() if k not in RETRY_FIELDS}
+        route = self.task_queue.route(
+            agent_id, task.get("priority", "medium"), json.dumps(fresh)
+        )
+        record = {
+            "task": task,
+            "attempts": list(task.get("attempts") or []),
+            "result": result,
+            "failed_at": datetime.fromtimestamp(self.clock(), timezone.utc).isoformat(),
+        }
+        added = self._add(
+            keys=[
+                f"{self.prefix}:all",
+                f"{self.prefix}:task:{dlq_id}",
+                *self._filter_keys(agent_id, task_type, cls),
+                *(f"{self.prefix}:count:{dimension}" for dimension in DIMENSIONS),
+            ],
+            args=[
+                dlq_id,
+                int(self.clock() * 1000),
+                agent_id,
+                task_type,
+                cls,
+                route,
+                json.dumps(record, default=str),
+            ],
+        )
+        if not added:
+            return None
+        logger.error(
+            "task_dead_lettered",
+            dlq_id=dlq_id,
+            agent_id=agent_id,
+            task_type=task_type,
+            error_class=cls,
+        )
+        return dlq_id
+
+    def ids(
+        self,
+        agent_id: Optional[str] = None,
+        task_type: Optional[str] = None,
+        error_class: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        before_ms: Optional[int] = None,
+    ) -> List[str]:
+        """
+        Newest matching ids first; page on with the last one's failed_at
+        """
+        key = self._index(agent_id, task_type, error_class, rebuild=before_ms is None)
+        high = f"({before_ms}" if before_ms is not None else "+inf"
+        ids = self.redis.zrevrangebyscore(key, high, "-inf", start=0, num=limit)
+        return [decode(i) for i in ids]
+
+    def get(self, dlq_id: str) -> Optional[DeadLetter]:
+        entries = self._entries([dlq_id])
+        return entries[0] if entries else None
+
+    def query(
+        self,
+        agent_id: Optional[str] = None,
+        task_type: Optional[str] = None,
+        error_class: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        before_ms: Optional[int] = None,
+    ) -> List[DeadLetter]:
+        """
+        One page of matching dead tasks, newest first
+        """
+        return self._entries(
+            self.ids(agent_id, task_type, error_class, limit, before_ms)
+        )
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Dead tasks in total and per agent, task type and error class
+        """
+        counts = {
+            dimension: {
+                decode(value): int(count)
+                for value, count in self.redis.hgetall(
+                    f"{self.prefix}:count:{dimension}"
+                ).items()
+            }
+            for dimension in DIMENSIONS
+        }
+        return {
+            "total": self.redis.zcard(f"{self.prefix}:all"),
+            "by_agent": counts["agent"],
+            "by_task_type": counts["type"],
+            "by_error_class": counts["error"],
+            "replayed": int(self.redis.get(f"{self.prefix}:replayed") or 0),
+        }
+
+    async def replay(
+        self,
+        agent_id: Optional[str] = None,
+        task_type: Optional[str] = None,
+        error_class: Optional[str] = None,
+        limit: Optional[int] = None,
+        rate_per_second: float = DEFAULT_REPLAY_RATE,
+        batch_size: int = DEFAULT_REPLAY_BATCH,
+    ) -> int:
+        """
+        Re-queues matching dead tasks, oldest first, at most
+        ``rate_per_second``; returns how many were re-queued
+        """
+        if rate_per_second <= 0:
+            raise ValueError("Replay needs a positive rate")
+        keys = self._filter_keys(agent_id, task_type, error_class)
+        pinned = len(keys) > 1
+        if pinned:
+            key = f"{self.prefix}:replay:{uuid.uuid4().hex}"
+            self.redis.zinterstore(key, keys, aggregate="MAX")
+        else:
+            key = keys[0] if keys else f"{self.prefix}:all"
+        replayed = 0
+        try:
+            while limit is None or replayed < limit:
+                count = (
+                    batch_size if limit is None else min(batch_size, limit - replayed)
+                )
+                batch = [decode(i) for i in self.redis.zrange(key, 0, count - 1)]
+                if not batch:
+                    break
+                replayed += int(
+                    self._replay(
+                        keys=[f"{self.prefix}:all", f"{self.prefix}:replayed"],
+                        args=[self.prefix, self.task_queue.now_ms(), *batch],
+                    )
+                )
+                # The replay's own intersection is not touched by the script.
+                self.redis.zrem(key, *batch)
+                if len(batch) < count:
+                    break
+                await asyncio.sleep(len(batch) / rate_per_second)
+        finally:
+            if pinned:
+                self.redis.delete(key)
+        logger.info(
+            "dead_letters_replayed",
+            count=replayed,
+            agent_id=agent_id,
+            task_type=task_type,
+            error_class=error_class,
+        )
+        return replayed
+
+    def _filter_keys(
+        self,
+        agent_id: Optional[str],
+        task_type: Optional[str],
+        error_class: Optional[str],
+    ) -> List[str]:
+        return [
+            f"{self.prefix}:{dimension}:{value}"
+            for dimension, value in zip(DIMENSIONS, (agent_id, task_type, error_class))
+            if value is not None
+        ]
+
+    def _index(
+        self,
+        agent_id: Optional[str],
+        task_type: Optional[str],
+        error_class: Optional[str],
+        rebuild: bool = False,
+    ) -> str:
+        """
+        Sorted set holding the ids that match every given filter
+        """
+        keys = self._filter_keys(agent_id, task_type, error_class)
+        if not keys:
+            return f"{self.prefix}:all"
+        if len(keys) == 1:
+            return keys[0]
+        cached = f"{self.prefix}:query:{agent_id}|{task_type}|{error_class}"
+        if rebuild or not self.redis.exists(cached):
+            self.redis.zinterstore(cached, keys, aggregate="MAX")
+        self.redis.expire(cached, self.query_ttl_seconds)
+        return cached
+
+    def _entries(self, ids: List[str]) -> List[DeadLetter]:
+        pipe = self.redis.pipeline()
+        for dlq_id in ids:
+            key = f"{self.prefix}:task:{dlq_id}"
+            pipe.hmget(key, "agent", "type", "error", "record")
+        entries = []
+        for dlq_id, (agent, task_type, cls, record) in zip(ids, pipe.execute()):
+            if record is None:
+                continue
+            record = json.loads(record)
+            entries.append(
+                DeadLetter(
+                    dlq_id=dlq_id,
+                    agent_id=decode(agent),
+                    task_type=decode(task_type),
+                    error_class=decode(cls),
+                    failed_at=record["failed_at"],
+                    task=record["task"],
+                    attempts=record["attempts"],
+                    result=record["result"],
+                )
+            )
+        return entries
@@ -0,0 +1,52 @@
+"""Embeddings - Local hashed text embeddings for similarity scoring
+
+Spec: specs/technical.md - Section 3.2 (Weaviate vectorizer), Section 12
+
+A feature-hashed bag of words is deterministic, dependency-free and fast
+enough for hot paths (plan cache lookups, trend routing). Components accept
+any ``embed(text) -> vector`` callable so a model-backed embedder such as
+text-embedding-3-small can be swapped in.
+"""
+
+import hashlib
+import re
+from typing import Callable, Sequence, Union
+
+import numpy as np
+
+EMBEDDING_DIM = 256
+
+# Model-backed embedders may return plain lists; the default returns an array.
+Embedder = Callable[[str], Union[np.ndarray, Sequence[float]]]
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> list:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def hashed_embedding(text: str, dim: int = EMBEDDING_DIM) -> np.ndarray:
+    """
+    Feature-hashed bag of words, L2-normalized
+    """
+    vector = np.zeros(dim, dtype=np.float32)
+    for token in tokenize(text):
+        digest = hashlib.blake2b(token.encode(), digest_size=8).digest()
+        bucket = int.from_bytes(digest[:4], "little") % dim
+        vector[bucket] += 1.0 if digest[4] & 1 else -1.0
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def embed_many(texts: Sequence[str], embed: Embedder = hashed_embedding) -> np.ndarray:
+    """
+    Stacks L2-normalized embeddings for texts into an (n, dim) float32 matrix
+    """
+    if not texts:
+        return np.zeros((0, EMBEDDING_DIM), dtype=np.float32)
+    matrix = np.stack([np.asarray(embed(text), dtype=np.float32) for text in texts])
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    normalized: np.ndarray = matrix / norms
+    return normalized
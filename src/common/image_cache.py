@@ -0,0 +1,273 @@
+"""Image Cache - Content-addressed cache for generate_image renders
+
+Spec: specs/technical.md - Section 8.1 (mcp-server-ideogram, $0.08/image)
+Spec: specs/functional.md - Story 2.2
+
+A render is addressed by the SHA-256 of its visual inputs: the image prompt
+(case-folded, whitespace collapsed), the character LoRA id and any model
+parameters. The worker builds the image prompt from the topic and the
+persona's visual style, not from the caption, so retries and regenerations
+of the same topic, and agents sharing a character, resolve to the same key.
+When that key exists the generate_image call is skipped entirely. Only
+successful renders are stored; an MCP error payload is returned to the
+caller but never cached.
+
+Results are stored as blobs on local disk under ``root`` (a volume shared by
+the worker pods, e.g. a ReadWriteMany PVC), and indexed in Redis. The index
+is a sorted set scored by last access, so the whole fleet agrees on LRU
+order, plus a size per key and a running byte total. A put that takes the
+total over ``max_bytes`` evicts the least recently used keys in the same Lua
+script and removes their blobs. An index entry whose blob is gone, e.g. from
+a pod with its own disk, counts as a miss and is re-rendered.
+
+Concurrent requests for the same key in one process share a single render.
+
+Hits and misses are counted per agent, so the hit rate of agents sharing a
+character can be compared with those that do not.
+
+Key layout (``prefix`` defaults to ``{chimera}:images``):
+    {prefix}:lru              zset key -> last access (ms)
+    {prefix}:size             hash key -> blob bytes
+    {prefix}:bytes            total bytes indexed
+    {prefix}:stats:{agent}    hash hits/misses/evictions for one agent
+    {prefix}:stats            hash hits/misses/evictions for the fleet
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import structlog
+
+from src.common.redis_text import decode
+
+logger = structlog.get_logger(__name__)
+
+IMAGE_CACHE_PREFIX = "{chimera}:images"
+DEFAULT_IMAGE_CACHE_BYTES = 512 * 1024 * 1024
+IMAGE_COST_USD = 0.08
+
+# KEYS[1] = lru zset, KEYS[2] = size hash, KEYS[3] = byte total,
+# ARGV[1] = now (ms), ARGV[2] = key, ARGV[3] = bytes, ARGV[4] = max bytes
+# Indexes a blob and evicts least recently used keys until the total fits.
+# Returns the evicted keys, whose blobs the caller deletes.
+_PUT_SCRIPT = """
+local previous = tonumber(redis.call('HGET', KEYS[2], ARGV[2]) or '0')
+redis.call('ZADD', KEYS[1], ARGV[1], ARGV[2])
+redis.call('HSET', KEYS[2], ARGV[2], ARGV[3])
+local total = redis.call('INCRBY', KEYS[3], tonumber(ARGV[3]) - previous)
+local evicted = {}
+while total > tonumber(ARGV[4]) do
+    local oldest = redis.call('ZRANGE', KEYS[1], 0, 0)[1]
+    if not oldest or oldest == ARGV[2] then
+        break
+    end
+    local size = tonumber(redis.call('HGET', KEYS[2], oldest) or '0')
+    redis.call('ZREM', KEYS[1], oldest)
+    redis.call('HDEL', KEYS[2], oldest)
+    total = redis.call('DECRBY', KEYS[3], size)
+    evicted[#evicted + 1] = oldest
+end
+return evicted
+"""
+
+
+def _normalize(prompt: str) -> str:
+    return " ".join(str(prompt).split()).casefold()
+
+
+def rendered(result: Any) -> bool:
+    """
+    True if ``result`` is a finished render rather than an MCP error payload
+    """
+    return (
+        isinstance(result, dict)
+        and not result.get("isError")
+        and not result.get("error")
+        and bool(result.get("url"))
+    )
+
+
+def render_key(
+    prompt: str,
+    character_lora: Optional[str] = None,
+    params: Optional[Dict[str, Any]] = None,
+) -> str:
+    """
+    Content address of a render: SHA-256 over the normalized inputs
+    """
+    canonical = json.dumps(
+        {
+            "prompt": _normalize(prompt),
+            "lora": character_lora,
+            "params": params or {},
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class ImageCache:
+    """
+    Disk blobs with a fleet-wide Redis LRU index and per-agent hit rates
+    """
+
+    def __init__(
+        self,
+        redis_client: Any,
+        root: str,
+        max_bytes: int = DEFAULT_IMAGE_CACHE_BYTES,
+        prefix: str = IMAGE_CACHE_PREFIX,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.redis = redis_client
+        self.root = root
+        self.max_bytes = max_bytes
+        self.prefix = prefix
+        self.clock = clock
+        self._put = redis_client.register_script(_PUT_SCRIPT)
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key)
+
+    def get(self, key: str, agent_id: Optional[str] = None) -> Optional[Any]:
+        """
+        The cached render for ``key``, or None; refreshes its LRU position
+        """
+        lru = f"{self.prefix}:lru"
+        if self.redis.zscore(lru, key) is None:
+            self._count(agent_id, "misses")
+            return None
+        try:
+            with open(self.path(key), "rb") as blob:
+                result = json.loads(blob.read())
+        except (OSError, ValueError):
+            self._drop(key)
+            self._count(agent_id, "misses")
+            return None
+        self.redis.zadd(lru, {key: self._now_ms()}, xx=True)
+        self._count(agent_id, "hits")
+        return result
+
+    def put(self, key: str, result: Any) -> List[str]:
+        """
+        Stores a render; returns the keys evicted to make room
+        """
+        blob = json.dumps(result, separators=(",", ":"), default=str).encode()
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        staging = f"{path}.{os.getpid()}.tmp"
+        with open(staging, "wb") as out:
+            out.write(blob)
+        os.replace(staging, path)
+        evicted = [
+            decode(k)
+            for k in self._put(
+                keys=self._index_keys(),
+                args=[self._now_ms(), key, len(blob), self.max_bytes],
+            )
+        ]
+        for old in evicted:
+            self._unlink(old)
+        if evicted:
+            self.redis.hincrby(f"{self.prefix}:stats", "evictions", len(evicted))
+        return evicted
+
+    async def get_or_render(
+        self,
+        arguments: Dict[str, Any],
+        render: Callable[[], Awaitable[Any]],
+        agent_id: Optional[str] = None,
+    ) -> Any:
+        """
+        Returns the cached render for ``arguments``, calling ``render`` only
+        when no identical render exists
+        """
+        params = {
+            k: v for k, v in arguments.items() if k not in ("prompt", "character_lora")
+        }
+        key = render_key(
+            arguments.get("prompt", ""), arguments.get("character_lora"), params
+        )
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self._count(agent_id, "hits")
+            return await asyncio.shield(inflight)
+        cached = self.get(key, agent_id)
+        if cached is not None:
+            return cached
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await render()
+            if rendered(result):
+                self.put(key, result)
+            else:
+                logger.warning("image_render_not_cached", key=key)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            # Retrieved here so a render no one else awaited is not reported.
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+    def stats(self, agent_id: Optional[str] = None) -> Dict[str, float]:
+        """
+        Hits, misses, hit rate and dollars saved, for one agent or the fleet
+        """
+        raw = {
+            decode(k): int(v)
+            for k, v in self.redis.hgetall(self._stats_key(agent_id)).items()
+        }
+        hits = raw.get("hits", 0)
+        lookups = hits + raw.get("misses", 0)
+        stats = {
+            "hits": hits,
+            "misses": raw.get("misses", 0),
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "saved_usd": round(hits * IMAGE_COST_USD, 2),
+        }
+        if agent_id is None:
+            stats["evictions"] = raw.get("evictions", 0)
+            stats["entries"] = self.redis.zcard(f"{self.prefix}:lru")
+            stats["bytes"] = int(self.redis.get(f"{self.prefix}:bytes") or 0)
+        return stats
+
+    def _count(self, agent_id: Optional[str], field: str) -> None:
+        pipe = self.redis.pipeline()
+        pipe.hincrby(f"{self.prefix}:stats", field, 1)
+        if agent_id is not None:
+            pipe.hincrby(self._stats_key(agent_id), field, 1)
+        pipe.execute()
+
+    def _drop(self, key: str) -> None:
+        size = self.redis.hget(f"{self.prefix}:size", key)
+        if self.redis.zrem(f"{self.prefix}:lru", key):
+            self.redis.hdel(f"{self.prefix}:size", key)
+            self.redis.decrby(f"{self.prefix}:bytes", int(size or 0))
+
+    def _unlink(self, key: str) -> None:
+        try:
+            os.remove(self.path(key))
+        except FileNotFoundError:
+            pass
+
+    def _index_keys(self) -> List[str]:
+        return [f"{self.prefix}:lru", f"{self.prefix}:size", f"{self.prefix}:bytes"]
+
+    def _stats_key(self, agent_id: Optional[str]) -> str:
+        if agent_id is None:
+            return f"{self.prefix}:stats"
+        return f"{self.prefix}:stats:{agent_id}"
+
+    def _now_ms(self) -> int:
+        return int(self.clock() * 1000)
@@ -0,0 +1,46 @@
+"""Lazy Imports - Defer heavy SDK imports to first use
+
+Spec: specs/technical.md - Section 12.3 (Worker Pool Auto-Scaling)
+
+An HPA scale-up is only as fast as a new pod's start. Provider SDKs
+(PROVIDER_SDKS) and heavy scientific modules can cost hundreds of
+milliseconds each to import, and a given role may never touch them. A module
+that needs one binds it with lazy_import() at import time, and the real
+import runs on the first attribute access. A role that never calls into it
+never pays for it.
+
+The module must be installed. A missing SDK fails at lazy_import(), not
+halfway through a task.
+"""
+
+import importlib.util
+import sys
+from types import ModuleType
+
+# Never imported at process start by any role (see tests/test_main.py).
+PROVIDER_SDKS = (
+    "web3",
+    "coinbase_agentkit",
+    "weaviate",
+    "anthropic",
+    "google.generativeai",
+    "sqlalchemy",
+    "mcp",
+)
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Returns ``name`` as a module whose import runs on first attribute access
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None or spec.loader is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
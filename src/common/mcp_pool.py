@@ -0,0 +1,537 @@
+"""MCP Pool - Shared, pooled MCP client over Streamable HTTP
+
+Spec: specs/technical.md - Section 8.1, Section 7.2
+Spec: specs/functional.md - FR-PERF-1, FR-SCALE-1
+
+One MCPClientPool per process serves every Planner, Worker, TrendFetcher
+and Judge call. It implements the same ``call_tool(name, arguments)`` the
+handlers already use, and routes each tool to the MCP server that hosts it
+(Section 8.1).
+
+Per server it keeps a few MCP sessions (``mcp.ClientSession`` on the
+Streamable HTTP transport, the ``mcp-server-*`` services' transport) that
+are opened lazily, initialized once and reused for every later call. A
+session multiplexes concurrent requests; it carries up to
+``pipeline_depth`` outstanding calls before a further session is opened, up
+to ``max_connections``. A per-server semaphore caps how many calls are
+outstanding against that server; callers beyond the cap queue FIFO in the
+process rather than piling onto the server.
+
+Every call's latency (queueing included, since that is what the caller
+waits) is recorded in a per-tool fixed-bucket histogram.
+
+Failures map onto the worker's error classes. An unreachable server, a
+dropped session or a timeout raises ConnectionError or TimeoutError, which
+are retryable. A session the server no longer knows (it restarted) is
+replaced and the call is sent once more on the new one. A tool that reports
+an error, or a request the server rejects, raises MCPToolError, a
+ValueError, which is fatal. An unknown tool raises KeyError.
+
+The mcp SDK takes about a second to import, so it is imported when the
+first session opens rather than at process start (see src/common/lazy.py).
+
+LocalMCPServer is an in-process Streamable HTTP MCP server (the SDK's
+low-level Server under uvicorn). Tests and local runs use it with plain
+Python functions as tools.
+"""
+
+import asyncio
+import bisect
+import inspect
+import json
+import math
+import socket
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Set
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+CLIENT_NAME = "chimera"
+CLIENT_VERSION = "0.1.0"
+DEFAULT_MCP_PATH = "/mcp"
+DEFAULT_MAX_CONNECTIONS = 2
+DEFAULT_PIPELINE_DEPTH = 16
+DEFAULT_MAX_CONCURRENCY = 32
+DEFAULT_CALL_TIMEOUT_SECONDS = 30.0
+# Upper bounds (ms) of the latency buckets; one more bucket holds overflow.
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+# What a Streamable HTTP server answers for a session it does not know.
+_SESSION_NOT_FOUND = "Session not found"
+
+# Tool name -> MCP server (specs/technical.md Section 8.1)
+TOOL_SERVERS = {
+    "get_trending_topics": "mcp-server-news",
+    "get_mentions": "mcp-server-twitter",
+    "post_content": "mcp-server-twitter",
+    "search_memory": "mcp-server-weaviate",
+    "transfer_usdc": "mcp-server-coinbase",
+    "generate_image": "mcp-server-ideogram",
+}
+
+
+class MCPToolError(ValueError):
+    """The MCP server rejected the call or the tool reported an error"""
+
+
+class _SessionExpired(ConnectionError):
+    """The server no longer knows the session; a new one must be opened"""
+
+
+@dataclass(frozen=True)
+class ServerEndpoint:
+    """Where one MCP server listens and how hard it may be driven"""
+
+    name: str
+    host: str
+    port: int
+    max_connections: int = DEFAULT_MAX_CONNECTIONS
+    pipeline_depth: int = DEFAULT_PIPELINE_DEPTH
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+    path: str = DEFAULT_MCP_PATH
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}{self.path}"
+
+
+def _text(result: Dict[str, Any]) -> str:
+    return "".join(
+        item.get("text", "")
+        for item in result.get("content") or []
+        if isinstance(item, dict) and item.get("type") == "text"
+    )
+
+
+def _tool_output(name: str, result: Any) -> Any:
+    if hasattr(result, "model_dump"):
+        result = result.model_dump(by_alias=True, exclude_none=True, mode="json")
+    result = result if isinstance(result, dict) else {}
+    if result.get("isError"):
+        raise MCPToolError(f"{name}: {_text(result)}")
+    if "structuredContent" in result:
+        return result["structuredContent"]
+    text = _text(result)
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def _map_error(error: Exception) -> Exception:
+    """
+    Maps an MCPError onto the worker's retryable and fatal error classes
+    """
+    from mcp import MCPError, types
+
+    if not isinstance(error, MCPError):
+        return error
+    if error.code == types.CONNECTION_CLOSED:
+        return ConnectionError(f"MCP session closed: {error.message}")
+    if error.code == types.REQUEST_TIMEOUT:
+        return TimeoutError(error.message)
+    if error.message == _SESSION_NOT_FOUND:
+        return _SessionExpired(error.message)
+    return MCPToolError(f"{error.code}: {error.message}")
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram for one tool
+    """
+
+    def __init__(self, buckets_ms: Sequence[float] = LATENCY_BUCKETS_MS):
+        self.buckets_ms = tuple(buckets_ms)
+        self.counts = [0] * (len(self.buckets_ms) + 1)
+        self.count = 0
+        self.errors = 0
+        self.sum_ms = 0.0
+
+    def observe(self, latency_ms: float, ok: bool = True) -> None:
+        self.counts[bisect.bisect_left(self.buckets_ms, latency_ms)] += 1
+        self.count += 1
+        self.sum_ms += latency_ms
+        if not ok:
+            self.errors += 1
+
+    def quantile(self, q: float) -> float:
+        """
+        Upper bound (ms) of the bucket holding the q-quantile; inf on overflow
+        """
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                break
+        return float(self.buckets_ms[i]) if i < len(self.buckets_ms) else math.inf
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "mean_ms": self.sum_ms / self.count if self.count else 0.0,
+            "p50_ms": self.quantile(0.50),
+            "p95_ms": self.quantile(0.95),
+            "p99_ms": self.quantile(0.99),
+        }
+
+
+class _Session:
+    """
+    One initialized MCP session, owned by a background task
+
+    The transport and session are async context managers whose task groups
+    must be exited by the task that entered them, so a dedicated task holds
+    them open until close().
+    """
+
+    def __init__(self, endpoint: ServerEndpoint):
+        self.endpoint = endpoint
+        self.in_flight = 0
+        self.closed = False
+        self.error: Optional[BaseException] = None
+        self._session: Any = None
+        self._ready = asyncio.Event()
+        self._stop = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def open(self, timeout: float) -> None:
+        """
+        Waits for the initialize handshake; raises ConnectionError on failure
+        """
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            await self.close()
+            raise TimeoutError(f"MCP server {self.endpoint.name} did not initialize")
+        if self._session is None:
+            raise ConnectionError(
+                f"Cannot reach MCP server {self.endpoint.name}: {self.error!r}"
+            ) from self.error
+
+    async def request(
+        self, send: Callable[[Any], Awaitable[Any]], timeout: float
+    ) -> Any:
+        """
+        Sends one request; a session that dies meanwhile fails it at once
+        """
+        if self.closed or self._session is None:
+            raise ConnectionError("MCP session is closed")
+        self.in_flight += 1
+        call = asyncio.ensure_future(send(self._session))
+        try:
+            done, _ = await asyncio.wait(
+                {call, self._task}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            if call in done:
+                try:
+                    return call.result()
+                except Exception as e:
+                    mapped = _map_error(e)
+                    if mapped is e:
+                        raise
+                    raise mapped from e
+            if self._task in done:
+                raise ConnectionError(
+                    f"MCP session to {self.endpoint.name} closed: {self.error!r}"
+                )
+            raise TimeoutError(f"MCP call to {self.endpoint.name} timed out")
+        finally:
+            self.in_flight -= 1
+            if not call.done():
+                call.cancel()
+
+    async def close(self) -> None:
+        self.closed = True
+        self._stop.set()
+        try:
+            await asyncio.wait_for(self._task, DEFAULT_CALL_TIMEOUT_SECONDS)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            self._task.cancel()
+
+    async def _run(self) -> None:
+        from mcp import ClientSession, types
+        from mcp.client.streamable_http import streamable_http_client
+
+        try:
+            async with streamable_http_client(self.endpoint.url) as (read, write):
+                async with ClientSession(
+                    read,
+                    write,
+                    client_info=types.Implementation(
+                        name=CLIENT_NAME, version=CLIENT_VERSION
+                    ),
+                ) as session:
+                    await session.initialize()
+                    self._session = session
+                    self._ready.set()
+                    await self._stop.wait()
+        except Exception as e:
+            self.error = e
+        finally:
+            self.closed = True
+            self._ready.set()
+
+
+class ServerPool:
+    """
+    MCP sessions to one server with bounded concurrency
+    """
+
+    def __init__(
+        self,
+        endpoint: ServerEndpoint,
+        timeout_seconds: float = DEFAULT_CALL_TIMEOUT_SECONDS,
+    ):
+        self.endpoint = endpoint
+        self.timeout_seconds = timeout_seconds
+        self._slots = asyncio.Semaphore(endpoint.max_concurrency)
+        self._lock = asyncio.Lock()
+        self._sessions: List[_Session] = []
+        self.opened = 0
+        self.queued = 0
+        self.in_flight = 0
+
+    async def call(self, send: Callable[[Any], Awaitable[Any]]) -> Any:
+        """
+        Sends one request on a pooled session once a concurrency slot is free
+        """
+        self.queued += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.queued -= 1
+        self.in_flight += 1
+        try:
+            session = await self._session()
+            try:
+                return await session.request(send, self.timeout_seconds)
+            except _SessionExpired:
+                await self._discard(session)
+                session = await self._session()
+                return await session.request(send, self.timeout_seconds)
+            except ConnectionError:
+                await self._discard(session)
+                raise
+        finally:
+            self.in_flight -= 1
+            self._slots.release()
+
+    async def close(self) -> None:
+        sessions, self._sessions = self._sessions, []
+        for session in sessions:
+            await session.close()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "connections": sum(not s.closed for s in self._sessions),
+            "opened": self.opened,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "max_concurrency": self.endpoint.max_concurrency,
+        }
+
+    async def _session(self) -> _Session:
+        # The least-loaded open session, unless it already carries a full
+        # pipeline and the pool may still grow.
+        async with self._lock:
+            self._sessions = [s for s in self._sessions if not s.closed]
+            best = min(self._sessions, key=lambda s: s.in_flight, default=None)
+            if best is not None and (
+                best.in_flight < self.endpoint.pipeline_depth
+                or len(self._sessions) >= self.endpoint.max_connections
+            ):
+                return best
+            session = _Session(self.endpoint)
+            await session.open(self.timeout_seconds)
+            self._sessions.append(session)
+            self.opened += 1
+            logger.info(
+                "mcp_session_opened",
+                server=self.endpoint.name,
+                sessions=len(self._sessions),
+            )
+            return session
+
+    async def _discard(self, session: _Session) -> None:
+        async with self._lock:
+            if session in self._sessions:
+                self._sessions.remove(session)
+        await session.close()
+
+
+class MCPClientPool:
+    """
+    Process-wide MCP client: one session pool per server, tools by name
+    """
+
+    def __init__(
+        self,
+        endpoints: Sequence[ServerEndpoint],
+        tool_servers: Optional[Dict[str, str]] = None,
+        timeout_seconds: float = DEFAULT_CALL_TIMEOUT_SECONDS,
+    ):
+        self.pools: Dict[str, ServerPool] = {
+            endpoint.name: ServerPool(endpoint, timeout_seconds)
+            for endpoint in endpoints
+        }
+        self.tool_servers = dict(TOOL_SERVERS if tool_servers is None else tool_servers)
+        self.latency: Dict[str, LatencyHistogram] = {}
+
+    def server_for(self, tool_name: str) -> ServerPool:
+        server = self.tool_servers.get(tool_name)
+        if server not in self.pools:
+            raise KeyError(f"No MCP server configured for tool {tool_name}")
+        return self.pools[server]
+
+    async def call_tool(self, name: str, arguments: Dict[str, Any]) -> Any:
+        """
+        Calls a tool on its server; returns the tool's structured output
+        """
+        pool = self.server_for(name)
+        started = time.perf_counter()
+        ok = False
+        try:
+            result = await pool.call(lambda session: session.call_tool(name, arguments))
+            output = _tool_output(name, result)
+            ok = True
+            return output
+        finally:
+            latency_ms = (time.perf_counter() - started) * 1000
+            self.latency.setdefault(name, LatencyHistogram()).observe(latency_ms, ok)
+
+    async def list_tools(self) -> List[str]:
+        """
+        Names of the tools every configured server advertises
+        """
+        replies = await asyncio.gather(
+            *(
+                pool.call(lambda session: session.list_tools())
+                for pool in self.pools.values()
+            )
+        )
+        return [tool.name for reply in replies for tool in reply.tools]
+
+    async def close(self) -> None:
+        for pool in self.pools.values():
+            await pool.close()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {name: pool.stats() for name, pool in self.pools.items()}
+
+    def latency_report(self) -> Dict[str, Dict[str, float]]:
+        """
+        Per-tool call count, error count, mean and bucketed p50/p95/p99 (ms)
+        """
+        return {tool: hist.snapshot() for tool, hist in self.latency.items()}
+
+
+class LocalMCPServer:
+    """
+    In-process Streamable HTTP MCP server whose tools are Python callables
+    """
+
+    def __init__(
+        self,
+        name: str,
+        tools: Dict[str, Callable[[Dict[str, Any]], Any]],
+        host: str = "127.0.0.1",
+    ):
+        self.name = name
+        self.tools = dict(tools)
+        self.host = host
+        self.port = 0
+        self.active = 0
+        self.peak_active = 0
+        self._sessions: Set[str] = set()
+        self._server: Any = None
+        self._serving: Optional[asyncio.Task] = None
+
+    @property
+    def connections(self) -> int:
+        """
+        MCP sessions that have made a request since start()
+        """
+        return len(self._sessions)
+
+    async def start(self) -> "LocalMCPServer":
+        """
+        Serves on ``port`` (a free one on the first start)
+        """
+        import uvicorn
+        from mcp.server.lowlevel import Server
+
+        app = Server(
+            self.name,
+            on_list_tools=self._list_tools,
+            on_call_tool=self._call_tool,
+        ).streamable_http_app(host=self.host)
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        self.port = sock.getsockname()[1]
+        self._sessions.clear()
+        self._server = uvicorn.Server(
+            uvicorn.Config(app, log_level="warning", timeout_graceful_shutdown=0)
+        )
+        self._serving = asyncio.create_task(self._server.serve(sockets=[sock]))
+        while not self._server.started:
+            if self._serving.done():
+                self._serving.result()
+            await asyncio.sleep(0.005)
+        return self
+
+    def endpoint(self, **limits: Any) -> ServerEndpoint:
+        return ServerEndpoint(self.name, self.host, self.port, **limits)
+
+    async def close(self) -> None:
+        if self._serving is None:
+            return
+        self._server.should_exit = True
+        await self._serving
+        self._serving = None
+
+    def _track(self, ctx: Any) -> None:
+        headers = getattr(ctx.request, "headers", None) or {}
+        self._sessions.add(headers.get("mcp-session-id", ""))
+
+    async def _list_tools(self, ctx: Any, params: Any) -> Any:
+        from mcp import types
+
+        self._track(ctx)
+        return types.ListToolsResult(
+            tools=[
+                types.Tool(name=name, input_schema={"type": "object"})
+                for name in self.tools
+            ]
+        )
+
+    async def _call_tool(self, ctx: Any, params: Any) -> Any:
+        from mcp import MCPError, types
+
+        self._track(ctx)
+        if params.name not in self.tools:
+            raise MCPError(types.INVALID_PARAMS, f"Unknown tool {params.name}")
+        self.active += 1
+        self.peak_active = max(self.peak_active, self.active)
+        try:
+            output = self.tools[params.name](params.arguments or {})
+            if inspect.isawaitable(output):
+                output = await output
+        except Exception as e:
+            return types.CallToolResult(
+                content=[types.TextContent(type="text", text=repr(e))], is_error=True
+            )
+        finally:
+            self.active -= 1
+        return types.CallToolResult(
+            content=[
+                types.TextContent(type="text", text=json.dumps(output, default=str))
+            ],
+            structured_content=output if isinstance(output, dict) else None,
+        )
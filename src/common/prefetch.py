@@ -0,0 +1,191 @@
+"""Prefetch - Speculative warm cache for worker inputs
+
+Spec: specs/technical.md - Section 4.2, Section 7.1, Section 7.2
+Spec: specs/functional.md - FR-PERF-1, Story 2.2
+
+When the planner submits a DAG it attaches prefetch hints to every parent of
+a ``generate_content`` task: the child's task_id, agent and memory query.
+The worker that starts the parent fires the hints in the background, so the
+child's persona, top-k memories and hashtag candidates are loaded into a
+short-lived per-task entry while the parent runs. The worker executing the
+child consumes that entry instead of calling search_memory itself.
+
+Prefetches are speculative: the child may be shed, fail upstream or start
+before its entry lands. Entries expire after ``ttl_seconds`` and the gap
+between what was prefetched and what was consumed is reported as waste.
+
+Key layout (``prefix`` defaults to ``{chimera}:warm``):
+    {prefix}:{task_id}   JSON inputs for one task (EX ttl)
+    {prefix}:stats       prefetched/hits/misses counts and bytes
+"""
+
+import asyncio
+import json
+import re
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+import structlog
+
+from src.common.redis_text import decode
+
+logger = structlog.get_logger(__name__)
+
+WARM_CACHE_PREFIX = "{chimera}:warm"
+DEFAULT_WARM_TTL_SECONDS = 120
+DEFAULT_MEMORY_TOP_K = 5
+MAX_HASHTAGS = 8
+# Task context key under which the planner attaches hints to a parent task.
+PREFETCH_CONTEXT_KEY = "prefetch"
+PREFETCH_TASK_TYPES = frozenset({"generate_content"})
+
+_WORD = re.compile(r"[A-Za-z0-9]+")
+
+
+def hashtag_candidates(topic: str, extra: Sequence[str] = ()) -> List[str]:
+    """
+    Candidate hashtags: any supplied by the trend, then the topic's words
+
+    Returns at most MAX_HASHTAGS unique tags, each prefixed with '#'.
+    """
+    words = [w for w in _WORD.findall(topic) if len(w) > 2]
+    candidates = list(extra)
+    if words:
+        candidates.append("".join(w.capitalize() for w in words))
+        candidates.extend(w.lower() for w in words)
+    tags: List[str] = []
+    for candidate in candidates:
+        tag = "#" + str(candidate).lstrip("#")
+        if len(tag) > 1 and tag.lower() not in {t.lower() for t in tags}:
+            tags.append(tag)
+    return tags[:MAX_HASHTAGS]
+
+
+class WarmCache:
+    """
+    Short-lived per-task inputs in Redis with hit and waste accounting
+    """
+
+    def __init__(
+        self,
+        redis_client: Any,
+        prefix: str = WARM_CACHE_PREFIX,
+        ttl_seconds: int = DEFAULT_WARM_TTL_SECONDS,
+    ):
+        self.redis = redis_client
+        self.prefix = prefix
+        self.ttl_seconds = ttl_seconds
+
+    def key(self, task_id: str) -> str:
+        return f"{self.prefix}:{task_id}"
+
+    @property
+    def stats_key(self) -> str:
+        return f"{self.prefix}:stats"
+
+    def put(self, task_id: str, inputs: Dict[str, Any]) -> int:
+        """
+        Stores prefetched inputs for a task; returns the bytes written
+        """
+        blob = json.dumps(inputs, separators=(",", ":"), default=str)
+        self.redis.set(self.key(task_id), blob, ex=self.ttl_seconds)
+        self.redis.hincrby(self.stats_key, "prefetched", 1)
+        self.redis.hincrby(self.stats_key, "prefetched_bytes", len(blob))
+        return len(blob)
+
+    def consume(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Takes a task's inputs out of the cache, or None on a miss
+        """
+        blob = self.redis.getdel(self.key(task_id))
+        if blob is None:
+            self.redis.hincrby(self.stats_key, "misses", 1)
+            return None
+        self.redis.hincrby(self.stats_key, "hits", 1)
+        self.redis.hincrby(self.stats_key, "hit_bytes", len(blob))
+        entry: Dict[str, Any] = json.loads(blob)
+        return entry
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Prefetch volume, hits and waste
+
+        Entries still within their TTL count as wasted until consumed, so
+        read this over windows much longer than ``ttl_seconds``.
+        """
+        raw = {decode(k): int(v) for k, v in self.redis.hgetall(self.stats_key).items()}
+        prefetched = raw.get("prefetched", 0)
+        hits = raw.get("hits", 0)
+        wasted = max(prefetched - hits, 0)
+        return {
+            "prefetched": prefetched,
+            "hits": hits,
+            "misses": raw.get("misses", 0),
+            "wasted": wasted,
+            "wasted_bytes": max(
+                raw.get("prefetched_bytes", 0) - raw.get("hit_bytes", 0), 0
+            ),
+            "waste_ratio": wasted / prefetched if prefetched else 0.0,
+        }
+
+
+class Prefetcher:
+    """
+    Loads a child task's inputs into the WarmCache while its parent runs
+    """
+
+    def __init__(
+        self,
+        mcp_client: Any,
+        cache: WarmCache,
+        persona_loader: Optional[Callable[[str], Awaitable[Dict[str, Any]]]] = None,
+        top_k: int = DEFAULT_MEMORY_TOP_K,
+    ):
+        self.mcp = mcp_client
+        self.cache = cache
+        self.persona_loader = persona_loader
+        self.top_k = top_k
+
+    async def prefetch(self, hint: Dict[str, Any]) -> bool:
+        """
+        Fetches and caches the inputs named by one hint
+
+        Failures are logged and swallowed; the consumer falls back to
+        fetching its inputs itself. Returns True if an entry was written.
+        """
+        agent_id = hint.get("agent_id")
+        query = hint.get("query", "")
+        try:
+            memories, persona = await asyncio.gather(
+                self._memories(agent_id, query), self._persona(agent_id)
+            )
+        except Exception as e:
+            logger.warning(
+                "prefetch_failed", task_id=hint.get("task_id"), error=repr(e)
+            )
+            return False
+        inputs: Dict[str, Any] = {
+            "memories": memories,
+            "hashtags": hashtag_candidates(query, hint.get("hashtags", ())),
+        }
+        if persona is not None:
+            inputs["persona"] = persona
+        self.cache.put(hint["task_id"], inputs)
+        return True
+
+    async def prefetch_all(self, hints: Sequence[Dict[str, Any]]) -> int:
+        results = await asyncio.gather(*(self.prefetch(hint) for hint in hints))
+        return sum(results)
+
+    async def _memories(self, agent_id: Optional[str], query: str) -> List[Any]:
+        response = await self.mcp.call_tool(
+            "search_memory",
+            {"agent_id": agent_id, "query": query, "top_k": self.top_k},
+        )
+        if not isinstance(response, dict):
+            return []
+        return list(response.get("memories") or [])
+
+    async def _persona(self, agent_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        if self.persona_loader is None or agent_id is None:
+            return None
+        return await self.persona_loader(agent_id)
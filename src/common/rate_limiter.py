@@ -0,0 +1,257 @@
+"""Rate Limiter - Fleet-wide token buckets for platform and MCP quotas
+
+Spec: specs/functional.md - Story 2.4, Story 10.1
+Spec: specs/technical.md - Section 8.1
+Spec: specs/_meta.md - Rate limits and quotas
+
+Platform and API quotas apply per account or per API key across every
+worker pod, so the buckets live in Redis. Each is keyed by
+platform + account + tool and refilled and debited atomically by one Lua
+script. The account is the agent for per-account platform limits, or
+"shared" for quotas that belong to the one API key.
+
+Hot paths do not pay a Redis round-trip per call. A process takes up to
+``prefetch`` tokens at once while the bucket has them, and spends them
+locally for ``local_ttl_seconds``. Tokens still unspent when that lapses are
+dropped; the fleet errs towards under-using a quota, never over-using it.
+When a bucket is empty the script returns how long until the next token,
+and the process remembers that, so callers get a wait estimate without
+asking Redis again.
+
+RateLimitedClient wraps any ``call_tool`` client. A call whose wait fits in
+``max_wait_seconds`` waits; a longer one raises RateLimitError with
+``retry_after``, which the worker turns into a delayed retry instead of
+hitting the platform's 429.
+
+The quotas below are provisional: _meta.md defers the real numbers.
+
+Key layout (``prefix`` defaults to ``{chimera}:ratelimit``):
+    {prefix}:{platform}:{account}:{tool}   hash tokens, ts (ms); expires once
+                                           the bucket would be full again
+"""
+
+import asyncio
+import math
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+RATE_LIMIT_PREFIX = "{chimera}:ratelimit"
+DEFAULT_LOCAL_TTL_SECONDS = 1.0
+DEFAULT_MAX_WAIT_SECONDS = 5.0
+SHARED_ACCOUNT = "shared"
+
+# KEYS[1] = bucket, ARGV[1] = now (ms), ARGV[2] = tokens per second,
+# ARGV[3] = capacity, ARGV[4] = tokens needed, ARGV[5] = tokens wanted
+# (0 only estimates the wait). Grants between need and want tokens, or none.
+# Returns {granted, ms until ``need`` tokens are available}.
+_TOKEN_BUCKET_SCRIPT = """
+local now = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local capacity = tonumber(ARGV[3])
+local need = tonumber(ARGV[4])
+local want = tonumber(ARGV[5])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate / 1000)
+local granted = 0
+if want > 0 and tokens >= need then
+    granted = math.min(want, math.floor(tokens))
+    tokens = tokens - granted
+end
+if want > 0 then
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', now)
+    redis.call('PEXPIRE', KEYS[1], math.ceil((capacity - tokens) / rate * 1000) + 1000)
+end
+local wait = 0
+if granted == 0 and tokens < need then
+    wait = math.ceil((need - tokens) / rate * 1000)
+end
+return {granted, wait}
+"""
+
+
+class RateLimitError(Exception):
+    """An API rate limit was hit; retry after ``retry_after`` seconds if given"""
+
+    def __init__(self, message: str = "", retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+@dataclass(frozen=True)
+class ToolQuota:
+    """Token bucket for one tool, per platform and account"""
+
+    rate_per_second: float
+    burst: int
+    platform: str
+    # Call argument naming the account; None means one bucket per API key.
+    account_field: Optional[str] = None
+    prefetch: int = 1
+
+    def __post_init__(self) -> None:
+        if self.rate_per_second <= 0 or self.burst < 1:
+            raise ValueError("A quota needs a positive rate and a burst of >= 1")
+        if not 1 <= self.prefetch <= self.burst:
+            raise ValueError("Quota prefetch must be between 1 and the burst")
+
+
+DEFAULT_TOOL_QUOTAS = {
+    # Twitter: 100 posts / 15 min and 450 mention reads / 15 min per account.
+    "post_content": ToolQuota(100 / 900, 100, "twitter", account_field="agent_id"),
+    "get_mentions": ToolQuota(450 / 900, 450, "twitter", account_field="agent_id"),
+    # Ideogram: shared API key.
+    "generate_image": ToolQuota(1.0, 10, "ideogram", prefetch=2),
+}
+
+
+class RateLimiter:
+    """
+    Redis token buckets with a per-process token cache
+    """
+
+    def __init__(
+        self,
+        redis_client: Any,
+        quotas: Optional[Dict[str, ToolQuota]] = None,
+        prefix: str = RATE_LIMIT_PREFIX,
+        clock: Callable[[], float] = time.time,
+        local_ttl_seconds: float = DEFAULT_LOCAL_TTL_SECONDS,
+    ):
+        self.redis = redis_client
+        self.quotas = dict(DEFAULT_TOOL_QUOTAS if quotas is None else quotas)
+        self.prefix = prefix
+        self.clock = clock
+        self.local_ttl_seconds = local_ttl_seconds
+        self._bucket = redis_client.register_script(_TOKEN_BUCKET_SCRIPT)
+        # bucket -> (tokens held locally, expiry); bucket -> empty until
+        self._local: Dict[str, Tuple[int, float]] = {}
+        self._blocked_until: Dict[str, float] = {}
+        self.local_grants = 0
+        self.redis_calls = 0
+        self.denials = 0
+
+    def bucket_key(self, tool: str, arguments: Dict[str, Any]) -> Optional[str]:
+        """
+        Redis key of the bucket a call draws from; None if it has no quota
+        """
+        quota = self.quotas.get(tool)
+        if quota is None:
+            return None
+        platform = arguments.get("platform") or quota.platform
+        account = SHARED_ACCOUNT
+        if quota.account_field is not None:
+            account = arguments.get(quota.account_field) or SHARED_ACCOUNT
+        return f"{self.prefix}:{platform}:{account}:{tool}"
+
+    def try_acquire(self, tool: str, arguments: Dict[str, Any]) -> float:
+        """
+        Takes one token; returns 0.0, or the estimated wait (s) if none is free
+        """
+        key = self.bucket_key(tool, arguments)
+        if key is None:
+            return 0.0
+        now = self.clock()
+        held, expiry = self._local.get(key, (0, 0.0))
+        if held > 0 and now < expiry:
+            self._local[key] = (held - 1, expiry)
+            self.local_grants += 1
+            return 0.0
+        blocked_until = self._blocked_until.get(key, 0.0)
+        if now < blocked_until:
+            self.denials += 1
+            return blocked_until - now
+        quota = self.quotas[tool]
+        granted, wait_ms = self._call_bucket(key, quota, now, quota.prefetch)
+        if granted:
+            self._local[key] = (granted - 1, now + self.local_ttl_seconds)
+            return 0.0
+        self._blocked_until[key] = now + wait_ms / 1000
+        self.denials += 1
+        return wait_ms / 1000
+
+    def wait_time(self, tool: str, arguments: Dict[str, Any]) -> float:
+        """
+        Estimated seconds until a call could proceed, without taking a token
+        """
+        key = self.bucket_key(tool, arguments)
+        if key is None:
+            return 0.0
+        now = self.clock()
+        held, expiry = self._local.get(key, (0, 0.0))
+        if held > 0 and now < expiry:
+            return 0.0
+        if now < self._blocked_until.get(key, 0.0):
+            return self._blocked_until[key] - now
+        _, wait_ms = self._call_bucket(key, self.quotas[tool], now, 0)
+        return wait_ms / 1000
+
+    async def acquire(
+        self,
+        tool: str,
+        arguments: Dict[str, Any],
+        max_wait_seconds: float = DEFAULT_MAX_WAIT_SECONDS,
+    ) -> None:
+        """
+        Waits for a token, or raises RateLimitError if that would take longer
+        than ``max_wait_seconds``
+        """
+        waited = 0.0
+        while True:
+            wait = self.try_acquire(tool, arguments)
+            if wait <= 0:
+                return
+            if waited + wait > max_wait_seconds:
+                raise RateLimitError(
+                    f"{tool} rate limited for {wait:.1f}s", retry_after=wait
+                )
+            await asyncio.sleep(wait)
+            waited += wait
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "local_grants": self.local_grants,
+            "redis_calls": self.redis_calls,
+            "denials": self.denials,
+        }
+
+    def _call_bucket(
+        self, key: str, quota: ToolQuota, now: float, want: int
+    ) -> Tuple[int, int]:
+        self.redis_calls += 1
+        granted, wait_ms = self._bucket(
+            keys=[key],
+            args=[
+                math.floor(now * 1000),
+                quota.rate_per_second,
+                quota.burst,
+                1,
+                want,
+            ],
+        )
+        return int(granted), int(wait_ms)
+
+
+class RateLimitedClient:
+    """
+    Wraps an MCP client so every call_tool draws from its quota first
+    """
+
+    def __init__(
+        self,
+        mcp_client: Any,
+        limiter: RateLimiter,
+        max_wait_seconds: float = DEFAULT_MAX_WAIT_SECONDS,
+    ):
+        self.mcp = mcp_client
+        self.limiter = limiter
+        self.max_wait_seconds = max_wait_seconds
+
+    async def call_tool(self, name: str, arguments: Dict[str, Any]) -> Any:
+        await self.limiter.acquire(name, arguments, self.max_wait_seconds)
+        return await self.mcp.call_tool(name, arguments)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.mcp, name)
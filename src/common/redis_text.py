@@ -0,0 +1,17 @@
+"""Redis Text - Replies as str whatever the client's decode_responses
+
+Spec: specs/technical.md - Section 12
+
+Production clients return bytes and the test fixtures return str. Modules
+that read keys, members or script results back from Redis pass them through
+decode() rather than caring which client they were given.
+"""
+
+from typing import Any
+
+
+def decode(value: Any) -> str:
+    """
+    ``value`` as str; bytes are decoded as UTF-8
+    """
+    return value.decode() if isinstance(value, bytes) else str(value)
@@ -0,0 +1,866 @@
+"""Task Queue - Priority lanes with per-agent fairness in Redis
+
+Spec: specs/technical.md - Section 5 (Task Schema), Section 7.2
+Spec: specs/functional.md - FR-PERF-1, FR-SCALE-1
+
+Tasks are split into HIGH / MEDIUM / LOW lanes. Inside a lane every agent has
+its own FIFO list and agents are served by deficit round-robin, so one noisy
+agent gets its quantum per round instead of the whole lane. Lanes are served
+in strict priority order, except that a lower lane whose oldest front task
+has waited longer than its aging threshold is served first; LOW work cannot
+starve behind a steady stream of HIGH work.
+
+Tasks with an absolute deadline bypass the per-agent lists: inside a lane
+they are served earliest-deadline-first ahead of deadline-free work. A
+deadline task in a lower lane whose latest start is within the urgency
+window is served before higher lanes, the same way aged work is. A task
+whose latest start (deadline minus its estimated service time) has passed
+cannot make its deadline; on claim it is either shed or downgraded into
+the next lane as ordinary work (a LOW task stays in LOW without its
+deadline), according to its miss policy. Shed, downgrade and met/late
+counts are kept per task_type for miss-rate metrics.
+
+Claims are leased. One claim call atomically takes up to N tasks, records
+each under the claiming worker's processing set with a lease deadline, and
+returns a token per task. The worker acks a token when the task is settled,
+unclaims it to hand it straight back when it has no capacity for it, and
+heartbeats the tokens of long tasks to extend their leases; a reaper
+(any worker may run it) puts tasks whose lease expired -- their worker died
+or stalled -- back at the front of their agent's list, or back into EDF
+order if they carried a deadline. Delivery is therefore at-least-once.
+
+A task to be retried later is moved from its lease into the delay set,
+scored by due time, instead of holding a worker while it waits. Each claim
+first promotes due entries back into their lanes (EDF if they carry a
+deadline), so no separate promoter process is needed.
+
+A task that needs an MCP tool whose circuit breaker is open is parked: moved
+from its lease to the tool's holding list without running. The
+CircuitMonitor releases parked tasks back into their lanes in waves once the
+tool recovers.
+
+Pushing is two plain idempotent commands (LPUSH onto the agent list, SADD
+the agent to the lane's incoming set; or one LPUSH onto the lane's deadline
+inbox). Everything that decides what a worker gets -- absorbing new agents
+into the ring, deficits, rotation, aging, deadline ordering and shedding --
+happens inside one Lua script per claim.
+
+Redis Cluster: the scripts reach keys whose names are only known inside
+them (an agent's lane list, a worker found in the workers set, the lane a
+route points at), so they cannot all be declared in KEYS. Every key of the
+queue instead shares one hash tag -- the ``{chimera}`` in the default
+prefix -- and therefore one slot; a custom prefix must carry a tag too.
+DagScheduler and DeadLetterQueue push routes into the lanes from their own
+scripts and must use the queue's tag. Fixed keys are still passed as KEYS
+so a cluster client routes each script to the right node.
+
+Key layout (``prefix`` defaults to ``{chimera}:tasks``, lane is high/medium/low):
+    {prefix}:{lane}:q:{agent_id}   "enqueued_ms|cost|payload", oldest at the tail
+    {prefix}:{lane}:incoming       agents with new work not yet in the ring
+    {prefix}:{lane}:ring           round-robin order of active agents
+    {prefix}:{lane}:deficit        agent_id -> DRR deficit (ring membership)
+    {prefix}:{lane}:edf:in         deadline tasks not yet ordered
+    {prefix}:{lane}:edf            zset "due|latest|policy|type|agent|payload"
+                                   scored by due time (ms)
+    {prefix}:shed                  most recently shed payloads, newest first
+    {prefix}:processing:{worker}   zset lease token -> lease deadline (ms)
+    {prefix}:processing:{worker}:routes
+                                   lease token -> route to re-queue it by
+    {prefix}:workers               workers that may hold leases
+    {prefix}:lease:seq             lease token counter
+    {prefix}:lease:reaped          number of expired leases re-queued
+    {prefix}:delayed               zset "token\troute" scored by due time (ms)
+    {prefix}:delayed:promoted      number of delayed tasks made ready again
+    {prefix}:parked:{tool}         routes of tasks held while the tool's circuit
+                                   is open, oldest at the head
+    {prefix}:parked                tools with parked tasks
+    {prefix}:deadline:{outcome}    task_type -> count, outcome is
+                                   met/late/shed/downgraded
+"""
+
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.common.redis_text import decode
+
+TASK_QUEUE_KEY = "{chimera}:tasks"
+LANES = ("high", "medium", "low")
+DEFAULT_QUANTUM = 1
+DEFAULT_AGING_SECONDS = {"medium": 60.0, "low": 300.0}
+DEFAULT_URGENCY_SECONDS = 1.0
+DEFAULT_SHED_HISTORY = 1000
+MISS_POLICIES = ("shed", "downgrade")
+DEADLINE_OUTCOMES = ("met", "late", "shed", "downgraded")
+DEFAULT_LEASE_SECONDS = 60.0
+DEFAULT_REAP_BATCH = 100
+DEFAULT_PROMOTE_BATCH = 100
+
+# Shared by the claim script and by DagScheduler so released children enter
+# the lanes atomically with their parent's completion. A route is
+# "lane_prefix\tagent_id\tcost\tdeadline\tpayload" as produced by
+# TaskQueue.route(); deadline is empty or Deadline.encode(). Routes parked
+# before deadlines existed have no deadline field and are still accepted.
+# With ``front`` set the task is put where the agent's next claim takes it.
+PUSH_ROUTE_LUA = """
+local function push_route(route, now, front)
+    local lane_prefix, agent, cost, deadline, payload = string.match(
+        route, '^([^\\t]*)\\t([^\\t]*)\\t(%d+)\\t([^\\t]*)\\t(.*)$')
+    if not lane_prefix then
+        deadline = ''
+        lane_prefix, agent, cost, payload =
+            string.match(route, '^([^\\t]*)\\t([^\\t]*)\\t(%d+)\\t(.*)$')
+    end
+    if deadline ~= '' then
+        local entry = deadline .. '|' .. agent .. '|' .. payload
+        redis.call('LPUSH', lane_prefix .. ':edf:in', entry)
+        return
+    end
+    local entry = now .. '|' .. cost .. '|' .. payload
+    redis.call(front and 'RPUSH' or 'LPUSH', lane_prefix .. ':q:' .. agent, entry)
+    redis.call('SADD', lane_prefix .. ':incoming', agent)
+end
+"""
+
+# KEYS[1] = delay set, KEYS[2] = worker's processing zset, KEYS[3] = workers
+# set, KEYS[4] = lease token counter,
+# ARGV[1] = prefix, ARGV[2] = now (ms), ARGV[3] = quantum,
+# ARGV[4] = medium aging (ms), ARGV[5] = low aging (ms),
+# ARGV[6] = deadline urgency window (ms), ARGV[7] = shed history length,
+# ARGV[8] = max tasks to claim, ARGV[9] = worker_id ('' for no lease),
+# ARGV[10] = lease length (ms), ARGV[11] = max delayed tasks to promote
+# Returns a list of {lane, payload, lease token}, empty when every lane is.
+_CLAIM_SCRIPT = PUSH_ROUTE_LUA + """
+local prefix = ARGV[1]
+local now = tonumber(ARGV[2])
+local quantum = tonumber(ARGV[3])
+local lanes = {'high', 'medium', 'low'}
+local aging = {nil, tonumber(ARGV[4]), tonumber(ARGV[5])}
+local urgency = tonumber(ARGV[6])
+local shed_history = tonumber(ARGV[7])
+local count = tonumber(ARGV[8])
+local worker = ARGV[9]
+local lease_ms = tonumber(ARGV[10])
+local promote_limit = tonumber(ARGV[11])
+
+local function promote()
+    local delayed = KEYS[1]
+    local due = redis.call(
+        'ZRANGEBYSCORE', delayed, '-inf', now, 'LIMIT', 0, promote_limit)
+    for _, member in ipairs(due) do
+        push_route(string.match(member, '^[^\t]*\t(.*)$'), now)
+        redis.call('ZREM', delayed, member)
+    end
+    if #due > 0 then
+        redis.call('INCRBY', delayed .. ':promoted', #due)
+    end
+end
+
+local function absorb(lp)
+    local incoming = redis.call('SMEMBERS', lp .. ':incoming')
+    if #incoming == 0 then
+        return
+    end
+    redis.call('DEL', lp .. ':incoming')
+    table.sort(incoming)
+    for _, agent in ipairs(incoming) do
+        if redis.call('HSETNX', lp .. ':deficit', agent, quantum) == 1 then
+            redis.call('RPUSH', lp .. ':ring', agent)
+        end
+    end
+end
+
+local function front(lp)
+    while true do
+        local agent = redis.call('LINDEX', lp .. ':ring', 0)
+        if not agent then
+            return nil
+        end
+        local entry = redis.call('LINDEX', lp .. ':q:' .. agent, -1)
+        if entry then
+            return agent, entry
+        end
+        redis.call('LPOP', lp .. ':ring')
+        redis.call('HDEL', lp .. ':deficit', agent)
+    end
+end
+
+local function serve(lp)
+    while true do
+        local agent, entry = front(lp)
+        if not agent then
+            return nil
+        end
+        local cost = tonumber(string.match(entry, '^%d+|(%d+)|'))
+        local deficit = tonumber(redis.call('HGET', lp .. ':deficit', agent) or quantum)
+        if deficit >= cost then
+            local queue = lp .. ':q:' .. agent
+            redis.call('RPOP', queue)
+            if redis.call('LLEN', queue) == 0 then
+                redis.call('LPOP', lp .. ':ring')
+                redis.call('HDEL', lp .. ':deficit', agent)
+            else
+                redis.call('HSET', lp .. ':deficit', agent, deficit - cost)
+            end
+            local _, header_end = string.find(entry, '^%d+|%d+|')
+            local payload = string.sub(entry, header_end + 1)
+            return payload, table.concat({lp, agent, cost, '', payload}, '\t')
+        end
+        -- Turn over: rotate to the back of the ring with a fresh quantum.
+        redis.call('RPUSH', lp .. ':ring', redis.call('LPOP', lp .. ':ring'))
+        redis.call('HSET', lp .. ':deficit', agent, deficit + quantum)
+    end
+end
+
+local function absorb_edf(lp)
+    local incoming = redis.call('LRANGE', lp .. ':edf:in', 0, -1)
+    if #incoming == 0 then
+        return
+    end
+    redis.call('DEL', lp .. ':edf:in')
+    for _, entry in ipairs(incoming) do
+        local due = tonumber(string.match(entry, '^(%d+)|'))
+        redis.call('ZADD', lp .. ':edf', due, entry)
+    end
+end
+
+-- Earliest-deadline entry of lane i that can still make it, as
+-- (entry, latest start, payload, agent). Hopeless entries met on the way are shed,
+-- or downgraded into the next lane (the LOW lane's own DRR queue for LOW
+-- entries) as deadline-free work.
+local function edf_front(i)
+    local lp = prefix .. ':' .. lanes[i]
+    while true do
+        local entry = redis.call('ZRANGE', lp .. ':edf', 0, 0)[1]
+        if not entry then
+            return nil
+        end
+        local latest, policy, task_type, agent, payload = string.match(
+            entry, '^%d+|(%d+)|(%a+)|([^|]*)|([^|]*)|(.*)$')
+        latest = tonumber(latest)
+        if now <= latest then
+            return entry, latest, payload, agent
+        end
+        redis.call('ZREM', lp .. ':edf', entry)
+        if policy == 'downgrade' then
+            local lower = prefix .. ':' .. lanes[math.min(i + 1, #lanes)]
+            redis.call('LPUSH', lower .. ':q:' .. agent, now .. '|1|' .. payload)
+            redis.call('SADD', lower .. ':incoming', agent)
+            absorb(lower)
+            redis.call('HINCRBY', prefix .. ':deadline:downgraded', task_type, 1)
+        else
+            redis.call('LPUSH', prefix .. ':shed', payload)
+            redis.call('LTRIM', prefix .. ':shed', 0, shed_history - 1)
+            redis.call('HINCRBY', prefix .. ':deadline:shed', task_type, 1)
+        end
+    end
+end
+
+local function serve_edf(i)
+    local lp = prefix .. ':' .. lanes[i]
+    local entry, latest, payload, agent = edf_front(i)
+    if not entry then
+        return nil
+    end
+    redis.call('ZREM', lp .. ':edf', entry)
+    local deadline = string.match(entry, '^([^|]*|[^|]*|[^|]*|[^|]*)|')
+    return payload, table.concat({lp, agent, 1, deadline, payload}, '\t')
+end
+
+-- Returns lane, payload and the route that would re-queue the task.
+local function claim_one()
+    for i = 1, #lanes do
+        local entry, latest = edf_front(i)
+        if entry and latest - now <= urgency then
+            return lanes[i], serve_edf(i)
+        end
+    end
+
+    for i = #lanes, 2, -1 do
+        local lp = prefix .. ':' .. lanes[i]
+        local agent, entry = front(lp)
+        if agent and now - tonumber(string.match(entry, '^(%d+)|')) >= aging[i] then
+            return lanes[i], serve(lp)
+        end
+    end
+
+    for i = 1, #lanes do
+        local payload, route = serve_edf(i)
+        if not payload then
+            payload, route = serve(prefix .. ':' .. lanes[i])
+        end
+        if payload then
+            return lanes[i], payload, route
+        end
+    end
+    return nil
+end
+
+promote()
+for i = 1, #lanes do
+    absorb_edf(prefix .. ':' .. lanes[i])
+    absorb(prefix .. ':' .. lanes[i])
+end
+
+local claimed = {}
+local processing = KEYS[2]
+for _ = 1, count do
+    local lane, payload, route = claim_one()
+    if not lane then
+        break
+    end
+    local token = ''
+    if worker ~= '' then
+        token = tostring(redis.call('INCR', KEYS[4]))
+        redis.call('ZADD', processing, now + lease_ms, token)
+        redis.call('HSET', processing .. ':routes', token, route)
+    end
+    claimed[#claimed + 1] = {lane, payload, token}
+end
+if worker ~= '' and #claimed > 0 then
+    redis.call('SADD', KEYS[3], worker)
+end
+return claimed
+"""
+
+# KEYS[1] = worker's processing zset, ARGV[1] = new lease deadline (ms),
+# ARGV[2..] = lease tokens. Returns the tokens no longer held (reaped).
+_EXTEND_SCRIPT = """
+local lost = {}
+for i = 2, #ARGV do
+    if redis.call('ZSCORE', KEYS[1], ARGV[i]) then
+        redis.call('ZADD', KEYS[1], ARGV[1], ARGV[i])
+    else
+        lost[#lost + 1] = ARGV[i]
+    end
+end
+return lost
+"""
+
+# KEYS[1] = worker's processing zset, KEYS[2] = delay set,
+# ARGV[1] = lease token, ARGV[2] = due time (ms), ARGV[3] = new payload
+# Moves a leased task into the delay set; 0 if its lease was already reaped.
+_RETRY_LATER_SCRIPT = """
+local route = redis.call('HGET', KEYS[1] .. ':routes', ARGV[1])
+if not route or redis.call('ZREM', KEYS[1], ARGV[1]) == 0 then
+    return 0
+end
+redis.call('HDEL', KEYS[1] .. ':routes', ARGV[1])
+local head = string.match(route, '^([^\t]*\t[^\t]*\t[^\t]*\t[^\t]*)\t')
+redis.call('ZADD', KEYS[2], ARGV[2], ARGV[1] .. '\t' .. head .. '\t' .. ARGV[3])
+return 1
+"""
+
+# KEYS[1] = worker's processing zset, KEYS[2] = tool's parked list,
+# KEYS[3] = parked tools set, ARGV[1] = lease token, ARGV[2] = tool
+# Moves a leased task to the parked list; 0 if its lease was already reaped.
+_PARK_SCRIPT = """
+local route = redis.call('HGET', KEYS[1] .. ':routes', ARGV[1])
+if not route or redis.call('ZREM', KEYS[1], ARGV[1]) == 0 then
+    return 0
+end
+redis.call('HDEL', KEYS[1] .. ':routes', ARGV[1])
+redis.call('RPUSH', KEYS[2], route)
+redis.call('SADD', KEYS[3], ARGV[2])
+return 1
+"""
+
+# KEYS[1] = worker's processing zset, ARGV[1] = lease token, ARGV[2] = now (ms)
+# Hands a leased task back to the front of its lane without running it; 0 if
+# its lease was already reaped.
+_UNCLAIM_SCRIPT = PUSH_ROUTE_LUA + """
+local route = redis.call('HGET', KEYS[1] .. ':routes', ARGV[1])
+if not route or redis.call('ZREM', KEYS[1], ARGV[1]) == 0 then
+    return 0
+end
+redis.call('HDEL', KEYS[1] .. ':routes', ARGV[1])
+push_route(route, tonumber(ARGV[2]), true)
+return 1
+"""
+
+# KEYS[1] = tool's parked list, KEYS[2] = parked tools set,
+# ARGV[1] = now (ms), ARGV[2] = max tasks to release, ARGV[3] = tool
+# Re-queues the oldest parked tasks into their lanes, in parking order.
+_RELEASE_PARKED_SCRIPT = PUSH_ROUTE_LUA + """
+local released = 0
+while released < tonumber(ARGV[2]) do
+    local route = redis.call('LPOP', KEYS[1])
+    if not route then
+        break
+    end
+    push_route(route, tonumber(ARGV[1]), false)
+    released = released + 1
+end
+if redis.call('LLEN', KEYS[1]) == 0 then
+    redis.call('SREM', KEYS[2], ARGV[3])
+end
+return released
+"""
+
+# KEYS[1] = workers set, KEYS[2] = reaped lease counter,
+# ARGV[1] = prefix, ARGV[2] = now (ms), ARGV[3] = max leases to reap
+# Returns the number of expired leases whose tasks were re-queued.
+_REAP_SCRIPT = PUSH_ROUTE_LUA + """
+local prefix = ARGV[1]
+local now = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+local reaped = 0
+for _, worker in ipairs(redis.call('SMEMBERS', KEYS[1])) do
+    local processing = prefix .. ':processing:' .. worker
+    local expired = redis.call(
+        'ZRANGEBYSCORE', processing, '-inf', now, 'LIMIT', 0, limit - reaped)
+    for _, token in ipairs(expired) do
+        local route = redis.call('HGET', processing .. ':routes', token)
+        if route then
+            push_route(route, now, true)
+        end
+        redis.call('ZREM', processing, token)
+        redis.call('HDEL', processing .. ':routes', token)
+        reaped = reaped + 1
+    end
+    if redis.call('ZCARD', processing) == 0 then
+        redis.call('SREM', KEYS[1], worker)
+    end
+    if reaped >= limit then
+        break
+    end
+end
+if reaped > 0 then
+    redis.call('INCRBY', KEYS[2], reaped)
+end
+return reaped
+"""
+
+
+def lane_for(priority: Any) -> str:
+    """
+    Maps a TaskPriority (or its string value) to a lane name
+    """
+    lane = str(getattr(priority, "value", priority)).lower()
+    if lane not in LANES:
+        raise ValueError(f"Unknown task priority: {priority}")
+    return lane
+
+
+def hash_tag(key: str) -> str:
+    """
+    The part of ``key`` Redis Cluster hashes to pick its slot
+
+    That is the text between the first ``{`` and the next ``}`` when it is
+    not empty, otherwise the whole key.
+    """
+    start = key.find("{")
+    if start != -1:
+        end = key.find("}", start + 1)
+        if end > start + 1:
+            return key[start + 1 : end]
+    return key
+
+
+def require_hash_tag(prefix: str, tag: Optional[str] = None) -> None:
+    """
+    Rejects a key prefix whose keys would not all hash to one cluster slot
+
+    With ``tag`` the prefix must also carry that tag, so a second keyspace
+    can share the slot of the queue it pushes into.
+    """
+    own = hash_tag(prefix)
+    if own == prefix:
+        raise ValueError(
+            f"Redis key prefix needs a hash tag such as {{chimera}}: {prefix}"
+        )
+    if tag is not None and own != tag:
+        raise ValueError(f"Redis key prefix {prefix} must use the hash tag {{{tag}}}")
+
+
+def as_utc(value: datetime) -> datetime:
+    """
+    Converts a deadline to an aware UTC datetime; naive values are taken as UTC
+    """
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+@dataclass(frozen=True)
+class Deadline:
+    """Absolute due time of a queued task and what to do if it cannot be met"""
+
+    due_ms: int
+    latest_start_ms: int
+    task_type: str
+    on_miss: str = "downgrade"
+
+    def __post_init__(self) -> None:
+        if self.on_miss not in MISS_POLICIES:
+            raise ValueError(f"Unknown deadline miss policy: {self.on_miss}")
+        if "|" in self.task_type or "\t" in self.task_type:
+            raise ValueError(f"Invalid task_type for a deadline: {self.task_type}")
+
+    def encode(self) -> str:
+        return (
+            f"{int(self.due_ms)}|{int(self.latest_start_ms)}|"
+            f"{self.on_miss}|{self.task_type}"
+        )
+
+
+@dataclass(frozen=True)
+class Lease:
+    """A claimed task and the token its worker acks or extends it by"""
+
+    token: str
+    lane: str
+    payload: str
+
+
+class TaskQueue:
+    """
+    Multi-lane task queue with deficit round-robin across agents
+    """
+
+    def __init__(
+        self,
+        redis_client: Any,
+        prefix: str = TASK_QUEUE_KEY,
+        quantum: int = DEFAULT_QUANTUM,
+        aging_seconds: Optional[Dict[str, float]] = None,
+        clock: Callable[[], float] = time.time,
+        urgency_seconds: float = DEFAULT_URGENCY_SECONDS,
+        shed_history: int = DEFAULT_SHED_HISTORY,
+        promote_batch: int = DEFAULT_PROMOTE_BATCH,
+    ):
+        require_hash_tag(prefix)
+        self.redis = redis_client
+        self.prefix = prefix
+        self.quantum = quantum
+        self.aging_seconds = {**DEFAULT_AGING_SECONDS, **(aging_seconds or {})}
+        self.clock = clock
+        self.urgency_seconds = urgency_seconds
+        self.shed_history = shed_history
+        self.promote_batch = promote_batch
+        self._claim = redis_client.register_script(_CLAIM_SCRIPT)
+        self._extend = redis_client.register_script(_EXTEND_SCRIPT)
+        self._reap = redis_client.register_script(_REAP_SCRIPT)
+        self._retry_later = redis_client.register_script(_RETRY_LATER_SCRIPT)
+        self._park = redis_client.register_script(_PARK_SCRIPT)
+        self._unclaim = redis_client.register_script(_UNCLAIM_SCRIPT)
+        self._release_parked = redis_client.register_script(_RELEASE_PARKED_SCRIPT)
+
+    def lane_prefix(self, priority: Any) -> str:
+        return f"{self.prefix}:{lane_for(priority)}"
+
+    def now_ms(self) -> int:
+        return int(self.clock() * 1000)
+
+    def push(
+        self,
+        agent_id: str,
+        priority: Any,
+        payload: str,
+        cost: int = 1,
+        deadline: Optional[Deadline] = None,
+    ) -> None:
+        """
+        Appends a ready task to its priority lane
+
+        Deadline-free tasks join the agent's DRR list; tasks with a deadline
+        go to the lane's deadline inbox and are served EDF.
+        """
+        lane_prefix = self.lane_prefix(priority)
+        if deadline is not None:
+            entry = f"{deadline.encode()}|{agent_id}|{payload}"
+            self.redis.lpush(f"{lane_prefix}:edf:in", entry)
+            return
+        entry = f"{self.now_ms()}|{int(cost)}|{payload}"
+        self.redis.lpush(f"{lane_prefix}:q:{agent_id}", entry)
+        self.redis.sadd(f"{lane_prefix}:incoming", agent_id)
+
+    def route(
+        self,
+        agent_id: str,
+        priority: Any,
+        payload: str,
+        cost: int = 1,
+        deadline: Optional[Deadline] = None,
+    ) -> str:
+        """
+        Encodes a deferred push for Lua callers of PUSH_ROUTE_LUA
+        """
+        encoded = deadline.encode() if deadline is not None else ""
+        return (
+            f"{self.lane_prefix(priority)}\t{agent_id}\t{int(cost)}\t"
+            f"{encoded}\t{payload}"
+        )
+
+    def claim(self) -> Optional[Tuple[str, str]]:
+        """
+        Atomically takes the next task; returns (lane, payload) or None
+
+        The task is not leased: if the caller dies it is lost. Workers use
+        claim_batch().
+        """
+        claimed = self._claim_many(1, "", 0)
+        if not claimed:
+            return None
+        lane, payload, _ = claimed[0]
+        return lane, payload
+
+    def claim_batch(
+        self,
+        worker_id: str,
+        count: int,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+    ) -> List[Lease]:
+        """
+        Atomically takes up to ``count`` tasks, leased to ``worker_id``
+
+        Tasks come out in the same order ``count`` single claims would give.
+        """
+        if not worker_id:
+            raise ValueError("Leased claims need a worker_id")
+        claimed = self._claim_many(count, worker_id, int(lease_seconds * 1000))
+        return [
+            Lease(token=token, lane=lane, payload=payload)
+            for lane, payload, token in claimed
+        ]
+
+    def extend_leases(
+        self,
+        worker_id: str,
+        tokens: List[str],
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+    ) -> List[str]:
+        """
+        Heartbeat: pushes the tokens' lease deadlines out by ``lease_seconds``
+
+        Returns the tokens whose lease was already reaped; those tasks have
+        been re-queued and may be running elsewhere.
+        """
+        if not tokens:
+            return []
+        expiry = self.now_ms() + int(lease_seconds * 1000)
+        lost = self._extend(
+            keys=[self._processing_key(worker_id)], args=[expiry, *tokens]
+        )
+        return [decode(token) for token in lost]
+
+    def ack(self, worker_id: str, token: str) -> bool:
+        """
+        Releases a settled task's lease; False if it had already been reaped
+        """
+        processing = self._processing_key(worker_id)
+        held = self.redis.zrem(processing, token)
+        self.redis.hdel(f"{processing}:routes", token)
+        return bool(held)
+
+    def unclaim(self, worker_id: str, token: str) -> bool:
+        """
+        Hands a leased task back to the front of its lane without running it
+
+        Returns False if the lease had already been reaped.
+        """
+        returned = self._unclaim(
+            keys=[self._processing_key(worker_id)], args=[token, self.now_ms()]
+        )
+        return bool(returned)
+
+    def retry_later(
+        self, worker_id: str, token: str, payload: str, delay_seconds: float
+    ) -> bool:
+        """
+        Releases a leased task into the delay set, due in ``delay_seconds``
+
+        ``payload`` replaces the task's payload (e.g. with its attempt count
+        bumped). Returns False if the lease had already been reaped; the
+        task was then re-queued by the reaper and is not scheduled again.
+        """
+        due_ms = self.now_ms() + int(delay_seconds * 1000)
+        moved = self._retry_later(
+            keys=[self._processing_key(worker_id), f"{self.prefix}:delayed"],
+            args=[token, due_ms, payload],
+        )
+        return bool(moved)
+
+    def defer(self, route: str, delay_seconds: float) -> None:
+        """
+        Adds an unleased task, encoded by route(), to the delay set
+        """
+        token = self.redis.incr(f"{self.prefix}:lease:seq")
+        due_ms = self.now_ms() + int(delay_seconds * 1000)
+        self.redis.zadd(f"{self.prefix}:delayed", {f"{token}\t{route}": due_ms})
+
+    def retry_stats(self) -> Dict[str, float]:
+        """
+        Tasks waiting in the delay set, how many were promoted, next due time
+        """
+        delayed = f"{self.prefix}:delayed"
+        head = self.redis.zrange(delayed, 0, 0, withscores=True)
+        return {
+            "delayed": self.redis.zcard(delayed),
+            "promoted": int(self.redis.get(f"{delayed}:promoted") or 0),
+            "next_due_in_seconds": (
+                max(head[0][1] - self.now_ms(), 0) / 1000 if head else 0.0
+            ),
+        }
+
+    def park(self, worker_id: str, token: str, tool: str) -> bool:
+        """
+        Moves a leased task to ``tool``'s parked list until the tool recovers
+
+        Returns False if the lease had already been reaped.
+        """
+        parked = self._park(
+            keys=[
+                self._processing_key(worker_id),
+                f"{self.prefix}:parked:{tool}",
+                f"{self.prefix}:parked",
+            ],
+            args=[token, tool],
+        )
+        return bool(parked)
+
+    def park_route(self, route: str, tool: str) -> None:
+        """
+        Parks an unleased task, encoded by route()
+        """
+        self.redis.rpush(f"{self.prefix}:parked:{tool}", route)
+        self.redis.sadd(f"{self.prefix}:parked", tool)
+
+    def release_parked(self, tool: str, count: int) -> int:
+        """
+        Re-queues up to ``count`` of ``tool``'s parked tasks, oldest first
+        """
+        released = self._release_parked(
+            keys=[f"{self.prefix}:parked:{tool}", f"{self.prefix}:parked"],
+            args=[self.now_ms(), count, tool],
+        )
+        return int(released)
+
+    def parked_tools(self) -> List[str]:
+        return sorted(decode(t) for t in self.redis.smembers(f"{self.prefix}:parked"))
+
+    def parked(self, tool: str) -> Dict[str, Any]:
+        """
+        Number of tasks parked on ``tool`` and the agents they belong to
+        """
+        routes = self.redis.lrange(f"{self.prefix}:parked:{tool}", 0, -1)
+        agents = {decode(route).split("\t", 2)[1] for route in routes}
+        return {"tasks": len(routes), "agents": sorted(agents)}
+
+    def reap_expired(self, limit: int = DEFAULT_REAP_BATCH) -> int:
+        """
+        Re-queues up to ``limit`` tasks whose lease has expired
+
+        Safe to run from every worker concurrently.
+        """
+        return int(
+            self._reap(
+                keys=[f"{self.prefix}:workers", f"{self.prefix}:lease:reaped"],
+                args=[self.prefix, self.now_ms(), limit],
+            )
+        )
+
+    def lease_stats(self) -> Dict[str, int]:
+        """
+        Tasks currently leased (per worker and total) and leases reaped so far
+        """
+        leased = {
+            decode(worker): self.redis.zcard(self._processing_key(decode(worker)))
+            for worker in self.redis.smembers(f"{self.prefix}:workers")
+        }
+        return {
+            "leased": sum(leased.values()),
+            "workers": len(leased),
+            "reaped": int(self.redis.get(f"{self.prefix}:lease:reaped") or 0),
+        }
+
+    def _processing_key(self, worker_id: str) -> str:
+        return f"{self.prefix}:processing:{worker_id}"
+
+    def _claim_many(
+        self, count: int, worker_id: str, lease_ms: int
+    ) -> List[Tuple[str, str, str]]:
+        claimed = self._claim(
+            keys=[
+                f"{self.prefix}:delayed",
+                self._processing_key(worker_id),
+                f"{self.prefix}:workers",
+                f"{self.prefix}:lease:seq",
+            ],
+            args=[
+                self.prefix,
+                self.now_ms(),
+                self.quantum,
+                int(self.aging_seconds["medium"] * 1000),
+                int(self.aging_seconds["low"] * 1000),
+                int(self.urgency_seconds * 1000),
+                self.shed_history,
+                int(count),
+                worker_id,
+                lease_ms,
+                self.promote_batch,
+            ],
+        )
+        return [
+            (decode(lane), decode(payload), decode(token))
+            for lane, payload, token in claimed or []
+        ]
+
+    def depth(self) -> Dict[str, int]:
+        """
+        Number of queued tasks per lane (for metrics, not the hot path)
+        """
+        depths = {}
+        for lane in LANES:
+            lane_prefix = f"{self.prefix}:{lane}"
+            agents = set(self.redis.lrange(f"{lane_prefix}:ring", 0, -1))
+            agents.update(self.redis.smembers(f"{lane_prefix}:incoming"))
+            depths[lane] = sum(
+                self.redis.llen(f"{lane_prefix}:q:{decode(agent)}") for agent in agents
+            )
+            depths[lane] += self.redis.zcard(f"{lane_prefix}:edf")
+            depths[lane] += self.redis.llen(f"{lane_prefix}:edf:in")
+        return depths
+
+    def record_deadline(self, task_type: str, met: bool) -> None:
+        """
+        Counts a finished deadline task as met or late
+        """
+        outcome = "met" if met else "late"
+        self.redis.hincrby(f"{self.prefix}:deadline:{outcome}", task_type, 1)
+
+    def deadline_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Per task_type deadline outcomes and miss rate
+
+        Shed tasks count as misses; downgraded tasks are reported separately
+        and counted as met or late once they finish.
+        """
+        stats: Dict[str, Dict[str, float]] = {}
+        for outcome in DEADLINE_OUTCOMES:
+            counts = self.redis.hgetall(f"{self.prefix}:deadline:{outcome}")
+            for task_type, count in counts.items():
+                row = stats.setdefault(
+                    decode(task_type), dict.fromkeys(DEADLINE_OUTCOMES, 0)
+                )
+                row[outcome] = int(count)
+        for row in stats.values():
+            finished = row["met"] + row["late"] + row["shed"]
+            missed = row["late"] + row["shed"]
+            row["miss_rate"] = missed / finished if finished else 0.0
+        return stats
+
+    def shed_tasks(self, count: int = 100) -> List[str]:
+        """
+        Payloads of the most recently shed tasks, newest first
+        """
+        shed = self.redis.lrange(f"{self.prefix}:shed", 0, count - 1)
+        return [decode(payload) for payload in shed]
+
+    def agents(self, priority: Any) -> List[str]:
+        """
+        Agents currently in a lane's round-robin ring, front first
+        """
+        ring = self.redis.lrange(f"{self.lane_prefix(priority)}:ring", 0, -1)
+        return [decode(agent) for agent in ring]
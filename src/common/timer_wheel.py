@@ -0,0 +1,140 @@
+"""Timer Wheel - Hierarchical timing wheel for process-wide scheduling
+
+Spec: specs/technical.md - Section 7.1 (poll cadence), Section 12
+Spec: specs/functional.md - FR-SCALE-1
+
+A single wheel replaces one sleeping coroutine per timer. Scheduling and
+cancelling are O(1); advancing costs O(1) per tick plus the timers that fire
+or cascade down a level.
+
+With the defaults (1s ticks, 64 slots, 4 levels) the wheel covers ~194 days
+without touching the overflow set.
+"""
+
+import math
+from typing import Any, Iterator, List, Optional, Set
+
+
+class Timer:
+    """
+    Handle for a scheduled entry; pass to TimerWheel.cancel to remove it
+    """
+
+    __slots__ = ("deadline_tick", "payload", "_slot")
+
+    def __init__(self, deadline_tick: int, payload: Any):
+        self.deadline_tick = deadline_tick
+        self.payload = payload
+        self._slot: Optional[Set["Timer"]] = None
+
+    @property
+    def active(self) -> bool:
+        return self._slot is not None
+
+
+class TimerWheel:
+    """
+    Hierarchical timing wheel keyed by integer ticks
+    """
+
+    def __init__(
+        self,
+        tick_seconds: float = 1.0,
+        slot_bits: int = 6,
+        levels: int = 4,
+        start_time: float = 0.0,
+    ):
+        self.tick_seconds = tick_seconds
+        self._bits = slot_bits
+        self._mask = (1 << slot_bits) - 1
+        self._levels = levels
+        self._wheels: List[List[Set[Timer]]] = [
+            [set() for _ in range(1 << slot_bits)] for _ in range(levels)
+        ]
+        self._overflow: Set[Timer] = set()
+        self._current_tick = int(start_time // tick_seconds)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def now(self) -> float:
+        return self._current_tick * self.tick_seconds
+
+    def schedule_at(self, when: float, payload: Any) -> Timer:
+        """
+        Schedules payload to fire at absolute time ``when`` (wheel clock)
+        """
+        deadline = max(self._current_tick + 1, math.ceil(when / self.tick_seconds))
+        timer = Timer(deadline, payload)
+        self._place(timer)
+        self._size += 1
+        return timer
+
+    def schedule(self, delay_seconds: float, payload: Any) -> Timer:
+        return self.schedule_at(self.now + delay_seconds, payload)
+
+    def cancel(self, timer: Timer) -> bool:
+        """
+        Removes a pending timer in O(1); returns False if it already fired
+        """
+        if timer._slot is None:
+            return False
+        timer._slot.discard(timer)
+        timer._slot = None
+        self._size -= 1
+        return True
+
+    def advance(self, now: float) -> List[Any]:
+        """
+        Moves the wheel forward to ``now`` and returns payloads that came due
+        """
+        target = int(now // self.tick_seconds)
+        fired: List[Any] = []
+        while self._current_tick < target:
+            self._current_tick += 1
+            self._cascade()
+            slot = self._wheels[0][self._current_tick & self._mask]
+            while slot:
+                timer = slot.pop()
+                timer._slot = None
+                self._size -= 1
+                fired.append(timer.payload)
+        return fired
+
+    def timers(self) -> Iterator[Timer]:
+        for wheel in self._wheels:
+            for slot in wheel:
+                yield from slot
+        yield from self._overflow
+
+    def _place(self, timer: Timer) -> None:
+        delta = timer.deadline_tick - self._current_tick
+        for level in range(self._levels):
+            if delta < 1 << (self._bits * (level + 1)):
+                index = (timer.deadline_tick >> (self._bits * level)) & self._mask
+                slot = self._wheels[level][index]
+                break
+        else:
+            slot = self._overflow
+        slot.add(timer)
+        timer._slot = slot
+
+    def _cascade(self) -> None:
+        # Re-place the higher-level slot whose span starts at this tick. Each
+        # level only cascades when every level below it has wrapped.
+        for level in range(1, self._levels):
+            shift = self._bits * level
+            if self._current_tick & ((1 << shift) - 1):
+                return
+            self._redistribute(
+                self._wheels[level][(self._current_tick >> shift) & self._mask]
+            )
+        self._redistribute(self._overflow)
+
+    def _redistribute(self, slot: Set[Timer]) -> None:
+        timers = list(slot)
+        slot.clear()
+        for timer in timers:
+            self._place(timer)
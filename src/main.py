@@ -1,42 +1,390 @@
 """Project Chimera - Main Entry Point
 
-This is a placeholder for Day 1. Actual implementation begins Day 2.
+Spec: specs/technical.md - Section 1.2, Section 12.3 (Worker Pool Auto-Scaling)
 
-Usage:
-    python -m src.main
+One process runs one role:
+
+    python -m src.main worker [--report]
+    python -m src.main planner [--report]
+    python -m src.main judge
+
+Without a role argument the process runs CHIMERA_ROLE, or DEFAULT_ROLE when
+that is unset too; the planner is the one role that starts with no client
+configuration.
+
+An HPA scale-up is only as fast as process start, so this module imports
+nothing beyond the standard library. Each role imports only the packages it
+runs, once it is chosen, and provider SDKs are bound with lazy_import()
+(src/common/lazy.py) so they load on first use. A worker has to be claiming
+tasks within STARTUP_BUDGET_SECONDS of start.
+
+``--report`` prints a startup report as one JSON line: the milliseconds
+since this module was loaded at which each of the role's modules finished
+importing, at which Redis answered, and at which the first claim
+round-trip completed. The role then runs as usual.
+
+Configuration comes from the environment:
+    CHIMERA_ROLE             role to run when none is given; default planner
+    REDIS_URL                default redis://localhost:6379/0
+    CHIMERA_REPLICA_ID       default the hostname (the pod name)
+    CHIMERA_MCP_SERVERS      "name=host:port,..."; default every MCP server
+                             in the tool map at its k8s service name, port 3000
+    CHIMERA_AGENT_IDS        comma-separated agents the planner fleet hosts
+    CHIMERA_JUDGE_CLIENT     "module:factory" building the worker's Judge client
+    CHIMERA_LLM_CLIENT       "module:factory" building the LLM client; the
+                             planner falls back to template DAGs without it
+    CHIMERA_IMAGE_CACHE_DIR  volume shared by the worker pods for cached
+                             generate_image renders; unset disables the cache
+
+A worker refuses to start unless both clients are configured; it would
+otherwise publish fallback captions that no Judge has seen. Each worker also
+runs a CircuitMonitor, which probes the /health of MCP servers whose breaker
+is open and releases the tasks parked on them. A planner subscribes the
+agents it hosts to one shared TrendFetcher, drives their mention polls from
+one PollScheduler and checkpoints them periodically.
 """
 
+import argparse
+import asyncio
+import functools
+import importlib
+import json
+import os
+import socket
 import sys
+import time
+from typing import Any, Awaitable, Callable, Coroutine, Dict, List, Optional, Sequence
+
+_STARTED = time.perf_counter()
+
+STARTUP_BUDGET_SECONDS = 1.0
+
+DEFAULT_ROLE = "planner"
+DEFAULT_REDIS_URL = "redis://localhost:6379/0"
+DEFAULT_MCP_PORT = 3000
+# What each role imports at start, in order; nothing else is loaded eagerly.
+ROLE_MODULES = {
+    "worker": ("redis", "src.common", "src.worker", "src.planner.dag_scheduler"),
+    "planner": (
+        "redis",
+        "src.common",
+        "src.planner.sharding",
+        "src.planner.checkpoint",
+        "src.planner.poll_scheduler",
+        "src.planner.trend_fetcher",
+    ),
+    "judge": ("src.judge",),
+}
+
+
+class StartupReport:
+    """
+    Milestones (ms since src.main was loaded) for one process start
+    """
+
+    def __init__(self, role: str):
+        self.role = role
+        self.milestones: Dict[str, float] = {}
+
+    def mark(self, name: str) -> float:
+        elapsed = (time.perf_counter() - _STARTED) * 1000
+        self.milestones[name] = round(elapsed, 1)
+        return elapsed
+
+    def as_dict(self) -> Dict[str, Any]:
+        ready = self.milestones.get("first_claim")
+        return {
+            "role": self.role,
+            "milestones_ms": dict(self.milestones),
+            "budget_ms": STARTUP_BUDGET_SECONDS * 1000,
+            "within_budget": (
+                ready is not None and ready <= STARTUP_BUDGET_SECONDS * 1000
+            ),
+        }
+
+
+def import_role(role: str, report: Optional[StartupReport] = None) -> None:
+    """
+    Imports the role's modules, marking each on the report
+    """
+    for name in ROLE_MODULES[role]:
+        importlib.import_module(name)
+        if report is not None:
+            report.mark(f"import:{name}")
+
+
+def mcp_endpoints(spec: Optional[str] = None) -> List[Any]:
+    """
+    ServerEndpoints from a CHIMERA_MCP_SERVERS value
+    """
+    from src.common.mcp_pool import TOOL_SERVERS, ServerEndpoint
+
+    if not spec:
+        return [
+            ServerEndpoint(name, name, DEFAULT_MCP_PORT)
+            for name in sorted(set(TOOL_SERVERS.values()))
+        ]
+    endpoints = []
+    for item in spec.split(","):
+        name, _, address = item.strip().partition("=")
+        host, _, port = address.rpartition(":")
+        if not name or not host or not port.isdigit():
+            raise ValueError(f"Invalid MCP server spec: {item!r}")
+        endpoints.append(ServerEndpoint(name, host, int(port)))
+    return endpoints
+
+
+def client_from_env(variable: str) -> Any:
+    """
+    Calls the ``module:factory`` named by ``variable``; None if it is unset
+    """
+    spec = os.environ.get(variable)
+    if not spec:
+        return None
+    module, _, factory = spec.partition(":")
+    if not module or not factory:
+        raise ValueError(f"Invalid {variable}: {spec!r} (expected module:factory)")
+    return getattr(importlib.import_module(module), factory)()
+
+
+def _redis(report: Optional[StartupReport]) -> Any:
+    import redis
+
+    client = redis.Redis.from_url(os.environ.get("REDIS_URL", DEFAULT_REDIS_URL))
+    client.ping()
+    if report is not None:
+        report.mark("redis_ready")
+    return client
+
+
+def _replica_id() -> str:
+    return os.environ.get("CHIMERA_REPLICA_ID") or socket.gethostname()
 
 
-def main() -> int:
-    """Main entry point for Chimera system."""
-    print("=" * 60)
-    print("Project Chimera - Autonomous Influencer Network")
-    print("=" * 60)
-    print()
-    print("Status: Day 1 Foundation Complete")
-    print()
-    print("Day 1 Deliverables:")
-    print("  ✅ Research & Architecture Strategy")
-    print("  ✅ Specifications (GitHub Spec Kit)")
-    print("  ✅ Skills Contracts")
-    print("  ✅ Test-Driven Development Structure")
-    print("  ✅ Infrastructure (Docker, Makefile, CI/CD)")
-    print()
-    print("Day 2 Focus:")
-    print("  ⏭️  Implement Planner-Worker-Judge Swarm")
-    print("  ⏭️  Build MCP Servers (Twitter, Weaviate, Coinbase)")
-    print("  ⏭️  Implement Skills (Trend Discovery, Content Generation)")
-    print()
-    print("To run tests:")
-    print("  make test")
-    print()
-    print("To view specifications:")
-    print("  cat specs/_meta.md")
-    print("=" * 60)
+def build_worker(
+    redis_client: Any,
+    worker_id: str,
+    mcp_client: Any,
+    judge_client: Any = None,
+    llm_client: Any = None,
+    image_cache_dir: Optional[str] = None,
+) -> Any:
+    """
+    A TaskWorker wired to the fleet's shared Redis state
+    """
+    from src.common import (
+        CircuitBreaker,
+        CircuitBreakerClient,
+        DeadLetterQueue,
+        ImageCache,
+        Prefetcher,
+        RateLimitedClient,
+        RateLimiter,
+        TaskQueue,
+        WarmCache,
+    )
+    from src.planner.dag_scheduler import DagScheduler
+    from src.worker import TaskWorker
+
+    task_queue = TaskQueue(redis_client)
+    breaker = CircuitBreaker(redis_client)
+    limited = RateLimitedClient(mcp_client, RateLimiter(redis_client))
+    guarded = CircuitBreakerClient(limited, breaker)
+    return TaskWorker(
+        worker_id,
+        guarded,
+        judge_client=judge_client,
+        llm_client=llm_client,
+        task_queue=task_queue,
+        scheduler=DagScheduler(redis_client, task_queue),
+        breaker=breaker,
+        dead_letters=DeadLetterQueue(redis_client, task_queue),
+        prefetcher=Prefetcher(guarded, WarmCache(redis_client)),
+        image_cache=(
+            ImageCache(redis_client, image_cache_dir) if image_cache_dir else None
+        ),
+    )
+
+
+def build_monitor(worker: Any, endpoints: Sequence[Any]) -> Any:
+    """
+    A CircuitMonitor for the worker's breakers, probing each server's /health
+    """
+    from src.common import CircuitMonitor
+    from src.common.circuit_breaker import http_health_probe
+
+    probes: Dict[str, Callable[[], Awaitable[bool]]] = {
+        endpoint.name: functools.partial(
+            http_health_probe, endpoint.host, endpoint.port
+        )
+        for endpoint in endpoints
+    }
+    return CircuitMonitor(worker.breaker, worker.task_queue, probes=probes)
+
+
+async def run_worker(report: Optional[StartupReport] = None) -> int:
+    import_role("worker", report)
+    from src.common import MCPClientPool
+
+    judge_client = client_from_env("CHIMERA_JUDGE_CLIENT")
+    llm_client = client_from_env("CHIMERA_LLM_CLIENT")
+    if judge_client is None or llm_client is None:
+        print(
+            "Worker needs CHIMERA_JUDGE_CLIENT and CHIMERA_LLM_CLIENT set.",
+            file=sys.stderr,
+        )
+        return 1
+    redis_client = _redis(report)
+    endpoints = mcp_endpoints(os.environ.get("CHIMERA_MCP_SERVERS"))
+    pool = MCPClientPool(endpoints)
+    worker = build_worker(
+        redis_client,
+        _replica_id(),
+        pool,
+        judge_client,
+        llm_client,
+        image_cache_dir=os.environ.get("CHIMERA_IMAGE_CACHE_DIR"),
+    )
+    monitor = build_monitor(worker, endpoints)
+    if report is not None:
+        _report_first_claim(worker, report)
+    monitoring = asyncio.create_task(monitor.run())
+    try:
+        await worker.run()
+    finally:
+        monitor.stop()
+        monitoring.cancel()
+        await pool.close()
+    return 0
+
+
+def build_planner(
+    redis_client: Any,
+    replica_id: str,
+    agent_ids: Sequence[str],
+    mcp_client: Any = None,
+    llm_client: Any = None,
+) -> Any:
+    """
+    A PlannerRuntime that fetches trends and polls mentions for, restores
+    and checkpoints the planners it hosts
+    """
+    from src.planner import (
+        PlannerCheckpointer,
+        PlannerRuntime,
+        PollKind,
+        PollScheduler,
+        TrendFetcher,
+    )
+    from src.planner.poll_scheduler import MENTION_POLL_INTERVAL_SECONDS
+
+    return PlannerRuntime(
+        replica_id,
+        redis_client,
+        roster=lambda: agent_ids,
+        llm_client=llm_client,
+        mcp_client=mcp_client,
+        poll_scheduler=PollScheduler(
+            intervals={PollKind.MENTIONS: MENTION_POLL_INTERVAL_SECONDS}
+        ),
+        checkpointer=PlannerCheckpointer(redis_client),
+        trend_fetcher=TrendFetcher(mcp_client),
+    )
+
+
+async def run_planner(report: Optional[StartupReport] = None) -> int:
+    import_role("planner", report)
+    from src.common import MCPClientPool
+
+    redis_client = _redis(report)
+    agent_ids = [
+        a.strip() for a in os.environ.get("CHIMERA_AGENT_IDS", "").split(",") if a
+    ]
+    pool = MCPClientPool(mcp_endpoints(os.environ.get("CHIMERA_MCP_SERVERS")))
+    runtime = build_planner(
+        redis_client,
+        _replica_id(),
+        agent_ids,
+        mcp_client=pool,
+        llm_client=client_from_env("CHIMERA_LLM_CLIENT"),
+    )
+    # The first rebalance runs before these start, so the first trend refresh
+    # already reaches the agents hosted at startup.
+    background = [
+        asyncio.create_task(runtime.trend_fetcher.run()),
+        asyncio.create_task(runtime.poll_scheduler.run()),
+        asyncio.create_task(
+            runtime.checkpointer.run(lambda: list(runtime.planners.values()))
+        ),
+    ]
+    if report is not None:
+        report.mark("ready")
+        _emit(report)
+    try:
+        await runtime.run()
+    finally:
+        runtime.trend_fetcher.stop()
+        runtime.poll_scheduler.stop()
+        runtime.checkpointer.stop()
+        for task in background:
+            task.cancel()
+        runtime.shutdown()
+        await pool.close()
     return 0
 
 
+async def run_judge(report: Optional[StartupReport] = None) -> int:
+    import_role("judge", report)
+    print("Judge service is not implemented yet (see src/judge).", file=sys.stderr)
+    return 1
+
+
+ROLES: Dict[str, Callable[[Optional[StartupReport]], Coroutine[Any, Any, int]]] = {
+    "worker": run_worker,
+    "planner": run_planner,
+    "judge": run_judge,
+}
+
+
+def _report_first_claim(worker: Any, report: StartupReport) -> None:
+    """
+    Marks the first claim round-trip, then emits the report
+    """
+    claim_batch = worker.task_queue.claim_batch
+
+    def claim_and_report(*args: Any, **kwargs: Any) -> Any:
+        leases = claim_batch(*args, **kwargs)
+        worker.task_queue.claim_batch = claim_batch
+        report.mark("first_claim")
+        _emit(report)
+        return leases
+
+    worker.task_queue.claim_batch = claim_and_report
+
+
+def _emit(report: StartupReport) -> None:
+    print(json.dumps(report.as_dict()), flush=True)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Runs one Chimera role until it is stopped."""
+    parser = argparse.ArgumentParser(prog="python -m src.main")
+    parser.add_argument(
+        "role",
+        nargs="?",
+        choices=sorted(ROLES),
+        default=os.environ.get("CHIMERA_ROLE", DEFAULT_ROLE),
+    )
+    parser.add_argument(
+        "--report", action="store_true", help="print a startup timing report"
+    )
+    args = parser.parse_args(argv)
+    report = StartupReport(args.role) if args.report else None
+    try:
+        return asyncio.run(ROLES[args.role](report))
+    except KeyboardInterrupt:
+        return 0
+
+
 if __name__ == "__main__":
     sys.exit(main())
@@ -3,10 +3,65 @@
 Spec: specs/functional.md - Epic 1 & 5
 Spec: specs/technical.md - Section 1.2
 
-Status: Day 1 - Specification complete, implementation pending
+Exports are resolved on first access, so importing one submodule (as the
+worker does for DagScheduler) does not pull in numpy, the fleet planner
+or the simulator.
 """
 
-# Day 2: Implement Planner class
-# class Planner:
-#     def decompose_goal(self, goal: str) -> TaskDAG:
-#         pass
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from src.planner.agent_planner import (
+        AgentPlanner,
+        Task,
+        TaskDAG,
+        TaskPriority,
+        decompose_goal_many,
+    )
+    from src.planner.checkpoint import PlannerCheckpointer
+    from src.planner.critical_path import ServiceTimeEstimator
+    from src.planner.dag_scheduler import DagScheduler
+    from src.planner.fleet_planner import FleetPlan, FleetPlanner
+    from src.planner.plan_cache import PlanCache
+    from src.planner.poll_scheduler import PollKind, PollScheduler
+    from src.planner.relevance import RelevanceEngine
+    from src.planner.sharding import HashRing, PlannerRuntime
+    from src.planner.simulator import SimulationReport, SwarmSimulator
+    from src.planner.trend_fetcher import Trend, TrendFetcher, TrendSource
+
+# Export name -> submodule that defines it.
+_EXPORTS = {
+    "AgentPlanner": "agent_planner",
+    "DagScheduler": "dag_scheduler",
+    "FleetPlan": "fleet_planner",
+    "FleetPlanner": "fleet_planner",
+    "HashRing": "sharding",
+    "PlanCache": "plan_cache",
+    "PlannerCheckpointer": "checkpoint",
+    "PlannerRuntime": "sharding",
+    "PollKind": "poll_scheduler",
+    "PollScheduler": "poll_scheduler",
+    "RelevanceEngine": "relevance",
+    "ServiceTimeEstimator": "critical_path",
+    "SimulationReport": "simulator",
+    "SwarmSimulator": "simulator",
+    "Task": "agent_planner",
+    "TaskDAG": "agent_planner",
+    "TaskPriority": "agent_planner",
+    "Trend": "trend_fetcher",
+    "TrendFetcher": "trend_fetcher",
+    "TrendSource": "trend_fetcher",
+    "decompose_goal_many": "agent_planner",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module}"), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,747 @@
+"""Agent Planner - Strategic goal decomposition and task DAG dispatch
+
+Spec: specs/technical.md - Section 5 (Task Schema), Section 7.1
+Spec: specs/functional.md - Epic 1 & 5, Story 2.1, FR-PERF-1
+"""
+
+import asyncio
+import json
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+import structlog
+from pydantic import BaseModel, Field
+
+from src.common.prefetch import PREFETCH_CONTEXT_KEY, PREFETCH_TASK_TYPES
+from src.common.task_queue import TASK_QUEUE_KEY, Deadline, TaskQueue, as_utc
+from src.planner.critical_path import (
+    LATENCY_BUDGET_SECONDS,
+    DagAnalysis,
+    ServiceTimeEstimator,
+    analyze_dag,
+)
+from src.planner.dag_scheduler import DagScheduler
+from src.planner.plan_cache import PlanCache, plan_group_hash
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_MIN_RELEVANCE = 0.75
+AGENT_STATUSES = ("active", "paused", "stopped", "archived", "degraded")
+# Late results of these task types are worthless (the trend has moved on),
+# so they are shed rather than downgraded when they cannot make a deadline.
+# Tasks that other tasks depend on are never shed.
+DEFAULT_SHED_TASK_TYPES = frozenset({"research_trends", "generate_content"})
+
+
+class TaskPriority(Enum):
+    HIGH = "high"
+    MEDIUM = "medium"
+    LOW = "low"
+
+
+@dataclass
+class Task:
+    task_id: str
+    task_type: str
+    agent_id: str
+    priority: TaskPriority
+    context: Dict
+    dependencies: List[str] = field(default_factory=list)
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    slack_seconds: Optional[float] = None
+    deadline: Optional[datetime] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Serializes the task to the Redis queue schema (specs/technical.md §5)
+        """
+        return {
+            "task_id": self.task_id,
+            "task_type": self.task_type,
+            "agent_id": self.agent_id,
+            "priority": self.priority.value,
+            "context": self.context,
+            "dependencies": list(self.dependencies),
+            "created_at": self.created_at.isoformat(),
+            "slack_seconds": self.slack_seconds,
+            "deadline": self.deadline.isoformat() if self.deadline else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Task":
+        created_at = data.get("created_at")
+        deadline = data.get("deadline")
+        return cls(
+            task_id=data["task_id"],
+            task_type=data["task_type"],
+            agent_id=data["agent_id"],
+            priority=TaskPriority(data.get("priority", TaskPriority.MEDIUM.value)),
+            context=data.get("context", {}),
+            dependencies=list(data.get("dependencies", [])),
+            created_at=(
+                datetime.fromisoformat(created_at) if created_at else datetime.utcnow()
+            ),
+            slack_seconds=data.get("slack_seconds"),
+            deadline=datetime.fromisoformat(deadline) if deadline else None,
+        )
+
+
+@dataclass
+class TrackedDag:
+    """In-flight DAG with one completion bit per task, in task order"""
+
+    dag_id: str
+    goal: str
+    tasks: List[Task]
+    completed: bytearray = field(default_factory=bytearray)
+
+    def __post_init__(self) -> None:
+        if not self.completed:
+            self.completed = bytearray((len(self.tasks) + 7) // 8)
+
+    def is_complete(self, index: int) -> bool:
+        return bool(self.completed[index >> 3] & (1 << (index & 7)))
+
+    def mark_complete(self, index: int) -> None:
+        self.completed[index >> 3] |= 1 << (index & 7)
+
+    @property
+    def done(self) -> bool:
+        return all(self.is_complete(i) for i in range(len(self.tasks)))
+
+
+@dataclass
+class PlannerState:
+    """Everything a planner needs to resume without re-decomposing goals"""
+
+    agent_id: str
+    agent_status: str
+    mention_cursor: Optional[str]
+    seen_topics: List[str]
+    dags: List[TrackedDag]
+
+
+class PlannedStep(BaseModel):
+    """One node of an LLM-produced plan; ids are local to the plan"""
+
+    step_id: str
+    task_type: str
+    priority: TaskPriority = TaskPriority.MEDIUM
+    depends_on: List[str] = Field(default_factory=list)
+    context: Dict[str, Any] = Field(default_factory=dict)
+
+
+class TaskDAG(BaseModel):
+    """Structured output schema requested from the LLM for goal decomposition"""
+
+    steps: List[PlannedStep] = Field(min_length=1)
+
+
+def default_task_dag(goal: str) -> TaskDAG:
+    """
+    Research -> generate -> publish plan used when no LLM client is configured
+    """
+    return TaskDAG(
+        steps=[
+            PlannedStep(
+                step_id="research",
+                task_type="research_trends",
+                priority=TaskPriority.HIGH,
+                context={"goal": goal},
+            ),
+            PlannedStep(
+                step_id="generate",
+                task_type="generate_content",
+                priority=TaskPriority.HIGH,
+                depends_on=["research"],
+                context={"goal": goal},
+            ),
+            PlannedStep(
+                step_id="publish",
+                task_type="publish_content",
+                priority=TaskPriority.MEDIUM,
+                depends_on=["generate"],
+                context={"goal": goal},
+            ),
+        ]
+    )
+
+
+def _normalize_goal_text(goal: str) -> str:
+    goal = goal.strip()
+    if not goal:
+        raise ValueError("Goal must be a non-empty string")
+    return goal
+
+
+def persona_archetype(persona: Optional[Dict[str, Any]]) -> str:
+    """
+    Coarse persona key used to share one plan across similar agents
+
+    An explicit ``archetype`` wins; otherwise the sorted voice traits are
+    used so that agents with the same voice plan identically.
+    """
+    if not persona:
+        return "default"
+    if persona.get("archetype"):
+        return str(persona["archetype"]).lower()
+    traits = sorted(str(trait).lower() for trait in persona.get("voice_traits", []))
+    return "+".join(traits) or "default"
+
+
+class AgentPlanner:
+    """
+    Planner service: Decomposes goals into executable tasks
+    """
+
+    def __init__(
+        self,
+        agent_id: str,
+        redis_client: Any,
+        llm_client: Any,
+        mcp_client: Any = None,
+        niche: Optional[str] = None,
+        region: Optional[str] = None,
+        persona: Optional[Dict[str, Any]] = None,
+        min_relevance_score: float = DEFAULT_MIN_RELEVANCE,
+        queue_key: str = TASK_QUEUE_KEY,
+        plan_cache: Optional[PlanCache] = None,
+        task_queue: Optional[TaskQueue] = None,
+        service_times: Optional[ServiceTimeEstimator] = None,
+        latency_budget_seconds: float = LATENCY_BUDGET_SECONDS,
+        scheduler: Optional[DagScheduler] = None,
+        shed_task_types: Optional[Set[str]] = None,
+    ):
+        self.agent_id = agent_id
+        self.redis = redis_client
+        self.llm = llm_client
+        self.mcp_client = mcp_client
+        self.niche = niche
+        self.region = region
+        self.persona = persona or {}
+        self.min_relevance_score = min_relevance_score
+        self.queue_key = queue_key
+        self.plan_cache = plan_cache
+        self.task_queue = task_queue or TaskQueue(redis_client, prefix=queue_key)
+        self.scheduler = scheduler or DagScheduler(redis_client, self.task_queue)
+        self.service_times = service_times or ServiceTimeEstimator()
+        self.latency_budget_seconds = latency_budget_seconds
+        self.shed_task_types = (
+            DEFAULT_SHED_TASK_TYPES if shed_task_types is None else shed_task_types
+        )
+        self._agent_status = "paused"
+        self._status_listeners: List[Callable[["AgentPlanner", str, str], None]] = []
+        self._seen_topics: Set[str] = set()
+        self._mention_cursor: Optional[str] = None
+        self._dags: Dict[str, TrackedDag] = {}
+        self._task_index: Dict[str, Tuple[str, int]] = {}
+
+    @property
+    def agent_status(self) -> str:
+        return self._agent_status
+
+    @agent_status.setter
+    def agent_status(self, status: str) -> None:
+        if status not in AGENT_STATUSES:
+            raise ValueError(f"Unknown agent status: {status}")
+        previous, self._agent_status = self._agent_status, status
+        if previous != status:
+            for listener in list(self._status_listeners):
+                listener(self, previous, status)
+
+    def add_status_listener(
+        self, listener: Callable[["AgentPlanner", str, str], None]
+    ) -> None:
+        """
+        Registers a callback invoked as listener(planner, previous, current)
+        """
+        self._status_listeners.append(listener)
+
+    def remove_status_listener(
+        self, listener: Callable[["AgentPlanner", str, str], None]
+    ) -> None:
+        if listener in self._status_listeners:
+            self._status_listeners.remove(listener)
+
+    async def decompose_goal(self, goal: str) -> List[Task]:
+        """
+        Uses LLM to break down high-level goal into task DAG
+
+        Example:
+            Input: "Promote sustainable fashion week"
+            Output: [
+                Task(type="research_trends", priority=HIGH),
+                Task(type="generate_content", priority=HIGH, depends_on=["research_trends"]),
+                Task(type="publish_content", priority=MEDIUM, depends_on=["generate_content"])
+            ]
+        """
+        goal = _normalize_goal_text(goal)
+        task_dag = await self._plan_task_dag(goal)
+        tasks = self._materialize_tasks(task_dag, goal)
+        analysis = self._validate_task_dag(tasks)
+        logger.info(
+            "goal_decomposed",
+            agent_id=self.agent_id,
+            goal=goal,
+            task_count=len(tasks),
+            makespan_seconds=analysis.makespan_seconds,
+        )
+        return tasks
+
+    async def enqueue_task(self, task: Task, on_miss: Optional[str] = None) -> bool:
+        """
+        Pushes a ready task into its priority lane or parks it until its deps finish
+
+        A task with a deadline is dispatched earliest-deadline-first within
+        its lane. ``on_miss`` ("shed" or "downgrade") says what happens if it
+        can no longer make that deadline; by default task types in
+        ``shed_task_types`` are shed and everything else is downgraded.
+
+        Returns True if the task is dispatchable now, False if it is waiting
+        on unfinished dependencies.
+        """
+        payload = json.dumps(task.to_dict())
+        deadline = self._queue_deadline(task, on_miss)
+        if not task.dependencies:
+            self.task_queue.push(
+                task.agent_id, task.priority, payload, deadline=deadline
+            )
+            return True
+        return self.scheduler.submit(
+            task.task_id,
+            payload,
+            task.dependencies,
+            agent_id=task.agent_id,
+            priority=task.priority,
+            deadline=deadline,
+        )
+
+    async def enqueue_dag(
+        self, tasks: List[Task], deadline: Optional[datetime] = None
+    ) -> List[str]:
+        """
+        Validates and submits a whole DAG; returns the ids dispatched immediately
+
+        Tasks are submitted in order of increasing slack so critical-path work
+        reaches the front of its agent's lane before tasks that can wait.
+        With a ``deadline`` (e.g. a campaign end date) every task gets its own
+        deadline: the DAG deadline minus the time its successors still need
+        after it, taken from the backward pass of the critical-path analysis.
+        """
+        analysis = self._validate_task_dag(tasks)
+        if deadline is not None:
+            deadline = as_utc(deadline)
+            for task in tasks:
+                remaining = (
+                    analysis.makespan_seconds
+                    - analysis.timings[task.task_id].latest_finish
+                )
+                task.deadline = deadline - timedelta(seconds=remaining)
+            available = (deadline - datetime.now(timezone.utc)).total_seconds()
+            if available < analysis.makespan_seconds:
+                logger.warning(
+                    "task_dag_deadline_unreachable",
+                    agent_id=self.agent_id,
+                    makespan_seconds=analysis.makespan_seconds,
+                    available_seconds=available,
+                )
+        if not analysis.within_budget(self.latency_budget_seconds):
+            logger.warning(
+                "task_dag_over_budget",
+                agent_id=self.agent_id,
+                makespan_seconds=analysis.makespan_seconds,
+                budget_seconds=self.latency_budget_seconds,
+                critical_path=analysis.critical_path,
+            )
+        self._attach_prefetch_hints(tasks)
+        # Shedding a task with dependents would strand them, so downgrade it.
+        required = {dep for task in tasks for dep in task.dependencies}
+        ready = []
+        for task in sorted(tasks, key=lambda t: analysis.slack(t.task_id)):
+            on_miss = "downgrade" if task.task_id in required else None
+            if await self.enqueue_task(task, on_miss=on_miss):
+                ready.append(task.task_id)
+        goal = tasks[0].context.get("goal", "") if tasks else ""
+        self._track_dag(
+            TrackedDag(dag_id=str(uuid.uuid4()), goal=goal, tasks=list(tasks))
+        )
+        return ready
+
+    async def complete_task(self, task_id: str) -> List[str]:
+        """
+        Records a finished task and returns the dependents it released
+        """
+        located = self._task_index.get(task_id)
+        if located is not None:
+            dag = self._dags[located[0]]
+            dag.mark_complete(located[1])
+            if dag.done:
+                self._untrack_dag(dag)
+        return self.scheduler.complete(task_id)
+
+    def sync_completions(self) -> int:
+        """
+        Marks tasks the workers finished and drops DAGs with nothing left
+
+        Workers settle tasks through the DagScheduler rather than this
+        planner, so completion is read back from its done and failed markers.
+        A DAG is dropped once every task is done or failed. Returns the
+        number of DAGs dropped.
+        """
+        unmarked = [
+            (dag, index)
+            for dag in self._dags.values()
+            for index in range(len(dag.tasks))
+            if not dag.is_complete(index)
+        ]
+        outcomes = self.scheduler.outcomes(
+            [dag.tasks[index].task_id for dag, index in unmarked]
+        )
+        open_dags = set()
+        for (dag, index), outcome in zip(unmarked, outcomes):
+            if outcome == "done":
+                dag.mark_complete(index)
+            elif outcome is None:
+                open_dags.add(dag.dag_id)
+        finished = [dag for dag in self._dags.values() if dag.dag_id not in open_dags]
+        for dag in finished:
+            self._untrack_dag(dag)
+        return len(finished)
+
+    @property
+    def in_flight_dags(self) -> List[TrackedDag]:
+        return list(self._dags.values())
+
+    def export_state(self) -> PlannerState:
+        """
+        Snapshot of in-process state for checkpointing
+        """
+        return PlannerState(
+            agent_id=self.agent_id,
+            agent_status=self._agent_status,
+            mention_cursor=self._mention_cursor,
+            seen_topics=sorted(self._seen_topics),
+            dags=list(self._dags.values()),
+        )
+
+    def import_state(self, state: PlannerState) -> None:
+        """
+        Restores a checkpoint; status listeners fire if the status changes
+        """
+        if state.agent_id != self.agent_id:
+            raise ValueError(
+                f"Checkpoint for {state.agent_id} does not belong to {self.agent_id}"
+            )
+        self._mention_cursor = state.mention_cursor
+        self._seen_topics = set(state.seen_topics)
+        self._dags.clear()
+        self._task_index.clear()
+        for dag in state.dags:
+            self._track_dag(dag)
+        self.agent_status = state.agent_status
+
+    async def resume_dags(self) -> List[str]:
+        """
+        Re-submits every unfinished task of the tracked DAGs
+
+        Only needed when the Redis queue and DAG state were lost along with
+        the planner; completed tasks are dropped from dependency lists so the
+        remainder dispatches without waiting on vanished done markers.
+        Returns the task ids dispatched immediately.
+        """
+        ready = []
+        for dag in self._dags.values():
+            done = {t.task_id for i, t in enumerate(dag.tasks) if dag.is_complete(i)}
+            pending = [t for i, t in enumerate(dag.tasks) if not dag.is_complete(i)]
+            for task in sorted(pending, key=lambda t: t.slack_seconds or 0.0):
+                task.dependencies = [d for d in task.dependencies if d not in done]
+                if await self.enqueue_task(task):
+                    ready.append(task.task_id)
+        return ready
+
+    def _attach_prefetch_hints(self, tasks: List[Task]) -> None:
+        """
+        Tells each parent which children's inputs to prefetch when it starts
+        """
+        by_id = {task.task_id: task for task in tasks}
+        for child in tasks:
+            if child.task_type not in PREFETCH_TASK_TYPES:
+                continue
+            trend = child.context.get("trend") or {}
+            hint = {
+                "task_id": child.task_id,
+                "agent_id": child.agent_id,
+                "query": child.context.get("topic") or child.context.get("goal", ""),
+                "hashtags": list(trend.get("hashtags", [])),
+            }
+            for dep in child.dependencies:
+                parent = by_id.get(dep)
+                if parent is not None:
+                    hints = parent.context.setdefault(PREFETCH_CONTEXT_KEY, [])
+                    if all(h["task_id"] != child.task_id for h in hints):
+                        hints.append(hint)
+
+    def _queue_deadline(
+        self, task: Task, on_miss: Optional[str] = None
+    ) -> Optional[Deadline]:
+        """
+        Converts a task's absolute deadline into its queue deadline
+
+        The latest start is the deadline minus the estimated service time of
+        the task's type; a task not claimed by then cannot finish in time.
+        """
+        if task.deadline is None:
+            return None
+        if on_miss is None:
+            on_miss = "shed" if task.task_type in self.shed_task_types else "downgrade"
+        due_ms = int(as_utc(task.deadline).timestamp() * 1000)
+        service_ms = int(self.service_times.estimate(task.task_type) * 1000)
+        return Deadline(
+            due_ms=due_ms,
+            latest_start_ms=due_ms - service_ms,
+            task_type=task.task_type,
+            on_miss=on_miss,
+        )
+
+    def _track_dag(self, dag: TrackedDag) -> None:
+        self._dags[dag.dag_id] = dag
+        for index, task in enumerate(dag.tasks):
+            self._task_index[task.task_id] = (dag.dag_id, index)
+
+    def _untrack_dag(self, dag: TrackedDag) -> None:
+        self._dags.pop(dag.dag_id, None)
+        for task in dag.tasks:
+            self._task_index.pop(task.task_id, None)
+
+    async def poll_resources(self) -> List[Task]:
+        """
+        Polls MCP Resources once for new trends and enqueues relevant ones
+
+        Trends are polled every 4 hours and mentions every 10 minutes; the
+        cadence is owned by the caller so this method performs a single pass.
+        """
+        if self.agent_status != "active" or self.mcp_client is None:
+            return []
+
+        response = await self.mcp_client.call_tool(
+            "get_trending_topics",
+            {"region": self.region, "niche": self.niche},
+        )
+        trends = response.get("trends", []) if isinstance(response, dict) else response
+        return await self.handle_trends(trends or [])
+
+    async def handle_trends(
+        self, trends: Sequence[Any], prescored: bool = False
+    ) -> List[Task]:
+        """
+        Enqueues content tasks for the relevant trends in a batch
+
+        Used both by poll_resources and as the TrendFetcher subscription
+        callback, so a shared fetch can be fanned out to many planners.
+        ``prescored`` skips the score threshold for trends already routed by
+        a RelevanceEngine; topic de-duplication still applies.
+        """
+        if self.agent_status != "active":
+            return []
+
+        created = []
+        for trend in trends:
+            trend = trend if isinstance(trend, dict) else trend.to_dict()
+            if self._is_relevant(trend, check_score=not prescored):
+                task = self._create_content_task(trend)
+                await self.enqueue_task(task)
+                created.append(task)
+        return created
+
+    def subscribe_trends(self, trend_fetcher: Any, time_window_hours: int = 24) -> None:
+        """
+        Receives this agent's trends from a shared TrendFetcher subscription
+        """
+        trend_fetcher.subscribe(
+            self.agent_id,
+            self.handle_trends,
+            niche=self.niche or "general",
+            region=self.region or "global",
+            time_window_hours=time_window_hours,
+        )
+
+    async def poll_mentions(self) -> List[Task]:
+        """
+        Polls once for new mentions and enqueues a reply task for each
+        """
+        if self.agent_status != "active" or self.mcp_client is None:
+            return []
+
+        response = await self.mcp_client.call_tool(
+            "get_mentions",
+            {"agent_id": self.agent_id, "since_id": self._mention_cursor},
+        )
+        mentions = (
+            response.get("mentions", []) if isinstance(response, dict) else response
+        )
+
+        created = []
+        for mention in mentions or []:
+            task = Task(
+                task_id=str(uuid.uuid4()),
+                task_type="reply_comment",
+                agent_id=self.agent_id,
+                priority=TaskPriority.MEDIUM,
+                context={
+                    "comment_id": mention.get("id"),
+                    "comment_text": mention.get("text", ""),
+                    "platform": mention.get("platform", "twitter"),
+                },
+            )
+            await self.enqueue_task(task)
+            created.append(task)
+            self._mention_cursor = str(mention.get("id", self._mention_cursor))
+        return created
+
+    @property
+    def plan_group_key(self) -> Tuple[str, str]:
+        """
+        Agents sharing this key receive the same plan skeleton for a goal
+        """
+        return (self.niche or "general", persona_archetype(self.persona))
+
+    async def _plan_task_dag(self, goal: str) -> TaskDAG:
+        if self.llm is None:
+            return default_task_dag(goal)
+
+        group_hash = plan_group_hash(self.plan_group_key)
+        if self.plan_cache is not None:
+            cached = self.plan_cache.get(goal, group_hash)
+            if cached is not None:
+                return cached
+
+        raw = await self.llm.generate_structured_output(
+            prompt=self._build_planning_prompt(goal),
+            schema=TaskDAG,
+        )
+        task_dag = TaskDAG.model_validate(raw)
+        if self.plan_cache is not None:
+            self.plan_cache.put(goal, group_hash, task_dag)
+        return task_dag
+
+    def _build_planning_prompt(self, goal: str) -> str:
+        # Only group-level attributes go into the prompt so one plan can be
+        # shared by every agent in the same (niche, archetype) group.
+        niche, archetype = self.plan_group_key
+        return (
+            "You are the strategic planner for an autonomous social media agent.\n"
+            f"Niche: {niche}\n"
+            f"Persona archetype: {archetype}\n\n"
+            f"Goal: {goal}\n\n"
+            "Decompose the goal into a small DAG of executable steps. Each step "
+            "has a step_id, a task_type (research_trends, generate_content, "
+            "publish_content, reply_comment, execute_transaction), a priority "
+            "(high, medium, low), the step_ids it depends_on, and a context "
+            "object with the inputs the worker needs. Steps must not form cycles."
+        )
+
+    def _materialize_tasks(self, task_dag: TaskDAG, goal: str) -> List[Task]:
+        """
+        Converts plan-local step ids into globally unique Task objects
+        """
+        ids = {step.step_id: str(uuid.uuid4()) for step in task_dag.steps}
+        now = datetime.utcnow()
+        tasks = []
+        for step in task_dag.steps:
+            unknown = [dep for dep in step.depends_on if dep not in ids]
+            if unknown:
+                raise ValueError(
+                    f"Step {step.step_id} depends on unknown steps {unknown}"
+                )
+            tasks.append(
+                Task(
+                    task_id=ids[step.step_id],
+                    task_type=step.task_type,
+                    agent_id=self.agent_id,
+                    priority=step.priority,
+                    context={**step.context, "goal": goal},
+                    dependencies=[ids[dep] for dep in step.depends_on],
+                    created_at=now,
+                )
+            )
+        return tasks
+
+    def _validate_task_dag(self, tasks: List[Task]) -> DagAnalysis:
+        """
+        Rejects DAGs with duplicate ids or dependency cycles
+
+        Dependencies on tasks outside the list are treated as already
+        scheduled elsewhere and do not participate in cycle detection. Each
+        task is annotated with its slack against the DAG's critical path,
+        using this planner's per-task_type service-time estimates.
+        """
+        analysis = analyze_dag(tasks, self.service_times)
+        for task in tasks:
+            task.slack_seconds = analysis.slack(task.task_id)
+        return analysis
+
+    def _is_relevant(self, trend: Dict[str, Any], check_score: bool = True) -> bool:
+        topic = str(trend.get("topic", "")).strip().lower()
+        if not topic or topic in self._seen_topics:
+            return False
+        score = trend.get("relevance_score", trend.get("relevance", 0.0))
+        if check_score and float(score) < self.min_relevance_score:
+            return False
+        self._seen_topics.add(topic)
+        return True
+
+    def _create_content_task(self, trend: Dict[str, Any]) -> Task:
+        # FR-PERF-1: content for a trend is due within the latency budget.
+        now = datetime.utcnow()
+        return Task(
+            task_id=str(uuid.uuid4()),
+            task_type="generate_content",
+            agent_id=self.agent_id,
+            priority=TaskPriority.HIGH,
+            context={"topic": trend["topic"], "trend": dict(trend)},
+            dependencies=[],
+            created_at=now,
+            deadline=now + timedelta(seconds=self.latency_budget_seconds),
+        )
+
+
+async def decompose_goal_many(
+    goal: str, planners: Sequence[AgentPlanner]
+) -> Dict[str, List[Task]]:
+    """
+    Decomposes one goal for a fleet with one LLM call per agent group
+
+    Agents are grouped by ``plan_group_key`` (niche, persona archetype). Each
+    group is planned once by its first member and the resulting skeleton is
+    materialized into agent-specific tasks for every member, so LLM calls
+    scale with the number of distinct groups rather than agents.
+
+    Returns a mapping of agent_id to that agent's task list.
+    """
+    goal = _normalize_goal_text(goal)
+
+    groups: Dict[Tuple[str, str], List[AgentPlanner]] = {}
+    for planner in planners:
+        groups.setdefault(planner.plan_group_key, []).append(planner)
+
+    skeletons = await asyncio.gather(
+        *(members[0]._plan_task_dag(goal) for members in groups.values())
+    )
+
+    plans: Dict[str, List[Task]] = {}
+    for members, task_dag in zip(groups.values(), skeletons):
+        for planner in members:
+            tasks = planner._materialize_tasks(task_dag, goal)
+            planner._validate_task_dag(tasks)
+            plans[planner.agent_id] = tasks
+
+    logger.info(
+        "fleet_goal_decomposed",
+        goal=goal,
+        agent_count=len(plans),
+        group_count=len(groups),
+    )
+    return plans
@@ -0,0 +1,374 @@
+"""Planner Checkpoint - Compact versioned snapshots of AgentPlanner state
+
+Spec: specs/technical.md - Section 7.1, Section 11 (Disaster Recovery)
+Spec: specs/functional.md - FR-SCALE-1
+
+A planner's in-flight DAGs, completion bitsets, mention cursor, seen topics
+and agent_status are serialized into a small binary blob per agent and
+stored in Redis. On startup a PlannerCheckpointer fetches every agent's blob
+with batched MGETs and restores it, so a restarted pod resumes dispatching
+without calling the LLM to re-decompose goals.
+
+Wire format (all integers are unsigned LEB128 varints unless noted):
+
+    magic "CHPT" | version u8 | flags u8 (bit 0: zlib) | body
+
+    body    := str agent_id | u8 status | opt-str cursor
+               | n, str* seen_topics | n, dag*
+    dag     := id dag_id | str goal | f64 created_at | n, task* | bitset
+    task    := id task_id | str task_type | u8 priority | str context_json
+               | n, dep* | f64 slack (NaN = unknown)
+               | f64 deadline (NaN = none; version 2 and later)
+    dep     := varint (index + 1) for a task in the same DAG,
+               or 0 followed by id for an external dependency
+    id      := u8 tag (0 = str, 1 = uuid) followed by str or 16 raw bytes
+    bitset  := ceil(n_tasks / 8) raw bytes
+
+Task ids are usually UUIDs, so they cost 17 bytes instead of 37, and
+in-DAG dependencies cost one byte instead of repeating the id.
+"""
+
+import asyncio
+import json
+import math
+import struct
+import uuid
+import zlib
+from datetime import datetime, timezone
+from typing import Any, Callable, List, Sequence
+
+import structlog
+
+from src.common.task_queue import as_utc
+from src.planner.agent_planner import (
+    AGENT_STATUSES,
+    AgentPlanner,
+    PlannerState,
+    Task,
+    TaskPriority,
+    TrackedDag,
+)
+
+logger = structlog.get_logger(__name__)
+
+MAGIC = b"CHPT"
+FORMAT_VERSION = 2
+_READABLE_VERSIONS = (1, 2)
+FLAG_ZLIB = 0x01
+CHECKPOINT_PREFIX = "{chimera}:checkpoint"
+DEFAULT_CHECKPOINT_INTERVAL_SECONDS = 30.0
+DEFAULT_BATCH_SIZE = 500
+_COMPRESS_ABOVE_BYTES = 256
+
+_PRIORITIES = list(TaskPriority)
+_F64 = struct.Struct("<d")
+
+
+class CheckpointError(ValueError):
+    """Raised when a checkpoint blob is malformed or from an unknown version"""
+
+
+class _Writer:
+    def __init__(self) -> None:
+        self.buffer = bytearray()
+
+    def varint(self, value: int) -> None:
+        while True:
+            byte = value & 0x7F
+            value >>= 7
+            if value:
+                self.buffer.append(byte | 0x80)
+            else:
+                self.buffer.append(byte)
+                return
+
+    def u8(self, value: int) -> None:
+        self.buffer.append(value)
+
+    def f64(self, value: float) -> None:
+        self.buffer += _F64.pack(value)
+
+    def text(self, value: str) -> None:
+        data = value.encode()
+        self.varint(len(data))
+        self.buffer += data
+
+    def id(self, value: str) -> None:
+        try:
+            parsed = uuid.UUID(value)
+        except ValueError:
+            parsed = None
+        if parsed is not None and str(parsed) == value:
+            self.u8(1)
+            self.buffer += parsed.bytes
+        else:
+            self.u8(0)
+            self.text(value)
+
+
+class _Reader:
+    def __init__(self, data: bytes) -> None:
+        self.data = memoryview(data)
+        self.pos = 0
+
+    def _take(self, size: int) -> memoryview:
+        if self.pos + size > len(self.data):
+            raise CheckpointError("Truncated checkpoint")
+        chunk = self.data[self.pos : self.pos + size]
+        self.pos += size
+        return chunk
+
+    def varint(self) -> int:
+        result = shift = 0
+        while True:
+            byte = self._take(1)[0]
+            result |= (byte & 0x7F) << shift
+            if not byte & 0x80:
+                return result
+            shift += 7
+
+    def u8(self) -> int:
+        return self._take(1)[0]
+
+    def raw(self, size: int) -> bytes:
+        return bytes(self._take(size))
+
+    def f64(self) -> float:
+        value: float = _F64.unpack(self._take(8))[0]
+        return value
+
+    def text(self) -> str:
+        return bytes(self._take(self.varint())).decode()
+
+    def id(self) -> str:
+        if self.u8() == 1:
+            return str(uuid.UUID(bytes=self.raw(16)))
+        return self.text()
+
+
+def encode_state(state: PlannerState, compress: bool = True) -> bytes:
+    """
+    Serializes planner state into the versioned binary format
+    """
+    w = _Writer()
+    w.text(state.agent_id)
+    w.u8(AGENT_STATUSES.index(state.agent_status))
+    w.u8(state.mention_cursor is not None)
+    if state.mention_cursor is not None:
+        w.text(state.mention_cursor)
+    w.varint(len(state.seen_topics))
+    for topic in state.seen_topics:
+        w.text(topic)
+
+    w.varint(len(state.dags))
+    for dag in state.dags:
+        index = {task.task_id: i for i, task in enumerate(dag.tasks)}
+        w.id(dag.dag_id)
+        w.text(dag.goal)
+        w.f64(_timestamp(dag.tasks[0].created_at) if dag.tasks else 0.0)
+        w.varint(len(dag.tasks))
+        for task in dag.tasks:
+            w.id(task.task_id)
+            w.text(task.task_type)
+            w.u8(_PRIORITIES.index(task.priority))
+            w.text(json.dumps(task.context, separators=(",", ":"), default=str))
+            w.varint(len(task.dependencies))
+            for dep in task.dependencies:
+                if dep in index:
+                    w.varint(index[dep] + 1)
+                else:
+                    w.varint(0)
+                    w.id(dep)
+            w.f64(math.nan if task.slack_seconds is None else task.slack_seconds)
+            w.f64(_timestamp(task.deadline) if task.deadline else math.nan)
+        w.buffer += bytes(dag.completed)
+
+    body = bytes(w.buffer)
+    flags = 0
+    if compress and len(body) > _COMPRESS_ABOVE_BYTES:
+        body = zlib.compress(body, 6)
+        flags |= FLAG_ZLIB
+    return MAGIC + bytes([FORMAT_VERSION, flags]) + body
+
+
+def decode_state(blob: bytes) -> PlannerState:
+    """
+    Parses a checkpoint blob; raises CheckpointError if it cannot be used
+    """
+    if len(blob) < 6 or blob[:4] != MAGIC:
+        raise CheckpointError("Not a planner checkpoint")
+    version, flags = blob[4], blob[5]
+    if version not in _READABLE_VERSIONS:
+        raise CheckpointError(f"Unsupported checkpoint version {version}")
+    body = blob[6:]
+    if flags & FLAG_ZLIB:
+        try:
+            body = zlib.decompress(body)
+        except zlib.error as e:
+            raise CheckpointError(f"Corrupt checkpoint body: {e}") from e
+
+    r = _Reader(body)
+    agent_id = r.text()
+    agent_status = _lookup(AGENT_STATUSES, r.u8())
+    mention_cursor = r.text() if r.u8() else None
+    seen_topics = [r.text() for _ in range(r.varint())]
+
+    dags = []
+    for _ in range(r.varint()):
+        dag_id = r.id()
+        goal = r.text()
+        created_at = _datetime(r.f64())
+        raw_tasks = []
+        count = r.varint()
+        for _ in range(count):
+            task_id = r.id()
+            task_type = r.text()
+            priority = _lookup(_PRIORITIES, r.u8())
+            context = json.loads(r.text())
+            deps = []
+            for _ in range(r.varint()):
+                ref = r.varint()
+                if ref > count:
+                    raise CheckpointError(f"Dependency index {ref - 1} out of range")
+                deps.append(ref - 1 if ref else r.id())
+            slack = r.f64()
+            due = r.f64() if version >= 2 else math.nan
+            raw_tasks.append((task_id, task_type, priority, context, deps, slack, due))
+        ids = [raw[0] for raw in raw_tasks]
+        tasks = [
+            Task(
+                task_id=task_id,
+                task_type=task_type,
+                agent_id=agent_id,
+                priority=priority,
+                context=context,
+                dependencies=[ids[d] if isinstance(d, int) else d for d in deps],
+                created_at=created_at,
+                slack_seconds=None if math.isnan(slack) else slack,
+                deadline=(
+                    None
+                    if math.isnan(due)
+                    else datetime.fromtimestamp(due, tz=timezone.utc)
+                ),
+            )
+            for task_id, task_type, priority, context, deps, slack, due in raw_tasks
+        ]
+        completed = bytearray(r.raw((len(tasks) + 7) // 8))
+        dags.append(
+            TrackedDag(dag_id=dag_id, goal=goal, tasks=tasks, completed=completed)
+        )
+
+    if r.pos != len(body):
+        raise CheckpointError("Trailing bytes in checkpoint")
+    return PlannerState(
+        agent_id=agent_id,
+        agent_status=agent_status,
+        mention_cursor=mention_cursor,
+        seen_topics=seen_topics,
+        dags=dags,
+    )
+
+
+def _lookup(table: Sequence[Any], index: int) -> Any:
+    if index >= len(table):
+        raise CheckpointError(f"Unknown enum index {index} in checkpoint")
+    return table[index]
+
+
+def _timestamp(value: datetime) -> float:
+    return as_utc(value).timestamp()
+
+
+def _datetime(timestamp: float) -> datetime:
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).replace(tzinfo=None)
+
+
+class PlannerCheckpointer:
+    """
+    Periodically checkpoints planners to Redis and restores them on startup
+    """
+
+    def __init__(
+        self,
+        redis_client: Any,
+        prefix: str = CHECKPOINT_PREFIX,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ):
+        self.redis = redis_client
+        self.prefix = prefix
+        self.batch_size = batch_size
+        self._running = False
+
+    def key(self, agent_id: str) -> str:
+        return f"{self.prefix}:{agent_id}"
+
+    def save(self, planners: Sequence[AgentPlanner]) -> int:
+        """
+        Writes one blob per planner in batched MSETs; returns bytes written
+
+        Each planner first syncs completions from the DagScheduler markers,
+        so finished DAGs are not checkpointed and completed tasks are not
+        re-dispatched by resume_dags().
+        """
+        written = 0
+        for start in range(0, len(planners), self.batch_size):
+            batch = {}
+            for planner in planners[start : start + self.batch_size]:
+                planner.sync_completions()
+                blob = encode_state(planner.export_state())
+                batch[self.key(planner.agent_id)] = blob
+                written += len(blob)
+            if batch:
+                self.redis.mset(batch)
+        return written
+
+    def restore(self, planners: Sequence[AgentPlanner]) -> int:
+        """
+        Restores every planner that has a usable checkpoint
+
+        Unreadable or mismatched blobs are logged and that planner starts
+        fresh. Returns the number of planners restored.
+        """
+        restored = 0
+        for start in range(0, len(planners), self.batch_size):
+            batch = planners[start : start + self.batch_size]
+            blobs = self.redis.mget([self.key(p.agent_id) for p in batch])
+            for planner, blob in zip(batch, blobs):
+                if blob is None:
+                    continue
+                try:
+                    planner.import_state(decode_state(blob))
+                except ValueError as e:
+                    logger.warning(
+                        "checkpoint_restore_failed",
+                        agent_id=planner.agent_id,
+                        error=str(e),
+                    )
+                    continue
+                restored += 1
+        logger.info("planners_restored", restored=restored, total=len(planners))
+        return restored
+
+    def delete(self, agent_ids: List[str]) -> None:
+        if agent_ids:
+            self.redis.delete(*[self.key(agent_id) for agent_id in agent_ids])
+
+    async def run(
+        self,
+        planners: Callable[[], Sequence[AgentPlanner]],
+        interval_seconds: float = DEFAULT_CHECKPOINT_INTERVAL_SECONDS,
+    ) -> None:
+        """
+        Checkpoints the planners hosted at each interval until stop() is
+        called; ``planners`` is re-read every time, as hosting changes
+        """
+        self._running = True
+        while self._running:
+            await asyncio.sleep(interval_seconds)
+            try:
+                self.save(planners())
+            except Exception as e:
+                logger.warning("checkpoint_save_failed", error=str(e))
+
+    def stop(self) -> None:
+        self._running = False
@@ -0,0 +1,191 @@
+"""Critical Path - Latency analysis for task DAGs
+
+Spec: specs/technical.md - Section 7.1 (_validate_task_dag)
+Spec: specs/functional.md - FR-PERF-1
+
+One Kahn pass (iterative, so DAG depth is not bounded by the recursion
+limit) both rejects cycles and yields a topological order. A forward pass
+over that order gives each task's earliest finish from per-task_type
+service-time estimates; a backward pass gives its latest finish without
+stretching the DAG's makespan. The difference is the task's slack: tasks
+with zero slack are on the critical path and are dispatched first.
+
+Service times are exponentially weighted moving averages of observed
+durations, seeded with conservative priors for the spec'd task types.
+"""
+
+from collections import deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence
+
+if TYPE_CHECKING:
+    from src.planner.agent_planner import Task
+
+LATENCY_BUDGET_SECONDS = 10.0
+DEFAULT_SERVICE_SECONDS = 2.0
+DEFAULT_EWMA_ALPHA = 0.2
+
+SERVICE_TIME_PRIORS = {
+    "research_trends": 2.0,
+    "generate_content": 5.0,
+    "publish_content": 1.0,
+    "reply_comment": 2.0,
+    "execute_transaction": 3.0,
+}
+
+
+class ServiceTimeEstimator:
+    """
+    EWMA of observed execution time per task_type
+    """
+
+    def __init__(
+        self,
+        priors: Optional[Dict[str, float]] = None,
+        alpha: float = DEFAULT_EWMA_ALPHA,
+        default_seconds: float = DEFAULT_SERVICE_SECONDS,
+    ):
+        self.alpha = alpha
+        self.default_seconds = default_seconds
+        self._estimates: Dict[str, float] = dict(
+            SERVICE_TIME_PRIORS if priors is None else priors
+        )
+
+    def estimate(self, task_type: str) -> float:
+        return self._estimates.get(task_type, self.default_seconds)
+
+    def observe(self, task_type: str, seconds: float) -> float:
+        """
+        Folds one observed duration into the estimate and returns it
+        """
+        previous = self._estimates.get(task_type)
+        if previous is None:
+            updated = seconds
+        else:
+            updated = previous + self.alpha * (seconds - previous)
+        self._estimates[task_type] = updated
+        return updated
+
+    def snapshot(self) -> Dict[str, float]:
+        return dict(self._estimates)
+
+
+@dataclass
+class TaskTiming:
+    duration_seconds: float
+    earliest_start: float
+    earliest_finish: float
+    latest_finish: float
+
+    @property
+    def slack_seconds(self) -> float:
+        return self.latest_finish - self.earliest_finish
+
+
+@dataclass
+class DagAnalysis:
+    order: List[str]
+    timings: Dict[str, TaskTiming]
+    makespan_seconds: float
+    critical_path: List[str] = field(default_factory=list)
+
+    def slack(self, task_id: str) -> float:
+        return self.timings[task_id].slack_seconds
+
+    def within_budget(self, budget_seconds: float = LATENCY_BUDGET_SECONDS) -> bool:
+        return self.makespan_seconds <= budget_seconds
+
+
+def analyze_dag(
+    tasks: Sequence["Task"],
+    estimator: Optional[ServiceTimeEstimator] = None,
+    epsilon: float = 1e-9,
+) -> DagAnalysis:
+    """
+    Validates a DAG and computes timings, slack and the critical path
+
+    Raises ValueError on duplicate ids or dependency cycles. Dependencies on
+    tasks outside ``tasks`` are treated as already scheduled elsewhere and do
+    not delay or constrain anything. Runs in O(tasks + edges).
+    """
+    estimator = estimator or ServiceTimeEstimator()
+
+    by_id: Dict[str, "Task"] = {}
+    for task in tasks:
+        if task.task_id in by_id:
+            raise ValueError(f"Duplicate task_id in DAG: {task.task_id}")
+        by_id[task.task_id] = task
+
+    indegree = {task_id: 0 for task_id in by_id}
+    children: Dict[str, List[str]] = {task_id: [] for task_id in by_id}
+    parents: Dict[str, List[str]] = {task_id: [] for task_id in by_id}
+    for task in tasks:
+        for dep in task.dependencies:
+            if dep in by_id:
+                indegree[task.task_id] += 1
+                children[dep].append(task.task_id)
+                parents[task.task_id].append(dep)
+
+    ready = deque(task_id for task_id, degree in indegree.items() if degree == 0)
+    order: List[str] = []
+    while ready:
+        task_id = ready.popleft()
+        order.append(task_id)
+        for child in children[task_id]:
+            indegree[child] -= 1
+            if indegree[child] == 0:
+                ready.append(child)
+
+    if len(order) != len(by_id):
+        cyclic = sorted(task_id for task_id, degree in indegree.items() if degree > 0)
+        raise ValueError(f"Task DAG contains a dependency cycle: {cyclic}")
+
+    duration = {t: estimator.estimate(by_id[t].task_type) for t in order}
+    earliest_finish: Dict[str, float] = {}
+    for task_id in order:
+        start = max((earliest_finish[p] for p in parents[task_id]), default=0.0)
+        earliest_finish[task_id] = start + duration[task_id]
+    makespan = max(earliest_finish.values(), default=0.0)
+
+    latest_finish: Dict[str, float] = {}
+    for task_id in reversed(order):
+        latest_finish[task_id] = min(
+            (latest_finish[c] - duration[c] for c in children[task_id]),
+            default=makespan,
+        )
+
+    timings = {
+        task_id: TaskTiming(
+            duration_seconds=duration[task_id],
+            earliest_start=earliest_finish[task_id] - duration[task_id],
+            earliest_finish=earliest_finish[task_id],
+            latest_finish=latest_finish[task_id],
+        )
+        for task_id in order
+    }
+
+    # Walk the zero-slack chain from a critical root to a critical sink.
+    critical_path: List[str] = []
+    current = next(
+        (t for t in order if not parents[t] and timings[t].slack_seconds <= epsilon),
+        None,
+    )
+    while current is not None:
+        critical_path.append(current)
+        finish = earliest_finish[current]
+        current = next(
+            (
+                c
+                for c in children[current]
+                if timings[c].slack_seconds <= epsilon
+                and abs(timings[c].earliest_start - finish) <= epsilon
+            ),
+            None,
+        )
+
+    return DagAnalysis(
+        order=order,
+        timings=timings,
+        makespan_seconds=makespan,
+        critical_path=critical_path,
+    )
@@ -0,0 +1,258 @@
+"""DAG Scheduler - Incremental in-degree ready-set scheduling in Redis
+
+Spec: specs/technical.md - Section 5 (Task Schema), Section 7.1
+Spec: specs/functional.md - FR-PERF-1
+
+Dependent tasks are parked in Redis with a counter of unfinished parents and
+registered as children of each parent. Completing a task decrements its
+children's counters and pushes every child that reaches zero into its
+TaskQueue lane, all inside one Lua script. The cost of a completion is
+O(children); nothing ever rescans the pending set.
+
+A task that fails for good can never release its children, so failing it
+cancels every parked descendant in one script: their keys are deleted and
+they are returned so the worker can dead-letter them. A task submitted after
+one of its parents failed is cancelled on arrival.
+
+Released children are pushed into their TaskQueue lanes from inside these
+scripts, so ``prefix`` must carry the queue's Redis Cluster hash tag. The
+task's own keys and its parents' are passed as KEYS; only the keys of
+children, read from the children sets, are built in the scripts.
+
+Key layout (``prefix`` defaults to ``{chimera}:dag``):
+    {prefix}:indeg:{task_id}     unfinished parent count
+    {prefix}:payload:{task_id}   TaskQueue route of a task waiting for its parents
+    {prefix}:children:{task_id}  set of task_ids blocked on this task
+    {prefix}:done:{task_id}      completion marker (expires after done_ttl)
+    {prefix}:failed:{task_id}    failure marker (expires after done_ttl)
+"""
+
+from typing import Any, List, Optional, Sequence, Tuple
+
+import structlog
+
+from src.common.redis_text import decode
+from src.common.task_queue import (
+    PUSH_ROUTE_LUA,
+    Deadline,
+    TaskQueue,
+    hash_tag,
+    require_hash_tag,
+)
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_PREFIX = "{chimera}:dag"
+DEFAULT_DONE_TTL_SECONDS = 86400
+
+# KEYS[1] = task's failure marker, KEYS[2] = its in-degree counter,
+# KEYS[3] = its parked route, then per dependency KEYS[i..i+2] = its failure
+# marker, done marker and children set,
+# ARGV[1] = task_id, ARGV[2] = route, ARGV[3] = now (ms),
+# ARGV[4] = failure marker TTL (seconds)
+# Returns 1 if the task went straight to its lane, 0 if it is parked and -1
+# if a parent has already failed (the task is cancelled).
+_SUBMIT_SCRIPT = PUSH_ROUTE_LUA + """
+for i = 4, #KEYS, 3 do
+    if redis.call('EXISTS', KEYS[i]) == 1 then
+        redis.call('SET', KEYS[1], 1, 'EX', tonumber(ARGV[4]))
+        return -1
+    end
+end
+local pending = 0
+for i = 4, #KEYS, 3 do
+    if redis.call('EXISTS', KEYS[i + 1]) == 0 then
+        if redis.call('SADD', KEYS[i + 2], ARGV[1]) == 1 then
+            pending = pending + 1
+        end
+    end
+end
+if pending == 0 then
+    push_route(ARGV[2], ARGV[3])
+    return 1
+end
+redis.call('SET', KEYS[2], pending)
+redis.call('SET', KEYS[3], ARGV[2])
+return 0
+"""
+
+# KEYS[1] = task's done marker, KEYS[2] = its children set,
+# ARGV[1] = prefix, ARGV[2] = done marker TTL (seconds), ARGV[3] = now (ms)
+# Returns the task_ids released into their lanes. Completing the same task
+# twice is a no-op.
+_COMPLETE_SCRIPT = PUSH_ROUTE_LUA + """
+local prefix = ARGV[1]
+if not redis.call('SET', KEYS[1], 1, 'EX', tonumber(ARGV[2]), 'NX') then
+    return {}
+end
+local children = redis.call('SMEMBERS', KEYS[2])
+redis.call('DEL', KEYS[2])
+local released = {}
+for _, child in ipairs(children) do
+    local indeg_key = prefix .. ':indeg:' .. child
+    local payload_key = prefix .. ':payload:' .. child
+    local payload = redis.call('GET', payload_key)
+    -- No payload: the child was cancelled when another parent failed.
+    if payload and redis.call('DECR', indeg_key) <= 0 then
+        redis.call('DEL', indeg_key, payload_key)
+        push_route(payload, ARGV[3])
+        table.insert(released, child)
+    end
+end
+return released
+"""
+
+# KEYS[1] = task's failure marker,
+# ARGV[1] = prefix, ARGV[2] = task_id, ARGV[3] = failure marker TTL (seconds)
+# Returns {task_id, route, ...} for every parked descendant it cancelled.
+# Failing the same task twice is a no-op.
+_FAIL_SCRIPT = """
+local prefix = ARGV[1]
+local ttl = tonumber(ARGV[3])
+if not redis.call('SET', KEYS[1], 1, 'EX', ttl, 'NX') then
+    return {}
+end
+local cancelled = {}
+local frontier = {ARGV[2]}
+while #frontier > 0 do
+    local task_id = table.remove(frontier)
+    local children_key = prefix .. ':children:' .. task_id
+    local children = redis.call('SMEMBERS', children_key)
+    redis.call('DEL', children_key)
+    for _, child in ipairs(children) do
+        local payload_key = prefix .. ':payload:' .. child
+        local payload = redis.call('GET', payload_key)
+        if payload then
+            redis.call('DEL', prefix .. ':indeg:' .. child, payload_key)
+            redis.call('SET', prefix .. ':failed:' .. child, 1, 'EX', ttl)
+            table.insert(cancelled, child)
+            table.insert(cancelled, payload)
+            table.insert(frontier, child)
+        end
+    end
+end
+return cancelled
+"""
+
+
+class DagScheduler:
+    """
+    Ready-set scheduler for task DAGs backed by Redis in-degree counters
+    """
+
+    def __init__(
+        self,
+        redis_client: Any,
+        queue: TaskQueue,
+        prefix: str = DEFAULT_PREFIX,
+        done_ttl_seconds: int = DEFAULT_DONE_TTL_SECONDS,
+    ):
+        require_hash_tag(prefix, hash_tag(queue.prefix))
+        self.redis = redis_client
+        self.queue = queue
+        self.prefix = prefix
+        self.done_ttl_seconds = done_ttl_seconds
+        self._submit = redis_client.register_script(_SUBMIT_SCRIPT)
+        self._complete = redis_client.register_script(_COMPLETE_SCRIPT)
+        self._fail = redis_client.register_script(_FAIL_SCRIPT)
+
+    def submit(
+        self,
+        task_id: str,
+        payload: str,
+        dependencies: Sequence[str],
+        agent_id: str,
+        priority: Any = "medium",
+        cost: int = 1,
+        deadline: Optional[Deadline] = None,
+    ) -> bool:
+        """
+        Registers a task and its edges; returns True if it is ready now
+        """
+        keys = [self._key(kind, task_id) for kind in ("failed", "indeg", "payload")]
+        keys += [
+            self._key(kind, dep)
+            for dep in dependencies
+            for kind in ("failed", "done", "children")
+        ]
+        ready = self._submit(
+            keys=keys,
+            args=[
+                task_id,
+                self.queue.route(agent_id, priority, payload, cost, deadline),
+                self.queue.now_ms(),
+                self.done_ttl_seconds,
+            ],
+        )
+        if ready == -1:
+            logger.warning("dag_task_cancelled_upstream_failed", task_id=task_id)
+            return False
+        return bool(ready)
+
+    def complete(self, task_id: str) -> List[str]:
+        """
+        Marks a task done and returns the children it released
+        """
+        released = [
+            decode(child)
+            for child in self._complete(
+                keys=[self._key("done", task_id), self._key("children", task_id)],
+                args=[self.prefix, self.done_ttl_seconds, self.queue.now_ms()],
+            )
+        ]
+        logger.debug("dag_task_completed", task_id=task_id, released=released)
+        return released
+
+    def fail(self, task_id: str) -> List[Tuple[str, str]]:
+        """
+        Marks a task failed and cancels every parked task that depends on it
+
+        Returns (task_id, payload) for each cancelled descendant.
+        """
+        flat = [
+            decode(item)
+            for item in self._fail(
+                keys=[self._key("failed", task_id)],
+                args=[self.prefix, task_id, self.done_ttl_seconds],
+            )
+        ]
+        cancelled = [
+            (child, route.split("\t", 4)[-1])
+            for child, route in zip(flat[::2], flat[1::2])
+        ]
+        if cancelled:
+            logger.warning(
+                "dag_dependents_cancelled",
+                task_id=task_id,
+                cancelled=[child for child, _ in cancelled],
+            )
+        return cancelled
+
+    def outcomes(self, task_ids: Sequence[str]) -> List[Optional[str]]:
+        """
+        "done", "failed" or None for each task, read in one MGET
+
+        None means the task is still pending, or its marker has expired.
+        """
+        if not task_ids:
+            return []
+        keys = [
+            self._key(marker, task_id)
+            for task_id in task_ids
+            for marker in ("done", "failed")
+        ]
+        markers = self.redis.mget(keys)
+        return [
+            "done" if done is not None else "failed" if failed is not None else None
+            for done, failed in zip(markers[::2], markers[1::2])
+        ]
+
+    def pending_count(self, task_id: str) -> int:
+        """
+        Returns how many parents a parked task is still waiting on
+        """
+        value = self.redis.get(self._key("indeg", task_id))
+        return int(value) if value is not None else 0
+
+    def _key(self, kind: str, task_id: str) -> str:
+        return f"{self.prefix}:{kind}:{task_id}"
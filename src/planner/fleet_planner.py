@@ -0,0 +1,318 @@
+"""Fleet Planner - Coordinated campaign distribution across many agents
+
+Spec: specs/functional.md - Story 9.1 (Fleet Campaign), Story 9.2
+Spec: specs/technical.md - Section 7.1
+
+A campaign goal is expanded into candidate angles, agents are split into
+research / create / engage roles, and creators are matched to angles by
+solving an assignment problem over an (agents x angles) affinity matrix.
+Each angle is expanded into ``max_per_angle`` slots whose cost grows with
+the slot index, so the Hungarian solver (scipy's linear_sum_assignment)
+only reuses an angle when the affinity gain outweighs the diversity
+penalty. Nothing is enqueued until the preview is approved and execute()
+is called.
+"""
+
+import math
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import structlog
+from pydantic import BaseModel, Field
+
+from src.common.embeddings import Embedder, embed_many, hashed_embedding
+from src.common.lazy import lazy_import
+from src.planner.agent_planner import AgentPlanner, PlannedStep, TaskDAG, TaskPriority
+from src.planner.relevance import agent_profile_text
+
+logger = structlog.get_logger(__name__)
+
+# scipy.optimize alone adds ~200ms to the planner's start; load it on first solve.
+optimize = lazy_import("scipy.optimize")
+
+DEFAULT_ROLE_MIX = {"research": 0.2, "create": 0.6, "engage": 0.2}
+DEFAULT_DIVERSITY_PENALTY = 0.1
+DEFAULT_MAX_ANGLES = 200
+
+ANGLE_PERSPECTIVES = [
+    "behind the scenes",
+    "sustainability impact",
+    "how-to guide",
+    "history and heritage",
+    "local voices",
+    "style inspiration",
+    "myth vs fact",
+    "community spotlight",
+    "future predictions",
+    "budget tips",
+    "day in the life",
+    "expert interview",
+    "before and after",
+    "top five picks",
+    "hot take",
+    "personal story",
+]
+
+
+class CampaignAngles(BaseModel):
+    """Structured output schema for LLM angle generation"""
+
+    angles: List[str] = Field(min_length=1)
+
+
+@dataclass
+class AgentAssignment:
+    agent_id: str
+    role: str
+    angle: Optional[str] = None
+    affinity: float = 0.0
+
+
+@dataclass
+class FleetPlan:
+    goal: str
+    angles: List[str]
+    assignments: Dict[str, AgentAssignment]
+    task_dags: Dict[str, TaskDAG]
+    planners: Dict[str, AgentPlanner] = field(repr=False, default_factory=dict)
+    deadline: Optional[datetime] = None
+
+    def preview(self) -> Dict[str, Any]:
+        """
+        Task distribution payload shown to the orchestrator before approval
+        """
+        role_counts: Dict[str, int] = {}
+        by_angle: Dict[str, List[str]] = {}
+        for assignment in self.assignments.values():
+            role_counts[assignment.role] = role_counts.get(assignment.role, 0) + 1
+            if assignment.angle is not None:
+                by_angle.setdefault(assignment.angle, []).append(assignment.agent_id)
+        return {
+            "goal": self.goal,
+            "agent_count": len(self.assignments),
+            "role_counts": role_counts,
+            "angles": by_angle,
+            "duplicated_angles": sum(1 for ids in by_angle.values() if len(ids) > 1),
+            "task_count": sum(len(dag.steps) for dag in self.task_dags.values()),
+        }
+
+
+def split_roles(agent_count: int, role_mix: Dict[str, float]) -> Dict[str, int]:
+    """
+    Apportions agents to roles by largest remainder so counts sum exactly
+    """
+    total = sum(role_mix.values())
+    quotas = {role: agent_count * share / total for role, share in role_mix.items()}
+    counts = {role: int(math.floor(quota)) for role, quota in quotas.items()}
+    leftover = agent_count - sum(counts.values())
+    by_remainder = sorted(quotas, key=lambda r: quotas[r] - counts[r], reverse=True)
+    for role in by_remainder[:leftover]:
+        counts[role] += 1
+    return counts
+
+
+def assign_angles(
+    affinity: np.ndarray,
+    diversity_penalty: float = DEFAULT_DIVERSITY_PENALTY,
+    max_per_angle: Optional[int] = None,
+) -> np.ndarray:
+    """
+    Returns the angle index for each row of an (agents x angles) affinity
+
+    Column j is replicated into slots k = 0..max_per_angle-1 costing
+    ``-affinity + diversity_penalty * k``; the optimal assignment therefore
+    spreads agents across angles unless sharing is clearly better.
+    """
+    agents, angles = affinity.shape
+    if agents == 0:
+        return np.zeros(0, dtype=np.int64)
+    slots = max_per_angle or math.ceil(agents / angles)
+    slot_index = np.tile(np.arange(slots, dtype=np.float32), angles)
+    cost = diversity_penalty * slot_index[None, :] - np.repeat(affinity, slots, axis=1)
+    rows, cols = optimize.linear_sum_assignment(cost)
+    assignment = np.empty(agents, dtype=np.int64)
+    assignment[rows] = cols // slots
+    return assignment
+
+
+def role_task_dag(role: str, goal: str, angle: Optional[str]) -> TaskDAG:
+    """
+    Plan skeleton for one agent's part in the campaign
+    """
+    context = {"campaign_goal": goal, "role": role}
+    if angle is not None:
+        context["angle"] = angle
+    research = PlannedStep(
+        step_id="research",
+        task_type="research_trends",
+        priority=TaskPriority.HIGH,
+        context=dict(context),
+    )
+    if role == "research":
+        return TaskDAG(steps=[research])
+    if role == "engage":
+        return TaskDAG(
+            steps=[
+                PlannedStep(
+                    step_id="engage",
+                    task_type="reply_comment",
+                    priority=TaskPriority.MEDIUM,
+                    context=dict(context),
+                )
+            ]
+        )
+    return TaskDAG(
+        steps=[
+            research,
+            PlannedStep(
+                step_id="generate",
+                task_type="generate_content",
+                priority=TaskPriority.HIGH,
+                depends_on=["research"],
+                context={**context, "topic": angle or goal},
+            ),
+            PlannedStep(
+                step_id="publish",
+                task_type="publish_content",
+                priority=TaskPriority.MEDIUM,
+                depends_on=["generate"],
+                context=dict(context),
+            ),
+        ]
+    )
+
+
+class FleetPlanner:
+    """
+    Plans one campaign across a fleet of agents without duplicated angles
+    """
+
+    def __init__(
+        self,
+        llm_client: Any = None,
+        role_mix: Optional[Dict[str, float]] = None,
+        diversity_penalty: float = DEFAULT_DIVERSITY_PENALTY,
+        max_angles: int = DEFAULT_MAX_ANGLES,
+        embed: Embedder = hashed_embedding,
+    ):
+        self.llm = llm_client
+        self.role_mix = dict(role_mix or DEFAULT_ROLE_MIX)
+        self.diversity_penalty = diversity_penalty
+        self.max_angles = max_angles
+        self.embed = embed
+
+    async def generate_angles(self, goal: str, count: int) -> List[str]:
+        """
+        Candidate angles for the goal; one LLM call, template fallback
+        """
+        count = max(1, min(count, self.max_angles))
+        if self.llm is not None:
+            raw = await self.llm.generate_structured_output(
+                prompt=(
+                    f"Campaign goal: {goal}\n\n"
+                    f"List {count} distinct content angles for this campaign. "
+                    "Each angle is a short phrase; no two angles may overlap."
+                ),
+                schema=CampaignAngles,
+            )
+            angles = list(dict.fromkeys(CampaignAngles.model_validate(raw).angles))
+            return angles[:count]
+
+        angles = []
+        for i in range(count):
+            perspective = ANGLE_PERSPECTIVES[i % len(ANGLE_PERSPECTIVES)]
+            series = i // len(ANGLE_PERSPECTIVES)
+            suffix = f" #{series + 1}" if series else ""
+            angles.append(f"{goal}: {perspective}{suffix}")
+        return angles
+
+    async def plan_campaign(
+        self,
+        goal: str,
+        planners: Sequence[AgentPlanner],
+        angles: Optional[List[str]] = None,
+        deadline: Optional[datetime] = None,
+    ) -> FleetPlan:
+        """
+        Assigns roles and angles and builds per-agent plan skeletons
+
+        ``deadline`` (usually the campaign's end_date) is propagated to every
+        task so the queue dispatches campaign work earliest-deadline-first.
+        """
+        goal = goal.strip()
+        if not goal:
+            raise ValueError("Goal must be a non-empty string")
+
+        counts = split_roles(len(planners), self.role_mix)
+        creator_count = counts.get("create", 0)
+        if angles is None:
+            angles = await self.generate_angles(goal, creator_count)
+
+        profiles = embed_many(
+            [agent_profile_text(p.niche, p.persona) for p in planners], self.embed
+        )
+        affinity = np.clip(profiles @ embed_many(angles, self.embed).T, 0.0, 1.0)
+
+        # Agents with the strongest angle fit create; the rest research/engage.
+        order = np.argsort(-affinity.max(axis=1), kind="stable")
+        creators = order[:creator_count]
+        others = order[creator_count:]
+
+        assignments: Dict[str, AgentAssignment] = {}
+        chosen = assign_angles(affinity[creators], self.diversity_penalty)
+        for row, angle_index in zip(creators.tolist(), chosen.tolist()):
+            agent_id = planners[row].agent_id
+            assignments[agent_id] = AgentAssignment(
+                agent_id=agent_id,
+                role="create",
+                angle=angles[angle_index],
+                affinity=float(affinity[row, angle_index]),
+            )
+
+        support_roles = [
+            role
+            for role, count in counts.items()
+            if role != "create"
+            for _ in range(count)
+        ]
+        for row, role in zip(others.tolist(), support_roles):
+            agent_id = planners[row].agent_id
+            assignments[agent_id] = AgentAssignment(agent_id=agent_id, role=role)
+
+        task_dags = {
+            agent_id: role_task_dag(a.role, goal, a.angle)
+            for agent_id, a in assignments.items()
+        }
+        plan = FleetPlan(
+            goal=goal,
+            angles=list(angles),
+            assignments=assignments,
+            task_dags=task_dags,
+            planners={p.agent_id: p for p in planners},
+            deadline=deadline,
+        )
+        preview = plan.preview()
+        logger.info(
+            "fleet_campaign_planned",
+            agents=preview["agent_count"],
+            roles=preview["role_counts"],
+            duplicated_angles=preview["duplicated_angles"],
+        )
+        return plan
+
+    async def execute(self, plan: FleetPlan) -> Dict[str, List[str]]:
+        """
+        Materializes and enqueues every agent's DAG after preview approval
+
+        Returns the task ids dispatched immediately per agent.
+        """
+        dispatched = {}
+        for agent_id, task_dag in plan.task_dags.items():
+            planner = plan.planners[agent_id]
+            tasks = planner._materialize_tasks(task_dag, plan.goal)
+            dispatched[agent_id] = await planner.enqueue_dag(
+                tasks, deadline=plan.deadline
+            )
+        return dispatched
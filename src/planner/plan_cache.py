@@ -0,0 +1,193 @@
+"""Plan Cache - Reuse of decomposed goal skeletons across similar goals
+
+Spec: specs/technical.md - Section 6.2 (LLM cost), Section 7.1, Section 12.2
+Spec: specs/functional.md - FR-PERF-1
+
+Entries are keyed by a normalized goal plus a hash of the agent group's
+(niche, persona archetype) key, the same grouping decompose_goal_many shares
+plans by, and evicted by LRU order and TTL. A lookup that misses the exact
+key falls back to an embedding near-match within the same group; the cached
+TaskDAG skeleton is reused with its context fitted to the new goal.
+"""
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Optional, Tuple
+
+import numpy as np
+
+from src.common.embeddings import Embedder, hashed_embedding, tokenize
+
+if TYPE_CHECKING:
+    from src.planner.agent_planner import TaskDAG
+
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_TTL_SECONDS = 6 * 3600
+DEFAULT_NEAR_MATCH_THRESHOLD = 0.8
+
+
+def normalize_goal(goal: str) -> str:
+    """
+    Lowercases and strips punctuation/whitespace noise from a goal
+    """
+    return " ".join(tokenize(goal))
+
+
+def plan_group_hash(group_key: Tuple[str, str]) -> str:
+    """
+    Stable short hash of an agent group's (niche, persona archetype) key
+
+    The planning prompt carries only these two attributes, so every agent in
+    a group gets an interchangeable plan for the same goal.
+    """
+    blob = json.dumps(list(group_key))
+    return hashlib.sha256(blob.encode()).hexdigest()[:16]
+
+
+def reparameterize(task_dag: "TaskDAG", cached_goal: str, goal: str) -> "TaskDAG":
+    """
+    Copies a cached skeleton and fits its step contexts to the new goal
+
+    Occurrences of the cached goal are rewritten. A near-match goal differs
+    in a few words (usually its topic), so a context value that still names
+    a word only the cached goal had was derived from it and is stale; that
+    field is dropped and the worker falls back to the task's ``goal``.
+    """
+    stale = set(tokenize(cached_goal)) - set(tokenize(goal))
+
+    def rewrite(value: Any) -> Any:
+        if isinstance(value, str):
+            return goal if value == cached_goal else value.replace(cached_goal, goal)
+        if isinstance(value, dict):
+            return {key: rewrite(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [rewrite(item) for item in value]
+        return value
+
+    def is_stale(value: Any) -> bool:
+        if isinstance(value, str):
+            return not stale.isdisjoint(tokenize(value))
+        if isinstance(value, dict):
+            return any(is_stale(item) for item in value.values())
+        if isinstance(value, list):
+            return any(is_stale(item) for item in value)
+        return False
+
+    skeleton = task_dag.model_copy(deep=True)
+    for step in skeleton.steps:
+        step.context = {
+            key: value
+            for key, value in rewrite(step.context).items()
+            if not is_stale(value)
+        }
+    return skeleton
+
+
+@dataclass
+class PlanCacheStats:
+    hits: int = 0
+    near_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.near_hits + self.misses
+        return (self.hits + self.near_hits) / lookups if lookups else 0.0
+
+
+@dataclass
+class _Entry:
+    goal: str
+    task_dag: "TaskDAG"
+    embedding: np.ndarray
+    expires_at: float
+
+
+class PlanCache:
+    """
+    LRU + TTL cache of TaskDAG skeletons with embedding near-match
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        near_match_threshold: float = DEFAULT_NEAR_MATCH_THRESHOLD,
+        embed: Embedder = hashed_embedding,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.near_match_threshold = near_match_threshold
+        self.embed = embed
+        self.clock = clock
+        self.stats = PlanCacheStats()
+        self._entries: "OrderedDict[Tuple[str, str], _Entry]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, goal: str, group_hash: str) -> Optional["TaskDAG"]:
+        """
+        Returns a plan for the goal, exact or re-parameterized near-match
+        """
+        self._expire()
+        key = (group_hash, normalize_goal(goal))
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return reparameterize(entry.task_dag, entry.goal, goal)
+
+        near = self._nearest(goal, group_hash)
+        if near is not None:
+            near_key, near_entry = near
+            self._entries.move_to_end(near_key)
+            self.stats.near_hits += 1
+            return reparameterize(near_entry.task_dag, near_entry.goal, goal)
+
+        self.stats.misses += 1
+        return None
+
+    def put(self, goal: str, group_hash: str, task_dag: "TaskDAG") -> None:
+        key = (group_hash, normalize_goal(goal))
+        self._entries[key] = _Entry(
+            goal=goal,
+            task_dag=task_dag.model_copy(deep=True),
+            embedding=np.asarray(self.embed(goal), dtype=np.float32),
+            expires_at=self.clock() + self.ttl_seconds,
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def _nearest(
+        self, goal: str, group_hash: str
+    ) -> Optional[Tuple[Tuple[str, str], _Entry]]:
+        candidates = [
+            (key, entry) for key, entry in self._entries.items() if key[0] == group_hash
+        ]
+        if not candidates:
+            return None
+        query = np.asarray(self.embed(goal), dtype=np.float32)
+        matrix = np.stack([entry.embedding for _, entry in candidates])
+        scores = matrix @ query
+        best = int(np.argmax(scores))
+        if scores[best] < self.near_match_threshold:
+            return None
+        return candidates[best]
+
+    def _expire(self) -> None:
+        now = self.clock()
+        expired = [
+            key for key, entry in self._entries.items() if entry.expires_at <= now
+        ]
+        for key in expired:
+            del self._entries[key]
+        self.stats.expirations += len(expired)
@@ -0,0 +1,189 @@
+"""Poll Scheduler - One timer wheel driving trend and mention polls for all agents
+
+Spec: specs/technical.md - Section 7.1 (poll_resources cadence)
+Spec: specs/functional.md - Story 2.1, FR-SCALE-1
+
+Replaces the per-agent ``while active: ...; await asyncio.sleep(14400)``
+loops with a single process-wide TimerWheel. First fires are staggered
+deterministically across the interval so a deploy does not wake every agent
+at once, and each re-arm adds random jitter so agents never re-synchronize.
+Pause/resume cancels or re-arms a fixed number of timers per agent (O(1))
+and is driven by AgentPlanner.agent_status changes.
+
+A PlannerRuntime with a shared TrendFetcher gets trends through its
+subscriptions, so its scheduler is built with the MENTIONS interval only.
+"""
+
+import asyncio
+import hashlib
+import random
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, Dict, List, Optional
+
+import structlog
+
+from src.common.timer_wheel import Timer, TimerWheel
+from src.planner.agent_planner import AgentPlanner
+
+logger = structlog.get_logger(__name__)
+
+TREND_POLL_INTERVAL_SECONDS = 4 * 3600
+MENTION_POLL_INTERVAL_SECONDS = 10 * 60
+DEFAULT_JITTER_RATIO = 0.1
+DEFAULT_MAX_CONCURRENT_POLLS = 32
+
+
+class PollKind(Enum):
+    TRENDS = "trends"
+    MENTIONS = "mentions"
+
+
+DEFAULT_INTERVALS = {
+    PollKind.TRENDS: TREND_POLL_INTERVAL_SECONDS,
+    PollKind.MENTIONS: MENTION_POLL_INTERVAL_SECONDS,
+}
+
+
+@dataclass(frozen=True)
+class PollJob:
+    agent_id: str
+    kind: PollKind
+
+
+class PollScheduler:
+    """
+    Process-wide scheduler for every agent's resource polls
+    """
+
+    def __init__(
+        self,
+        intervals: Optional[Dict[PollKind, float]] = None,
+        jitter_ratio: float = DEFAULT_JITTER_RATIO,
+        max_concurrent_polls: int = DEFAULT_MAX_CONCURRENT_POLLS,
+        tick_seconds: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+        rng: Optional[random.Random] = None,
+    ):
+        self.intervals = dict(intervals or DEFAULT_INTERVALS)
+        self.jitter_ratio = jitter_ratio
+        self.clock = clock
+        self.wheel = TimerWheel(tick_seconds=tick_seconds, start_time=clock())
+        self._rng = rng or random.Random()
+        self._semaphore = asyncio.Semaphore(max_concurrent_polls)
+        self._planners: Dict[str, AgentPlanner] = {}
+        self._timers: Dict[PollJob, Timer] = {}
+        self._running = False
+
+    def __len__(self) -> int:
+        return len(self._planners)
+
+    def register(self, planner: AgentPlanner) -> None:
+        """
+        Tracks a planner; it is armed now if active and on later activation
+        """
+        self._planners[planner.agent_id] = planner
+        planner.add_status_listener(self._on_status_change)
+        if planner.agent_status == "active":
+            self.resume(planner.agent_id)
+
+    def unregister(self, agent_id: str) -> None:
+        self.pause(agent_id)
+        planner = self._planners.pop(agent_id, None)
+        if planner is not None:
+            planner.remove_status_listener(self._on_status_change)
+
+    def pause(self, agent_id: str) -> None:
+        for kind in self.intervals:
+            timer = self._timers.pop(PollJob(agent_id, kind), None)
+            if timer is not None:
+                self.wheel.cancel(timer)
+
+    def resume(self, agent_id: str) -> None:
+        for kind, interval in self.intervals.items():
+            job = PollJob(agent_id, kind)
+            if job not in self._timers:
+                self._arm(job, self._stagger(job, interval))
+
+    async def run_due(self) -> int:
+        """
+        Fires every poll that has come due and re-arms it; returns the count
+        """
+        jobs: List[PollJob] = self.wheel.advance(self.clock())
+        for job in jobs:
+            self._timers.pop(job, None)
+            if self._planners.get(job.agent_id) is not None:
+                self._arm(job, self._jittered(self.intervals[job.kind]))
+        await asyncio.gather(*(self._fire(job) for job in jobs))
+        return len(jobs)
+
+    async def run(self) -> None:
+        """
+        Drives the wheel until stop() is called
+        """
+        self._running = True
+        while self._running:
+            await asyncio.sleep(self.wheel.tick_seconds)
+            await self.run_due()
+
+    def stop(self) -> None:
+        self._running = False
+
+    def backlog(self, horizon_seconds: float, bucket_seconds: float) -> List[int]:
+        """
+        Histogram of upcoming fires per bucket over the horizon
+
+        A tall bucket is a thundering-herd warning: that many polls will hit
+        the MCP servers within the same window.
+        """
+        buckets = [0] * max(1, int(horizon_seconds // bucket_seconds))
+        now = self.wheel.now
+        for timer in self.wheel.timers():
+            offset = timer.deadline_tick * self.wheel.tick_seconds - now
+            index = int(offset // bucket_seconds)
+            if 0 <= index < len(buckets):
+                buckets[index] += 1
+        return buckets
+
+    def _on_status_change(
+        self, planner: AgentPlanner, previous: str, status: str
+    ) -> None:
+        if status == "active":
+            self.resume(planner.agent_id)
+        else:
+            self.pause(planner.agent_id)
+
+    def _arm(self, job: PollJob, delay: float) -> None:
+        self._timers[job] = self.wheel.schedule(delay, job)
+
+    def _stagger(self, job: PollJob, interval: float) -> float:
+        # Deterministic per-(agent, kind) phase spreads first fires uniformly.
+        digest = hashlib.blake2b(
+            f"{job.agent_id}:{job.kind.value}".encode(), digest_size=8
+        ).digest()
+        return interval * int.from_bytes(digest, "little") / 2**64
+
+    def _jittered(self, interval: float) -> float:
+        spread = interval * self.jitter_ratio
+        return interval + self._rng.uniform(-spread, spread)
+
+    async def _fire(self, job: PollJob) -> None:
+        planner = self._planners.get(job.agent_id)
+        if planner is None or planner.agent_status != "active":
+            return
+        poll = (
+            planner.poll_resources
+            if job.kind is PollKind.TRENDS
+            else planner.poll_mentions
+        )
+        async with self._semaphore:
+            try:
+                await poll()
+            except Exception as e:
+                logger.warning(
+                    "poll_failed",
+                    agent_id=job.agent_id,
+                    kind=job.kind.value,
+                    error=str(e),
+                )
@@ -0,0 +1,169 @@
+"""Relevance Engine - Vectorized trend-to-agent routing
+
+Spec: specs/technical.md - Section 7.1 (_is_relevant)
+Spec: specs/functional.md - Story 2.1, FR-SCALE-1
+
+Keeps one (agents x dim) matrix of niche/persona embeddings. A batch of
+trends is embedded once and scored against every agent with a single matrix
+multiply; per-agent ``min_relevance_score`` thresholds are applied as a
+broadcast comparison. The final score blends semantic similarity with the
+upstream relevance the trend source reported:
+
+    score = w * max(cos(trend, agent), 0) + (1 - w) * trend.relevance_score
+
+With ``semantic_weight=0`` routing reduces to AgentPlanner._is_relevant.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.common.embeddings import EMBEDDING_DIM, Embedder, embed_many, hashed_embedding
+from src.planner.agent_planner import AgentPlanner
+
+DEFAULT_SEMANTIC_WEIGHT = 0.5
+
+
+def agent_profile_text(niche: Optional[str], persona: Dict[str, Any]) -> str:
+    """
+    Text describing what an agent posts about, used for its embedding
+    """
+    parts = [(niche or "").replace("_", " ")]
+    parts.extend(str(item) for item in persona.get("interests", []))
+    parts.extend(
+        str(item).replace("_", " ") for item in persona.get("core_beliefs", [])
+    )
+    return " ".join(part for part in parts if part)
+
+
+def _trend_field(trend: Any, name: str, default: Any) -> Any:
+    if isinstance(trend, dict):
+        return trend.get(name, default)
+    return getattr(trend, name, default)
+
+
+class RelevanceEngine:
+    """
+    Scores trend batches against every registered agent at once
+    """
+
+    def __init__(
+        self,
+        embed: Embedder = hashed_embedding,
+        semantic_weight: float = DEFAULT_SEMANTIC_WEIGHT,
+        dim: int = EMBEDDING_DIM,
+    ):
+        self.embed = embed
+        self.semantic_weight = semantic_weight
+        # Row buffers grow by doubling; only the first len(self) rows are live.
+        self._matrix = np.zeros((16, dim), dtype=np.float32)
+        self._thresholds = np.zeros(16, dtype=np.float32)
+        self._agent_ids: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._planners: Dict[str, AgentPlanner] = {}
+
+    def __len__(self) -> int:
+        return len(self._agent_ids)
+
+    def add_agent(
+        self,
+        agent_id: str,
+        profile_text: str,
+        min_relevance_score: float,
+        planner: Optional[AgentPlanner] = None,
+    ) -> None:
+        """
+        Adds or replaces an agent's row in the embedding matrix
+        """
+        vector = embed_many([profile_text], self.embed)[0]
+        row = self._index.get(agent_id)
+        if row is None:
+            row = len(self._agent_ids)
+            if row == len(self._thresholds):
+                self._matrix = np.concatenate(
+                    [self._matrix, np.zeros_like(self._matrix)]
+                )
+                self._thresholds = np.concatenate(
+                    [self._thresholds, np.zeros_like(self._thresholds)]
+                )
+            self._index[agent_id] = row
+            self._agent_ids.append(agent_id)
+        self._matrix[row] = vector
+        self._thresholds[row] = min_relevance_score
+        if planner is not None:
+            self._planners[agent_id] = planner
+
+    def add_planner(self, planner: AgentPlanner) -> None:
+        self.add_agent(
+            planner.agent_id,
+            agent_profile_text(planner.niche, planner.persona),
+            planner.min_relevance_score,
+            planner=planner,
+        )
+
+    def remove_agent(self, agent_id: str) -> None:
+        """
+        Drops an agent by swapping the last row into its slot
+        """
+        row = self._index.pop(agent_id, None)
+        self._planners.pop(agent_id, None)
+        if row is None:
+            return
+        last = len(self._agent_ids) - 1
+        if row != last:
+            moved = self._agent_ids[last]
+            self._matrix[row] = self._matrix[last]
+            self._thresholds[row] = self._thresholds[last]
+            self._agent_ids[row] = moved
+            self._index[moved] = row
+        self._agent_ids.pop()
+
+    def score(self, trends: Sequence[Any]) -> np.ndarray:
+        """
+        Returns a (trends x agents) relevance matrix in [0, 1]
+        """
+        if not trends or not self._agent_ids:
+            return np.zeros((len(trends), len(self._agent_ids)), dtype=np.float32)
+        topics = [str(_trend_field(trend, "topic", "")) for trend in trends]
+        upstream = np.array(
+            [
+                float(
+                    _trend_field(
+                        trend, "relevance_score", _trend_field(trend, "relevance", 0.0)
+                    )
+                )
+                for trend in trends
+            ],
+            dtype=np.float32,
+        )
+        agents = self._matrix[: len(self._agent_ids)]
+        similarity = np.clip(embed_many(topics, self.embed) @ agents.T, 0.0, 1.0)
+        weight = self.semantic_weight
+        return weight * similarity + (1.0 - weight) * upstream[:, None]
+
+    def route(self, trends: Sequence[Any]) -> Dict[str, List[Any]]:
+        """
+        Maps each agent_id to the trends that clear its threshold
+        """
+        thresholds = self._thresholds[: len(self._agent_ids)]
+        mask = self.score(trends) >= thresholds[None, :]
+        agent_rows, trend_cols = np.nonzero(mask.T)
+        assignment: Dict[str, List[Any]] = {}
+        for agent_row, trend_col in zip(agent_rows.tolist(), trend_cols.tolist()):
+            assignment.setdefault(self._agent_ids[agent_row], []).append(
+                trends[trend_col]
+            )
+        return assignment
+
+    async def dispatch(self, trends: Sequence[Any]) -> int:
+        """
+        Routes a batch and hands each registered planner its trends
+
+        Returns the number of tasks created across all planners.
+        """
+        created = 0
+        for agent_id, assigned in self.route(trends).items():
+            planner = self._planners.get(agent_id)
+            if planner is not None:
+                created += len(await planner.handle_trends(assigned, prescored=True))
+        return created
@@ -0,0 +1,342 @@
+"""Planner Sharding - Many agents per planner process via consistent hashing
+
+Spec: specs/technical.md - Section 1.2, Section 6.1, Section 11.3
+Spec: specs/functional.md - FR-SCALE-1
+
+Instead of one planner deployment per agent, each PlannerRuntime hosts the
+AgentPlanner instances for the agents it owns. Ownership is decided by a
+consistent-hash ring over the live replicas (virtual nodes smooth the
+spread), and enforced by per-agent leases in Redis so two replicas never
+drive the same agent. A joining or leaving replica only moves ~1/N of the
+agents; a replica that shuts down cleanly releases its leases and leaves
+the member set so its agents move on the next tick rather than after lease
+expiry.
+
+Planners hosted by one runtime share a single TaskQueue, DagScheduler and
+ServiceTimeEstimator, which keeps per-agent memory to a few kilobytes. With
+a TrendFetcher each attached planner is subscribed to its (region, niche,
+time window) key, so trend calls to MCP grow with distinct niches rather
+than with hosted agents; detaching unsubscribes it.
+
+A planner is configured from its agent record when it is attached: niche,
+region and persona come from the record, and so does agent_status, which
+wins over a checkpointed one since the agent API owns it. Statuses of hosted
+agents are re-read on every tick, so an agent activated or paused through
+the API follows within one rebalance interval.
+
+Key layout (``prefix`` defaults to ``{chimera}:planners``):
+    {prefix}:members          zset replica_id -> membership expiry (ms)
+    {prefix}:lease:{agent_id} replica_id holding the agent (PX lease_ttl)
+
+Agent records (``agent_prefix`` defaults to ``{chimera}:agents``):
+    {agent_prefix}:{agent_id} hash: niche, region, status, persona (JSON)
+"""
+
+import asyncio
+import bisect
+import hashlib
+import json
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+import structlog
+
+from src.common.redis_text import decode
+from src.common.task_queue import TaskQueue
+from src.planner.agent_planner import AgentPlanner
+from src.planner.critical_path import ServiceTimeEstimator
+from src.planner.dag_scheduler import DagScheduler
+
+logger = structlog.get_logger(__name__)
+
+SHARD_PREFIX = "{chimera}:planners"
+AGENT_CONFIG_PREFIX = "{chimera}:agents"
+DEFAULT_VNODES = 128
+DEFAULT_LEASE_TTL_SECONDS = 15.0
+DEFAULT_TICK_SECONDS = 5.0
+
+# KEYS = lease keys, ARGV[1] = replica_id, ARGV[2] = ttl (ms)
+# Takes free leases and renews our own; returns the 1-based indexes held.
+_ACQUIRE_SCRIPT = """
+local held = {}
+for i, key in ipairs(KEYS) do
+    local owner = redis.call('GET', key)
+    if not owner then
+        redis.call('SET', key, ARGV[1], 'PX', ARGV[2])
+        table.insert(held, i)
+    elseif owner == ARGV[1] then
+        redis.call('PEXPIRE', key, ARGV[2])
+        table.insert(held, i)
+    end
+end
+return held
+"""
+
+# KEYS = lease keys, ARGV[1] = replica_id. Deletes only leases we own.
+_RELEASE_SCRIPT = """
+local released = 0
+for _, key in ipairs(KEYS) do
+    if redis.call('GET', key) == ARGV[1] then
+        redis.call('DEL', key)
+        released = released + 1
+    end
+end
+return released
+"""
+
+
+def _hash(value: str) -> int:
+    digest = hashlib.blake2b(value.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+class HashRing:
+    """
+    Consistent-hash ring with virtual nodes
+    """
+
+    def __init__(self, nodes: Iterable[str] = (), vnodes: int = DEFAULT_VNODES):
+        self.vnodes = vnodes
+        self._points: List[int] = []
+        self._owners: List[str] = []
+        self._nodes: Set[str] = set()
+        for node in nodes:
+            self.add(node)
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    @property
+    def nodes(self) -> Set[str]:
+        return set(self._nodes)
+
+    def add(self, node: str) -> None:
+        if node in self._nodes:
+            return
+        self._nodes.add(node)
+        for i in range(self.vnodes):
+            point = _hash(f"{node}#{i}")
+            index = bisect.bisect(self._points, point)
+            self._points.insert(index, point)
+            self._owners.insert(index, node)
+
+    def remove(self, node: str) -> None:
+        if node not in self._nodes:
+            return
+        self._nodes.discard(node)
+        keep = [i for i, owner in enumerate(self._owners) if owner != node]
+        self._points = [self._points[i] for i in keep]
+        self._owners = [self._owners[i] for i in keep]
+
+    def owner(self, key: str) -> Optional[str]:
+        if not self._points:
+            return None
+        index = bisect.bisect(self._points, _hash(key)) % len(self._points)
+        return self._owners[index]
+
+
+class PlannerRuntime:
+    """
+    Hosts the AgentPlanners this replica owns and follows ring changes
+    """
+
+    def __init__(
+        self,
+        replica_id: str,
+        redis_client: Any,
+        roster: Callable[[], Iterable[str]],
+        planner_factory: Optional[Callable[[str], AgentPlanner]] = None,
+        llm_client: Any = None,
+        mcp_client: Any = None,
+        poll_scheduler: Any = None,
+        checkpointer: Any = None,
+        trend_fetcher: Any = None,
+        trend_window_hours: int = 24,
+        prefix: str = SHARD_PREFIX,
+        agent_prefix: str = AGENT_CONFIG_PREFIX,
+        lease_ttl_seconds: float = DEFAULT_LEASE_TTL_SECONDS,
+        vnodes: int = DEFAULT_VNODES,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.replica_id = replica_id
+        self.redis = redis_client
+        self.roster = roster
+        self.llm = llm_client
+        self.mcp_client = mcp_client
+        self.poll_scheduler = poll_scheduler
+        self.checkpointer = checkpointer
+        self.trend_fetcher = trend_fetcher
+        self.trend_window_hours = trend_window_hours
+        self.prefix = prefix
+        self.agent_prefix = agent_prefix
+        self.lease_ttl_seconds = lease_ttl_seconds
+        self.vnodes = vnodes
+        self.clock = clock
+        self.task_queue = TaskQueue(redis_client)
+        self.scheduler = DagScheduler(redis_client, self.task_queue)
+        self.service_times = ServiceTimeEstimator()
+        self.planner_factory = planner_factory or self._default_planner
+        self.planners: Dict[str, AgentPlanner] = {}
+        self.ring = HashRing(vnodes=vnodes)
+        self._acquire = redis_client.register_script(_ACQUIRE_SCRIPT)
+        self._release = redis_client.register_script(_RELEASE_SCRIPT)
+        self._running = False
+
+    @property
+    def members_key(self) -> str:
+        return f"{self.prefix}:members"
+
+    def lease_key(self, agent_id: str) -> str:
+        return f"{self.prefix}:lease:{agent_id}"
+
+    def agent_key(self, agent_id: str) -> str:
+        return f"{self.agent_prefix}:{agent_id}"
+
+    def heartbeat(self) -> Set[str]:
+        """
+        Refreshes this replica's membership and returns the live replicas
+        """
+        now_ms = int(self.clock() * 1000)
+        ttl_ms = int(self.lease_ttl_seconds * 1000)
+        self.redis.zadd(self.members_key, {self.replica_id: now_ms + ttl_ms})
+        self.redis.zremrangebyscore(self.members_key, "-inf", now_ms)
+        return {decode(m) for m in self.redis.zrange(self.members_key, 0, -1)}
+
+    def rebalance(self) -> Dict[str, int]:
+        """
+        Aligns hosted planners with the ring and renews held leases
+
+        Agents that hash elsewhere are checkpointed, detached and released.
+        Agents that hash here are acquired if their lease is free; one still
+        leased to a departing owner is retried on the next tick.
+        """
+        members = self.heartbeat()
+        for node in self.ring.nodes - members:
+            self.ring.remove(node)
+        for node in members - self.ring.nodes:
+            self.ring.add(node)
+
+        desired = {a for a in self.roster() if self.ring.owner(a) == self.replica_id}
+        leaving = [a for a in self.planners if a not in desired]
+        if leaving:
+            self._detach(leaving)
+
+        wanted = sorted(desired)
+        held: Set[str] = set()
+        if wanted:
+            indexes = self._acquire(
+                keys=[self.lease_key(a) for a in wanted],
+                args=[self.replica_id, int(self.lease_ttl_seconds * 1000)],
+            )
+            held = {wanted[int(i) - 1] for i in indexes}
+
+        lost = [a for a in self.planners if a not in held]
+        if lost:
+            # Someone else holds these now; do not overwrite their checkpoint.
+            self._detach(lost, handoff=False)
+        joined = [a for a in wanted if a in held and a not in self.planners]
+        if self.planners:
+            self._sync_statuses(list(self.planners))
+        if joined:
+            self._attach(joined)
+
+        stats = {
+            "hosted": len(self.planners),
+            "joined": len(joined),
+            "left": len(leaving) + len(lost),
+            "pending": len(desired) - len(held),
+        }
+        if joined or leaving or lost:
+            logger.info("planner_rebalanced", replica_id=self.replica_id, **stats)
+        return stats
+
+    def shutdown(self) -> None:
+        """
+        Checkpoints and releases every hosted agent and leaves the ring
+        """
+        self._running = False
+        self._detach(list(self.planners))
+        self.redis.zrem(self.members_key, self.replica_id)
+
+    async def run(self, interval_seconds: float = DEFAULT_TICK_SECONDS) -> None:
+        """
+        Rebalances every interval until stop() or shutdown() is called
+        """
+        self._running = True
+        while self._running:
+            try:
+                self.rebalance()
+            except Exception as e:
+                logger.warning("planner_rebalance_failed", error=str(e))
+            await asyncio.sleep(interval_seconds)
+
+    def stop(self) -> None:
+        self._running = False
+
+    def _default_planner(self, agent_id: str) -> AgentPlanner:
+        return AgentPlanner(
+            agent_id=agent_id,
+            redis_client=self.redis,
+            llm_client=self.llm,
+            mcp_client=self.mcp_client,
+            task_queue=self.task_queue,
+            scheduler=self.scheduler,
+            service_times=self.service_times,
+        )
+
+    def _agent_records(self, agent_ids: List[str]) -> List[Dict[str, str]]:
+        pipe = self.redis.pipeline()
+        for agent_id in agent_ids:
+            pipe.hgetall(self.agent_key(agent_id))
+        return [
+            {decode(k): decode(v) for k, v in record.items()}
+            for record in pipe.execute()
+        ]
+
+    def _configure(self, planner: AgentPlanner, record: Dict[str, str]) -> None:
+        planner.niche = record.get("niche") or planner.niche
+        planner.region = record.get("region") or planner.region
+        try:
+            if record.get("persona"):
+                planner.persona = json.loads(record["persona"])
+            if record.get("status"):
+                planner.agent_status = record["status"]
+        except ValueError as e:
+            logger.warning(
+                "agent_record_invalid", agent_id=planner.agent_id, error=str(e)
+            )
+
+    def _sync_statuses(self, agent_ids: List[str]) -> None:
+        pipe = self.redis.pipeline()
+        for agent_id in agent_ids:
+            pipe.hget(self.agent_key(agent_id), "status")
+        for agent_id, status in zip(agent_ids, pipe.execute()):
+            if status is not None:
+                self._configure(self.planners[agent_id], {"status": decode(status)})
+
+    def _attach(self, agent_ids: List[str]) -> None:
+        planners = [self.planner_factory(agent_id) for agent_id in agent_ids]
+        if self.checkpointer is not None:
+            self.checkpointer.restore(planners)
+        for planner, record in zip(planners, self._agent_records(agent_ids)):
+            self._configure(planner, record)
+            self.planners[planner.agent_id] = planner
+            if self.poll_scheduler is not None:
+                self.poll_scheduler.register(planner)
+            if self.trend_fetcher is not None:
+                planner.subscribe_trends(self.trend_fetcher, self.trend_window_hours)
+
+    def _detach(self, agent_ids: List[str], handoff: bool = True) -> None:
+        planners = [self.planners.pop(agent_id) for agent_id in agent_ids]
+        for planner in planners:
+            if self.poll_scheduler is not None:
+                self.poll_scheduler.unregister(planner.agent_id)
+            if self.trend_fetcher is not None:
+                self.trend_fetcher.unsubscribe(planner.agent_id)
+        if handoff:
+            if self.checkpointer is not None:
+                self.checkpointer.save(planners)
+            self._release(
+                keys=[self.lease_key(agent_id) for agent_id in agent_ids],
+                args=[self.replica_id],
+            )
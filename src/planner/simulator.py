@@ -0,0 +1,330 @@
+"""Swarm Simulator - Offline discrete-event model of a campaign's execution
+
+Spec: specs/functional.md - Story 9.1, FR-PERF-1, FR-SCALE-1
+Spec: specs/technical.md - Section 8.1, Section 12.3
+
+Replays the per-agent TaskDAGs of a campaign (e.g. ``FleetPlan.task_dags``)
+through Planner -> Redis -> Worker -> Judge with a fixed worker count, so a
+distribution can be previewed and the worker pool sized before anything
+runs. Each task_type is a sequence of MCP tool / LLM calls; each call has a
+lognormal latency (given by its p50 and p95) and a dollar cost. Ready tasks
+wait in the queue in lane order (HIGH, MEDIUM, LOW; FIFO within a lane), a
+worker executes the calls back to back and then waits for the Judge, and a
+rejected output is executed again up to ``max_attempts`` times.
+
+All latencies are drawn up front with numpy and the event loop is a single
+heap, so 1,000 agents simulate in well under a second. Results are
+deterministic for a given seed.
+
+This is a library for campaign tooling; no role in src/main.py runs it, and
+it is only imported when ``SwarmSimulator`` is first used from src.planner.
+"""
+
+import heapq
+import math
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.planner.agent_planner import TaskDAG, TaskPriority
+
+_Z95 = 1.6448536269514722
+_LANE_RANK = {TaskPriority.HIGH: 0, TaskPriority.MEDIUM: 1, TaskPriority.LOW: 2}
+
+DEFAULT_SAMPLE_SECONDS = 1.0
+DEFAULT_MAX_ATTEMPTS = 2
+# t3.small spot: $200/month for 50 workers (specs/technical.md cost table).
+DEFAULT_WORKER_HOUR_USD = 200.0 / 50 / 730
+
+
+@dataclass(frozen=True)
+class CallProfile:
+    """Latency (lognormal by p50/p95, seconds) and cost of one call"""
+
+    p50_seconds: float
+    p95_seconds: float
+    cost_usd: float = 0.0
+
+    def __post_init__(self) -> None:
+        if not 0 < self.p50_seconds <= self.p95_seconds:
+            raise ValueError("Call latency needs 0 < p50 <= p95")
+
+    def sample(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        sigma = math.log(self.p95_seconds / self.p50_seconds) / _Z95
+        return rng.lognormal(math.log(self.p50_seconds), sigma, size)
+
+
+DEFAULT_CALL_PROFILES: Dict[str, CallProfile] = {
+    "planner_enqueue": CallProfile(0.005, 0.02),
+    "search_memory": CallProfile(0.08, 0.3),
+    "get_trending_topics": CallProfile(0.5, 2.0),
+    "llm_generate": CallProfile(1.5, 4.0, cost_usd=0.002),
+    "generate_image": CallProfile(3.0, 8.0, cost_usd=0.08),
+    "post_content": CallProfile(0.4, 1.5),
+    "transfer_usdc": CallProfile(2.0, 6.0),
+    "judge_validate": CallProfile(0.8, 2.0, cost_usd=0.001),
+}
+
+# Calls a worker makes per task_type, in order (see TaskWorker.execute_task).
+DEFAULT_TASK_CALLS: Dict[str, Tuple[str, ...]] = {
+    "research_trends": ("search_memory", "get_trending_topics"),
+    "generate_content": ("search_memory", "llm_generate", "generate_image"),
+    "reply_comment": ("search_memory", "llm_generate"),
+    "publish_content": ("search_memory", "post_content"),
+    "execute_transaction": ("search_memory", "transfer_usdc"),
+}
+JUDGED_TASK_TYPES = frozenset({"generate_content", "reply_comment"})
+
+
+def _percentile(values: Sequence[float], q: float) -> float:
+    return float(np.percentile(values, q)) if len(values) else 0.0
+
+
+@dataclass
+class SimulationReport:
+    workers: int
+    agents: int
+    tasks: int
+    makespan_seconds: float
+    completion_p50_seconds: float
+    completion_p95_seconds: float
+    queue_wait_p95_seconds: float
+    utilization: float
+    cost_usd: float
+    cost_by_call: Dict[str, float]
+    rejections: int
+    queue_depth: List[Tuple[float, int]] = field(repr=False, default_factory=list)
+
+    @property
+    def peak_queue_depth(self) -> int:
+        return max((depth for _, depth in self.queue_depth), default=0)
+
+    @property
+    def peak_depth_per_worker(self) -> float:
+        """Comparable to the HPA queue_depth target (tasks per worker)"""
+        return self.peak_queue_depth / self.workers
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "workers": self.workers,
+            "agents": self.agents,
+            "tasks": self.tasks,
+            "makespan_seconds": round(self.makespan_seconds, 3),
+            "completion_p50_seconds": round(self.completion_p50_seconds, 3),
+            "completion_p95_seconds": round(self.completion_p95_seconds, 3),
+            "queue_wait_p95_seconds": round(self.queue_wait_p95_seconds, 3),
+            "peak_queue_depth": self.peak_queue_depth,
+            "utilization": round(self.utilization, 3),
+            "cost_usd": round(self.cost_usd, 4),
+        }
+
+
+class SwarmSimulator:
+    """
+    Discrete-event simulation of a campaign on a fixed-size worker pool
+    """
+
+    def __init__(
+        self,
+        call_profiles: Optional[Mapping[str, CallProfile]] = None,
+        task_calls: Optional[Mapping[str, Sequence[str]]] = None,
+        judge_reject_rate: float = 0.05,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        worker_hour_usd: float = DEFAULT_WORKER_HOUR_USD,
+        sample_seconds: float = DEFAULT_SAMPLE_SECONDS,
+        seed: int = 0,
+    ):
+        self.call_profiles = {**DEFAULT_CALL_PROFILES, **(call_profiles or {})}
+        self.task_calls = {**DEFAULT_TASK_CALLS, **(task_calls or {})}
+        self.judge_reject_rate = judge_reject_rate
+        self.max_attempts = max_attempts
+        self.worker_hour_usd = worker_hour_usd
+        self.sample_seconds = sample_seconds
+        self.seed = seed
+
+    def run(
+        self,
+        dags: Mapping[str, TaskDAG],
+        workers: int,
+        arrival_window_seconds: float = 0.0,
+    ) -> SimulationReport:
+        """
+        Simulates every agent's DAG submitted within the arrival window
+
+        Agents are submitted evenly over ``arrival_window_seconds`` (0 means
+        a simultaneous campaign launch).
+        """
+        if workers < 1:
+            raise ValueError("Simulation needs at least one worker")
+        rng = np.random.default_rng(self.seed)
+
+        # Flatten all DAGs into integer-indexed tasks.
+        task_types: List[str] = []
+        lanes: List[int] = []
+        owner: List[int] = []
+        children: List[List[int]] = []
+        indegree: List[int] = []
+        roots: List[List[int]] = []
+        for agent_index, dag in enumerate(dags.values()):
+            base = len(task_types)
+            local = {step.step_id: base + i for i, step in enumerate(dag.steps)}
+            agent_roots = []
+            for step in dag.steps:
+                task_types.append(step.task_type)
+                lanes.append(_LANE_RANK[step.priority])
+                owner.append(agent_index)
+                children.append([])
+                indegree.append(len(step.depends_on))
+                if not step.depends_on:
+                    agent_roots.append(local[step.step_id])
+            for step in dag.steps:
+                for dep in step.depends_on:
+                    children[local[dep]].append(local[step.step_id])
+            roots.append(agent_roots)
+        task_count = len(task_types)
+        agent_count = len(roots)
+        remaining = [0] * agent_count
+        for agent_index in owner:
+            remaining[agent_index] += 1
+
+        # Pre-draw every latency: one row per possible attempt.
+        attempts = self.max_attempts
+        service = np.zeros((attempts, task_count))
+        call_costs: Dict[str, float] = {}
+        call_masks: Dict[str, np.ndarray] = {}
+        for call in sorted({c for t in set(task_types) for c in self._calls(t)}):
+            mask = np.array([call in self._calls(t) for t in task_types])
+            profile = self.call_profiles[call]
+            draws = profile.sample(rng, attempts * task_count)
+            service += np.where(mask, draws.reshape(attempts, task_count), 0.0)
+            call_costs[call] = profile.cost_usd
+            call_masks[call] = mask
+        judged = np.array([t in JUDGED_TASK_TYPES for t in task_types])
+        draws = rng.random((attempts, task_count))
+        rejected = judged & (draws < self.judge_reject_rate)
+        rejected[-1] = False
+        enqueue = self.call_profiles["planner_enqueue"].sample(rng, agent_count)
+
+        # Event loop. Events are (time, seq, kind, task); kinds: 0 ready, 1 done.
+        events: List[Tuple[float, int, int, int]] = []
+        seq = 0
+        spacing = arrival_window_seconds / agent_count if agent_count else 0.0
+        submitted = [0.0] * agent_count
+        for agent_index, agent_roots in enumerate(roots):
+            submitted[agent_index] = agent_index * spacing
+            ready_at = submitted[agent_index] + float(enqueue[agent_index])
+            for task in agent_roots:
+                events.append((ready_at, seq, 0, task))
+                seq += 1
+        heapq.heapify(events)
+
+        queue: List[Tuple[int, float, int, int]] = []  # (lane, ready time, seq, task)
+        idle = workers
+        attempt = [0] * task_count
+        finished_at = [0.0] * agent_count
+        waits: List[float] = []
+        busy_seconds = 0.0
+        rejections = 0
+        depth_samples: List[Tuple[float, int]] = []
+        next_sample = 0.0
+        now = 0.0
+
+        while events:
+            now, _, kind, task = heapq.heappop(events)
+            while next_sample <= now:
+                depth_samples.append((next_sample, len(queue)))
+                next_sample += self.sample_seconds
+            if kind == 0:
+                heapq.heappush(queue, (lanes[task], now, seq, task))
+                seq += 1
+            else:
+                idle += 1
+                k = attempt[task] - 1
+                if rejected[k, task]:
+                    rejections += 1
+                    heapq.heappush(queue, (lanes[task], now, seq, task))
+                    seq += 1
+                else:
+                    agent_index = owner[task]
+                    remaining[agent_index] -= 1
+                    if remaining[agent_index] == 0:
+                        finished_at[agent_index] = now
+                    for child in children[task]:
+                        indegree[child] -= 1
+                        if indegree[child] == 0:
+                            heapq.heappush(events, (now, seq, 0, child))
+                            seq += 1
+            while idle and queue:
+                _, ready_at, _, next_task = heapq.heappop(queue)
+                waits.append(now - ready_at)
+                duration = float(service[attempt[next_task], next_task])
+                attempt[next_task] += 1
+                busy_seconds += duration
+                idle -= 1
+                heapq.heappush(events, (now + duration, seq, 1, next_task))
+                seq += 1
+        depth_samples.append((now, len(queue)))
+
+        makespan = now
+        cost_by_call = {}
+        executions = np.array(attempt)
+        for call, mask in call_masks.items():
+            cost = call_costs[call] * float(executions[mask].sum())
+            if cost:
+                cost_by_call[call] = cost
+        worker_hours = workers * makespan / 3600
+        cost_by_call["worker_compute"] = worker_hours * self.worker_hour_usd
+        completion = [finished_at[i] - submitted[i] for i in range(agent_count)]
+        return SimulationReport(
+            workers=workers,
+            agents=agent_count,
+            tasks=task_count,
+            makespan_seconds=makespan,
+            completion_p50_seconds=_percentile(completion, 50),
+            completion_p95_seconds=_percentile(completion, 95),
+            queue_wait_p95_seconds=_percentile(waits, 95),
+            utilization=busy_seconds / (workers * makespan) if makespan else 0.0,
+            cost_usd=sum(cost_by_call.values()),
+            cost_by_call=cost_by_call,
+            rejections=rejections,
+            queue_depth=depth_samples,
+        )
+
+    def sweep(
+        self, dags: Mapping[str, TaskDAG], worker_counts: Sequence[int], **kwargs: Any
+    ) -> List[SimulationReport]:
+        return [self.run(dags, workers, **kwargs) for workers in worker_counts]
+
+    def min_workers(
+        self,
+        dags: Mapping[str, TaskDAG],
+        p95_target_seconds: float,
+        max_workers: int = 200,
+        **kwargs: Any,
+    ) -> Optional[SimulationReport]:
+        """
+        Smallest pool whose p95 completion meets the target, by bisection
+
+        Returns None if even ``max_workers`` misses the target.
+        """
+        best = self.run(dags, max_workers, **kwargs)
+        if best.completion_p95_seconds > p95_target_seconds:
+            return None
+        low, high = 1, max_workers
+        while low < high:
+            middle = (low + high) // 2
+            report = self.run(dags, middle, **kwargs)
+            if report.completion_p95_seconds <= p95_target_seconds:
+                high, best = middle, report
+            else:
+                low = middle + 1
+        return best
+
+    def _calls(self, task_type: str) -> Tuple[str, ...]:
+        if task_type not in self.task_calls:
+            raise ValueError(f"No call profile for task_type: {task_type}")
+        calls = tuple(self.task_calls[task_type])
+        if task_type in JUDGED_TASK_TYPES:
+            calls += ("judge_validate",)
+        return calls
@@ -0,0 +1,237 @@
+"""Trend Fetcher - Trend discovery with shared subscriptions
+
+Spec: specs/technical.md - Section 7.1, Section 12.2 (Caching Strategy)
+Spec: specs/functional.md - Story 2.1
+Spec: skills/README.md - TrendDiscoveryInput / TrendDiscoveryOutput
+
+Agents subscribe to a (region, niche, time_window) key instead of polling
+``get_trending_topics`` themselves. Each refresh makes one upstream call per
+distinct key and pushes the result to every subscriber, so MCP call volume
+grows with distinct niches rather than with agents. Direct fetch_trends
+calls share the same TTL cache and collapse concurrent identical requests
+into one in-flight call.
+"""
+
+import asyncio
+import hashlib
+import time
+from dataclasses import asdict
+from datetime import datetime
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+import structlog
+from pydantic import Field
+from pydantic.dataclasses import dataclass
+
+logger = structlog.get_logger(__name__)
+
+TREND_TOOL = "get_trending_topics"
+DEFAULT_CACHE_TTL_SECONDS = 300
+DEFAULT_REFRESH_INTERVAL_SECONDS = 4 * 3600
+
+TrendCallback = Callable[[List["Trend"]], Awaitable[Any]]
+
+
+class TrendSource(str, Enum):
+    TWITTER = "twitter"
+    GOOGLE_TRENDS = "google_trends"
+    NEWS = "news"
+    REDDIT = "reddit"
+
+
+@dataclass
+class Trend:
+    trend_id: str = Field()
+    topic: str = Field()
+    relevance_score: float = Field(ge=0.0, le=1.0)
+    volume: int = Field(ge=0)
+    source: str = Field()
+    discovered_at: datetime = Field(default_factory=datetime.utcnow)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["discovered_at"] = self.discovered_at.isoformat()
+        return data
+
+
+@dataclass(frozen=True)
+class TrendKey:
+    region: str
+    niche: str
+    time_window_hours: int
+
+
+class TrendFetcher:
+    """
+    Fetches trends via MCP and fans them out to subscribed planners
+    """
+
+    def __init__(
+        self,
+        mcp_client: Any,
+        cache_ttl_seconds: float = DEFAULT_CACHE_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.mcp_client = mcp_client
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self.clock = clock
+        self.upstream_calls = 0
+        self._cache: Dict[TrendKey, Tuple[float, List[Trend]]] = {}
+        self._inflight: Dict[TrendKey, "asyncio.Future[List[Trend]]"] = {}
+        self._subscribers: Dict[TrendKey, Dict[str, TrendCallback]] = {}
+        self._subscriptions: Dict[str, TrendKey] = {}
+        self._running = False
+
+    async def fetch_trends(
+        self,
+        niche: str,
+        region: str = "global",
+        time_window_hours: int = 24,
+        min_relevance_score: float = 0.75,
+    ) -> List[Trend]:
+        """
+        Returns trends for the niche/region scoring at least min_relevance_score
+        """
+        trends = await self._get(TrendKey(region, niche, time_window_hours))
+        return [
+            trend for trend in trends if trend.relevance_score >= min_relevance_score
+        ]
+
+    def subscribe(
+        self,
+        subscriber_id: str,
+        callback: TrendCallback,
+        niche: str,
+        region: str = "global",
+        time_window_hours: int = 24,
+    ) -> TrendKey:
+        """
+        Registers a subscriber; re-subscribing moves it to the new key
+        """
+        self.unsubscribe(subscriber_id)
+        key = TrendKey(region, niche, time_window_hours)
+        self._subscribers.setdefault(key, {})[subscriber_id] = callback
+        self._subscriptions[subscriber_id] = key
+        return key
+
+    def unsubscribe(self, subscriber_id: str) -> None:
+        key = self._subscriptions.pop(subscriber_id, None)
+        if key is None:
+            return
+        subscribers = self._subscribers.get(key, {})
+        subscribers.pop(subscriber_id, None)
+        if not subscribers:
+            self._subscribers.pop(key, None)
+
+    @property
+    def subscription_keys(self) -> List[TrendKey]:
+        return list(self._subscribers)
+
+    async def refresh(self) -> int:
+        """
+        Fetches every subscribed key once and pushes results to subscribers
+
+        Returns the number of subscriber callbacks delivered.
+        """
+        keys = list(self._subscribers)
+        results = await asyncio.gather(
+            *(self._get(key, force=True) for key in keys), return_exceptions=True
+        )
+
+        deliveries = []
+        for key, trends in zip(keys, results):
+            if isinstance(trends, BaseException):
+                logger.warning("trend_refresh_failed", key=key, error=str(trends))
+                continue
+            for subscriber_id, callback in list(self._subscribers.get(key, {}).items()):
+                deliveries.append(self._deliver(subscriber_id, callback, trends))
+
+        await asyncio.gather(*deliveries)
+        return len(deliveries)
+
+    async def run(
+        self, interval_seconds: float = DEFAULT_REFRESH_INTERVAL_SECONDS
+    ) -> None:
+        """
+        Refreshes all subscriptions every interval until stop() is called
+        """
+        self._running = True
+        while self._running:
+            await self.refresh()
+            await asyncio.sleep(interval_seconds)
+
+    def stop(self) -> None:
+        self._running = False
+
+    async def _deliver(
+        self, subscriber_id: str, callback: TrendCallback, trends: List[Trend]
+    ) -> None:
+        try:
+            await callback(list(trends))
+        except Exception as e:
+            logger.warning(
+                "trend_delivery_failed", subscriber_id=subscriber_id, error=str(e)
+            )
+
+    async def _get(self, key: TrendKey, force: bool = False) -> List[Trend]:
+        cached = self._cache.get(key)
+        if not force and cached is not None and cached[0] > self.clock():
+            return cached[1]
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await inflight
+
+        future: "asyncio.Future[List[Trend]]" = (
+            asyncio.get_running_loop().create_future()
+        )
+        self._inflight[key] = future
+        try:
+            trends = await self._fetch_upstream(key)
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so a failure nobody else awaited is not logged.
+            future.exception()
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        else:
+            self._cache[key] = (self.clock() + self.cache_ttl_seconds, trends)
+            future.set_result(trends)
+            return trends
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _fetch_upstream(self, key: TrendKey) -> List[Trend]:
+        self.upstream_calls += 1
+        response = await self.mcp_client.call_tool(
+            TREND_TOOL,
+            {
+                "niche": key.niche,
+                "region": key.region,
+                "time_window_hours": key.time_window_hours,
+            },
+        )
+        items = response.get("trends", []) if isinstance(response, dict) else response
+        return [self._parse_trend(key, item) for item in items or []]
+
+    @staticmethod
+    def _parse_trend(key: TrendKey, item: Dict[str, Any]) -> Trend:
+        topic = str(item["topic"])
+        trend_id = (
+            item.get("trend_id")
+            or hashlib.sha1(
+                f"{key.region}:{key.niche}:{topic.lower()}".encode()
+            ).hexdigest()[:16]
+        )
+        return Trend(
+            trend_id=trend_id,
+            topic=topic,
+            relevance_score=float(
+                item.get("relevance_score", item.get("relevance", 0.0))
+            ),
+            volume=int(item.get("volume", 0)),
+            source=str(item.get("source", TrendSource.TWITTER.value)),
+        )
@@ -2,11 +2,22 @@
 
 Spec: specs/functional.md - Epic 2
 Spec: specs/technical.md - Section 1.2
-
-Status: Day 1 - Specification complete, implementation pending
 """
 
-# Day 2: Implement Worker class
-# class Worker:
-#     async def execute_task(self, task: dict) -> dict:
-#         pass
+from src.worker.concurrency import AdaptiveLimit
+from src.worker.precheck import PrecheckPolicy
+from src.worker.retry import RetryPolicy
+from src.worker.steps import Step, StepGraph, StepStats
+from src.worker.task_executor import ContentOutput, TaskResult, TaskWorker
+
+__all__ = [
+    "AdaptiveLimit",
+    "ContentOutput",
+    "PrecheckPolicy",
+    "RetryPolicy",
+    "Step",
+    "StepGraph",
+    "StepStats",
+    "TaskResult",
+    "TaskWorker",
+]
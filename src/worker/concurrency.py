@@ -0,0 +1,113 @@
+"""Worker Concurrency - Adaptive per-task_type in-flight limits
+
+Spec: specs/technical.md - Section 7.2, Section 12.3
+Spec: specs/functional.md - FR-PERF-1, FR-SCALE-1
+
+A TaskWorker spends nearly all of a task's wall time awaiting MCP tools and
+the LLM, so one process runs many tasks concurrently on its event loop. The
+process-wide ``max_in_flight`` bounds how many tasks it has claimed; when
+every slot is taken it stops claiming (backpressure stays in Redis, where
+other pods can take the work). Within that, each task_type has its own
+limit that adapts AIMD-style: a success whose latency stays within
+``latency_tolerance`` of the best latency seen grows the limit by about one
+per limit's worth of completions, while an error or a latency blow-up cuts
+it multiplicatively. A downstream dependency that slows down or starts
+failing therefore gets fewer concurrent calls without starving task types
+that are healthy. A claimed task whose task_type is at its limit is handed
+back to its lane rather than waiting in-process for a slot, so that
+backpressure stays in Redis too.
+"""
+
+import asyncio
+from typing import Dict, Optional
+
+DEFAULT_MAX_IN_FLIGHT = 32
+DEFAULT_INITIAL_LIMIT = 4
+DEFAULT_MIN_LIMIT = 1
+DEFAULT_MAX_LIMIT = 32
+DEFAULT_LATENCY_TOLERANCE = 2.0
+DEFAULT_BACKOFF = 0.7
+# Lets the latency baseline recover if a dependency gets permanently slower.
+_BASELINE_DRIFT = 0.01
+
+
+class AdaptiveLimit:
+    """
+    AIMD concurrency limit for one task_type
+    """
+
+    def __init__(
+        self,
+        initial: int = DEFAULT_INITIAL_LIMIT,
+        minimum: int = DEFAULT_MIN_LIMIT,
+        maximum: int = DEFAULT_MAX_LIMIT,
+        latency_tolerance: float = DEFAULT_LATENCY_TOLERANCE,
+        backoff: float = DEFAULT_BACKOFF,
+    ):
+        if not minimum <= initial <= maximum:
+            raise ValueError("Concurrency limit needs minimum <= initial <= maximum")
+        self.minimum = minimum
+        self.maximum = maximum
+        self.latency_tolerance = latency_tolerance
+        self.backoff = backoff
+        self._limit = float(initial)
+        self._baseline: Optional[float] = None
+        self.in_flight = 0
+        self.successes = 0
+        self.errors = 0
+        self._changed = asyncio.Condition()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    async def acquire(self) -> None:
+        """
+        Waits until this task_type has a free slot and takes it
+        """
+        async with self._changed:
+            await self._changed.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+
+    def try_acquire(self) -> bool:
+        """
+        Takes a free slot without waiting; False if the task_type is saturated
+        """
+        if self.in_flight >= self.limit:
+            return False
+        self.in_flight += 1
+        return True
+
+    async def release(self, latency_seconds: float, ok: bool) -> None:
+        """
+        Frees a slot and adapts the limit from the task's outcome
+        """
+        async with self._changed:
+            self.in_flight -= 1
+            self.observe(latency_seconds, ok)
+            self._changed.notify_all()
+
+    def observe(self, latency_seconds: float, ok: bool) -> int:
+        if not ok:
+            self.errors += 1
+            self._limit = max(self.minimum, self._limit * self.backoff)
+            return self.limit
+        self.successes += 1
+        if self._baseline is None or latency_seconds < self._baseline:
+            self._baseline = latency_seconds
+        else:
+            self._baseline *= 1 + _BASELINE_DRIFT
+        if latency_seconds > self._baseline * self.latency_tolerance:
+            self._limit = max(self.minimum, self._limit * self.backoff)
+        else:
+            self._limit = min(self.maximum, self._limit + 1 / self._limit)
+        return self.limit
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "baseline_seconds": self._baseline or 0.0,
+            "successes": self.successes,
+            "errors": self.errors,
+        }
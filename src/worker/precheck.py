@@ -0,0 +1,171 @@
+"""Caption Pre-check - Cheap incremental safety and length gate
+
+Spec: specs/functional.md - Story 2.2, CR-4 (Content Safety)
+Spec: specs/technical.md - Section 7.2, Section 7.3
+
+The Judge validates finished content, so a caption that was doomed from
+its first sentence still pays for the rest of its tokens, an image render
+and a Judge call. The worker streams the caption instead and feeds every
+chunk to a CaptionScanner, which aborts generation as soon as it sees a hard
+violation:
+
+    blocked_term   a prohibited term (CR-4 categories; word-bounded,
+                   case-insensitive, matched across chunk boundaries)
+    too_long       more than ``max_chars`` characters (Twitter's 280)
+    too_short      fewer than ``min_chars`` once the stream ends
+
+The image step runs only after the caption passes. The pre-check is a cheap
+first pass, not a classifier; the Judge stays the authority on safety.
+
+PrecheckStats counts the outcomes, the time from the start of the caption
+to its rejection, and the tokens generated for captions that were then
+thrown away.
+"""
+
+import re
+from collections import Counter
+from typing import Dict, Iterable, Optional
+
+DEFAULT_MAX_CAPTION_CHARS = 280
+DEFAULT_MIN_CAPTION_CHARS = 50
+DEFAULT_BLOCKED_TERMS = (
+    "kill yourself",
+    "kys",
+    "nazi",
+    "white power",
+    "terrorist attack",
+    "porn",
+    "nsfw",
+    "miracle cure",
+    "vaccines cause",
+    "election was stolen",
+)
+
+
+class PrecheckRejected(Exception):
+    """The caption failed the pre-check; ``reason`` names the violation"""
+
+    def __init__(self, reason: str, tokens: int = 0):
+        super().__init__(f"Caption pre-check failed: {reason}")
+        self.reason = reason
+        self.tokens = tokens
+
+
+class PrecheckPolicy:
+    """
+    Limits a caption must meet before an image is generated for it
+    """
+
+    def __init__(
+        self,
+        max_chars: int = DEFAULT_MAX_CAPTION_CHARS,
+        min_chars: int = DEFAULT_MIN_CAPTION_CHARS,
+        blocked_terms: Iterable[str] = DEFAULT_BLOCKED_TERMS,
+    ):
+        terms = sorted({t.strip().lower() for t in blocked_terms if t.strip()})
+        self.max_chars = max_chars
+        self.min_chars = min_chars
+        self.longest_term = max((len(t) for t in terms), default=0)
+        self.pattern = (
+            re.compile(r"\b(?:" + "|".join(map(re.escape, terms)) + r")\b")
+            if terms
+            else None
+        )
+
+    def scanner(self) -> "CaptionScanner":
+        return CaptionScanner(self)
+
+
+class CaptionScanner:
+    """
+    Checks one caption as it streams in
+    """
+
+    def __init__(self, policy: PrecheckPolicy):
+        self.policy = policy
+        self.text = ""
+        self.tokens = 0
+        # Where the next blocked-term search starts.
+        self._scanned = 0
+
+    def feed(self, chunk: str) -> Optional[str]:
+        """
+        Adds a chunk; returns the violation if the caption is already doomed
+        """
+        self.text += chunk
+        self.tokens += 1
+        if len(self.text) > self.policy.max_chars:
+            return "too_long"
+        return self._blocked(final=False)
+
+    def finish(self) -> Optional[str]:
+        """
+        Checks what can only be judged on the whole caption
+        """
+        violation = self._blocked(final=True)
+        if violation is not None:
+            return violation
+        if len(self.text.strip()) < self.policy.min_chars:
+            return "too_short"
+        return None
+
+    def check(self, text: str) -> Optional[str]:
+        """
+        Checks a caption that was generated in one piece
+        """
+        violation = self.feed(text) or self.finish()
+        # No token boundaries to count; words are a close enough proxy.
+        self.tokens = len(text.split())
+        return violation
+
+    def _blocked(self, final: bool) -> Optional[str]:
+        if self.policy.pattern is None:
+            return None
+        lowered = self.text.lower()
+        for match in self.policy.pattern.finditer(lowered, self._scanned):
+            # A match touching the end may be a prefix of a longer word.
+            if final or match.end() < len(lowered):
+                return "blocked_term"
+        # Terms can only start within the last ``longest_term`` characters.
+        self._scanned = max(len(lowered) - self.policy.longest_term, 0)
+        return None
+
+
+class PrecheckStats:
+    """
+    Pre-check outcomes, time-to-reject and wasted tokens
+    """
+
+    def __init__(self) -> None:
+        self.passed = 0
+        self.rejected: Counter = Counter()
+        self.aborted_streams = 0
+        self.wasted_tokens = 0
+        self.time_to_reject_ms_total = 0.0
+        self.time_to_reject_ms_max = 0.0
+
+    def record_pass(self) -> None:
+        self.passed += 1
+
+    def record_reject(
+        self, reason: str, tokens: int, elapsed_ms: float, aborted: bool
+    ) -> None:
+        self.rejected[reason] += 1
+        self.wasted_tokens += tokens
+        self.aborted_streams += int(aborted)
+        self.time_to_reject_ms_total += elapsed_ms
+        self.time_to_reject_ms_max = max(self.time_to_reject_ms_max, elapsed_ms)
+
+    def snapshot(self) -> Dict[str, object]:
+        rejected = sum(self.rejected.values())
+        return {
+            "passed": self.passed,
+            "rejected": rejected,
+            "rejected_by_reason": dict(self.rejected),
+            "aborted_streams": self.aborted_streams,
+            "wasted_tokens": self.wasted_tokens,
+            "mean_time_to_reject_ms": (
+                self.time_to_reject_ms_total / rejected if rejected else 0.0
+            ),
+            "max_time_to_reject_ms": self.time_to_reject_ms_max,
+        }
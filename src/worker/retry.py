@@ -0,0 +1,68 @@
+"""Retry Policy - Backoff delays for retryable task failures
+
+Spec: specs/functional.md - Story 10.1
+Spec: specs/technical.md - Section 7.2
+
+Story 10.1 has two retry strategies. Transient errors back off
+exponentially (1s, 2s, 4s, 8s) for at most 3 retries. ``api_rate_limit``
+waits 15 minutes, or whatever the API asked for.
+
+The worker never sleeps out these delays. A retried task goes back to the
+TaskQueue's delay set with its due time, the worker's slot is freed at once,
+and the claim path promotes the task back into its lane when it is due.
+
+Delays get +/- ``jitter`` so tasks that failed together, e.g. on a
+fleet-wide rate limit, do not all come back in the same instant.
+"""
+
+import random
+from typing import Callable, Optional, Sequence
+
+DEFAULT_BACKOFF_SECONDS = (1.0, 2.0, 4.0, 8.0)
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_RATE_LIMIT_SECONDS = 15 * 60.0
+DEFAULT_RETRY_JITTER = 0.1
+
+
+class RetryPolicy:
+    """
+    Maps a retryable failure and the task's attempt count to a delay
+    """
+
+    def __init__(
+        self,
+        backoff_seconds: Sequence[float] = DEFAULT_BACKOFF_SECONDS,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        rate_limit_seconds: float = DEFAULT_RATE_LIMIT_SECONDS,
+        jitter: float = DEFAULT_RETRY_JITTER,
+        rng: Callable[[], float] = random.random,
+    ):
+        if not backoff_seconds:
+            raise ValueError("RetryPolicy needs at least one backoff delay")
+        self.backoff_seconds = tuple(backoff_seconds)
+        self.max_retries = max_retries
+        self.rate_limit_seconds = rate_limit_seconds
+        self.jitter = jitter
+        self.rng = rng
+
+    def delay(
+        self,
+        attempt: int,
+        rate_limited: bool = False,
+        retry_after: Optional[float] = None,
+    ) -> Optional[float]:
+        """
+        Seconds to wait before retry number ``attempt + 1``
+
+        ``attempt`` counts the retries already made. Returns None once
+        ``max_retries`` is spent; the task has then failed for good.
+        """
+        if attempt >= self.max_retries:
+            return None
+        if retry_after is not None:
+            base = retry_after
+        elif rate_limited:
+            base = self.rate_limit_seconds
+        else:
+            base = self.backoff_seconds[min(attempt, len(self.backoff_seconds) - 1)]
+        return base * (1 + self.jitter * (2 * self.rng() - 1))
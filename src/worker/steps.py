@@ -0,0 +1,161 @@
+"""Task Steps - Small dependency graphs run with maximal overlap
+
+Spec: specs/technical.md - Section 7.2
+Spec: specs/functional.md - FR-PERF-1
+
+A task handler is a handful of I/O-bound steps (memory search, persona
+lookup, caption, image) with only a few real dependencies between them.
+StepGraph starts every step as soon as the steps it depends on have
+finished, so independent calls overlap instead of running back to back.
+Each run records per-step start/end offsets and the critical path (the
+chain of steps that determined the task's wall time); StepStats aggregates
+those per task_type.
+
+If a step raises, the steps still running are cancelled and the first
+exception propagates, so the worker's retryable/fatal classification is
+unchanged.
+"""
+
+import asyncio
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_STEP_EWMA_ALPHA = 0.2
+
+StepFn = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+
+@dataclass(frozen=True)
+class Step:
+    """One step; ``run`` receives the results of the steps finished so far"""
+
+    name: str
+    run: StepFn
+    after: Tuple[str, ...] = ()
+
+
+@dataclass
+class StepTiming:
+    start_ms: float
+    end_ms: float
+
+    @property
+    def duration_ms(self) -> float:
+        return self.end_ms - self.start_ms
+
+
+@dataclass
+class StepRun:
+    results: Dict[str, Any]
+    timings: Dict[str, StepTiming]
+    elapsed_ms: float
+    critical_path: List[str] = field(default_factory=list)
+
+    def durations(self) -> Dict[str, float]:
+        return {name: t.duration_ms for name, t in self.timings.items()}
+
+
+class StepGraph:
+    """
+    Runs async steps as soon as their dependencies are done
+    """
+
+    def __init__(self, steps: Sequence[Step]):
+        self.steps = {step.name: step for step in steps}
+        if len(self.steps) != len(steps):
+            raise ValueError("Duplicate step names in step graph")
+        for step in steps:
+            unknown = [dep for dep in step.after if dep not in self.steps]
+            if unknown:
+                raise ValueError(f"Step {step.name} depends on unknown steps {unknown}")
+
+    async def run(self, seeded: Optional[Dict[str, Any]] = None) -> StepRun:
+        """
+        Executes the graph; steps named in ``seeded`` count as already done
+        """
+        results: Dict[str, Any] = dict(seeded or {})
+        timings: Dict[str, StepTiming] = {}
+        waiting = {
+            name: step for name, step in self.steps.items() if name not in results
+        }
+        running: Dict[asyncio.Task, str] = {}
+        started = time.perf_counter()
+
+        def now_ms() -> float:
+            return (time.perf_counter() - started) * 1000
+
+        try:
+            while waiting or running:
+                for name, step in list(waiting.items()):
+                    if all(dep in results for dep in step.after):
+                        del waiting[name]
+                        timings[name] = StepTiming(now_ms(), 0.0)
+                        running[asyncio.ensure_future(step.run(results))] = name
+                if not running:
+                    raise ValueError(f"Step graph cycle among {sorted(waiting)}")
+                done, _ = await asyncio.wait(
+                    running, return_when=asyncio.FIRST_COMPLETED
+                )
+                for finished in done:
+                    name = running.pop(finished)
+                    timings[name].end_ms = now_ms()
+                    results[name] = finished.result()
+        finally:
+            for pending in running:
+                pending.cancel()
+
+        return StepRun(
+            results=results,
+            timings=timings,
+            elapsed_ms=now_ms(),
+            critical_path=self._critical_path(timings),
+        )
+
+    def _critical_path(self, timings: Dict[str, StepTiming]) -> List[str]:
+        # Walk back from the last step to finish through, at each step, the
+        # dependency that finished last (the one it actually waited for).
+        if not timings:
+            return []
+        current: Optional[str] = max(timings, key=lambda name: timings[name].end_ms)
+        path = []
+        while current is not None:
+            path.append(current)
+            deps = [dep for dep in self.steps[current].after if dep in timings]
+            current = max(deps, key=lambda d: timings[d].end_ms) if deps else None
+        return path[::-1]
+
+
+class StepStats:
+    """
+    Per task_type step durations (EWMA) and critical-path frequencies
+    """
+
+    def __init__(self, alpha: float = DEFAULT_STEP_EWMA_ALPHA):
+        self.alpha = alpha
+        self._durations: Dict[str, Dict[str, float]] = {}
+        self._paths: Dict[str, Counter] = {}
+
+    def record(self, task_type: str, run: StepRun) -> None:
+        durations = self._durations.setdefault(task_type, {})
+        for name, duration in run.durations().items():
+            previous = durations.get(name)
+            durations[name] = (
+                duration
+                if previous is None
+                else previous + self.alpha * (duration - previous)
+            )
+        self._paths.setdefault(task_type, Counter())[tuple(run.critical_path)] += 1
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Mean step durations (ms) and the most common critical path per type
+        """
+        return {
+            task_type: {
+                "step_ms": dict(durations),
+                "critical_path": list(self._paths[task_type].most_common(1)[0][0]),
+            }
+            for task_type, durations in self._durations.items()
+        }
@@ -0,0 +1,905 @@
+"""Task Executor - Stateless worker that claims and executes queued tasks
+
+Spec: specs/technical.md - Section 5 (Task Schema), Section 7.2
+Spec: specs/functional.md - Epic 2, Story 2.2
+
+Workers claim from the multi-lane TaskQueue, so HIGH work is dispatched
+first and no single agent can monopolise a lane. run() keeps up to
+``max_in_flight`` tasks executing concurrently on one event loop, each
+within an adaptive per-task_type limit (see src/worker/concurrency.py), and
+stops claiming while every slot is busy. Each claimed task is
+executed (memory lookup, generation, judge validation) and, once approved,
+marked complete in the DAG scheduler so its dependents are released; a task
+that fails or is rejected fails its parked dependents instead (dead-lettered
+as UpstreamFailed when a DeadLetterQueue is configured). Tasks that carry a
+deadline are counted as met or late for miss-rate metrics.
+
+With a Prefetcher configured, starting a task fires its planner-issued
+prefetch hints in the background, and content generation reads persona,
+memories and hashtag candidates from the warm cache before falling back to
+fetching them itself.
+
+Claims are leased and batched: run() takes up to ``claim_batch`` tasks (never
+more than its free slots) in one round-trip, heartbeats the leases of the
+tasks it is running and periodically reaps expired leases so a task held by
+a dead worker is re-queued. A settled task's lease is acked.
+
+Retryable failures are not waited out in the worker: the RetryPolicy's
+delay (exponential backoff, or 15 minutes on a rate limit) is returned on
+the "retry" TaskResult and the task moves from its lease into the queue's
+delay set with its ``attempt`` count bumped and the failure appended to its
+``attempts`` history, freeing the slot immediately. Once retries are spent
+the task fails; with a DeadLetterQueue configured, failed tasks are
+dead-lettered with that history and their last TaskResult.
+
+Captions are streamed from the LLM (when it offers ``stream``) through a
+cheap incremental safety and length pre-check (src/worker/precheck.py).
+Generation is aborted at the first hard violation, the image is only
+generated for a caption that passed, and the task is rejected without
+calling the Judge. Outcomes, time-to-reject and wasted tokens are kept in
+``precheck_stats``.
+
+With an ImageCache configured, generate_image is skipped whenever an
+identical render (same normalized image prompt, LoRA and parameters) is
+cached. The image prompt is built from the topic and visual style, not the
+caption, so a regenerated caption still reuses the render.
+
+Each task type's handler is a small step graph (src/worker/steps.py), so
+e.g. the persona lookup overlaps search_memory and the image prompt is
+drafted while the caption generates. Step timings and the critical path are
+returned on the TaskResult and aggregated per task_type in ``step_stats``.
+
+With a CircuitBreaker configured (src/common/circuit_breaker.py), a claimed
+task that needs an MCP tool whose circuit is open is parked rather than run:
+it moves from its lease to the tool's holding list and comes back when the
+tool recovers. A CircuitOpenError raised mid-task parks the task the same
+way instead of spending one of its retries.
+"""
+
+import asyncio
+import json
+import time
+from datetime import datetime, timezone
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+import structlog
+from pydantic import BaseModel, Field
+
+from src.common.circuit_breaker import CircuitBreaker, CircuitOpenError
+from src.common.dead_letter import DeadLetterQueue
+from src.common.image_cache import ImageCache
+from src.common.prefetch import PREFETCH_CONTEXT_KEY, PREFETCH_TASK_TYPES, Prefetcher
+from src.common.rate_limiter import RateLimitError
+from src.common.task_queue import DEFAULT_LEASE_SECONDS, as_utc
+from src.worker.concurrency import (
+    DEFAULT_INITIAL_LIMIT,
+    DEFAULT_MAX_IN_FLIGHT,
+    AdaptiveLimit,
+)
+from src.worker.precheck import PrecheckPolicy, PrecheckRejected, PrecheckStats
+from src.worker.retry import RetryPolicy
+from src.worker.steps import Step, StepGraph, StepRun, StepStats
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_IDLE_SLEEP_SECONDS = 0.05
+MAX_IDLE_SLEEP_SECONDS = 1.0
+DEFAULT_CLAIM_BATCH = 8
+
+
+class RetryableError(Exception):
+    """Transient failure; the task should be retried later"""
+
+
+class FatalError(Exception):
+    """Permanent failure; retrying the task cannot succeed"""
+
+
+RETRYABLE_ERRORS = (
+    RetryableError,
+    RateLimitError,
+    TimeoutError,
+    asyncio.TimeoutError,
+    ConnectionError,
+)
+FATAL_ERRORS = (FatalError, ValueError, KeyError, TypeError)
+
+# MCP tools each task_type's step graph calls; a task is parked while any of
+# them has an open circuit.
+TASK_TOOLS = {
+    "generate_content": ("search_memory", "generate_image"),
+    "reply_comment": ("search_memory",),
+    "execute_transaction": ("search_memory", "transfer_usdc"),
+    "research_trends": ("search_memory", "get_trending_topics"),
+    "publish_content": ("search_memory", "post_content"),
+}
+
+
+class ContentOutput(BaseModel):
+    caption: str
+    image_url: Optional[str] = None
+    confidence_score: float = Field(ge=0.0, le=1.0)
+
+
+TaskStatus = Literal["complete", "rejected", "retry", "failed", "parked"]
+
+
+class TaskResult(BaseModel):
+    status: TaskStatus
+    output: Optional[Any] = None
+    reason: Optional[str] = None
+    error: Optional[str] = None
+    execution_time_ms: float = 0.0
+    retry_after_seconds: Optional[float] = None
+    steps: Optional[Dict[str, float]] = None
+    critical_path: Optional[List[str]] = None
+
+
+def _field(obj: Any, name: str, default: Any = None) -> Any:
+    if isinstance(obj, dict):
+        return obj.get(name, default)
+    return getattr(obj, name, default)
+
+
+class TaskWorker:
+    """
+    Stateless worker: Executes tasks from Redis queue
+    """
+
+    def __init__(
+        self,
+        worker_id: str,
+        mcp_client: Any,
+        judge_client: Any,
+        llm_client: Any = None,
+        task_queue: Any = None,
+        scheduler: Any = None,
+        service_times: Any = None,
+        prefetcher: Optional[Prefetcher] = None,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        limits: Optional[Dict[str, AdaptiveLimit]] = None,
+        persona_loader: Optional[Callable[[str], Awaitable[Dict[str, Any]]]] = None,
+        claim_batch: int = DEFAULT_CLAIM_BATCH,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        retry_policy: Optional[RetryPolicy] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        dead_letters: Optional[DeadLetterQueue] = None,
+        image_cache: Optional[ImageCache] = None,
+        precheck: Optional[PrecheckPolicy] = None,
+    ):
+        self.worker_id = worker_id
+        self.mcp = mcp_client
+        self.judge = judge_client
+        self.llm = llm_client
+        self.task_queue = task_queue
+        self.scheduler = scheduler
+        self.service_times = service_times
+        self.prefetcher = prefetcher
+        self._prefetches: Set[asyncio.Task] = set()
+        self.max_in_flight = max_in_flight
+        self.limits: Dict[str, AdaptiveLimit] = dict(limits or {})
+        self.persona_loader = persona_loader or (
+            prefetcher.persona_loader if prefetcher is not None else None
+        )
+        self.step_stats = StepStats()
+        self.claim_batch = claim_batch
+        self.lease_seconds = lease_seconds
+        # task_id -> lease token for every claimed task not yet settled
+        self._leases: Dict[str, str] = {}
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.breaker = breaker
+        self.dead_letters = dead_letters
+        self.image_cache = image_cache
+        self.precheck = precheck or PrecheckPolicy()
+        self.precheck_stats = PrecheckStats()
+        self._running = False
+
+    async def execute_task(self, task: Any) -> TaskResult:
+        """
+        Main execution loop with error handling and retries
+        """
+        task = task if isinstance(task, dict) else task.to_dict()
+        context = task.get("context", {})
+        started = time.perf_counter()
+        try:
+            self._start_prefetches(task)
+
+            # Steps 1-2: Memories, persona and generation as one step graph
+            # (warm cache first), overlapping every independent call.
+            warm = self._warm_inputs(task)
+            seeded = {}
+            if warm is not None and "memories" in warm:
+                seeded["memories"] = warm["memories"]
+            result, run = await self._run_steps(task, warm, seeded)
+            steps = run.durations()
+            trace = {"steps": steps, "critical_path": run.critical_path}
+
+            # Step 3: Send to Judge for validation
+            if self.judge is None:
+                return self._result("complete", started, output=result, **trace)
+            judge_started = time.perf_counter()
+            judgment = await self.judge.validate(result, context)
+            steps["judge"] = (time.perf_counter() - judge_started) * 1000
+            trace["critical_path"] = run.critical_path + ["judge"]
+            if _field(judgment, "approved", False):
+                return self._result("complete", started, output=result, **trace)
+            return self._result(
+                "rejected",
+                started,
+                output=result,
+                reason=_field(judgment, "reason") or _field(judgment, "route"),
+                **trace,
+            )
+
+        except PrecheckRejected as e:
+            logger.info(
+                "caption_precheck_rejected",
+                task_id=task.get("task_id"),
+                reason=e.reason,
+                tokens=e.tokens,
+            )
+            return self._result("rejected", started, reason=f"precheck:{e.reason}")
+        except CircuitOpenError as e:
+            logger.warning("task_parked", task_id=task.get("task_id"), tool=e.tool)
+            return self._result("parked", started, reason=e.tool)
+        except RETRYABLE_ERRORS as e:
+            delay = self.retry_policy.delay(
+                int(task.get("attempt") or 0),
+                rate_limited=isinstance(e, RateLimitError),
+                retry_after=getattr(e, "retry_after", None),
+            )
+            if delay is None:
+                logger.error(
+                    "task_retries_exhausted", task_id=task.get("task_id"), error=repr(e)
+                )
+                return self._result("failed", started, error=repr(e))
+            logger.warning(
+                "task_retryable_error",
+                task_id=task.get("task_id"),
+                error=repr(e),
+                retry_after_seconds=delay,
+            )
+            return self._result(
+                "retry", started, error=repr(e), retry_after_seconds=delay
+            )
+        except FATAL_ERRORS as e:
+            logger.error("task_fatal_error", task_id=task.get("task_id"), error=repr(e))
+            return self._result("failed", started, error=repr(e))
+        except Exception as e:
+            # An unmapped error (an MCP transport or anyio failure, a bug in a
+            # step) is retried on the normal schedule, then dead-lettered, so
+            # the lease is always settled.
+            delay = self.retry_policy.delay(int(task.get("attempt") or 0))
+            logger.exception(
+                "task_unexpected_error",
+                task_id=task.get("task_id"),
+                error=repr(e),
+                retry_after_seconds=delay,
+            )
+            if delay is None:
+                return self._result("failed", started, error=repr(e))
+            return self._result(
+                "retry", started, error=repr(e), retry_after_seconds=delay
+            )
+
+    async def claim_task(self) -> Optional[Dict[str, Any]]:
+        """
+        Claims the next task from the priority lanes, or None if all are empty
+        """
+        tasks = await self.claim_tasks(1)
+        return tasks[0] if tasks else None
+
+    async def claim_tasks(self, count: int) -> List[Dict[str, Any]]:
+        """
+        Claims up to ``count`` tasks in one round-trip, leased to this worker
+        """
+        leases = self.task_queue.claim_batch(self.worker_id, count, self.lease_seconds)
+        tasks = []
+        for lease in leases:
+            task = json.loads(lease.payload)
+            self._leases[task.get("task_id")] = lease.token
+            logger.debug(
+                "task_claimed",
+                worker_id=self.worker_id,
+                task_id=task.get("task_id"),
+                lane=lease.lane,
+            )
+            tasks.append(task)
+        return tasks
+
+    async def run_once(self) -> Optional[TaskResult]:
+        """
+        Claims and executes a single task; returns None when the queue is empty
+        """
+        task = await self.claim_task()
+        if task is None:
+            return None
+        return await self.process_task(task)
+
+    async def process_task(self, task: Dict[str, Any]) -> TaskResult:
+        """
+        Executes a claimed task within its task_type's limit and records it
+
+        Retries and failures count as errors for the adaptive limit; a Judge
+        rejection does not, since the dependencies did their job. A task
+        needing a tool whose circuit is open is parked without running. The
+        lease is settled however the task ends, so it is never renewed for a
+        task nobody is running.
+        """
+        blocked = self._blocked_tool(task)
+        if blocked is not None:
+            parked = TaskResult(status="parked", reason=blocked)
+            self._settle_lease(task, parked)
+            logger.info(
+                "task_parked",
+                worker_id=self.worker_id,
+                task_id=task.get("task_id"),
+                tool=blocked,
+            )
+            return parked
+        limit = self.limit_for(task.get("task_type"))
+        await limit.acquire()
+        return await self._process_in_slot(task, limit)
+
+    async def _process_in_slot(
+        self, task: Dict[str, Any], limit: AdaptiveLimit
+    ) -> TaskResult:
+        result: Optional[TaskResult] = None
+        try:
+            result = await self.execute_task(task)
+        finally:
+            ok = result is not None and result.status in ("complete", "rejected")
+            latency = result.execution_time_ms / 1000 if result is not None else 0.0
+            await limit.release(latency, ok)
+            if result is None:
+                # Cancelled mid-run: stop renewing the lease so the reaper
+                # hands the task to another worker.
+                self._leases.pop(task.get("task_id") or "", None)
+        try:
+            settled = result.status not in ("retry", "parked")
+            if self.service_times is not None and settled:
+                self.service_times.observe(
+                    task.get("task_type"), result.execution_time_ms / 1000
+                )
+            if result.status == "complete" and self.scheduler is not None:
+                self.scheduler.complete(task["task_id"])
+            if result.status in ("failed", "rejected") and self.scheduler is not None:
+                self._fail_dependents(task)
+            if task.get("deadline") and settled:
+                due = as_utc(datetime.fromisoformat(task["deadline"]))
+                met = datetime.now(timezone.utc) <= due
+                self.task_queue.record_deadline(task.get("task_type"), met)
+        finally:
+            self._settle_lease(task, result)
+        logger.info(
+            "task_executed",
+            worker_id=self.worker_id,
+            task_id=task.get("task_id"),
+            status=result.status,
+            execution_time_ms=result.execution_time_ms,
+        )
+        return result
+
+    async def run(self) -> None:
+        """
+        Claims tasks until stop() is called, backing off while idle
+
+        Up to ``max_in_flight`` tasks run concurrently. With every slot busy
+        nothing is claimed until one finishes. A claimed task whose task_type
+        is at its limit is unclaimed straight back to its lane, where another
+        worker can take it, and claiming pauses until a task finishes.
+        In-flight tasks are drained before run() returns.
+        """
+        self._running = True
+        idle_sleep = DEFAULT_IDLE_SLEEP_SECONDS
+        in_flight: Set[asyncio.Task] = set()
+        maintenance = asyncio.create_task(self._maintain_leases())
+        try:
+            while self._running:
+                free = self.max_in_flight - len(in_flight)
+                if free <= 0:
+                    in_flight = await self._reap(in_flight)
+                    continue
+                tasks = await self.claim_tasks(min(self.claim_batch, free))
+                if not tasks:
+                    if in_flight:
+                        in_flight = await self._reap(in_flight, timeout=idle_sleep)
+                    else:
+                        await asyncio.sleep(idle_sleep)
+                    idle_sleep = min(idle_sleep * 2, MAX_IDLE_SLEEP_SECONDS)
+                    continue
+                saturated = False
+                for task in tasks:
+                    limit = self.limit_for(task.get("task_type"))
+                    if self._blocked_tool(task) is not None:
+                        # Parked without running, so it needs no slot.
+                        job = self.process_task(task)
+                    elif limit.try_acquire():
+                        job = self._process_in_slot(task, limit)
+                    else:
+                        self._unclaim(task)
+                        saturated = True
+                        continue
+                    in_flight.add(asyncio.create_task(job))
+                if not saturated:
+                    idle_sleep = DEFAULT_IDLE_SLEEP_SECONDS
+                    continue
+                # Back off as when idle, so a saturated task_type at the head
+                # of the lanes is not claimed and unclaimed in a tight loop.
+                if in_flight:
+                    in_flight = await self._reap(in_flight, timeout=idle_sleep)
+                else:
+                    await asyncio.sleep(idle_sleep)
+                idle_sleep = min(idle_sleep * 2, MAX_IDLE_SLEEP_SECONDS)
+        finally:
+            while in_flight:
+                in_flight = await self._reap(in_flight)
+            maintenance.cancel()
+
+    def stop(self) -> None:
+        self._running = False
+
+    def limit_for(self, task_type: Optional[str]) -> AdaptiveLimit:
+        key = task_type or "unknown"
+        if key not in self.limits:
+            self.limits[key] = AdaptiveLimit(
+                initial=min(DEFAULT_INITIAL_LIMIT, self.max_in_flight),
+                maximum=self.max_in_flight,
+            )
+        return self.limits[key]
+
+    def heartbeat(self) -> List[str]:
+        """
+        Extends the leases of every task this worker still holds
+
+        Returns the task_ids whose lease had already been reaped; another
+        worker may be running those, so their results are not acked.
+        """
+        by_token = {token: task_id for task_id, token in self._leases.items()}
+        lost = self.task_queue.extend_leases(
+            self.worker_id, list(by_token), self.lease_seconds
+        )
+        lost_ids = [by_token[token] for token in lost if token in by_token]
+        for task_id in lost_ids:
+            self._leases.pop(task_id, None)
+            logger.warning("task_lease_lost", worker_id=self.worker_id, task_id=task_id)
+        return lost_ids
+
+    def concurrency_snapshot(self) -> Dict[str, Dict[str, float]]:
+        """
+        Current limit, in-flight count and outcome counts per task_type
+        """
+        return {task_type: lim.snapshot() for task_type, lim in self.limits.items()}
+
+    async def _maintain_leases(self) -> None:
+        # Three heartbeats per lease, so one slow round-trip does not lose it.
+        interval = self.lease_seconds / 3
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                self.heartbeat()
+                reaped = self.task_queue.reap_expired()
+            except Exception as e:
+                logger.warning(
+                    "lease_maintenance_failed", worker_id=self.worker_id, error=repr(e)
+                )
+                continue
+            if reaped:
+                logger.info("leases_reaped", worker_id=self.worker_id, count=reaped)
+
+    def _settle_lease(self, task: Dict[str, Any], result: TaskResult) -> None:
+        token = self._leases.pop(task.get("task_id") or "", None)
+        if result.status == "retry":
+            self._schedule_retry(task, token, result)
+            return
+        if result.status == "failed" and self.dead_letters is not None:
+            self.dead_letters.add(task, result)
+        if result.status == "parked":
+            self._park(task, token, result.reason or "")
+            return
+        if token is None:
+            return
+        if not self.task_queue.ack(self.worker_id, token):
+            logger.warning(
+                "task_lease_expired_before_ack",
+                worker_id=self.worker_id,
+                task_id=task.get("task_id"),
+            )
+
+    def _unclaim(self, task: Dict[str, Any]) -> None:
+        token = self._leases.pop(task.get("task_id") or "", None)
+        if token is None:
+            return
+        self.task_queue.unclaim(self.worker_id, token)
+        logger.debug(
+            "task_unclaimed",
+            worker_id=self.worker_id,
+            task_id=task.get("task_id"),
+            task_type=task.get("task_type"),
+        )
+
+    def _fail_dependents(self, task: Dict[str, Any]) -> None:
+        # Children of a task that will never complete would wait forever.
+        task_id = task.get("task_id")
+        if not task_id:
+            return
+        for child_id, payload in self.scheduler.fail(task_id):
+            if self.dead_letters is None:
+                continue
+            try:
+                child = json.loads(payload)
+            except ValueError:
+                child = {"task_id": child_id}
+            self.dead_letters.add(
+                child,
+                TaskResult(status="failed", error=f"UpstreamFailed({task_id!r})"),
+            )
+
+    def _schedule_retry(
+        self, task: Dict[str, Any], token: Optional[str], result: TaskResult
+    ) -> None:
+        attempt = int(task.get("attempt") or 0)
+        delay = result.retry_after_seconds or 0.0
+        history = list(task.get("attempts") or []) + [
+            {
+                "attempt": attempt,
+                "error": result.error,
+                "retry_after_seconds": delay,
+                "at": datetime.utcnow().isoformat(),
+            }
+        ]
+        payload = json.dumps({**task, "attempt": attempt + 1, "attempts": history})
+        if token is not None:
+            if not self.task_queue.retry_later(self.worker_id, token, payload, delay):
+                logger.warning(
+                    "task_lease_expired_before_retry",
+                    worker_id=self.worker_id,
+                    task_id=task.get("task_id"),
+                )
+        elif self.task_queue is not None and task.get("agent_id"):
+            route = self.task_queue.route(
+                task["agent_id"], task.get("priority", "medium"), payload
+            )
+            self.task_queue.defer(route, delay)
+
+    def _blocked_tool(self, task: Dict[str, Any]) -> Optional[str]:
+        if self.breaker is None:
+            return None
+        for tool in TASK_TOOLS.get(task.get("task_type") or "", ()):
+            if self.breaker.is_open(tool):
+                return tool
+        return None
+
+    def _park(self, task: Dict[str, Any], token: Optional[str], tool: str) -> None:
+        if token is not None:
+            if not self.task_queue.park(self.worker_id, token, tool):
+                logger.warning(
+                    "task_lease_expired_before_park",
+                    worker_id=self.worker_id,
+                    task_id=task.get("task_id"),
+                )
+        elif self.task_queue is not None and task.get("agent_id"):
+            route = self.task_queue.route(
+                task["agent_id"], task.get("priority", "medium"), json.dumps(task)
+            )
+            self.task_queue.park_route(route, tool)
+
+    async def _reap(
+        self, in_flight: Set[asyncio.Task], timeout: Optional[float] = None
+    ) -> Set[asyncio.Task]:
+        done, pending = await asyncio.wait(
+            in_flight, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+        )
+        for finished in done:
+            if not finished.cancelled() and finished.exception() is not None:
+                logger.error(
+                    "task_processing_crashed",
+                    worker_id=self.worker_id,
+                    error=repr(finished.exception()),
+                )
+        return pending
+
+    def _start_prefetches(self, task: Dict[str, Any]) -> None:
+        hints = task.get("context", {}).get(PREFETCH_CONTEXT_KEY)
+        if self.prefetcher is None or not hints:
+            return
+        prefetch = asyncio.create_task(self.prefetcher.prefetch_all(hints))
+        self._prefetches.add(prefetch)
+        prefetch.add_done_callback(self._prefetches.discard)
+
+    def _warm_inputs(self, task: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if self.prefetcher is None or task.get("task_type") not in PREFETCH_TASK_TYPES:
+            return None
+        return self.prefetcher.cache.consume(task.get("task_id") or "")
+
+    async def _search_memory(self, task: Dict[str, Any]) -> List[Dict[str, Any]]:
+        context = task.get("context", {})
+        response = await self.mcp.call_tool(
+            "search_memory",
+            {
+                "agent_id": task.get("agent_id"),
+                "query": context.get("topic") or context.get("goal", ""),
+            },
+        )
+        if not isinstance(response, dict):
+            return []
+        return list(response.get("memories") or [])
+
+    async def _run_steps(
+        self,
+        task: Dict[str, Any],
+        warm: Optional[Dict[str, Any]] = None,
+        seeded: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[Any, StepRun]:
+        """
+        Runs the task_type's step graph; returns its output and step trace
+        """
+        task_type = task.get("task_type")
+        if task_type == "generate_content":
+            graph, output = self._content_steps(task, warm or {}), "content"
+        elif task_type == "reply_comment":
+            graph, output = self._reply_steps(task, warm or {}), "reply"
+        elif task_type == "execute_transaction":
+            graph, output = self._with_memories(task, "transfer", self._execute_payment)
+        elif task_type == "research_trends":
+            graph, output = self._with_memories(task, "trends", self._research_trends)
+        elif task_type == "publish_content":
+            graph, output = self._with_memories(task, "post", self._publish_content)
+        else:
+            raise FatalError(f"Unknown task_type: {task_type}")
+        run = await graph.run(seeded)
+        self.step_stats.record(task_type, run)
+        return run.results[output], run
+
+    def _content_steps(self, task: Dict[str, Any], warm: Dict[str, Any]) -> StepGraph:
+        """
+        memories, persona -> caption; persona -> image_prompt;
+        caption, image_prompt -> image -> content
+        """
+        context = task.get("context", {})
+        topic = context.get("topic") or context.get("goal", "")
+
+        async def caption(r: Dict[str, Any]) -> str:
+            prompt = self._build_content_prompt(
+                persona=r["persona"],
+                topic=topic,
+                memories=r["memories"],
+                hashtags=warm.get("hashtags", ()),
+            )
+            return await self._generate_caption(prompt, fallback=topic)
+
+        async def image_prompt(r: Dict[str, Any]) -> str:
+            # Drafted while the caption is still generating. Only visual
+            # inputs go in, so regenerations of a topic share a cached render.
+            style = r["persona"].get("visual_style", "default")
+            return f"{topic} in style of {style}"
+
+        async def image(r: Dict[str, Any]) -> Any:
+            arguments = {
+                "prompt": r["image_prompt"],
+                "character_lora": r["persona"].get("character_id"),
+            }
+            if self.image_cache is None:
+                return await self.mcp.call_tool("generate_image", arguments)
+            return await self.image_cache.get_or_render(
+                arguments,
+                lambda: self.mcp.call_tool("generate_image", arguments),
+                agent_id=task.get("agent_id"),
+            )
+
+        async def content(r: Dict[str, Any]) -> ContentOutput:
+            return ContentOutput(
+                caption=r["caption"],
+                image_url=self._image_url(r["image"]),
+                confidence_score=self._calculate_confidence(r["caption"], r["image"]),
+            )
+
+        return StepGraph(
+            [
+                Step("memories", lambda r: self._search_memory(task)),
+                Step("persona", lambda r: self._load_persona(task, warm)),
+                Step("caption", caption, after=("memories", "persona")),
+                Step("image_prompt", image_prompt, after=("persona",)),
+                Step("image", image, after=("caption", "image_prompt", "persona")),
+                Step("content", content, after=("caption", "image")),
+            ]
+        )
+
+    def _reply_steps(self, task: Dict[str, Any], warm: Dict[str, Any]) -> StepGraph:
+        """
+        memories, persona -> reply
+        """
+        comment = task.get("context", {}).get("comment_text", "")
+
+        async def reply(r: Dict[str, Any]) -> ContentOutput:
+            prompt = self._build_content_prompt(
+                persona=r["persona"],
+                topic=f"Reply to this comment: {comment}",
+                memories=r["memories"],
+            )
+            text = await self._generate_text(prompt, fallback="Thanks for the love!")
+            return ContentOutput(
+                caption=text,
+                confidence_score=self._calculate_confidence(text, None),
+            )
+
+        return StepGraph(
+            [
+                Step("memories", lambda r: self._search_memory(task)),
+                Step("persona", lambda r: self._load_persona(task, warm)),
+                Step("reply", reply, after=("memories", "persona")),
+            ]
+        )
+
+    def _with_memories(
+        self, task: Dict[str, Any], name: str, handler: Callable[..., Awaitable[Any]]
+    ) -> Tuple[StepGraph, str]:
+        # The memory lookup does not feed these handlers, so it runs alongside.
+        graph = StepGraph(
+            [
+                Step("memories", lambda r: self._search_memory(task)),
+                Step(name, lambda r: handler(task)),
+            ]
+        )
+        return graph, name
+
+    async def _load_persona(
+        self, task: Dict[str, Any], warm: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        persona: Optional[Dict[str, Any]] = task.get("context", {}).get("persona")
+        persona = persona or warm.get("persona")
+        if persona:
+            return persona
+        if self.persona_loader is not None and task.get("agent_id"):
+            loaded = await self.persona_loader(task["agent_id"])
+            return loaded or {}
+        return {}
+
+    async def _generate_content(
+        self,
+        task: Dict[str, Any],
+        memories: List[Any],
+        warm: Optional[Dict[str, Any]] = None,
+    ) -> ContentOutput:
+        """
+        Generate social media post with caption + image
+        """
+        task = {**task, "task_type": "generate_content"}
+        output, _ = await self._run_steps(task, warm, {"memories": memories})
+        content: ContentOutput = output
+        return content
+
+    async def _reply_to_comment(
+        self, task: Dict[str, Any], memories: List[Any]
+    ) -> ContentOutput:
+        task = {**task, "task_type": "reply_comment"}
+        output, _ = await self._run_steps(task, None, {"memories": memories})
+        reply: ContentOutput = output
+        return reply
+
+    async def _execute_payment(self, task: Dict[str, Any]) -> Dict[str, Any]:
+        context = task.get("context", {})
+        if float(context.get("amount", 0)) <= 0:
+            raise FatalError("Transaction amount must be positive")
+        response = await self.mcp.call_tool(
+            context.get("transaction_type", "transfer_usdc"),
+            {
+                "to_address": context.get("recipient"),
+                "amount": context.get("amount"),
+                "memo": context.get("memo", task.get("task_id")),
+            },
+        )
+        return response if isinstance(response, dict) else {"result": str(response)}
+
+    async def _research_trends(self, task: Dict[str, Any]) -> Dict[str, Any]:
+        context = task.get("context", {})
+        response = await self.mcp.call_tool(
+            "get_trending_topics",
+            {"niche": context.get("niche"), "region": context.get("region", "global")},
+        )
+        return response if isinstance(response, dict) else {"trends": []}
+
+    async def _publish_content(self, task: Dict[str, Any]) -> Dict[str, Any]:
+        context = task.get("context", {})
+        response = await self.mcp.call_tool(
+            "post_content",
+            {
+                "agent_id": task.get("agent_id"),
+                "platform": context.get("platform", "twitter"),
+                "text": context.get("caption", ""),
+                "media_urls": context.get("media_urls", []),
+            },
+        )
+        return response if isinstance(response, dict) else {"result": str(response)}
+
+    async def _generate_caption(self, prompt: str, fallback: str) -> str:
+        """
+        Streams the caption through the pre-check; raises PrecheckRejected
+        as soon as it has a hard violation
+        """
+        if self.llm is None:
+            return fallback
+        started = time.perf_counter()
+        scanner = self.precheck.scanner()
+        stream = getattr(self.llm, "stream", None)
+        aborted = False
+        if callable(stream):
+            chunks = stream(prompt)
+            try:
+                violation = None
+                async for chunk in chunks:
+                    violation = scanner.feed(str(chunk))
+                    if violation is not None:
+                        aborted = True
+                        break
+                else:
+                    violation = scanner.finish()
+            finally:
+                aclose = getattr(chunks, "aclose", None)
+                if aclose is not None:
+                    await aclose()
+        else:
+            violation = scanner.check(str(await self.llm.generate(prompt)))
+        if violation is not None:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.precheck_stats.record_reject(
+                violation, scanner.tokens, elapsed_ms, aborted
+            )
+            raise PrecheckRejected(violation, scanner.tokens)
+        self.precheck_stats.record_pass()
+        return scanner.text.strip()
+
+    async def _generate_text(self, prompt: str, fallback: str) -> str:
+        if self.llm is None:
+            return fallback
+        return str(await self.llm.generate(prompt))
+
+    def _build_content_prompt(
+        self,
+        persona: Dict[str, Any],
+        topic: str,
+        memories: List[Any],
+        hashtags: Sequence[str] = (),
+    ) -> str:
+        voice = ", ".join(str(trait) for trait in persona.get("voice_traits", []))
+        beliefs = ", ".join(str(item) for item in persona.get("core_beliefs", []))
+        recalled = "\n".join(f"- {_field(m, 'content', m)}" for m in memories[:5])
+        tags = f"Candidate hashtags: {' '.join(hashtags)}\n" if hashtags else ""
+        return (
+            "You are writing a social media post as an autonomous influencer.\n"
+            f"Backstory: {persona.get('backstory', '')}\n"
+            f"Voice: {voice}\n"
+            f"Core beliefs: {beliefs}\n"
+            f"Relevant memories:\n{recalled or '- none'}\n\n"
+            f"Topic: {topic}\n{tags}\n"
+            "Write one caption under 280 characters in this voice."
+        )
+
+    @staticmethod
+    def _image_url(image_result: Any) -> Optional[str]:
+        url = _field(image_result, "url") if isinstance(image_result, dict) else None
+        return str(url) if url else None
+
+    @staticmethod
+    def _calculate_confidence(caption: str, image_result: Any) -> float:
+        if not caption:
+            return 0.0
+        score = 0.5 if len(caption) <= 280 else 0.3
+        if TaskWorker._image_url(image_result) is not None:
+            score += 0.3
+        return min(score, 1.0)
+
+    def _result(self, status: TaskStatus, started: float, **fields: Any) -> TaskResult:
+        elapsed_ms = max((time.perf_counter() - started) * 1000, 1e-3)
+        return TaskResult(status=status, execution_time_ms=elapsed_ms, **fields)
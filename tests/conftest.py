@@ -23,6 +23,15 @@ def mock_redis_client() -> MagicMock:
     return client
 
 
+@pytest.fixture
+def fake_redis():
+    """In-memory Redis with Lua scripting for queue and scheduler tests."""
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.FakeRedis()
+    yield client
+    client.flushall()
+
+
 @pytest.fixture
 def sample_agent_data() -> dict:
     """Sample agent configuration for testing."""
@@ -0,0 +1,224 @@
+"""Test suite for planner checkpoint/restore.
+
+Validates the binary round trip, version checks, restore of in-flight DAGs
+across a simulated restart, completions made by workers reaching the
+checkpoint, periodic checkpoints of the hosted planners and
+fleet-scale cold start without LLM calls.
+"""
+
+import asyncio
+import json
+import time
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.planner.agent_planner import AgentPlanner, TrackedDag
+from src.planner.checkpoint import (
+    CheckpointError,
+    PlannerCheckpointer,
+    decode_state,
+    encode_state,
+)
+from src.worker.task_executor import TaskWorker
+
+
+def _planner(redis_client, agent_id: str = "agent_1", llm=None) -> AgentPlanner:
+    return AgentPlanner(agent_id=agent_id, redis_client=redis_client, llm_client=llm)
+
+
+class TestCheckpointFormat:
+    """Test encoding and decoding of planner state."""
+
+    @pytest.mark.asyncio
+    async def test_round_trip_preserves_state(self, fake_redis):
+        planner = _planner(fake_redis)
+        planner.agent_status = "active"
+        planner._mention_cursor = "tweet_42"
+        planner._seen_topics = {"fashion week", "addis style"}
+        tasks = await planner.decompose_goal("Promote sustainable fashion week")
+        await planner.enqueue_dag(tasks)
+        await planner.complete_task(tasks[0].task_id)
+
+        state = decode_state(encode_state(planner.export_state()))
+
+        assert state.agent_status == "active"
+        assert state.mention_cursor == "tweet_42"
+        assert state.seen_topics == ["addis style", "fashion week"]
+        (dag,) = state.dags
+        assert [t.task_id for t in dag.tasks] == [t.task_id for t in tasks]
+        assert [t.dependencies for t in dag.tasks] == [t.dependencies for t in tasks]
+        assert [t.context for t in dag.tasks] == [t.context for t in tasks]
+        assert [dag.is_complete(i) for i in range(3)] == [True, False, False]
+
+    @pytest.mark.asyncio
+    async def test_round_trip_preserves_deadlines(self, fake_redis):
+        planner = _planner(fake_redis)
+        tasks = await planner.decompose_goal("Promote sustainable fashion week")
+        await planner.enqueue_dag(tasks, deadline=datetime(2026, 2, 12, 23, 59))
+
+        (dag,) = decode_state(encode_state(planner.export_state())).dags
+
+        assert [t.deadline for t in dag.tasks] == [t.deadline for t in tasks]
+
+    def test_uuid_ids_are_compact(self, mock_redis_client):
+        planner = _planner(mock_redis_client)
+        blob = encode_state(planner.export_state(), compress=False)
+
+        assert blob[:4] == b"CHPT"
+        assert len(blob) < 32
+
+    def test_rejects_unknown_version(self, mock_redis_client):
+        blob = bytearray(encode_state(_planner(mock_redis_client).export_state()))
+        blob[4] = 99
+
+        with pytest.raises(CheckpointError, match="version"):
+            decode_state(bytes(blob))
+
+    def test_rejects_truncated_blob(self, mock_redis_client):
+        blob = encode_state(_planner(mock_redis_client).export_state(), compress=False)
+
+        with pytest.raises(CheckpointError):
+            decode_state(blob[:-2])
+
+
+class TestRestore:
+    """Test restart recovery through Redis."""
+
+    @pytest.mark.asyncio
+    async def test_restart_resumes_dag_without_llm(self, fake_redis):
+        llm = MagicMock()
+        llm.generate_structured_output = AsyncMock(
+            return_value={
+                "steps": [
+                    {"step_id": "a", "task_type": "research_trends"},
+                    {
+                        "step_id": "b",
+                        "task_type": "generate_content",
+                        "depends_on": ["a"],
+                    },
+                ]
+            }
+        )
+        before = _planner(fake_redis, llm=llm)
+        before.agent_status = "active"
+        tasks = await before.decompose_goal("Launch sneakers")
+        await before.enqueue_dag(tasks)
+        checkpointer = PlannerCheckpointer(fake_redis)
+        checkpointer.save([before])
+
+        after = _planner(fake_redis, llm=llm)
+        assert checkpointer.restore([after]) == 1
+
+        assert after.agent_status == "active"
+        assert await after.complete_task(tasks[0].task_id) == [tasks[1].task_id]
+        await after.complete_task(tasks[1].task_id)
+        assert after.in_flight_dags == []
+        assert llm.generate_structured_output.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_resume_dags_after_queue_loss(self, fake_redis):
+        before = _planner(fake_redis)
+        tasks = await before.decompose_goal("Promote sustainable fashion week")
+        await before.enqueue_dag(tasks)
+        await before.complete_task(tasks[0].task_id)
+        blob = encode_state(before.export_state())
+        fake_redis.flushall()
+
+        after = _planner(fake_redis)
+        after.import_state(decode_state(blob))
+
+        assert await after.resume_dags() == [tasks[1].task_id]
+        _, payload = after.task_queue.claim()
+        assert json.loads(payload)["task_id"] == tasks[1].task_id
+
+    @pytest.mark.asyncio
+    async def test_worker_completions_reach_the_checkpoint(
+        self, fake_redis, mock_mcp_client
+    ):
+        mock_mcp_client.call_tool = AsyncMock(return_value={"url": "https://cdn/x"})
+        planner = _planner(fake_redis)
+        tasks = await planner.decompose_goal("Promote sustainable fashion week")
+        await planner.enqueue_dag(tasks)
+        worker = TaskWorker(
+            worker_id="worker_1",
+            mcp_client=mock_mcp_client,
+            judge_client=None,
+            task_queue=planner.task_queue,
+            scheduler=planner.scheduler,
+        )
+        checkpointer = PlannerCheckpointer(fake_redis)
+
+        await worker.run_once()
+        checkpointer.save([planner])
+
+        state = decode_state(fake_redis.get(checkpointer.key("agent_1")))
+        (dag,) = state.dags
+        assert [dag.is_complete(i) for i in range(3)] == [True, False, False]
+        fake_redis.flushall()
+        after = _planner(fake_redis)
+        after.import_state(state)
+        assert await after.resume_dags() == [tasks[1].task_id]
+
+        while await worker.run_once() is not None:
+            pass
+        checkpointer.save([planner])
+
+        assert planner.in_flight_dags == []
+        assert decode_state(fake_redis.get(checkpointer.key("agent_1"))).dags == []
+
+    def test_corrupt_checkpoint_starts_fresh(self, fake_redis):
+        fake_redis.set("{chimera}:checkpoint:agent_1", b"CHPT\x01\x00garbage")
+        planner = _planner(fake_redis)
+
+        assert PlannerCheckpointer(fake_redis).restore([planner]) == 0
+        assert planner.agent_status == "paused"
+
+    def test_rejects_other_agents_state(self, mock_redis_client):
+        state = _planner(mock_redis_client, "agent_1").export_state()
+
+        with pytest.raises(ValueError):
+            _planner(mock_redis_client, "agent_2").import_state(state)
+
+    @pytest.mark.asyncio
+    async def test_periodic_run_checkpoints_the_planners_hosted_now(self, fake_redis):
+        checkpointer = PlannerCheckpointer(fake_redis)
+        hosted = [_planner(fake_redis, "agent_1")]
+
+        async def stop_after_save():
+            hosted.append(_planner(fake_redis, "agent_2"))
+            await asyncio.sleep(0.05)
+            checkpointer.stop()
+
+        await asyncio.gather(
+            checkpointer.run(lambda: list(hosted), interval_seconds=0.01),
+            stop_after_save(),
+        )
+
+        assert fake_redis.exists(checkpointer.key("agent_1"))
+        assert fake_redis.exists(checkpointer.key("agent_2"))
+
+    @pytest.mark.asyncio
+    async def test_fleet_cold_start_in_seconds(self, fake_redis):
+        planners = [_planner(fake_redis, f"agent_{i}") for i in range(1000)]
+        for planner in planners:
+            planner.agent_status = "active"
+            tasks = await planner.decompose_goal("Promote sustainable fashion week")
+            planner._track_dag(
+                TrackedDag(dag_id=f"dag_{planner.agent_id}", goal="g", tasks=tasks)
+            )
+        checkpointer = PlannerCheckpointer(fake_redis)
+        checkpointer.save(planners)
+
+        restarted = [_planner(fake_redis, f"agent_{i}") for i in range(1000)]
+        start = time.perf_counter()
+        restored = checkpointer.restore(restarted)
+        elapsed = time.perf_counter() - start
+
+        assert restored == 1000
+        assert all(len(p.in_flight_dags) == 1 for p in restarted)
+        assert elapsed < 5.0
+
+
+pytestmark = pytest.mark.unit
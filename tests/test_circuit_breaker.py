@@ -0,0 +1,310 @@
+"""Test suite for the per-tool circuit breakers.
+
+Validates opening on repeated connection failures fleet-wide, half-open
+trials, the failing-fast client wrapper, parking of tasks for open tools,
+release of parked tasks in waves on recovery, the outage alert and the
+/health probe.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from src.common.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerClient,
+    CircuitMonitor,
+    CircuitOpenError,
+    http_health_probe,
+)
+from src.common.mcp_pool import MCPToolError
+from src.common.task_queue import TaskQueue
+from src.worker.task_executor import TaskWorker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _breaker(redis_client, clock, **kwargs) -> CircuitBreaker:
+    kwargs.setdefault("failure_threshold", 3)
+    return CircuitBreaker(redis_client, clock=clock, refresh_seconds=0, **kwargs)
+
+
+def _publish(queue: TaskQueue, agent_id: str, task_id: str) -> None:
+    task = {
+        "task_id": task_id,
+        "task_type": "publish_content",
+        "agent_id": agent_id,
+        "context": {"caption": "hello"},
+    }
+    queue.push(agent_id, "medium", json.dumps(task))
+
+
+def _drain(queue: TaskQueue) -> list:
+    ids = []
+    while (claimed := queue.claim()) is not None:
+        ids.append(json.loads(claimed[1])["task_id"])
+    return ids
+
+
+class TestCircuitBreaker:
+    """Test the breaker state machine."""
+
+    def test_failures_open_the_breaker_for_every_pod(self, fake_redis):
+        clock = FakeClock()
+        pod_a = _breaker(fake_redis, clock)
+        pod_b = _breaker(fake_redis, clock)
+
+        states = [pod_a.record_failure("post_content") for _ in range(3)]
+
+        assert states == ["closed", "closed", "open"]
+        assert pod_b.is_open("post_content")
+        assert not pod_b.is_open("search_memory")
+        assert pod_b.retry_at("post_content") == clock.now + 30
+
+    def test_failures_outside_the_window_do_not_add_up(self, fake_redis):
+        clock = FakeClock()
+        breaker = _breaker(fake_redis, clock, window_seconds=1)
+        breaker.record_failure("post_content")
+        breaker.record_failure("post_content")
+        fake_redis.delete("{chimera}:circuit:failures:post_content")
+
+        assert breaker.record_failure("post_content") == "closed"
+
+    def test_half_open_closes_on_success_and_reopens_on_failure(self, fake_redis):
+        clock = FakeClock()
+        breaker = _breaker(fake_redis, clock, failure_threshold=1)
+        breaker.record_failure("post_content")
+
+        breaker.half_open("post_content")
+        assert breaker.state("post_content") == "half_open"
+        assert breaker.record_failure("post_content") == "open"
+
+        breaker.half_open("post_content")
+        assert breaker.record_success("post_content") == "closed"
+        assert breaker.open_tools() == []
+        assert breaker.half_open_tools() == []
+
+    def test_half_open_admits_only_the_trial_calls(self, fake_redis):
+        clock = FakeClock()
+        pod_a = _breaker(fake_redis, clock, failure_threshold=1, trial_calls=2)
+        pod_b = _breaker(fake_redis, clock, failure_threshold=1, trial_calls=2)
+        pod_a.record_failure("post_content")
+        pod_a.half_open("post_content")
+
+        admitted = [pod.try_call("post_content") for pod in (pod_a, pod_b, pod_b)]
+
+        assert admitted == ["trial", "trial", None]
+        pod_a.end_trial("post_content")
+        assert pod_b.try_call("post_content") == "trial"
+        assert pod_a.record_success("post_content") == "closed"
+        assert pod_b.try_call("post_content") == "closed"
+
+    def test_success_reads_state_past_a_stale_cache(self, fake_redis):
+        clock = FakeClock()
+        other = _breaker(fake_redis, clock, failure_threshold=1)
+        breaker = CircuitBreaker(fake_redis, clock=clock, refresh_seconds=60)
+        other.record_failure("post_content")
+        other.half_open("post_content")
+        assert breaker.state("post_content") == "half_open"
+        other.record_failure("post_content")
+
+        assert breaker.record_success("post_content") == "open"
+        assert other.is_open("post_content")
+
+    def test_cached_state_avoids_redis_until_refresh(self, fake_redis):
+        clock = FakeClock()
+        other = _breaker(fake_redis, clock, failure_threshold=1)
+        breaker = CircuitBreaker(fake_redis, clock=clock, refresh_seconds=1)
+        assert breaker.state("post_content") == "closed"
+        other.record_failure("post_content")
+
+        assert breaker.state("post_content") == "closed"
+        clock.now += 1
+        assert breaker.state("post_content") == "open"
+
+
+class TestCircuitBreakerClient:
+    """Test the call_tool wrapper."""
+
+    @pytest.mark.asyncio
+    async def test_connection_failures_open_and_then_fail_fast(
+        self, fake_redis, mock_mcp_client
+    ):
+        mock_mcp_client.call_tool.side_effect = ConnectionError("refused")
+        breaker = _breaker(fake_redis, FakeClock())
+        client = CircuitBreakerClient(mock_mcp_client, breaker)
+
+        for _ in range(3):
+            with pytest.raises(ConnectionError):
+                await client.call_tool("post_content", {})
+        with pytest.raises(CircuitOpenError):
+            await client.call_tool("post_content", {})
+
+        assert mock_mcp_client.call_tool.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_tool_errors_are_not_outages(self, fake_redis, mock_mcp_client):
+        mock_mcp_client.call_tool.side_effect = MCPToolError("bad arguments")
+        breaker = _breaker(fake_redis, FakeClock())
+        client = CircuitBreakerClient(mock_mcp_client, breaker)
+
+        for _ in range(3):
+            with pytest.raises(MCPToolError):
+                await client.call_tool("post_content", {})
+
+        assert breaker.state("post_content") == "closed"
+        assert await client.list_tools() == []
+
+    @pytest.mark.asyncio
+    async def test_tool_error_on_a_trial_call_frees_the_slot(
+        self, fake_redis, mock_mcp_client
+    ):
+        breaker = _breaker(fake_redis, FakeClock(), failure_threshold=1)
+        breaker.record_failure("post_content")
+        breaker.half_open("post_content")
+        client = CircuitBreakerClient(mock_mcp_client, breaker)
+        mock_mcp_client.call_tool.side_effect = MCPToolError("bad arguments")
+
+        with pytest.raises(MCPToolError):
+            await client.call_tool("post_content", {})
+        mock_mcp_client.call_tool.side_effect = None
+        await client.call_tool("post_content", {})
+
+        assert breaker.state("post_content") == "closed"
+
+
+class TestParking:
+    """Test parking tasks on open tools and releasing them."""
+
+    @pytest.mark.asyncio
+    async def test_worker_parks_task_without_calling_tools(
+        self, fake_redis, mock_mcp_client
+    ):
+        clock = FakeClock()
+        queue = TaskQueue(fake_redis, clock=clock)
+        breaker = _breaker(fake_redis, clock, failure_threshold=1)
+        breaker.record_failure("post_content")
+        _publish(queue, "a1", "t1")
+        worker = TaskWorker(
+            "w1", mock_mcp_client, None, task_queue=queue, breaker=breaker
+        )
+
+        result = await worker.run_once()
+
+        assert (result.status, result.reason) == ("parked", "post_content")
+        mock_mcp_client.call_tool.assert_not_awaited()
+        assert queue.lease_stats()["leased"] == 0
+        assert queue.parked("post_content") == {"tasks": 1, "agents": ["a1"]}
+        assert await worker.run_once() is None
+
+    @pytest.mark.asyncio
+    async def test_circuit_opening_mid_task_parks_instead_of_retrying(
+        self, fake_redis, mock_mcp_client
+    ):
+        clock = FakeClock()
+        queue = TaskQueue(fake_redis, clock=clock)
+        breaker = _breaker(fake_redis, clock, failure_threshold=1)
+        mock_mcp_client.call_tool.side_effect = ConnectionError("refused")
+        client = CircuitBreakerClient(mock_mcp_client, breaker)
+        worker = TaskWorker("w1", client, None, task_queue=queue, breaker=breaker)
+        _publish(queue, "a1", "t1")
+        _publish(queue, "a1", "t2")
+
+        first = await worker.run_once()
+        second = await worker.run_once()
+
+        assert first.status == "retry"
+        assert second.status == "parked"
+        assert queue.parked("search_memory")["tasks"] == 1
+        assert queue.retry_stats()["delayed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_recovery_releases_parked_tasks_in_waves(self, fake_redis):
+        clock = FakeClock()
+        queue = TaskQueue(fake_redis, clock=clock)
+        breaker = _breaker(fake_redis, clock, failure_threshold=1)
+        breaker.record_failure("post_content")
+        for i in range(5):
+            route = queue.route("a1", "medium", json.dumps({"task_id": f"t{i}"}))
+            queue.park_route(route, "post_content")
+        healthy = [False, True]
+
+        async def probe() -> bool:
+            return healthy.pop(0)
+
+        monitor = CircuitMonitor(
+            breaker, queue, probes={"mcp-server-twitter": probe}, wave_size=2
+        )
+
+        assert await monitor.tick() == {}
+        clock.now += 30
+        assert await monitor.tick() == {}
+        assert breaker.is_open("post_content")
+        assert breaker.retry_at("post_content") == clock.now + 30
+        clock.now += 30
+
+        assert await monitor.tick() == {"post_content": 1}
+        assert _drain(queue) == ["t0"]
+        breaker.record_success("post_content")
+        assert await monitor.tick() == {"post_content": 2}
+        assert await monitor.tick() == {"post_content": 2}
+        assert await monitor.tick() == {}
+        assert _drain(queue) == ["t1", "t2", "t3", "t4"]
+        assert queue.parked_tools() == []
+
+    def test_outage_alert_counts_affected_agents(self, fake_redis):
+        clock = FakeClock()
+        queue = TaskQueue(fake_redis, clock=clock)
+        breaker = _breaker(fake_redis, clock, failure_threshold=1)
+        breaker.record_failure("post_content")
+        breaker.record_failure("get_mentions")
+        for agent_id, tool in [
+            ("a1", "post_content"),
+            ("a2", "post_content"),
+            ("a1", "get_mentions"),
+            ("a3", "get_mentions"),
+        ]:
+            route = queue.route(agent_id, "medium", json.dumps({"task_id": "t"}))
+            queue.park_route(route, tool)
+
+        (alert,) = CircuitMonitor(breaker, queue).outages()
+
+        assert alert["message"] == "Twitter MCP server down - 3 agents affected"
+        assert alert["tools"] == ["get_mentions", "post_content"]
+        assert alert["parked"] == 4
+        assert alert["agents"] == ["a1", "a2", "a3"]
+
+
+class TestHealthProbe:
+    """Test the HTTP /health probe."""
+
+    @pytest.mark.asyncio
+    async def test_probe_reads_status_line(self):
+        statuses = iter([b"200 OK", b"503 Service Unavailable"])
+
+        async def handle(reader, writer):
+            await reader.readuntil(b"\r\n\r\n")
+            writer.write(b"HTTP/1.1 " + next(statuses) + b"\r\n\r\n")
+            await writer.drain()
+            writer.close()
+
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            assert await http_health_probe("127.0.0.1", port) is True
+            assert await http_health_probe("127.0.0.1", port) is False
+        finally:
+            server.close()
+            await server.wait_closed()
+
+        assert await http_health_probe("127.0.0.1", port, timeout_seconds=1) is False
+
+
+pytestmark = pytest.mark.unit
@@ -0,0 +1,190 @@
+"""Test suite for the concurrent worker runtime.
+
+Validates the adaptive per-task_type limits, that run() overlaps I/O-bound
+tasks, that it stops claiming while its slots are full, and that tasks of a
+saturated task_type are handed back to Redis instead of waiting in-process.
+"""
+
+import asyncio
+import json
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.common.task_queue import TaskQueue
+from src.worker.concurrency import AdaptiveLimit
+from src.worker.task_executor import TaskWorker
+
+
+class SlowMCP:
+    """MCP stand-in whose calls take a fixed time and track concurrency."""
+
+    def __init__(self, delay: float, fail: bool = False):
+        self.delay = delay
+        self.fail = fail
+        self.active = 0
+        self.peak = 0
+
+    async def call_tool(self, name, arguments):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.fail and name != "search_memory":
+                raise ConnectionError("tool unavailable")
+            return {"memories": [], "trends": []}
+        finally:
+            self.active -= 1
+
+
+def _fill(queue: TaskQueue, count: int, task_type: str = "research_trends") -> None:
+    for i in range(count):
+        payload = {"task_id": f"t{i}", "task_type": task_type, "context": {}}
+        queue.push("agent_1", "high", json.dumps(payload))
+
+
+async def _run_until_drained(worker: TaskWorker, queue: TaskQueue) -> float:
+    start = time.perf_counter()
+    runner = asyncio.create_task(worker.run())
+    while sum(queue.depth().values()):
+        await asyncio.sleep(0.01)
+    worker.stop()
+    await runner
+    return time.perf_counter() - start
+
+
+class TestAdaptiveLimit:
+    """Test AIMD adaptation."""
+
+    def test_fast_successes_raise_limit(self):
+        limit = AdaptiveLimit(initial=2, maximum=8)
+        for _ in range(20):
+            limit.observe(0.1, ok=True)
+
+        assert limit.limit > 2
+
+    def test_errors_cut_limit(self):
+        limit = AdaptiveLimit(initial=8, maximum=8)
+        limit.observe(0.1, ok=False)
+
+        assert limit.limit == 5
+        assert limit.snapshot()["errors"] == 1
+
+    def test_latency_blowup_cuts_limit(self):
+        limit = AdaptiveLimit(initial=8, maximum=8)
+        limit.observe(0.1, ok=True)
+        limit.observe(1.0, ok=True)
+
+        assert limit.limit < 8
+
+    def test_never_below_minimum(self):
+        limit = AdaptiveLimit(initial=2, minimum=1)
+        for _ in range(10):
+            limit.observe(0.1, ok=False)
+
+        assert limit.limit == 1
+
+    def test_try_acquire_does_not_wait(self):
+        limit = AdaptiveLimit(initial=1, maximum=1)
+
+        assert limit.try_acquire() is True
+        assert limit.try_acquire() is False
+        assert limit.in_flight == 1
+
+    @pytest.mark.asyncio
+    async def test_acquire_waits_for_a_slot(self):
+        limit = AdaptiveLimit(initial=1, maximum=1)
+        await limit.acquire()
+        waiter = asyncio.create_task(limit.acquire())
+        await asyncio.sleep(0.01)
+
+        assert not waiter.done()
+        await limit.release(0.1, ok=True)
+        await asyncio.wait_for(waiter, 1.0)
+
+
+class TestConcurrentRun:
+    """Test run() overlaps tasks within its slots."""
+
+    @pytest.mark.asyncio
+    async def test_overlaps_io_bound_tasks(self, fake_redis):
+        queue = TaskQueue(fake_redis)
+        _fill(queue, 40)
+        mcp = SlowMCP(delay=0.05)
+        worker = TaskWorker(
+            worker_id="worker_1",
+            mcp_client=mcp,
+            judge_client=None,
+            task_queue=queue,
+            max_in_flight=20,
+            limits={"research_trends": AdaptiveLimit(initial=20, maximum=20)},
+        )
+
+        elapsed = await _run_until_drained(worker, queue)
+
+        # Serially: 40 tasks x 2 calls x 50ms = 4s.
+        assert elapsed < 1.0
+        assert mcp.peak > 10
+
+    @pytest.mark.asyncio
+    async def test_stops_claiming_when_slots_are_full(self, fake_redis):
+        queue = TaskQueue(fake_redis)
+        _fill(queue, 10)
+        worker = TaskWorker(
+            worker_id="worker_1",
+            mcp_client=SlowMCP(delay=0.2),
+            judge_client=None,
+            task_queue=queue,
+            max_in_flight=3,
+        )
+        runner = asyncio.create_task(worker.run())
+        await asyncio.sleep(0.05)
+
+        assert queue.depth()["high"] == 7
+        worker.stop()
+        await runner
+        assert worker.concurrency_snapshot()["research_trends"]["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_saturated_task_type_stays_in_redis(self, fake_redis):
+        queue = TaskQueue(fake_redis)
+        _fill(queue, 10)
+        worker = TaskWorker(
+            worker_id="worker_1",
+            mcp_client=SlowMCP(delay=0.2),
+            judge_client=None,
+            task_queue=queue,
+            max_in_flight=8,
+            limits={"research_trends": AdaptiveLimit(initial=2, maximum=2)},
+        )
+        runner = asyncio.create_task(worker.run())
+        await asyncio.sleep(0.05)
+
+        assert queue.depth()["high"] == 8
+        assert len(worker._leases) == 2
+        assert queue.lease_stats()["leased"] == 2
+        worker.stop()
+        await runner
+
+    @pytest.mark.asyncio
+    async def test_failing_task_type_backs_off(self, fake_redis):
+        queue = TaskQueue(fake_redis)
+        _fill(queue, 12)
+        worker = TaskWorker(
+            worker_id="worker_1",
+            mcp_client=SlowMCP(delay=0.01, fail=True),
+            judge_client=MagicMock(),
+            task_queue=queue,
+            max_in_flight=8,
+            limits={"research_trends": AdaptiveLimit(initial=8, maximum=8)},
+        )
+
+        await _run_until_drained(worker, queue)
+
+        snapshot = worker.concurrency_snapshot()["research_trends"]
+        assert snapshot["errors"] == 12
+        assert snapshot["limit"] == 1
+
+
+pytestmark = pytest.mark.unit
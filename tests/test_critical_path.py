@@ -0,0 +1,128 @@
+"""Test suite for task DAG critical-path analysis.
+
+Validates cycle detection without recursion, slack annotation from
+per-task_type service-time estimates and slack-ordered dispatch.
+"""
+
+import json
+from datetime import datetime
+
+import pytest
+
+from src.planner.agent_planner import AgentPlanner, Task, TaskPriority
+from src.planner.critical_path import ServiceTimeEstimator, analyze_dag
+
+
+def _task(task_id: str, task_type: str, dependencies: list) -> Task:
+    return Task(
+        task_id=task_id,
+        task_type=task_type,
+        agent_id="agent_1",
+        priority=TaskPriority.MEDIUM,
+        context={},
+        dependencies=dependencies,
+        created_at=datetime.utcnow(),
+    )
+
+
+ESTIMATES = ServiceTimeEstimator(priors={"slow": 5.0, "fast": 1.0, "mid": 2.0})
+
+
+class TestAnalyzeDag:
+    """Test forward/backward passes over the Kahn order."""
+
+    def test_diamond_slack_and_critical_path(self):
+        tasks = [
+            _task("root", "fast", []),
+            _task("slow_branch", "slow", ["root"]),
+            _task("fast_branch", "fast", ["root"]),
+            _task("sink", "mid", ["slow_branch", "fast_branch"]),
+        ]
+
+        analysis = analyze_dag(tasks, ESTIMATES)
+
+        assert analysis.makespan_seconds == 8.0
+        assert analysis.critical_path == ["root", "slow_branch", "sink"]
+        assert analysis.slack("fast_branch") == 4.0
+        assert analysis.slack("sink") == 0.0
+
+    def test_independent_chains_have_slack_against_longest(self):
+        tasks = [_task("a", "slow", []), _task("b", "fast", [])]
+
+        analysis = analyze_dag(tasks, ESTIMATES)
+
+        assert analysis.slack("a") == 0.0
+        assert analysis.slack("b") == 4.0
+
+    def test_deep_chain_is_not_recursion_limited(self):
+        tasks = [_task("t0", "fast", [])]
+        tasks += [_task(f"t{i}", "fast", [f"t{i - 1}"]) for i in range(1, 20000)]
+
+        analysis = analyze_dag(tasks, ESTIMATES)
+
+        assert analysis.makespan_seconds == 20000.0
+        assert len(analysis.critical_path) == 20000
+
+    def test_cycle_is_rejected(self):
+        with pytest.raises(ValueError, match="cycle"):
+            analyze_dag([_task("a", "fast", ["b"]), _task("b", "fast", ["a"])])
+
+    def test_external_dependencies_do_not_delay(self):
+        analysis = analyze_dag([_task("a", "mid", ["elsewhere"])], ESTIMATES)
+
+        assert analysis.timings["a"].earliest_start == 0.0
+
+    def test_budget(self):
+        analysis = analyze_dag([_task("a", "slow", [])], ESTIMATES)
+
+        assert analysis.within_budget(10.0)
+        assert not analysis.within_budget(4.0)
+
+
+class TestServiceTimeEstimator:
+    """Test the per-task_type EWMA."""
+
+    def test_observations_move_estimate(self):
+        estimator = ServiceTimeEstimator(priors={"x": 10.0}, alpha=0.5)
+
+        assert estimator.observe("x", 2.0) == 6.0
+        assert estimator.estimate("x") == 6.0
+
+    def test_unknown_type_uses_default_then_first_observation(self):
+        estimator = ServiceTimeEstimator(priors={}, default_seconds=3.0)
+
+        assert estimator.estimate("new") == 3.0
+        estimator.observe("new", 7.0)
+        assert estimator.estimate("new") == 7.0
+
+
+class TestPlannerSlack:
+    """Test AgentPlanner annotates and dispatches by slack."""
+
+    @pytest.mark.asyncio
+    async def test_decomposed_tasks_carry_slack(self, fake_redis):
+        planner = AgentPlanner(
+            agent_id="agent_1", redis_client=fake_redis, llm_client=None
+        )
+
+        tasks = await planner.decompose_goal("Promote sustainable fashion week")
+
+        assert [task.slack_seconds for task in tasks] == [0.0, 0.0, 0.0]
+        assert tasks[0].to_dict()["slack_seconds"] == 0.0
+
+    @pytest.mark.asyncio
+    async def test_zero_slack_tasks_dispatched_first(self, fake_redis):
+        planner = AgentPlanner(
+            agent_id="agent_1",
+            redis_client=fake_redis,
+            llm_client=None,
+            service_times=ESTIMATES,
+        )
+        tasks = [_task("fast", "fast", []), _task("slow", "slow", [])]
+
+        assert await planner.enqueue_dag(tasks) == ["slow", "fast"]
+        _, payload = planner.task_queue.claim()
+        assert json.loads(payload)["task_id"] == "slow"
+
+
+pytestmark = pytest.mark.unit
@@ -0,0 +1,164 @@
+"""Test suite for the Redis in-degree DAG scheduler behind AgentPlanner.
+
+Validates that dependent tasks are parked until every parent completes and
+that completions release children without rescanning pending tasks.
+"""
+
+import json
+from datetime import datetime
+
+import pytest
+
+from src.common.task_queue import TaskQueue
+from src.planner.agent_planner import AgentPlanner, Task, TaskPriority
+from src.planner.dag_scheduler import DagScheduler
+
+AGENT = "agent_550e8400"
+LANE = "{chimera}:tasks:high:q:" + AGENT
+
+
+def _scheduler(redis_client) -> DagScheduler:
+    return DagScheduler(redis_client, TaskQueue(redis_client))
+
+
+def _submit(scheduler, task_id: str, deps: list) -> bool:
+    payload = json.dumps({"task_id": task_id})
+    return scheduler.submit(task_id, payload, deps, agent_id=AGENT, priority="high")
+
+
+def _queued_ids(redis_client) -> list:
+    queue = TaskQueue(redis_client)
+    claimed = []
+    while (item := queue.claim()) is not None:
+        claimed.append(json.loads(item[1])["task_id"])
+    return claimed
+
+
+def _task(task_id: str, dependencies: list) -> Task:
+    return Task(
+        task_id=task_id,
+        task_type="generate_content",
+        agent_id="agent_550e8400",
+        priority=TaskPriority.HIGH,
+        context={},
+        dependencies=dependencies,
+        created_at=datetime.utcnow(),
+    )
+
+
+class TestDagScheduler:
+    """Test the atomic submit/complete scripts."""
+
+    def test_task_without_pending_deps_is_ready(self, fake_redis):
+        scheduler = _scheduler(fake_redis)
+
+        assert _submit(scheduler, "a", []) is True
+        assert fake_redis.llen(LANE) == 1
+
+    def test_dependent_task_waits_for_all_parents(self, fake_redis):
+        scheduler = _scheduler(fake_redis)
+
+        assert _submit(scheduler, "c", ["a", "b"]) is False
+        assert scheduler.pending_count("c") == 2
+
+        assert scheduler.complete("a") == []
+        assert scheduler.pending_count("c") == 1
+        assert scheduler.complete("b") == ["c"]
+        assert _queued_ids(fake_redis) == ["c"]
+
+    def test_completion_is_idempotent(self, fake_redis):
+        scheduler = _scheduler(fake_redis)
+        _submit(scheduler, "b", ["a", "x"])
+
+        scheduler.complete("a")
+        scheduler.complete("a")
+
+        assert scheduler.pending_count("b") == 1
+        assert fake_redis.llen(LANE) == 0
+
+    def test_submit_after_parent_completed_is_ready(self, fake_redis):
+        scheduler = _scheduler(fake_redis)
+        scheduler.complete("a")
+
+        assert _submit(scheduler, "b", ["a"]) is True
+
+    def test_fan_out_releases_every_child(self, fake_redis):
+        scheduler = _scheduler(fake_redis)
+        for child in ("b", "c", "d"):
+            _submit(scheduler, child, ["a"])
+
+        assert sorted(scheduler.complete("a")) == ["b", "c", "d"]
+        assert fake_redis.exists("{chimera}:dag:children:a") == 0
+
+    def test_failure_cancels_every_descendant_and_cleans_up(self, fake_redis):
+        scheduler = _scheduler(fake_redis)
+        _submit(scheduler, "b", ["a"])
+        _submit(scheduler, "c", ["b", "x"])
+
+        cancelled = scheduler.fail("a")
+
+        assert sorted(child for child, _ in cancelled) == ["b", "c"]
+        assert json.loads(dict(cancelled)["c"]) == {"task_id": "c"}
+        assert scheduler.fail("a") == []
+        assert scheduler.complete("x") == []
+        assert not fake_redis.keys("{chimera}:dag:indeg:*")
+        assert not fake_redis.keys("{chimera}:dag:payload:*")
+        assert not fake_redis.keys("{chimera}:dag:children:*")
+        assert fake_redis.llen(LANE) == 0
+
+    def test_submit_after_parent_failed_is_cancelled(self, fake_redis):
+        scheduler = _scheduler(fake_redis)
+        scheduler.fail("a")
+
+        assert _submit(scheduler, "b", ["a"]) is False
+        assert scheduler.pending_count("b") == 0
+        assert scheduler.fail("b") == []
+
+    def test_outcomes_read_done_and_failed_markers(self, fake_redis):
+        scheduler = _scheduler(fake_redis)
+        _submit(scheduler, "b", ["a"])
+        _submit(scheduler, "c", ["a"])
+        scheduler.complete("a")
+        scheduler.fail("b")
+
+        assert scheduler.outcomes(["a", "b", "c"]) == ["done", "failed", None]
+        assert scheduler.outcomes([]) == []
+
+
+class TestPlannerDagDispatch:
+    """Test AgentPlanner drives a decomposed DAG through the scheduler."""
+
+    @pytest.mark.asyncio
+    async def test_decomposed_goal_runs_in_dependency_order(self, fake_redis):
+        planner = AgentPlanner(
+            agent_id="agent_550e8400",
+            redis_client=fake_redis,
+            llm_client=None,
+        )
+        tasks = await planner.decompose_goal("Promote sustainable fashion week")
+        research, generate, publish = tasks
+
+        ready = await planner.enqueue_dag(tasks)
+
+        assert ready == [research.task_id]
+        assert _queued_ids(fake_redis) == [research.task_id]
+
+        assert await planner.complete_task(research.task_id) == [generate.task_id]
+        assert _queued_ids(fake_redis) == [generate.task_id]
+        assert await planner.complete_task(generate.task_id) == [publish.task_id]
+        assert _queued_ids(fake_redis) == [publish.task_id]
+
+    @pytest.mark.asyncio
+    async def test_enqueue_rejects_cyclic_dag(self, fake_redis):
+        planner = AgentPlanner(
+            agent_id="agent_550e8400",
+            redis_client=fake_redis,
+            llm_client=None,
+        )
+
+        with pytest.raises(ValueError):
+            await planner.enqueue_dag([_task("t1", ["t2"]), _task("t2", ["t1"])])
+        assert _queued_ids(fake_redis) == []
+
+
+pytestmark = pytest.mark.unit
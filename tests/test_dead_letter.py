@@ -0,0 +1,256 @@
+"""Test suite for the dead-letter queue.
+
+Validates storing failed tasks with their error class and attempt history,
+indexed triage queries and paging, summary counts, and filtered replay that
+is rate-limited and re-queues each task exactly once.
+"""
+
+import json
+
+import pytest
+
+from src.common.dead_letter import DeadLetterQueue, error_class
+from src.common.task_queue import TaskQueue
+from src.planner.dag_scheduler import DagScheduler
+from src.worker.task_executor import TaskResult, TaskWorker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _dlq(redis_client, clock):
+    queue = TaskQueue(redis_client, clock=clock)
+    return DeadLetterQueue(redis_client, queue, clock=clock), queue
+
+
+def _kill(dlq, clock, task_id, agent_id, task_type, error):
+    clock.now += 1
+    task = {"task_id": task_id, "agent_id": agent_id, "task_type": task_type}
+    return dlq.add(task, TaskResult(status="failed", error=error))
+
+
+def _fill(dlq, clock):
+    _kill(dlq, clock, "t1", "a1", "publish_content", "ConnectionError('x')")
+    _kill(dlq, clock, "t2", "a1", "generate_content", "ValueError('bad')")
+    _kill(dlq, clock, "t3", "a2", "publish_content", "ConnectionError('y')")
+    _kill(dlq, clock, "t4", "a1", "publish_content", "ConnectionError('z')")
+
+
+def _drain(queue: TaskQueue) -> list:
+    ids = []
+    while (claimed := queue.claim()) is not None:
+        ids.append(json.loads(claimed[1])["task_id"])
+    return ids
+
+
+class TestDeadLetterQueue:
+    """Test storing and triaging dead tasks."""
+
+    def test_error_class_comes_from_the_repr(self):
+        assert error_class("TimeoutError('slow')") == "TimeoutError"
+        assert error_class(None) == "unknown"
+
+    def test_entry_keeps_history_and_last_result(self, fake_redis):
+        clock = FakeClock()
+        dlq, _ = _dlq(fake_redis, clock)
+        task = {
+            "task_id": "t1",
+            "agent_id": "a1",
+            "task_type": "publish_content",
+            "attempt": 3,
+            "attempts": [{"attempt": 0, "error": "TimeoutError()"}],
+        }
+        result = TaskResult(status="failed", error="TimeoutError()")
+
+        assert dlq.add(task, result) == "t1"
+        assert dlq.add(task, result) is None
+
+        entry = dlq.get("t1")
+        assert entry.error_class == "TimeoutError"
+        assert entry.attempts == task["attempts"]
+        assert entry.result["status"] == "failed"
+        assert dlq.summary()["total"] == 1
+
+    def test_filters_use_the_indexes_and_page_newest_first(self, fake_redis):
+        clock = FakeClock()
+        dlq, _ = _dlq(fake_redis, clock)
+        _fill(dlq, clock)
+
+        assert dlq.ids(agent_id="a1") == ["t4", "t2", "t1"]
+        assert dlq.ids(error_class="ConnectionError") == ["t4", "t3", "t1"]
+        assert dlq.ids(agent_id="a1", task_type="publish_content") == ["t4", "t1"]
+        page = dlq.query(agent_id="a1", limit=2)
+        assert [e.dlq_id for e in page] == ["t4", "t2"]
+        assert dlq.ids(agent_id="a1", before_ms=1_002_000) == ["t1"]
+
+    def test_first_page_sees_tasks_dead_lettered_since_the_last_query(self, fake_redis):
+        clock = FakeClock()
+        dlq, _ = _dlq(fake_redis, clock)
+        _fill(dlq, clock)
+        assert dlq.ids(agent_id="a1", task_type="publish_content") == ["t4", "t1"]
+
+        _kill(dlq, clock, "t5", "a1", "publish_content", "TimeoutError()")
+
+        assert dlq.ids(agent_id="a1", task_type="publish_content", limit=2) == [
+            "t5",
+            "t4",
+        ]
+        assert dlq.ids(
+            agent_id="a1", task_type="publish_content", before_ms=1_004_000
+        ) == ["t1"]
+        assert dlq.get("t5").failed_at == "1970-01-01T00:16:45+00:00"
+
+    def test_summary_counts_per_dimension(self, fake_redis):
+        clock = FakeClock()
+        dlq, _ = _dlq(fake_redis, clock)
+        _fill(dlq, clock)
+
+        summary = dlq.summary()
+
+        assert summary["total"] == 4
+        assert summary["by_agent"] == {"a1": 3, "a2": 1}
+        assert summary["by_task_type"] == {"publish_content": 3, "generate_content": 1}
+        assert summary["by_error_class"] == {"ConnectionError": 3, "ValueError": 1}
+
+
+class TestReplay:
+    """Test bulk replay."""
+
+    @pytest.mark.asyncio
+    async def test_filtered_replay_requeues_once_with_fresh_retries(self, fake_redis):
+        clock = FakeClock()
+        dlq, queue = _dlq(fake_redis, clock)
+        _fill(dlq, clock)
+
+        first = await dlq.replay(
+            task_type="publish_content",
+            error_class="ConnectionError",
+            rate_per_second=1_000,
+            batch_size=2,
+        )
+        second = await dlq.replay(
+            task_type="publish_content", error_class="ConnectionError"
+        )
+
+        assert (first, second) == (3, 0)
+        assert sorted(_drain(queue)) == ["t1", "t3", "t4"]
+        summary = dlq.summary()
+        assert summary["total"] == 1
+        assert summary["by_error_class"] == {"ValueError": 1}
+        assert summary["replayed"] == 3
+        assert dlq.ids(agent_id="a1") == ["t2"]
+
+    @pytest.mark.asyncio
+    async def test_replay_pins_its_intersection_for_the_whole_run(
+        self, fake_redis, monkeypatch
+    ):
+        clock = FakeClock()
+        dlq, queue = _dlq(fake_redis, clock)
+        _fill(dlq, clock)
+        assert dlq.ids(agent_id="a1", task_type="publish_content") == ["t4", "t1"]
+
+        async def expire_cached_queries(seconds):
+            for key in fake_redis.keys("{chimera}:dlq:query:*"):
+                fake_redis.delete(key)
+
+        monkeypatch.setattr("asyncio.sleep", expire_cached_queries)
+        replayed = await dlq.replay(
+            agent_id="a1", task_type="publish_content", batch_size=1
+        )
+
+        assert replayed == 2
+        assert sorted(_drain(queue)) == ["t1", "t4"]
+        assert fake_redis.keys("{chimera}:dlq:replay:*") == []
+
+    @pytest.mark.asyncio
+    async def test_replay_limit_takes_oldest_first(self, fake_redis):
+        clock = FakeClock()
+        dlq, queue = _dlq(fake_redis, clock)
+        _fill(dlq, clock)
+
+        assert await dlq.replay(limit=2, rate_per_second=1_000) == 2
+        assert sorted(_drain(queue)) == ["t1", "t2"]
+
+    @pytest.mark.asyncio
+    async def test_invalid_rate_is_rejected(self, fake_redis):
+        dlq, _ = _dlq(fake_redis, FakeClock())
+
+        with pytest.raises(ValueError):
+            await dlq.replay(rate_per_second=0)
+
+
+class TestWorkerDeadLetters:
+    """Test that the worker dead-letters failed tasks with their history."""
+
+    @pytest.mark.asyncio
+    async def test_exhausted_retries_are_dead_lettered(
+        self, fake_redis, mock_mcp_client
+    ):
+        clock = FakeClock()
+        dlq, queue = _dlq(fake_redis, clock)
+        mock_mcp_client.call_tool.side_effect = ConnectionError("refused")
+        worker = TaskWorker(
+            "w1", mock_mcp_client, None, task_queue=queue, dead_letters=dlq
+        )
+        task = {
+            "task_id": "t1",
+            "task_type": "research_trends",
+            "agent_id": "a1",
+            "priority": "high",
+        }
+        queue.push("a1", "high", json.dumps(task))
+
+        statuses = []
+        while len(statuses) < 4:
+            clock.now += 3_600
+            result = await worker.run_once()
+            if result is not None:
+                statuses.append(result.status)
+
+        assert statuses == ["retry", "retry", "retry", "failed"]
+        entry = dlq.get("t1")
+        assert entry.error_class == "ConnectionError"
+        assert [a["attempt"] for a in entry.attempts] == [0, 1, 2]
+
+        assert await dlq.replay() == 1
+        lane, payload = queue.claim()
+        replayed = json.loads(payload)
+        assert lane == "high"
+        assert "attempt" not in replayed and "attempts" not in replayed
+
+    @pytest.mark.asyncio
+    async def test_failed_parent_dead_letters_its_dependents(
+        self, fake_redis, mock_mcp_client
+    ):
+        clock = FakeClock()
+        dlq, queue = _dlq(fake_redis, clock)
+        scheduler = DagScheduler(fake_redis, queue)
+        mock_mcp_client.call_tool.side_effect = ValueError("bad query")
+        worker = TaskWorker(
+            "w1",
+            mock_mcp_client,
+            None,
+            task_queue=queue,
+            scheduler=scheduler,
+            dead_letters=dlq,
+        )
+        parent = {"task_id": "p", "task_type": "research_trends", "agent_id": "a1"}
+        child = {"task_id": "c", "task_type": "generate_content", "agent_id": "a1"}
+        scheduler.submit("p", json.dumps(parent), [], agent_id="a1")
+        scheduler.submit("c", json.dumps(child), ["p"], agent_id="a1")
+
+        result = await worker.run_once()
+
+        assert result.status == "failed"
+        assert dlq.get("c").error_class == "UpstreamFailed"
+        assert dlq.get("c").task == child
+        assert not fake_redis.keys("{chimera}:dag:indeg:*")
+        assert queue.claim() is None
+
+
+pytestmark = pytest.mark.unit
@@ -0,0 +1,141 @@
+"""Test suite for fleet campaign distribution.
+
+Validates role splitting, diversity-aware angle assignment, the preview
+payload and that nothing is enqueued before execute().
+"""
+
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pytest
+
+from src.planner.agent_planner import AgentPlanner
+from src.planner.fleet_planner import (
+    CampaignAngles,
+    FleetPlanner,
+    assign_angles,
+    split_roles,
+)
+
+
+def _planners(mock_redis_client, niches):
+    return [
+        AgentPlanner(
+            agent_id=f"agent_{i}",
+            redis_client=mock_redis_client,
+            llm_client=None,
+            niche=niche,
+        )
+        for i, niche in enumerate(niches)
+    ]
+
+
+class TestAssignment:
+    """Test the role split and the assignment solver."""
+
+    def test_split_roles_sums_to_agent_count(self):
+        counts = split_roles(7, {"research": 0.2, "create": 0.6, "engage": 0.2})
+
+        assert sum(counts.values()) == 7
+        assert counts["create"] == 4
+
+    def test_prefers_distinct_angles(self):
+        # Both agents like angle 0 best, but sharing costs more than the gap.
+        affinity = np.array([[0.9, 0.85], [0.9, 0.5]], dtype=np.float32)
+
+        assert assign_angles(affinity, diversity_penalty=0.1).tolist() == [1, 0]
+
+    def test_shares_angle_when_gain_outweighs_penalty(self):
+        affinity = np.array([[0.9, 0.1], [0.9, 0.1]], dtype=np.float32)
+
+        chosen = assign_angles(affinity, diversity_penalty=0.1, max_per_angle=2)
+
+        assert chosen.tolist() == [0, 0]
+
+    def test_solves_thousand_agents_two_hundred_angles_under_a_second(self):
+        rng = np.random.default_rng(0)
+        affinity = rng.random((1000, 200), dtype=np.float32)
+
+        start = time.perf_counter()
+        chosen = assign_angles(affinity)
+        elapsed = time.perf_counter() - start
+
+        assert len(chosen) == 1000
+        assert np.bincount(chosen, minlength=200).max() <= 5
+        assert elapsed < 1.0
+
+
+class TestFleetPlanner:
+    """Test campaign planning and approval-gated execution."""
+
+    @pytest.mark.asyncio
+    async def test_plan_preview_has_no_duplicates(self, mock_redis_client):
+        niches = ["fashion", "tech", "food", "music", "travel"]
+        planners = _planners(mock_redis_client, niches * 4)
+        fleet = FleetPlanner()
+
+        plan = await fleet.plan_campaign("Promote summer collection", planners)
+        preview = plan.preview()
+
+        assert preview["agent_count"] == 20
+        assert preview["role_counts"] == {"create": 12, "research": 4, "engage": 4}
+        assert preview["duplicated_angles"] == 0
+        assert mock_redis_client.lpush.call_count == 0
+
+    @pytest.mark.asyncio
+    async def test_creators_get_generate_and_publish_steps(self, mock_redis_client):
+        planners = _planners(mock_redis_client, ["fashion"] * 5)
+        plan = await FleetPlanner().plan_campaign("Launch sneakers", planners)
+
+        for agent_id, assignment in plan.assignments.items():
+            task_types = [step.task_type for step in plan.task_dags[agent_id].steps]
+            if assignment.role == "create":
+                assert task_types == [
+                    "research_trends",
+                    "generate_content",
+                    "publish_content",
+                ]
+                generate = plan.task_dags[agent_id].steps[1]
+                assert generate.context["topic"] == assignment.angle
+            else:
+                assert len(task_types) == 1
+
+    @pytest.mark.asyncio
+    async def test_llm_angles_used_once(self, mock_redis_client):
+        mock_llm_client = MagicMock()
+        mock_llm_client.generate_structured_output = AsyncMock(
+            return_value=CampaignAngles(
+                angles=["street style", "eco fabrics", "street style"]
+            )
+        )
+        planners = _planners(mock_redis_client, ["fashion"] * 5)
+
+        plan = await FleetPlanner(llm_client=mock_llm_client).plan_campaign(
+            "Launch sneakers", planners
+        )
+
+        assert plan.angles == ["street style", "eco fabrics"]
+        mock_llm_client.generate_structured_output.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_execute_enqueues_ready_tasks(self, mock_redis_client):
+        planners = _planners(mock_redis_client, ["fashion"] * 5)
+        fleet = FleetPlanner()
+        plan = await fleet.plan_campaign("Launch sneakers", planners)
+
+        dispatched = await fleet.execute(plan)
+
+        assert set(dispatched) == {p.agent_id for p in planners}
+        # Every agent's DAG starts with exactly one dependency-free step.
+        assert mock_redis_client.lpush.call_count == 5
+
+    @pytest.mark.asyncio
+    async def test_rejects_empty_goal(self, mock_redis_client):
+        with pytest.raises(ValueError):
+            await FleetPlanner().plan_campaign(
+                "  ", _planners(mock_redis_client, ["a"])
+            )
+
+
+pytestmark = pytest.mark.unit
@@ -0,0 +1,222 @@
+"""Test suite for the content-addressed image cache.
+
+Validates key normalization, skipping generate_image on identical renders,
+sharing one in-flight render, size-bounded LRU eviction, recovery from a
+missing blob and per-agent hit-rate metrics.
+"""
+
+import asyncio
+import os
+
+import pytest
+
+from src.common.image_cache import ImageCache, render_key
+from src.worker.task_executor import TaskWorker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _cache(redis_client, tmp_path, **kwargs) -> ImageCache:
+    return ImageCache(redis_client, str(tmp_path), clock=FakeClock(), **kwargs)
+
+
+class TestRenderKey:
+    """Test content addressing."""
+
+    def test_normalized_prompt_lora_and_params_address_the_render(self):
+        key = render_key("A cat  in\nspace", "lora_1")
+
+        assert key == render_key("a cat in space", "lora_1")
+        assert key != render_key("a cat in space", "lora_2")
+        assert key != render_key("a cat in space", "lora_1", {"seed": 7})
+        assert render_key("x", params={"a": 1, "b": 2}) == render_key(
+            "x", params={"b": 2, "a": 1}
+        )
+
+
+class TestImageCache:
+    """Test the blob store and its Redis index."""
+
+    @pytest.mark.asyncio
+    async def test_identical_render_skips_the_call(self, fake_redis, tmp_path):
+        cache = _cache(fake_redis, tmp_path)
+        calls = []
+
+        async def render():
+            calls.append(1)
+            return {"url": "https://img/1.png"}
+
+        args = {"prompt": "Sunset", "character_lora": "c1"}
+        first = await cache.get_or_render(args, render, agent_id="a1")
+        second = await cache.get_or_render(
+            {"prompt": " sunset ", "character_lora": "c1"}, render, agent_id="a2"
+        )
+
+        assert first == second == {"url": "https://img/1.png"}
+        assert len(calls) == 1
+        assert cache.stats("a1") == {
+            "hits": 0,
+            "misses": 1,
+            "hit_rate": 0.0,
+            "saved_usd": 0.0,
+        }
+        assert cache.stats("a2")["hit_rate"] == 1.0
+        assert cache.stats()["entries"] == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_render(self, fake_redis, tmp_path):
+        cache = _cache(fake_redis, tmp_path)
+        calls = []
+
+        async def render():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {"url": "u"}
+
+        args = {"prompt": "p"}
+        results = await asyncio.gather(
+            *(cache.get_or_render(args, render) for _ in range(5))
+        )
+
+        assert results == [{"url": "u"}] * 5
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_render_is_not_cached(self, fake_redis, tmp_path):
+        cache = _cache(fake_redis, tmp_path)
+
+        async def render():
+            raise ConnectionError("ideogram down")
+
+        with pytest.raises(ConnectionError):
+            await cache.get_or_render({"prompt": "p"}, render)
+
+        assert cache.stats()["entries"] == 0
+
+    @pytest.mark.asyncio
+    async def test_error_payload_is_returned_but_not_cached(self, fake_redis, tmp_path):
+        cache = _cache(fake_redis, tmp_path)
+        results = [{"isError": True, "content": []}, {"url": "u"}]
+
+        async def render():
+            return results.pop(0)
+
+        first = await cache.get_or_render({"prompt": "p"}, render)
+        second = await cache.get_or_render({"prompt": "p"}, render)
+
+        assert first == {"isError": True, "content": []}
+        assert second == {"url": "u"}
+        assert cache.stats()["entries"] == 1
+
+    def test_lru_eviction_keeps_the_total_bounded(self, fake_redis, tmp_path):
+        cache = _cache(fake_redis, tmp_path, max_bytes=100)
+        blob = {"url": "x" * 30}
+        cache.put("k1", blob)
+        cache.clock.now += 1
+        cache.put("k2", blob)
+        cache.clock.now += 1
+        assert cache.get("k1") is not None
+        cache.clock.now += 1
+
+        assert cache.put("k3", blob) == ["k2"]
+
+        assert cache.get("k2") is None
+        assert not os.path.exists(cache.path("k2"))
+        assert cache.get("k1") is not None
+        stats = cache.stats()
+        assert stats["entries"] == 2
+        assert stats["bytes"] <= 100
+        assert stats["evictions"] == 1
+
+    def test_missing_blob_is_a_miss_and_leaves_the_index(self, fake_redis, tmp_path):
+        cache = _cache(fake_redis, tmp_path)
+        cache.put("k1", {"url": "u"})
+        os.remove(cache.path("k1"))
+
+        assert cache.get("k1", agent_id="a1") is None
+        assert cache.stats()["entries"] == 0
+        assert cache.stats()["bytes"] == 0
+
+
+class TestWorkerImageCache:
+    """Test that content generation reuses cached renders."""
+
+    @pytest.mark.asyncio
+    async def test_regenerating_same_content_skips_generate_image(
+        self, fake_redis, tmp_path, mock_mcp_client
+    ):
+        async def call_tool(name, arguments):
+            if name == "generate_image":
+                return {"url": "https://img/1.png"}
+            return {"memories": []}
+
+        mock_mcp_client.call_tool.side_effect = call_tool
+        cache = _cache(fake_redis, tmp_path)
+        worker = TaskWorker("w1", mock_mcp_client, None, image_cache=cache)
+        task = {
+            "task_id": "t1",
+            "task_type": "generate_content",
+            "agent_id": "a1",
+            "context": {"topic": "Sunset over Nairobi"},
+        }
+
+        first = await worker.execute_task(task)
+        second = await worker.execute_task({**task, "task_id": "t2"})
+
+        assert first.output.image_url == second.output.image_url
+        images = [
+            call
+            for call in mock_mcp_client.call_tool.call_args_list
+            if call.args[0] == "generate_image"
+        ]
+        assert len(images) == 1
+        assert cache.stats("a1")["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_new_caption_for_the_same_topic_reuses_the_render(
+        self, fake_redis, tmp_path, mock_mcp_client
+    ):
+        async def call_tool(name, arguments):
+            if name == "generate_image":
+                return {"url": "https://img/1.png"}
+            return {"memories": []}
+
+        class DraftingLLM:
+            def __init__(self):
+                self.drafts = 0
+
+            async def generate(self, prompt: str) -> str:
+                self.drafts += 1
+                return f"Draft {self.drafts}: golden hour over the Nairobi skyline tonight."
+
+        mock_mcp_client.call_tool.side_effect = call_tool
+        cache = _cache(fake_redis, tmp_path)
+        worker = TaskWorker(
+            "w1", mock_mcp_client, None, llm_client=DraftingLLM(), image_cache=cache
+        )
+        task = {
+            "task_id": "t1",
+            "task_type": "generate_content",
+            "agent_id": "a1",
+            "context": {"topic": "Sunset over Nairobi"},
+        }
+
+        first = await worker.execute_task(task)
+        second = await worker.execute_task({**task, "task_id": "t2"})
+
+        assert first.output.caption != second.output.caption
+        (image,) = [
+            call
+            for call in mock_mcp_client.call_tool.call_args_list
+            if call.args[0] == "generate_image"
+        ]
+        assert image.args[1]["prompt"] == "Sunset over Nairobi in style of default"
+
+
+pytestmark = pytest.mark.unit
@@ -0,0 +1,255 @@
+"""Test suite for the role entry points.
+
+Validates that src.main imports only the standard library, that a role's
+start-up imports load no provider SDKs, lazy imports, configuration of the
+MCP endpoints and the worker's clients, the worker's circuit monitor and
+the startup report.
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.common.lazy import lazy_import
+from src.planner.poll_scheduler import PollKind
+from src.main import (
+    ROLES,
+    STARTUP_BUDGET_SECONDS,
+    StartupReport,
+    _report_first_claim,
+    build_monitor,
+    build_planner,
+    build_worker,
+    client_from_env,
+    main,
+    mcp_endpoints,
+)
+
+
+def _in_fresh_interpreter(code: str) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=Path(__file__).resolve().parents[1],
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+class TestStartupImports:
+    """Test what each role pays for at process start."""
+
+    def test_main_imports_only_the_standard_library(self):
+        loaded = _in_fresh_interpreter(
+            "import json, sys\n"
+            "import src.main\n"
+            "print(json.dumps(sorted(sys.modules)))"
+        )
+
+        for heavy in ("redis", "pydantic", "structlog", "numpy", "src.worker"):
+            assert heavy not in loaded
+
+    @pytest.mark.parametrize("role", ["worker", "planner"])
+    def test_role_imports_load_no_provider_sdks(self, role):
+        loaded = _in_fresh_interpreter(
+            "import json, sys\n"
+            "from src.main import import_role\n"
+            f"import_role({role!r})\n"
+            "print(json.dumps(sorted(sys.modules)))"
+        )
+
+        for sdk in ("web3", "coinbase_agentkit", "weaviate", "anthropic", "mcp"):
+            assert sdk not in loaded
+        assert "sqlalchemy" not in loaded
+        assert "scipy.optimize._optimize" not in loaded
+
+    @pytest.mark.parametrize("role", ["worker", "planner"])
+    def test_role_imports_fit_the_startup_budget(self, role):
+        # Best of three fresh interpreters, so one slow run on a busy host
+        # does not fail it; a quarter of the budget is left for Redis and the
+        # first claim.
+        timings = [
+            _in_fresh_interpreter(
+                "import json, time\n"
+                "started = time.perf_counter()\n"
+                "from src.main import import_role\n"
+                f"import_role({role!r})\n"
+                "print(json.dumps(time.perf_counter() - started))"
+            )
+            for _ in range(3)
+        ]
+
+        assert min(timings) < STARTUP_BUDGET_SECONDS * 0.75
+
+    def test_worker_does_not_load_the_rest_of_the_planner(self):
+        loaded = _in_fresh_interpreter(
+            "import json, sys\n"
+            "from src.main import import_role\n"
+            "import_role('worker')\n"
+            "print(json.dumps(sorted(sys.modules)))"
+        )
+
+        assert "src.planner.dag_scheduler" in loaded
+        for heavy in ("numpy", "src.planner.fleet_planner", "src.planner.simulator"):
+            assert heavy not in loaded
+
+
+class TestLazyImport:
+    """Test deferred imports."""
+
+    def test_module_loads_on_first_attribute_access(self):
+        sys.modules.pop("colorsys", None)
+        colorsys = lazy_import("colorsys")
+
+        assert type(colorsys).__name__ == "_LazyModule"
+        assert colorsys.rgb_to_hsv(1.0, 0.0, 0.0) == (0.0, 1.0, 1.0)
+        assert lazy_import("colorsys") is colorsys
+
+    def test_missing_module_fails_at_bind_time(self):
+        with pytest.raises(ModuleNotFoundError):
+            lazy_import("chimera_no_such_sdk")
+
+
+class TestConfiguration:
+    """Test environment parsing."""
+
+    def test_mcp_endpoints_default_to_service_names(self):
+        names = [endpoint.name for endpoint in mcp_endpoints()]
+
+        assert "mcp-server-twitter" in names
+        assert {endpoint.port for endpoint in mcp_endpoints()} == {3000}
+
+    def test_mcp_endpoints_from_spec(self):
+        (endpoint,) = mcp_endpoints("mcp-server-twitter=10.0.0.5:3100")
+
+        assert (endpoint.name, endpoint.host, endpoint.port) == (
+            "mcp-server-twitter",
+            "10.0.0.5",
+            3100,
+        )
+        with pytest.raises(ValueError):
+            mcp_endpoints("mcp-server-twitter=nohost")
+
+    def test_client_from_env_calls_the_factory(self, monkeypatch):
+        monkeypatch.setenv("CHIMERA_LLM_CLIENT", "collections:OrderedDict")
+
+        assert client_from_env("CHIMERA_LLM_CLIENT") == {}
+        assert client_from_env("CHIMERA_JUDGE_CLIENT_UNSET") is None
+        monkeypatch.setenv("CHIMERA_LLM_CLIENT", "collections")
+        with pytest.raises(ValueError):
+            client_from_env("CHIMERA_LLM_CLIENT")
+
+    def test_role_defaults_to_the_planner(self, monkeypatch):
+        started = []
+
+        async def fake_role(report):
+            started.append(report)
+            return 0
+
+        monkeypatch.delenv("CHIMERA_ROLE", raising=False)
+        monkeypatch.setitem(ROLES, "planner", fake_role)
+        monkeypatch.setitem(ROLES, "judge", fake_role)
+
+        assert main([]) == 0
+        monkeypatch.setenv("CHIMERA_ROLE", "judge")
+        assert main([]) == 0
+        assert len(started) == 2
+        monkeypatch.setenv("CHIMERA_ROLE", "janitor")
+        with pytest.raises(SystemExit):
+            main([])
+
+    def test_worker_refuses_to_start_without_judge_and_llm(self, monkeypatch, capsys):
+        monkeypatch.delenv("CHIMERA_JUDGE_CLIENT", raising=False)
+        monkeypatch.setenv("CHIMERA_LLM_CLIENT", "collections:OrderedDict")
+
+        assert main(["worker"]) == 1
+        assert "CHIMERA_JUDGE_CLIENT" in capsys.readouterr().err
+
+
+class TestRoleWiring:
+    """Test the components each role runs with."""
+
+    def test_monitor_probes_every_server_for_the_worker_breakers(
+        self, fake_redis, mock_mcp_client
+    ):
+        endpoints = mcp_endpoints("mcp-server-twitter=10.0.0.5:3100")
+        worker = build_worker(fake_redis, "w1", mock_mcp_client)
+
+        monitor = build_monitor(worker, endpoints)
+
+        assert monitor.breaker is worker.breaker
+        assert monitor.task_queue is worker.task_queue
+        assert list(monitor.probes) == ["mcp-server-twitter"]
+        assert monitor.probes["mcp-server-twitter"].args == ("10.0.0.5", 3100)
+
+    def test_worker_prefetches_through_the_guarded_client(
+        self, fake_redis, mock_mcp_client
+    ):
+        worker = build_worker(fake_redis, "w1", mock_mcp_client)
+
+        assert worker.prefetcher.mcp is worker.mcp
+        assert worker.prefetcher.cache.redis is fake_redis
+
+    def test_image_cache_is_enabled_by_its_directory(
+        self, fake_redis, mock_mcp_client, tmp_path
+    ):
+        cached = build_worker(
+            fake_redis, "w1", mock_mcp_client, image_cache_dir=str(tmp_path)
+        )
+
+        assert cached.image_cache.root == str(tmp_path)
+        assert build_worker(fake_redis, "w2", mock_mcp_client).image_cache is None
+
+    def test_planner_checkpoints_the_agents_it_hosts(self, fake_redis):
+        runtime = build_planner(fake_redis, "r1", ["a1", "a2"])
+        runtime.rebalance()
+        runtime.planners["a1"].agent_status = "active"
+
+        runtime.shutdown()
+        restarted = build_planner(fake_redis, "r1", ["a1", "a2"])
+        restarted.rebalance()
+
+        assert restarted.planners["a1"].agent_status == "active"
+
+    def test_planner_polls_the_agents_it_hosts(self, fake_redis, mock_mcp_client):
+        runtime = build_planner(fake_redis, "r1", ["a1", "a2"], mock_mcp_client)
+        runtime.rebalance()
+
+        assert runtime.planners["a1"].mcp_client is mock_mcp_client
+        assert len(runtime.poll_scheduler) == 2
+        assert list(runtime.poll_scheduler.intervals) == [PollKind.MENTIONS]
+        assert runtime.trend_fetcher.mcp_client is mock_mcp_client
+        assert len(runtime.trend_fetcher.subscription_keys) == 1
+
+
+class TestStartupReport:
+    """Test the measured startup report."""
+
+    @pytest.mark.asyncio
+    async def test_first_claim_is_reported_once(
+        self, fake_redis, mock_mcp_client, capsys
+    ):
+        worker = build_worker(fake_redis, "w1", mock_mcp_client)
+        report = StartupReport("worker")
+        report.mark("import:src.worker")
+        _report_first_claim(worker, report)
+
+        assert await worker.claim_tasks(4) == []
+        assert await worker.claim_tasks(4) == []
+
+        (line,) = capsys.readouterr().out.strip().splitlines()
+        emitted = json.loads(line)
+        assert emitted["role"] == "worker"
+        assert list(emitted["milestones_ms"]) == ["import:src.worker", "first_claim"]
+        assert emitted["budget_ms"] == STARTUP_BUDGET_SECONDS * 1000
+
+    def test_judge_role_is_not_implemented(self, capsys):
+        assert main(["judge"]) == 1
+        assert "not implemented" in capsys.readouterr().err
+
+
+pytestmark = pytest.mark.unit
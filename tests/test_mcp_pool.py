@@ -0,0 +1,221 @@
+"""Test suite for the pooled MCP client.
+
+Validates tool routing, session reuse and multiplexing, per-server
+concurrency caps, error mapping, reconnects and latency histograms, all
+against the in-process Streamable HTTP LocalMCPServer.
+"""
+
+import asyncio
+import math
+import time
+
+import pytest
+
+from src.common.mcp_pool import (
+    LatencyHistogram,
+    LocalMCPServer,
+    MCPClientPool,
+    MCPToolError,
+)
+from src.worker.task_executor import TaskWorker
+
+
+async def _slow_memories(arguments):
+    await asyncio.sleep(0.05)
+    return {"memories": [{"content": arguments["query"]}]}
+
+
+async def _hang(arguments):
+    await asyncio.sleep(10)
+
+
+def _broken(arguments):
+    raise RuntimeError("index offline")
+
+
+async def _pool(timeout_seconds=0.5, **limits):
+    weaviate = await LocalMCPServer(
+        "mcp-server-weaviate",
+        {"search_memory": _slow_memories, "hang": _hang, "broken": _broken},
+    ).start()
+    news = await LocalMCPServer(
+        "mcp-server-news",
+        {"get_trending_topics": lambda args: {"trends": [{"topic": "linen"}]}},
+    ).start()
+    pool = MCPClientPool(
+        [weaviate.endpoint(**limits), news.endpoint()],
+        tool_servers={
+            "search_memory": "mcp-server-weaviate",
+            "hang": "mcp-server-weaviate",
+            "broken": "mcp-server-weaviate",
+            "get_trending_topics": "mcp-server-news",
+        },
+        timeout_seconds=timeout_seconds,
+    )
+    return pool, weaviate, news
+
+
+class TestMCPClientPool:
+    """Test the pooled client against local stand-in servers."""
+
+    @pytest.mark.asyncio
+    async def test_routes_tools_to_their_servers(self):
+        pool, weaviate, news = await _pool()
+        try:
+            trends = await pool.call_tool("get_trending_topics", {})
+            memories = await pool.call_tool("search_memory", {"query": "fall"})
+
+            assert trends == {"trends": [{"topic": "linen"}]}
+            assert memories == {"memories": [{"content": "fall"}]}
+            assert sorted(await pool.list_tools()) == [
+                "broken",
+                "get_trending_topics",
+                "hang",
+                "search_memory",
+            ]
+            with pytest.raises(KeyError):
+                await pool.call_tool("transfer_usdc", {})
+        finally:
+            await pool.close()
+            await weaviate.close()
+            await news.close()
+
+    @pytest.mark.asyncio
+    async def test_multiplexes_concurrent_calls_on_one_session(self):
+        pool, weaviate, news = await _pool(timeout_seconds=5, pipeline_depth=64)
+        try:
+            start = time.perf_counter()
+            await asyncio.gather(
+                *(pool.call_tool("search_memory", {"query": str(i)}) for i in range(30))
+            )
+            elapsed = time.perf_counter() - start
+
+            # Serially: 30 x 50ms = 1.5s.
+            assert elapsed < 1.5
+            assert weaviate.connections == 1
+            assert weaviate.peak_active > 1
+        finally:
+            await pool.close()
+            await weaviate.close()
+            await news.close()
+
+    @pytest.mark.asyncio
+    async def test_sequential_calls_reuse_the_session(self):
+        pool, weaviate, news = await _pool()
+        try:
+            for i in range(10):
+                await pool.call_tool("search_memory", {"query": str(i)})
+
+            assert weaviate.connections == 1
+            assert pool.stats()["mcp-server-weaviate"]["opened"] == 1
+            assert pool.stats()["mcp-server-news"]["opened"] == 0
+        finally:
+            await pool.close()
+            await weaviate.close()
+            await news.close()
+
+    @pytest.mark.asyncio
+    async def test_per_server_concurrency_cap_queues_callers(self):
+        pool, weaviate, news = await _pool(max_concurrency=3)
+        try:
+            calls = asyncio.gather(
+                *(pool.call_tool("search_memory", {"query": str(i)}) for i in range(9))
+            )
+            await asyncio.sleep(0.01)
+            queued = pool.stats()["mcp-server-weaviate"]["queued"]
+            await calls
+
+            assert queued == 6
+            assert weaviate.peak_active == 3
+        finally:
+            await pool.close()
+            await weaviate.close()
+            await news.close()
+
+    @pytest.mark.asyncio
+    async def test_errors_map_to_worker_error_classes(self):
+        pool, weaviate, news = await _pool()
+        try:
+            with pytest.raises(MCPToolError):
+                await pool.call_tool("broken", {})
+            with pytest.raises(TimeoutError):
+                await pool.call_tool("hang", {})
+
+            report = pool.latency_report()
+            assert report["broken"]["errors"] == 1
+            assert report["hang"]["errors"] == 1
+        finally:
+            await pool.close()
+            await weaviate.close()
+            await news.close()
+
+    @pytest.mark.asyncio
+    async def test_reopens_session_after_server_restart(self):
+        pool, weaviate, news = await _pool()
+        try:
+            await pool.call_tool("search_memory", {"query": "first"})
+            await weaviate.close()
+            await weaviate.start()
+
+            result = await pool.call_tool("search_memory", {"query": "again"})
+
+            assert result == {"memories": [{"content": "again"}]}
+            assert weaviate.connections == 1
+            assert pool.stats()["mcp-server-weaviate"]["opened"] == 2
+        finally:
+            await pool.close()
+            await weaviate.close()
+            await news.close()
+
+    @pytest.mark.asyncio
+    async def test_unreachable_server_is_retryable(self):
+        pool, weaviate, news = await _pool()
+        await weaviate.close()
+        await news.close()
+        try:
+            with pytest.raises(ConnectionError):
+                await pool.call_tool("search_memory", {"query": "x"})
+        finally:
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_worker_runs_through_the_pool(self):
+        pool, weaviate, news = await _pool()
+        try:
+            worker = TaskWorker("w1", pool, None)
+            task = {
+                "task_id": "t1",
+                "task_type": "research_trends",
+                "agent_id": "agent_1",
+                "context": {},
+            }
+
+            result = await worker.execute_task(task)
+
+            assert result.status == "complete"
+            assert set(pool.latency_report()) == {
+                "search_memory",
+                "get_trending_topics",
+            }
+        finally:
+            await pool.close()
+            await weaviate.close()
+            await news.close()
+
+
+class TestLatencyHistogram:
+    """Test bucketed latency quantiles."""
+
+    def test_quantiles_report_bucket_bounds(self):
+        hist = LatencyHistogram(buckets_ms=(10, 100, 1000))
+        for latency in [1] * 90 + [50] * 9 + [5000]:
+            hist.observe(latency)
+
+        assert hist.quantile(0.5) == 10
+        assert hist.quantile(0.95) == 100
+        assert math.isinf(hist.quantile(1.0))
+        assert hist.snapshot()["count"] == 100
+        assert LatencyHistogram().quantile(0.5) == 0.0
+
+
+pytestmark = pytest.mark.unit
@@ -0,0 +1,187 @@
+"""Test suite for the planner's plan template cache.
+
+Validates exact and near-match reuse of TaskDAG skeletons within an agent
+group, that stale goal-derived context is not reused, LRU/TTL eviction and
+that cached plans still produce fresh Task objects.
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.planner.agent_planner import AgentPlanner, TaskDAG
+from src.planner.plan_cache import PlanCache, normalize_goal, plan_group_hash
+
+GROUP = plan_group_hash(("fashion", "witty"))
+
+
+def _dag(goal: str) -> TaskDAG:
+    return TaskDAG.model_validate(
+        {
+            "steps": [
+                {
+                    "step_id": "research",
+                    "task_type": "research_trends",
+                    "priority": "high",
+                    "context": {"query": goal},
+                },
+                {
+                    "step_id": "post",
+                    "task_type": "generate_content",
+                    "depends_on": ["research"],
+                    "context": {"brief": f"Write about: {goal}"},
+                },
+            ]
+        }
+    )
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestPlanCache:
+    """Test cache keying, near-match and eviction."""
+
+    def test_normalize_goal_ignores_case_and_punctuation(self):
+        assert normalize_goal("  Promote X -- to Gen-Z! ") == "promote x to gen z"
+
+    def test_exact_hit_after_put(self):
+        cache = PlanCache()
+        cache.put("Promote sneakers to Gen-Z audience", GROUP, _dag("sneakers"))
+
+        assert cache.get("promote sneakers to gen-z audience!", GROUP) is not None
+        assert cache.stats.hits == 1
+
+    def test_agent_group_partitions_entries(self):
+        cache = PlanCache()
+        cache.put("Promote sneakers to Gen-Z audience", GROUP, _dag("sneakers"))
+
+        other = plan_group_hash(("fashion", "formal"))
+        assert cache.get("Promote sneakers to Gen-Z audience", other) is None
+        assert cache.stats.misses == 1
+
+    def test_near_match_reparameterizes_context(self):
+        cache = PlanCache()
+        cached_goal = "Promote sneakers to Gen-Z audience"
+        cache.put(cached_goal, GROUP, _dag(cached_goal))
+
+        goal = "Promote hoodies to Gen-Z audience"
+        plan = cache.get(goal, GROUP)
+
+        assert plan is not None
+        assert cache.stats.near_hits == 1
+        assert plan.steps[0].context["query"] == goal
+        assert plan.steps[1].context["brief"] == f"Write about: {goal}"
+        assert [s.task_type for s in plan.steps] == [
+            "research_trends",
+            "generate_content",
+        ]
+
+    def test_near_match_drops_context_derived_from_the_old_topic(self):
+        cache = PlanCache()
+        cached_goal = "Promote sneakers to Gen-Z audience"
+        dag = _dag(cached_goal)
+        dag.steps[1].context.update(
+            {
+                "topic": "sneakers",
+                "keywords": ["sneakers", "streetwear"],
+                "platform": "twitter",
+            }
+        )
+        cache.put(cached_goal, GROUP, dag)
+
+        plan = cache.get("Promote hoodies to Gen-Z audience", GROUP)
+
+        assert cache.stats.near_hits == 1
+        assert plan.steps[1].context == {
+            "brief": "Write about: Promote hoodies to Gen-Z audience",
+            "platform": "twitter",
+        }
+
+    def test_unrelated_goal_misses(self):
+        cache = PlanCache()
+        cache.put("Promote sneakers to Gen-Z audience", GROUP, _dag("sneakers"))
+
+        assert cache.get("Cover trend Ethiopian fashion week", GROUP) is None
+
+    def test_lru_eviction(self):
+        cache = PlanCache(max_entries=2, near_match_threshold=1.01)
+        cache.put("goal a", GROUP, _dag("a"))
+        cache.put("goal b", GROUP, _dag("b"))
+        cache.get("goal a", GROUP)
+        cache.put("goal c", GROUP, _dag("c"))
+
+        assert cache.get("goal b", GROUP) is None
+        assert cache.get("goal a", GROUP) is not None
+        assert cache.stats.evictions == 1
+
+    def test_ttl_expiry(self):
+        clock = FakeClock()
+        cache = PlanCache(ttl_seconds=60, clock=clock)
+        cache.put("goal a", GROUP, _dag("a"))
+
+        clock.now = 61
+        assert cache.get("goal a", GROUP) is None
+        assert cache.stats.expirations == 1
+        assert len(cache) == 0
+
+
+class TestPlannerWithPlanCache:
+    """Test AgentPlanner consults the cache before calling the LLM."""
+
+    @pytest.mark.asyncio
+    async def test_second_similar_goal_skips_llm(self, mock_redis_client):
+        llm = MagicMock()
+        llm.generate_structured_output = AsyncMock(
+            return_value=_dag("Promote sneakers to Gen-Z audience").model_dump(
+                mode="json"
+            )
+        )
+        planner = AgentPlanner(
+            agent_id="agent_550e8400",
+            redis_client=mock_redis_client,
+            llm_client=llm,
+            niche="fashion",
+            plan_cache=PlanCache(),
+        )
+
+        first = await planner.decompose_goal("Promote sneakers to Gen-Z audience")
+        second = await planner.decompose_goal("Promote hoodies to Gen-Z audience")
+
+        assert llm.generate_structured_output.await_count == 1
+        assert planner.plan_cache.stats.hit_rate == 0.5
+        assert {t.task_id for t in first}.isdisjoint({t.task_id for t in second})
+        assert second[0].context["goal"] == "Promote hoodies to Gen-Z audience"
+
+    @pytest.mark.asyncio
+    async def test_agents_in_one_group_share_entries(self, mock_redis_client):
+        llm = MagicMock()
+        llm.generate_structured_output = AsyncMock(
+            return_value=_dag("Promote sneakers").model_dump(mode="json")
+        )
+        cache = PlanCache()
+        planners = [
+            AgentPlanner(
+                agent_id=f"agent_{i}",
+                redis_client=mock_redis_client,
+                llm_client=llm,
+                niche="fashion",
+                persona={"voice_traits": ["witty"], "backstory": backstory},
+                plan_cache=cache,
+            )
+            for i, backstory in enumerate(["Addis", "Nairobi"])
+        ]
+
+        for planner in planners:
+            await planner.decompose_goal("Promote sneakers to Gen-Z audience")
+
+        assert llm.generate_structured_output.await_count == 1
+        assert cache.stats.hits == 1
+
+
+pytestmark = pytest.mark.unit
@@ -22,6 +22,11 @@ except ImportError:
     TaskPriority = None
     TaskDAG = None
 
+try:
+    from src.planner.agent_planner import decompose_goal_many
+except ImportError:
+    decompose_goal_many = None
+
 
 class TestTaskModel:
     """Test Task data model from specs/technical.md Section 7.1."""
@@ -424,5 +429,90 @@ class TestPlannerStateManagement:
         assert mock_mcp_client.call_tool.call_count == 0
 
 
+class TestFleetDecomposition:
+    """Test batched goal decomposition across a fleet (Story 9.1)."""
+
+    @staticmethod
+    def _fleet(redis_client, llm_client, personas):
+        return [
+            AgentPlanner(
+                agent_id=f"agent_{i}",
+                redis_client=redis_client,
+                llm_client=llm_client,
+                niche=niche,
+                persona=persona,
+            )
+            for i, (niche, persona) in enumerate(personas)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_one_llm_call_per_group(self, mock_redis_client):
+        """Test LLM calls scale with distinct (niche, archetype) groups."""
+        from unittest.mock import AsyncMock, MagicMock
+
+        if decompose_goal_many is None:
+            pytest.skip("decompose_goal_many not implemented")
+
+        mock_llm = MagicMock()
+        mock_llm.generate_structured_output = AsyncMock(
+            return_value={
+                "steps": [
+                    {
+                        "step_id": "research",
+                        "task_type": "research_trends",
+                        "priority": "high",
+                    },
+                    {
+                        "step_id": "post",
+                        "task_type": "generate_content",
+                        "depends_on": ["research"],
+                    },
+                ]
+            }
+        )
+        witty = {"voice_traits": ["witty", "trendy"]}
+        formal = {"voice_traits": ["formal"]}
+        planners = self._fleet(
+            mock_redis_client,
+            mock_llm,
+            [("fashion", witty)] * 30
+            + [("fashion", formal)] * 10
+            + [("tech", witty)] * 10,
+        )
+
+        plans = await decompose_goal_many("Promote sustainable fashion week", planners)
+
+        assert mock_llm.generate_structured_output.await_count == 3
+        assert len(plans) == 50
+
+    @pytest.mark.asyncio
+    async def test_fan_out_creates_agent_specific_tasks(self, mock_redis_client):
+        """Test every agent gets its own task ids and dependency wiring."""
+        if decompose_goal_many is None:
+            pytest.skip("decompose_goal_many not implemented")
+
+        planners = self._fleet(
+            mock_redis_client, None, [("fashion", {"archetype": "curator"})] * 2
+        )
+
+        plans = await decompose_goal_many("Promote sustainable fashion week", planners)
+
+        first, second = plans["agent_0"], plans["agent_1"]
+        assert {t.agent_id for t in first} == {"agent_0"}
+        assert {t.task_id for t in first}.isdisjoint({t.task_id for t in second})
+        first_ids = {t.task_id for t in first}
+        for task in first:
+            assert set(task.dependencies) <= first_ids
+
+    @pytest.mark.asyncio
+    async def test_rejects_empty_goal(self, mock_redis_client):
+        """Test batched decomposition validates the goal once up front."""
+        if decompose_goal_many is None:
+            pytest.skip("decompose_goal_many not implemented")
+
+        with pytest.raises(ValueError):
+            await decompose_goal_many("  ", self._fleet(mock_redis_client, None, []))
+
+
 # Mark all tests in this module as unit tests
 pytestmark = pytest.mark.unit
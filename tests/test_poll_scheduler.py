@@ -0,0 +1,156 @@
+"""Test suite for the hierarchical timer wheel and shared poll scheduler.
+
+Validates that one wheel drives every agent's trend/mention polls with
+staggered first fires, O(1) pause/resume on agent_status changes and an
+observable next-fire backlog.
+"""
+
+import random
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.common.timer_wheel import TimerWheel
+from src.planner.agent_planner import AgentPlanner
+from src.planner.poll_scheduler import PollKind, PollScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTimerWheel:
+    """Test scheduling, cascading and cancellation."""
+
+    def test_fires_at_deadline(self):
+        wheel = TimerWheel()
+        wheel.schedule(5, "a")
+
+        assert wheel.advance(4) == []
+        assert wheel.advance(5) == ["a"]
+        assert len(wheel) == 0
+
+    def test_cascades_across_levels(self):
+        wheel = TimerWheel()
+        delays = [1, 63, 64, 65, 4095, 4096, 14400, 300000]
+        for delay in delays:
+            wheel.schedule(delay, delay)
+
+        fired = {}
+        for second in range(1, 300001):
+            for payload in wheel.advance(second):
+                fired[payload] = second
+
+        assert fired == {delay: delay for delay in delays}
+
+    def test_cancel_is_constant_time_removal(self):
+        wheel = TimerWheel()
+        timer = wheel.schedule(100, "a")
+
+        assert wheel.cancel(timer) is True
+        assert wheel.cancel(timer) is False
+        assert wheel.advance(200) == []
+
+    def test_overflow_beyond_top_level(self):
+        wheel = TimerWheel(slot_bits=2, levels=2)
+        wheel.schedule(40, "far")
+
+        assert wheel.advance(39) == []
+        assert wheel.advance(40) == ["far"]
+
+
+def _planner(agent_id: str, status: str = "active") -> AgentPlanner:
+    planner = AgentPlanner(agent_id=agent_id, redis_client=MagicMock(), llm_client=None)
+    planner.poll_resources = AsyncMock(return_value=[])
+    planner.poll_mentions = AsyncMock(return_value=[])
+    planner.agent_status = status
+    return planner
+
+
+class TestPollScheduler:
+    """Test fleet-wide polling on one wheel."""
+
+    @pytest.mark.asyncio
+    async def test_each_agent_polls_once_per_interval(self):
+        clock = FakeClock()
+        scheduler = PollScheduler(
+            intervals={PollKind.TRENDS: 100, PollKind.MENTIONS: 10},
+            jitter_ratio=0.0,
+            clock=clock,
+        )
+        planners = [_planner(f"agent_{i}") for i in range(20)]
+        for planner in planners:
+            scheduler.register(planner)
+
+        for second in range(1, 101):
+            clock.now = second
+            await scheduler.run_due()
+
+        for planner in planners:
+            assert planner.poll_resources.await_count == 1
+            assert planner.poll_mentions.await_count == 10
+
+    def test_first_fires_are_staggered(self):
+        scheduler = PollScheduler(
+            intervals={PollKind.TRENDS: 3600}, clock=FakeClock(), rng=random.Random(7)
+        )
+        for i in range(300):
+            scheduler.register(_planner(f"agent_{i}"))
+
+        backlog = scheduler.backlog(horizon_seconds=3600, bucket_seconds=360)
+
+        assert sum(backlog) == 300
+        assert max(backlog) < 60
+
+    @pytest.mark.asyncio
+    async def test_status_change_pauses_and_resumes(self):
+        clock = FakeClock()
+        scheduler = PollScheduler(
+            intervals={PollKind.TRENDS: 100, PollKind.MENTIONS: 10},
+            jitter_ratio=0.0,
+            clock=clock,
+        )
+        planner = _planner("agent_1")
+        scheduler.register(planner)
+        assert len(scheduler.wheel) == 2
+
+        planner.agent_status = "paused"
+        assert len(scheduler.wheel) == 0
+
+        clock.now = 200
+        assert await scheduler.run_due() == 0
+        planner.poll_resources.assert_not_awaited()
+
+        planner.agent_status = "active"
+        assert len(scheduler.wheel) == 2
+
+    @pytest.mark.asyncio
+    async def test_inactive_agent_is_not_armed(self):
+        scheduler = PollScheduler(clock=FakeClock())
+        scheduler.register(_planner("agent_1", status="stopped"))
+
+        assert len(scheduler.wheel) == 0
+
+    @pytest.mark.asyncio
+    async def test_failing_poll_does_not_stop_others(self):
+        clock = FakeClock()
+        scheduler = PollScheduler(
+            intervals={PollKind.TRENDS: 10}, jitter_ratio=0.0, clock=clock
+        )
+        broken, healthy = _planner("broken"), _planner("healthy")
+        broken.poll_resources.side_effect = TimeoutError()
+        scheduler.register(broken)
+        scheduler.register(healthy)
+
+        clock.now = 10
+        await scheduler.run_due()
+
+        healthy.poll_resources.assert_awaited_once()
+        assert len(scheduler.wheel) == 2
+
+
+pytestmark = pytest.mark.unit
@@ -0,0 +1,132 @@
+"""Test suite for the streaming caption pre-check.
+
+Validates incremental blocked-term and length checks, that the worker aborts
+a streaming caption at the first violation without generating an image or
+calling the Judge, and the time-to-reject and wasted-token counters.
+"""
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.worker.precheck import PrecheckPolicy
+from src.worker.task_executor import TaskWorker
+
+GOOD_CAPTION = "Golden hour over the Nairobi skyline, and the city hums along with it."
+
+
+class StreamingLLM:
+    """Yields a caption word by word and records how much was consumed."""
+
+    def __init__(self, text: str):
+        self.words = [w + " " for w in text.split()]
+        self.yielded = 0
+        self.closed = False
+
+    async def stream(self, prompt: str):
+        try:
+            for word in self.words:
+                self.yielded += 1
+                yield word
+        finally:
+            self.closed = True
+
+
+def _task() -> dict:
+    return {
+        "task_id": "t1",
+        "task_type": "generate_content",
+        "agent_id": "a1",
+        "context": {"topic": "Nairobi"},
+    }
+
+
+class TestCaptionScanner:
+    """Test the incremental checks."""
+
+    def test_blocked_term_found_across_chunks(self):
+        scanner = PrecheckPolicy(blocked_terms=["miracle cure"]).scanner()
+
+        assert scanner.feed("Try this mir") is None
+        assert scanner.feed("acle cu") is None
+        assert scanner.feed("re") is None
+        assert scanner.feed(" today") == "blocked_term"
+
+    def test_term_prefix_of_longer_word_is_not_blocked(self):
+        scanner = PrecheckPolicy(blocked_terms=["porn"], min_chars=0).scanner()
+
+        assert scanner.feed("porn") is None
+        assert scanner.feed("ography of light") is None
+        assert scanner.finish() is None
+
+    def test_term_at_end_is_caught_on_finish(self):
+        scanner = PrecheckPolicy(blocked_terms=["nsfw"], min_chars=0).scanner()
+
+        assert scanner.check("totally NSFW") == "blocked_term"
+
+    def test_length_limits(self):
+        policy = PrecheckPolicy(max_chars=10, min_chars=5, blocked_terms=())
+        scanner = policy.scanner()
+
+        assert scanner.feed("0123456789") is None
+        assert scanner.feed("x") == "too_long"
+        assert policy.scanner().check("hey") == "too_short"
+
+
+class TestWorkerPrecheck:
+    """Test the streaming content path."""
+
+    @pytest.mark.asyncio
+    async def test_violation_aborts_stream_before_image_and_judge(
+        self, mock_mcp_client
+    ):
+        mock_mcp_client.call_tool.return_value = {"memories": []}
+        llm = StreamingLLM("Forget the doctors, this miracle cure " + "word " * 50)
+        judge = AsyncMock()
+        worker = TaskWorker("w1", mock_mcp_client, judge, llm_client=llm)
+
+        result = await worker.execute_task(_task())
+
+        assert (result.status, result.reason) == ("rejected", "precheck:blocked_term")
+        assert llm.yielded == 6
+        assert llm.closed
+        tools = [call.args[0] for call in mock_mcp_client.call_tool.call_args_list]
+        assert "generate_image" not in tools
+        judge.validate.assert_not_awaited()
+        stats = worker.precheck_stats.snapshot()
+        assert stats["rejected_by_reason"] == {"blocked_term": 1}
+        assert stats["aborted_streams"] == 1
+        assert stats["wasted_tokens"] == 6
+        assert stats["mean_time_to_reject_ms"] > 0
+
+    @pytest.mark.asyncio
+    async def test_passing_caption_goes_on_to_image(self, mock_mcp_client):
+        mock_mcp_client.call_tool.return_value = {"url": "https://img/1.png"}
+        llm = StreamingLLM(GOOD_CAPTION)
+        worker = TaskWorker("w1", mock_mcp_client, None, llm_client=llm)
+
+        result = await worker.execute_task(_task())
+
+        assert result.status == "complete"
+        assert result.output.caption == GOOD_CAPTION
+        assert result.output.image_url == "https://img/1.png"
+        assert worker.precheck_stats.snapshot()["passed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_non_streaming_llm_is_checked_whole(self, mock_mcp_client):
+        mock_mcp_client.call_tool.return_value = {"memories": []}
+
+        class WholeLLM:
+            async def generate(self, prompt: str) -> str:
+                return "too short"
+
+        worker = TaskWorker("w1", mock_mcp_client, None, llm_client=WholeLLM())
+
+        result = await worker.execute_task(_task())
+
+        assert result.reason == "precheck:too_short"
+        assert worker.precheck_stats.snapshot()["aborted_streams"] == 0
+        assert worker.precheck_stats.snapshot()["wasted_tokens"] == 2
+
+
+pytestmark = pytest.mark.unit
@@ -0,0 +1,159 @@
+"""Test suite for speculative prefetch of worker inputs.
+
+Validates planner-issued hints, the worker consuming warm inputs instead of
+calling search_memory itself, and hit/waste accounting.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.common.prefetch import (
+    PREFETCH_CONTEXT_KEY,
+    Prefetcher,
+    WarmCache,
+    hashtag_candidates,
+)
+from src.common.task_queue import TaskQueue
+from src.planner.agent_planner import AgentPlanner
+from src.planner.dag_scheduler import DagScheduler
+from src.worker.task_executor import TaskWorker
+
+
+def _tool_calls(mcp_client, name: str) -> list:
+    return [c for c in mcp_client.call_tool.await_args_list if c.args[0] == name]
+
+
+class TestHashtags:
+    """Test hashtag candidate derivation."""
+
+    def test_trend_tags_then_topic_words(self):
+        tags = hashtag_candidates("Addis fashion week", ["#AFW", "afw"])
+
+        assert tags == ["#AFW", "#AddisFashionWeek", "#addis", "#fashion", "#week"]
+
+    def test_empty_topic(self):
+        assert hashtag_candidates("") == []
+
+
+class TestPlannerHints:
+    """Test the planner attaches hints to parents of content tasks."""
+
+    @pytest.mark.asyncio
+    async def test_research_task_carries_hint_for_generate(self, fake_redis):
+        planner = AgentPlanner(
+            agent_id="agent_1", redis_client=fake_redis, llm_client=None
+        )
+        research, generate, publish = await planner.decompose_goal(
+            "Promote sustainable fashion week"
+        )
+
+        await planner.enqueue_dag([research, generate, publish])
+
+        (hint,) = research.context[PREFETCH_CONTEXT_KEY]
+        assert hint["task_id"] == generate.task_id
+        assert hint["query"] == "Promote sustainable fashion week"
+        assert PREFETCH_CONTEXT_KEY not in generate.context
+        assert PREFETCH_CONTEXT_KEY not in publish.context
+
+
+class TestWorkerPrefetch:
+    """Test the worker fires hints and reads the warm cache."""
+
+    @pytest.mark.asyncio
+    async def test_child_reads_warm_inputs(self, fake_redis, mock_mcp_client):
+        mock_mcp_client.call_tool = AsyncMock(
+            return_value={"memories": [{"content": "Loved last year's show"}]}
+        )
+        planner = AgentPlanner(
+            agent_id="agent_1", redis_client=fake_redis, llm_client=None
+        )
+        tasks = await planner.decompose_goal("Promote sustainable fashion week")
+        await planner.enqueue_dag(tasks)
+        queue = TaskQueue(fake_redis)
+        cache = WarmCache(fake_redis)
+        persona_loader = AsyncMock(return_value={"voice_traits": ["witty"]})
+        worker = TaskWorker(
+            worker_id="worker_1",
+            mcp_client=mock_mcp_client,
+            judge_client=None,
+            task_queue=queue,
+            scheduler=DagScheduler(fake_redis, queue),
+            prefetcher=Prefetcher(mock_mcp_client, cache, persona_loader),
+        )
+        prompts = []
+        build_prompt = worker._build_content_prompt
+
+        def spy(**kwargs):
+            prompts.append(kwargs)
+            return build_prompt(**kwargs)
+
+        worker._build_content_prompt = spy
+
+        await worker.run_once()  # research: fires the prefetch
+        await asyncio.gather(*worker._prefetches)
+        searches_before = len(_tool_calls(mock_mcp_client, "search_memory"))
+        await worker.run_once()  # generate: reads the warm cache
+
+        assert len(_tool_calls(mock_mcp_client, "search_memory")) == searches_before
+        assert prompts[0]["persona"] == {"voice_traits": ["witty"]}
+        assert "#PromoteSustainableFashionWeek" in prompts[0]["hashtags"]
+        persona_loader.assert_awaited_once_with("agent_1")
+        stats = cache.stats()
+        assert (stats["hits"], stats["wasted"]) == (1, 0)
+
+    @pytest.mark.asyncio
+    async def test_miss_falls_back_to_search(self, fake_redis, mock_mcp_client):
+        mock_mcp_client.call_tool = AsyncMock(return_value={"memories": []})
+        cache = WarmCache(fake_redis)
+        worker = TaskWorker(
+            worker_id="worker_1",
+            mcp_client=mock_mcp_client,
+            judge_client=None,
+            prefetcher=Prefetcher(mock_mcp_client, cache),
+        )
+
+        await worker.execute_task(
+            {"task_id": "t1", "task_type": "generate_content", "context": {}}
+        )
+
+        assert len(_tool_calls(mock_mcp_client, "search_memory")) == 1
+        assert cache.stats()["misses"] == 1
+
+
+class TestWarmCache:
+    """Test waste accounting and failure handling."""
+
+    def test_unconsumed_prefetch_is_wasted(self, fake_redis):
+        cache = WarmCache(fake_redis)
+        written = cache.put("t1", {"memories": []})
+        cache.put("t2", {"memories": []})
+        cache.consume("t2")
+
+        stats = cache.stats()
+
+        assert stats["wasted"] == 1
+        assert stats["wasted_bytes"] == written
+        assert stats["waste_ratio"] == 0.5
+
+    def test_entries_expire(self, fake_redis):
+        cache = WarmCache(fake_redis, ttl_seconds=30)
+        cache.put("t1", {})
+
+        assert 0 < fake_redis.ttl("{chimera}:warm:t1") <= 30
+
+    @pytest.mark.asyncio
+    async def test_failed_prefetch_is_swallowed(self, fake_redis, mock_mcp_client):
+        mock_mcp_client.call_tool = AsyncMock(side_effect=ConnectionError("down"))
+        prefetcher = Prefetcher(mock_mcp_client, WarmCache(fake_redis))
+
+        written = await prefetcher.prefetch_all(
+            [{"task_id": "t1", "agent_id": "agent_1", "query": "x"}]
+        )
+
+        assert written == 0
+        assert fake_redis.get("{chimera}:warm:t1") is None
+
+
+pytestmark = pytest.mark.unit
@@ -0,0 +1,163 @@
+"""Test suite for the distributed rate limiter.
+
+Validates bucket keying, refill and burst limits shared across processes,
+the local token cache, wait estimates, and that the wrapped client defers
+rate-limited work to the worker's delayed retries.
+"""
+
+import pytest
+
+from src.common.rate_limiter import (
+    RateLimitedClient,
+    RateLimiter,
+    RateLimitError,
+    ToolQuota,
+)
+from src.worker.task_executor import TaskWorker
+
+QUOTAS = {
+    "post_content": ToolQuota(1.0, 3, "twitter", account_field="agent_id"),
+    "generate_image": ToolQuota(2.0, 10, "ideogram", prefetch=5),
+}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _limiter(redis_client, clock, **kwargs) -> RateLimiter:
+    return RateLimiter(redis_client, quotas=QUOTAS, clock=clock, **kwargs)
+
+
+class TestRateLimiter:
+    """Test the token buckets."""
+
+    def test_buckets_are_keyed_by_platform_account_and_tool(self, fake_redis):
+        limiter = _limiter(fake_redis, FakeClock())
+
+        assert (
+            limiter.bucket_key("post_content", {"agent_id": "a1"})
+            == "{chimera}:ratelimit:twitter:a1:post_content"
+        )
+        assert (
+            limiter.bucket_key("post_content", {"agent_id": "a1", "platform": "ig"})
+            == "{chimera}:ratelimit:ig:a1:post_content"
+        )
+        assert (
+            limiter.bucket_key("generate_image", {})
+            == "{chimera}:ratelimit:ideogram:shared:generate_image"
+        )
+        assert limiter.bucket_key("search_memory", {}) is None
+
+    def test_burst_then_refill_across_processes(self, fake_redis):
+        clock = FakeClock()
+        pod_a = _limiter(fake_redis, clock)
+        pod_b = _limiter(fake_redis, clock)
+        args = {"agent_id": "a1"}
+
+        waits = [pod.try_acquire("post_content", args) for pod in (pod_a, pod_b) * 2]
+
+        assert waits[:3] == [0.0, 0.0, 0.0]
+        assert waits[3] == pytest.approx(1.0)
+        assert pod_a.try_acquire("post_content", {"agent_id": "a2"}) == 0.0
+        clock.now += 1
+        assert pod_b.try_acquire("post_content", args) == 0.0
+
+    def test_prefetched_tokens_skip_redis(self, fake_redis):
+        clock = FakeClock()
+        limiter = _limiter(fake_redis, clock)
+
+        for _ in range(5):
+            assert limiter.try_acquire("generate_image", {}) == 0.0
+
+        assert limiter.stats()["redis_calls"] == 1
+        assert limiter.stats()["local_grants"] == 4
+
+    def test_expired_local_tokens_are_not_spent(self, fake_redis):
+        clock = FakeClock()
+        limiter = _limiter(fake_redis, clock, local_ttl_seconds=1.0)
+        limiter.try_acquire("generate_image", {})
+        clock.now += 1.5
+
+        limiter.try_acquire("generate_image", {})
+
+        assert limiter.stats()["redis_calls"] == 2
+
+    def test_wait_estimate_does_not_take_tokens(self, fake_redis):
+        clock = FakeClock()
+        limiter = _limiter(fake_redis, clock)
+        args = {"agent_id": "a1"}
+
+        assert limiter.wait_time("post_content", args) == 0.0
+        for _ in range(3):
+            limiter.try_acquire("post_content", args)
+        other = _limiter(fake_redis, clock)
+
+        assert other.wait_time("post_content", args) == pytest.approx(1.0)
+        clock.now += 0.5
+        assert limiter.try_acquire("post_content", args) == pytest.approx(0.5)
+        calls = limiter.stats()["redis_calls"]
+        assert limiter.wait_time("post_content", args) == pytest.approx(0.5)
+        assert limiter.stats()["redis_calls"] == calls
+
+    @pytest.mark.asyncio
+    async def test_acquire_waits_short_and_raises_long(self, fake_redis):
+        clock = FakeClock()
+        limiter = _limiter(fake_redis, clock)
+        args = {"agent_id": "a1"}
+        for _ in range(3):
+            await limiter.acquire("post_content", args)
+
+        with pytest.raises(RateLimitError) as raised:
+            await limiter.acquire("post_content", args, max_wait_seconds=0.5)
+
+        assert raised.value.retry_after == pytest.approx(1.0)
+
+    def test_invalid_quota_is_rejected(self):
+        with pytest.raises(ValueError):
+            ToolQuota(0, 10, "twitter")
+        with pytest.raises(ValueError):
+            ToolQuota(1.0, 2, "twitter", prefetch=3)
+
+
+class TestRateLimitedClient:
+    """Test the call_tool wrapper."""
+
+    @pytest.mark.asyncio
+    async def test_limited_publish_becomes_delayed_retry(
+        self, fake_redis, mock_mcp_client
+    ):
+        mock_mcp_client.call_tool.return_value = {"post_id": "1"}
+        limiter = _limiter(fake_redis, FakeClock())
+        client = RateLimitedClient(mock_mcp_client, limiter, max_wait_seconds=0)
+        worker = TaskWorker("w1", client, None)
+        task = {
+            "task_id": "t1",
+            "task_type": "publish_content",
+            "agent_id": "a1",
+            "context": {"caption": "hello"},
+        }
+
+        results = [await worker.execute_task(task) for _ in range(4)]
+
+        assert [r.status for r in results] == ["complete"] * 3 + ["retry"]
+        assert results[3].retry_after_seconds == pytest.approx(1.0, rel=0.1)
+        posts = [
+            call
+            for call in mock_mcp_client.call_tool.call_args_list
+            if call.args[0] == "post_content"
+        ]
+        assert len(posts) == 3
+
+    @pytest.mark.asyncio
+    async def test_delegates_other_attributes(self, fake_redis, mock_mcp_client):
+        client = RateLimitedClient(mock_mcp_client, _limiter(fake_redis, FakeClock()))
+
+        assert await client.list_tools() == []
+
+
+pytestmark = pytest.mark.unit
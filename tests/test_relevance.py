@@ -0,0 +1,117 @@
+"""Test suite for vectorized trend-to-agent relevance routing.
+
+Validates matrix scoring, per-agent thresholds and planner dispatch.
+"""
+
+import time
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from src.planner.agent_planner import AgentPlanner
+from src.planner.relevance import RelevanceEngine, agent_profile_text
+from src.planner.trend_fetcher import Trend
+
+
+def _trend(topic: str, relevance: float) -> Trend:
+    return Trend(
+        trend_id=topic,
+        topic=topic,
+        relevance_score=relevance,
+        volume=1000,
+        source="twitter",
+        discovered_at=datetime.utcnow(),
+    )
+
+
+class TestRelevanceEngine:
+    """Test batched scoring against the agent matrix."""
+
+    def test_semantic_match_routes_to_matching_niche(self):
+        engine = RelevanceEngine(semantic_weight=0.5)
+        engine.add_agent("fashion", "ethiopian fashion", 0.6)
+        engine.add_agent("crypto", "crypto defi", 0.6)
+
+        routed = engine.route([_trend("Ethiopian fashion week", 0.8)])
+
+        assert list(routed) == ["fashion"]
+
+    def test_per_agent_thresholds(self):
+        engine = RelevanceEngine(semantic_weight=0.0)
+        engine.add_agent("strict", "fashion", 0.9)
+        engine.add_agent("lenient", "fashion", 0.5)
+
+        routed = engine.route([_trend("a", 0.95), _trend("b", 0.6)])
+
+        assert [t.topic for t in routed["strict"]] == ["a"]
+        assert [t.topic for t in routed["lenient"]] == ["a", "b"]
+
+    def test_remove_agent_keeps_rows_consistent(self):
+        engine = RelevanceEngine(semantic_weight=0.0)
+        for i in range(40):
+            engine.add_agent(f"agent_{i}", "fashion", 0.5 if i == 39 else 0.99)
+
+        engine.remove_agent("agent_0")
+
+        assert len(engine) == 39
+        assert list(engine.route([_trend("a", 0.6)])) == ["agent_39"]
+
+    def test_score_shape(self):
+        engine = RelevanceEngine()
+        engine.add_agent("a", "fashion", 0.5)
+        engine.add_agent("b", "tech", 0.5)
+
+        scores = engine.score([_trend("x", 0.5)] * 3)
+
+        assert scores.shape == (3, 2)
+        assert np.all((scores >= 0.0) & (scores <= 1.0))
+
+    def test_routes_fleet_batch_in_milliseconds(self):
+        engine = RelevanceEngine()
+        niches = ["fashion", "tech", "food", "music", "travel"]
+        for i in range(1000):
+            engine.add_agent(f"agent_{i}", niches[i % 5], 0.7)
+        trends = [_trend(f"{niches[i % 5]} topic {i}", 0.9) for i in range(100)]
+
+        start = time.perf_counter()
+        routed = engine.route(trends)
+        elapsed = time.perf_counter() - start
+
+        assert len(routed) == 1000
+        assert elapsed < 0.5
+
+
+class TestRelevanceDispatch:
+    """Test routed trends become planner tasks."""
+
+    def test_profile_text_uses_niche_and_beliefs(self):
+        text = agent_profile_text(
+            "ethiopian_fashion", {"core_beliefs": ["sustainability"]}
+        )
+
+        assert text == "ethiopian fashion sustainability"
+
+    @pytest.mark.asyncio
+    async def test_dispatch_enqueues_for_routed_planners(self, mock_redis_client):
+        engine = RelevanceEngine(semantic_weight=0.0)
+        planners = []
+        for i, score in enumerate([0.9, 0.99]):
+            planner = AgentPlanner(
+                agent_id=f"agent_{i}",
+                redis_client=mock_redis_client,
+                llm_client=None,
+                niche="fashion",
+                min_relevance_score=score,
+            )
+            planner.agent_status = "active"
+            engine.add_planner(planner)
+            planners.append(planner)
+
+        created = await engine.dispatch([_trend("Ethiopian fashion week", 0.95)])
+
+        assert created == 1
+        assert mock_redis_client.lpush.call_count == 1
+
+
+pytestmark = pytest.mark.unit
@@ -0,0 +1,83 @@
+"""Test suite for the worker retry policy.
+
+Validates the Story 10.1 backoff schedule, the rate-limit wait, the retry
+cap, jitter bounds, and that retryable failures never hold a worker slot.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from src.worker.retry import RetryPolicy
+from src.worker.task_executor import RateLimitError, TaskWorker
+
+
+class TestRetryPolicy:
+    """Test delay selection."""
+
+    def test_exponential_backoff_then_exhausted(self):
+        policy = RetryPolicy(jitter=0)
+
+        assert [policy.delay(attempt) for attempt in range(4)] == [1, 2, 4, None]
+
+    def test_rate_limit_waits_fifteen_minutes_or_retry_after(self):
+        policy = RetryPolicy(jitter=0)
+
+        assert policy.delay(0, rate_limited=True) == 900
+        assert policy.delay(1, rate_limited=True, retry_after=30) == 30
+
+    def test_jitter_stays_within_bounds(self):
+        low = RetryPolicy(jitter=0.1, rng=lambda: 0.0)
+        high = RetryPolicy(jitter=0.1, rng=lambda: 1.0)
+
+        assert low.delay(2) == pytest.approx(3.6)
+        assert high.delay(2) == pytest.approx(4.4)
+
+    def test_requires_a_backoff_schedule(self):
+        with pytest.raises(ValueError):
+            RetryPolicy(backoff_seconds=())
+
+
+class RateLimitedMCP:
+    """MCP stand-in that is rate limited after a short delay."""
+
+    async def call_tool(self, name, arguments):
+        await asyncio.sleep(0.01)
+        if name == "search_memory":
+            return {"memories": []}
+        raise RateLimitError("429 Too Many Requests")
+
+
+class TestWorkerRetries:
+    """Test that retries are scheduled, not slept."""
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_does_not_hold_the_worker(self):
+        worker = TaskWorker("w1", RateLimitedMCP(), None)
+        task = {"task_id": "t1", "task_type": "research_trends", "context": {}}
+
+        start = time.perf_counter()
+        result = await worker.execute_task(task)
+
+        assert time.perf_counter() - start < 1.0
+        assert result.status == "retry"
+        assert 810 <= result.retry_after_seconds <= 990
+
+    @pytest.mark.asyncio
+    async def test_spent_retries_fail_the_task(self):
+        worker = TaskWorker("w1", RateLimitedMCP(), None)
+        task = {
+            "task_id": "t1",
+            "task_type": "research_trends",
+            "context": {},
+            "attempt": 3,
+        }
+
+        result = await worker.execute_task(task)
+
+        assert result.status == "failed"
+        assert result.retry_after_seconds is None
+
+
+pytestmark = pytest.mark.unit
@@ -0,0 +1,190 @@
+"""Test suite for planner sharding.
+
+Validates ring balance and minimal movement, lease-enforced single ownership
+across replicas, clean handoff on shutdown, agents configured from their
+records, one shared trend fetch for every hosted agent and per-agent memory
+footprint.
+"""
+
+import json
+import tracemalloc
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.planner.checkpoint import PlannerCheckpointer
+from src.planner.sharding import HashRing, PlannerRuntime
+from src.planner.trend_fetcher import TrendFetcher
+
+AGENTS = [f"agent_{i}" for i in range(200)]
+
+
+def _runtime(redis_client, replica_id: str, **kwargs) -> PlannerRuntime:
+    return PlannerRuntime(replica_id, redis_client, roster=lambda: AGENTS, **kwargs)
+
+
+class TestHashRing:
+    """Test the consistent-hash ring."""
+
+    def test_spread_is_balanced(self):
+        ring = HashRing([f"replica_{i}" for i in range(4)])
+        counts = {}
+        for i in range(10000):
+            owner = ring.owner(f"agent_{i}")
+            counts[owner] = counts.get(owner, 0) + 1
+
+        assert len(counts) == 4
+        assert all(1500 < count < 3500 for count in counts.values())
+
+    def test_join_moves_only_its_share(self):
+        keys = [f"agent_{i}" for i in range(10000)]
+        ring = HashRing([f"replica_{i}" for i in range(4)])
+        before = {key: ring.owner(key) for key in keys}
+
+        ring.add("replica_4")
+        moved = [key for key in keys if ring.owner(key) != before[key]]
+
+        assert all(ring.owner(key) == "replica_4" for key in moved)
+        assert len(moved) < 0.3 * len(keys)
+
+    def test_remove_restores_previous_owners(self):
+        ring = HashRing(["a", "b"])
+        before = {key: ring.owner(key) for key in AGENTS}
+
+        ring.add("c")
+        ring.remove("c")
+
+        assert {key: ring.owner(key) for key in AGENTS} == before
+        assert HashRing().owner("agent_1") is None
+
+
+class TestPlannerRuntime:
+    """Test lease-based ownership across replicas."""
+
+    def test_single_replica_hosts_everyone(self, fake_redis):
+        runtime = _runtime(fake_redis, "r1")
+
+        stats = runtime.rebalance()
+
+        assert stats["hosted"] == len(AGENTS)
+        assert fake_redis.get("{chimera}:planners:lease:agent_0") == b"r1"
+        assert runtime.planners["agent_0"].task_queue is runtime.task_queue
+
+    def test_join_splits_agents_without_double_ownership(self, fake_redis):
+        r1 = _runtime(fake_redis, "r1")
+        r2 = _runtime(fake_redis, "r2")
+        r1.rebalance()
+
+        # r2 joins but r1 still holds the leases until its next tick.
+        first = r2.rebalance()
+        assert first["hosted"] == 0
+        assert first["pending"] > 0
+        assert not set(r1.planners) & set(r2.planners)
+
+        r1.rebalance()
+        r2.rebalance()
+
+        assert not set(r1.planners) & set(r2.planners)
+        assert set(r1.planners) | set(r2.planners) == set(AGENTS)
+        assert 50 < len(r2.planners) < 150
+
+    def test_shutdown_hands_agents_over_with_state(self, fake_redis):
+        checkpointer = PlannerCheckpointer(fake_redis)
+        r1 = _runtime(fake_redis, "r1", checkpointer=checkpointer)
+        r2 = _runtime(fake_redis, "r2", checkpointer=checkpointer)
+        r1.rebalance()
+        r1.planners["agent_7"].agent_status = "active"
+
+        r1.shutdown()
+        stats = r2.rebalance()
+
+        assert stats["hosted"] == len(AGENTS)
+        assert r1.planners == {}
+        assert r2.planners["agent_7"].agent_status == "active"
+
+    def test_foreign_lease_blocks_acquisition(self, fake_redis):
+        fake_redis.set("{chimera}:planners:lease:agent_3", "elsewhere", px=60000)
+        runtime = _runtime(fake_redis, "r1")
+
+        stats = runtime.rebalance()
+
+        assert "agent_3" not in runtime.planners
+        assert stats["pending"] == 1
+
+    def test_lost_lease_detaches_without_release(self, fake_redis):
+        runtime = _runtime(fake_redis, "r1")
+        runtime.rebalance()
+        fake_redis.set("{chimera}:planners:lease:agent_3", "elsewhere", px=60000)
+
+        runtime.rebalance()
+
+        assert "agent_3" not in runtime.planners
+        assert fake_redis.get("{chimera}:planners:lease:agent_3") == b"elsewhere"
+
+    @pytest.mark.asyncio
+    async def test_attached_agent_is_configured_from_its_record(self, fake_redis):
+        fake_redis.hset(
+            "{chimera}:agents:agent_1",
+            mapping={
+                "niche": "ethiopian_fashion",
+                "region": "ethiopia",
+                "status": "active",
+                "persona": json.dumps({"voice_traits": ["witty", "trendy"]}),
+            },
+        )
+        runtime = PlannerRuntime("r1", fake_redis, roster=lambda: ["agent_1"])
+        runtime.rebalance()
+        planner = runtime.planners["agent_1"]
+
+        assert (planner.niche, planner.region) == ("ethiopian_fashion", "ethiopia")
+        assert planner.persona == {"voice_traits": ["witty", "trendy"]}
+        assert planner.agent_status == "active"
+        tasks = await planner.decompose_goal("Promote sustainable fashion week")
+        assert await planner.enqueue_dag(tasks) == [tasks[0].task_id]
+        assert sum(runtime.task_queue.depth().values()) == 1
+
+    def test_status_changes_reach_hosted_agents(self, fake_redis):
+        runtime = PlannerRuntime("r1", fake_redis, roster=lambda: ["agent_1"])
+        runtime.rebalance()
+        assert runtime.planners["agent_1"].agent_status == "paused"
+
+        fake_redis.hset("{chimera}:agents:agent_1", "status", "active")
+        runtime.rebalance()
+        assert runtime.planners["agent_1"].agent_status == "active"
+
+        fake_redis.hset("{chimera}:agents:agent_1", "status", "bogus")
+        runtime.rebalance()
+        assert runtime.planners["agent_1"].agent_status == "active"
+
+    @pytest.mark.asyncio
+    async def test_hosted_agents_share_one_trend_fetch(
+        self, fake_redis, mock_mcp_client
+    ):
+        mock_mcp_client.call_tool = AsyncMock(return_value={"trends": []})
+        fetcher = TrendFetcher(mock_mcp_client)
+        runtime = _runtime(fake_redis, "r1", trend_fetcher=fetcher)
+        runtime.rebalance()
+
+        assert await fetcher.refresh() == len(AGENTS)
+        assert mock_mcp_client.call_tool.await_count == 1
+
+        runtime.shutdown()
+        assert fetcher.subscription_keys == []
+
+    def test_planner_footprint_is_kilobytes(self, fake_redis):
+        runtime = PlannerRuntime(
+            "r1", fake_redis, roster=lambda: [f"agent_{i}" for i in range(1000)]
+        )
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            runtime.rebalance()
+            after = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+
+        assert len(runtime.planners) == 1000
+        assert (after - before) / 1000 < 16 * 1024
+
+
+pytestmark = pytest.mark.unit
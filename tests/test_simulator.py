@@ -0,0 +1,134 @@
+"""Test suite for the discrete-event swarm simulator.
+
+Validates dependency ordering, capacity behaviour as the worker pool grows,
+cost accounting, determinism and that 1,000 agents simulate in seconds.
+"""
+
+import time
+
+import pytest
+
+from src.planner.agent_planner import PlannedStep, TaskDAG, TaskPriority
+from src.planner.fleet_planner import role_task_dag
+from src.planner.simulator import CallProfile, SwarmSimulator
+
+FIXED = {
+    "planner_enqueue": CallProfile(0.001, 0.001),
+    "search_memory": CallProfile(1.0, 1.0),
+    "get_trending_topics": CallProfile(1.0, 1.0),
+    "llm_generate": CallProfile(1.0, 1.0, cost_usd=0.01),
+    "generate_image": CallProfile(1.0, 1.0, cost_usd=0.08),
+    "post_content": CallProfile(1.0, 1.0),
+    "judge_validate": CallProfile(1.0, 1.0),
+}
+
+
+def _chain() -> TaskDAG:
+    return TaskDAG(
+        steps=[
+            PlannedStep(step_id="research", task_type="research_trends"),
+            PlannedStep(
+                step_id="generate",
+                task_type="generate_content",
+                depends_on=["research"],
+            ),
+            PlannedStep(
+                step_id="publish", task_type="publish_content", depends_on=["generate"]
+            ),
+        ]
+    )
+
+
+def _campaign(agents: int) -> dict:
+    roles = ["create", "research", "engage"]
+    return {
+        f"agent_{i}": role_task_dag(roles[i % 3], "Promote fashion week", "angle")
+        for i in range(agents)
+    }
+
+
+class TestSimulation:
+    """Test the event loop against hand-computed timelines."""
+
+    def test_single_chain_runs_in_dependency_order(self):
+        sim = SwarmSimulator(call_profiles=FIXED, judge_reject_rate=0.0)
+
+        report = sim.run({"agent_1": _chain()}, workers=4)
+
+        # research 2s + generate 4s (incl. judge) + publish 2s
+        assert report.completion_p50_seconds == pytest.approx(8.001)
+        assert report.cost_usd == pytest.approx(0.09, abs=1e-4)
+        assert report.cost_by_call["generate_image"] == pytest.approx(0.08)
+
+    def test_queue_builds_when_workers_are_scarce(self):
+        sim = SwarmSimulator(call_profiles=FIXED, judge_reject_rate=0.0)
+        dags = {f"agent_{i}": _chain() for i in range(10)}
+
+        one = sim.run(dags, workers=1)
+        ten = sim.run(dags, workers=10)
+
+        assert one.makespan_seconds == pytest.approx(80.001)
+        assert ten.makespan_seconds == pytest.approx(8.001)
+        assert one.peak_queue_depth == 9
+        assert one.completion_p95_seconds > ten.completion_p95_seconds
+
+    def test_high_lane_served_before_low(self):
+        sim = SwarmSimulator(call_profiles=FIXED)
+
+        def single(priority: TaskPriority) -> TaskDAG:
+            return TaskDAG(
+                steps=[
+                    PlannedStep(
+                        step_id="a", task_type="research_trends", priority=priority
+                    )
+                ]
+            )
+
+        report = sim.run(
+            {"low": single(TaskPriority.LOW), "high": single(TaskPriority.HIGH)},
+            workers=1,
+        )
+
+        assert report.completion_p50_seconds == pytest.approx(3.0, abs=0.01)
+
+    def test_rejections_are_reexecuted(self):
+        sim = SwarmSimulator(call_profiles=FIXED, judge_reject_rate=1.0)
+
+        report = sim.run({"agent_1": _chain()}, workers=1)
+
+        assert report.rejections == 1
+        assert report.cost_by_call["generate_image"] == pytest.approx(0.16)
+
+    def test_unknown_task_type_is_rejected(self):
+        dag = TaskDAG(steps=[PlannedStep(step_id="a", task_type="dance")])
+
+        with pytest.raises(ValueError, match="dance"):
+            SwarmSimulator().run({"agent_1": dag}, workers=1)
+
+
+class TestCapacityPlanning:
+    """Test fleet-scale runs and pool sizing."""
+
+    def test_thousand_agents_in_seconds_and_deterministic(self):
+        dags = _campaign(1000)
+        start = time.perf_counter()
+        first = SwarmSimulator(seed=7).run(dags, workers=50)
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 5.0
+        assert first.agents == 1000
+        assert first.summary() == SwarmSimulator(seed=7).run(dags, 50).summary()
+        assert 0 < first.utilization <= 1.0
+
+    def test_min_workers_meets_target(self):
+        sim = SwarmSimulator()
+        dags = _campaign(300)
+
+        report = sim.min_workers(dags, p95_target_seconds=60.0)
+
+        assert report.completion_p95_seconds <= 60.0
+        assert sim.run(dags, report.workers - 1).completion_p95_seconds > 60.0
+        assert sim.min_workers(dags, p95_target_seconds=0.1) is None
+
+
+pytestmark = pytest.mark.unit
@@ -0,0 +1,209 @@
+"""Test suite for intra-task step graphs.
+
+Validates that independent steps overlap, the critical path is the chain
+that set the wall time, failures cancel sibling steps, and that the worker's
+handlers run their steps through the graph with timings recorded.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from src.worker.steps import Step, StepGraph, StepStats
+from src.worker.task_executor import TaskWorker
+
+
+def _sleeper(name: str, delay: float, log=None):
+    async def run(results):
+        if log is not None:
+            log.append(name)
+        await asyncio.sleep(delay)
+        return name
+
+    return run
+
+
+class DelayedMCP:
+    """MCP stand-in with a per-tool delay."""
+
+    def __init__(self, delays):
+        self.delays = delays
+        self.calls = []
+
+    async def call_tool(self, name, arguments):
+        self.calls.append(name)
+        await asyncio.sleep(self.delays.get(name, 0))
+        if name == "search_memory":
+            return {"memories": [{"content": "liked the linen drop"}]}
+        if name == "generate_image":
+            return {"url": "https://cdn.example/img.png"}
+        return {}
+
+
+class TestStepGraph:
+    """Test the step graph executor."""
+
+    @pytest.mark.asyncio
+    async def test_independent_steps_overlap(self):
+        graph = StepGraph(
+            [
+                Step("a", _sleeper("a", 0.05)),
+                Step("b", _sleeper("b", 0.05)),
+                Step("c", _sleeper("c", 0.01), after=("a", "b")),
+            ]
+        )
+
+        start = time.perf_counter()
+        run = await graph.run()
+        elapsed = time.perf_counter() - start
+
+        assert run.results == {"a": "a", "b": "b", "c": "c"}
+        assert elapsed < 0.09
+        assert run.timings["c"].start_ms >= run.timings["a"].end_ms
+
+    @pytest.mark.asyncio
+    async def test_critical_path_follows_slowest_chain(self):
+        graph = StepGraph(
+            [
+                Step("fast", _sleeper("fast", 0.01)),
+                Step("slow", _sleeper("slow", 0.06)),
+                Step("join", _sleeper("join", 0.01), after=("fast", "slow")),
+                Step("side", _sleeper("side", 0.02), after=("fast",)),
+            ]
+        )
+
+        run = await graph.run()
+
+        assert run.critical_path == ["slow", "join"]
+        assert set(run.durations()) == {"fast", "slow", "join", "side"}
+
+    @pytest.mark.asyncio
+    async def test_seeded_steps_are_skipped(self):
+        log = []
+        graph = StepGraph(
+            [
+                Step("a", _sleeper("a", 0, log)),
+                Step("b", _sleeper("b", 0, log), after=("a",)),
+            ]
+        )
+
+        run = await graph.run({"a": "seed"})
+
+        assert log == ["b"]
+        assert run.results["a"] == "seed"
+
+    @pytest.mark.asyncio
+    async def test_failure_cancels_running_steps(self):
+        cancelled = asyncio.Event()
+
+        async def slow(results):
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        async def broken(results):
+            raise ConnectionError("down")
+
+        graph = StepGraph([Step("slow", slow), Step("broken", broken)])
+
+        with pytest.raises(ConnectionError):
+            await graph.run()
+        await asyncio.sleep(0)
+        assert cancelled.is_set()
+
+    @pytest.mark.asyncio
+    async def test_invalid_graphs_raise(self):
+        with pytest.raises(ValueError):
+            StepGraph([Step("a", _sleeper("a", 0), after=("missing",))])
+        with pytest.raises(ValueError):
+            StepGraph([Step("a", _sleeper("a", 0)), Step("a", _sleeper("a", 0))])
+
+        cyclic = StepGraph(
+            [
+                Step("a", _sleeper("a", 0), after=("b",)),
+                Step("b", _sleeper("b", 0), after=("a",)),
+            ]
+        )
+        with pytest.raises(ValueError):
+            await cyclic.run()
+
+
+class TestWorkerSteps:
+    """Test the worker's handlers as step graphs."""
+
+    @pytest.mark.asyncio
+    async def test_persona_overlaps_memory_search(self):
+        mcp = DelayedMCP({"search_memory": 0.05, "generate_image": 0.01})
+
+        async def load_persona(agent_id):
+            await asyncio.sleep(0.05)
+            return {"visual_style": "film grain", "character_id": "lora_1"}
+
+        worker = TaskWorker("w1", mcp, None, persona_loader=load_persona)
+        task = {
+            "task_id": "t1",
+            "task_type": "generate_content",
+            "agent_id": "agent_1",
+            "context": {"topic": "linen season"},
+        }
+
+        start = time.perf_counter()
+        result = await worker.execute_task(task)
+        elapsed = time.perf_counter() - start
+
+        assert result.status == "complete"
+        assert elapsed < 0.095
+        assert result.output.image_url == "https://cdn.example/img.png"
+        assert result.critical_path[-2:] == ["image", "content"]
+        assert {"memories", "persona", "caption", "image_prompt"} <= set(result.steps)
+
+    @pytest.mark.asyncio
+    async def test_transaction_runs_memory_alongside_transfer(self):
+        mcp = DelayedMCP({"search_memory": 0.02})
+        worker = TaskWorker("w1", mcp, None)
+        task = {
+            "task_id": "t2",
+            "task_type": "execute_transaction",
+            "context": {"to_address": "0xabc", "amount": 1},
+        }
+
+        result = await worker.execute_task(task)
+
+        assert result.status == "complete"
+        assert set(result.steps) == {"memories", "transfer"}
+        assert "execute_transaction" in worker.step_stats.report()
+
+    @pytest.mark.asyncio
+    async def test_unknown_task_type_is_fatal(self):
+        worker = TaskWorker("w1", DelayedMCP({}), None)
+
+        result = await worker.execute_task({"task_id": "t3", "task_type": "dance"})
+
+        assert result.status == "failed"
+
+
+class TestStepStats:
+    """Test per task_type step aggregation."""
+
+    @pytest.mark.asyncio
+    async def test_report_tracks_ewma_and_common_path(self):
+        stats = StepStats(alpha=0.5)
+        graph = StepGraph(
+            [
+                Step("a", _sleeper("a", 0.01)),
+                Step("b", _sleeper("b", 0), after=("a",)),
+            ]
+        )
+
+        for _ in range(3):
+            stats.record("research_trends", await graph.run())
+        report = stats.report()["research_trends"]
+
+        assert report["critical_path"] == ["a", "b"]
+        assert report["step_ms"]["a"] >= 5
+
+
+pytestmark = pytest.mark.unit
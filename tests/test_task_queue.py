@@ -0,0 +1,584 @@
+"""Test suite for the multi-lane Redis task queue.
+
+Validates strict lane priority, deficit round-robin between agents, aging of
+lower lanes, earliest-deadline-first dispatch with shedding and downgrades,
+leased batch claims with heartbeats, unclaims and a reaper, delayed retries, that a
+task failing with an unexpected error still settles its lease, that the
+planner and worker both go through the lanes, and that every key the queue,
+DAG scheduler and dead-letter queue write shares one Redis Cluster slot.
+"""
+
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.common.dead_letter import DeadLetterQueue
+from src.common.redis_text import decode
+from src.common.task_queue import Deadline, TaskQueue, hash_tag
+from src.planner.agent_planner import AgentPlanner, Task, TaskPriority
+from src.planner.dag_scheduler import DagScheduler
+from src.worker.retry import RetryPolicy
+from src.worker.task_executor import RateLimitError, TaskWorker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _push(queue: TaskQueue, agent_id: str, priority: str, task_id: str, cost: int = 1):
+    queue.push(agent_id, priority, json.dumps({"task_id": task_id}), cost=cost)
+
+
+def _drain(queue: TaskQueue) -> list:
+    claimed = []
+    while (item := queue.claim()) is not None:
+        claimed.append(json.loads(item[1])["task_id"])
+    return claimed
+
+
+class TestLanes:
+    """Test priority ordering and aging across lanes."""
+
+    def test_high_lane_is_served_first(self, fake_redis):
+        queue = TaskQueue(fake_redis)
+        _push(queue, "a", "low", "low-1")
+        _push(queue, "a", "medium", "medium-1")
+        _push(queue, "a", "high", "high-1")
+
+        assert _drain(queue) == ["high-1", "medium-1", "low-1"]
+
+    def test_claim_reports_lane(self, fake_redis):
+        queue = TaskQueue(fake_redis)
+        _push(queue, "a", TaskPriority.MEDIUM, "t1")
+
+        lane, payload = queue.claim()
+
+        assert lane == "medium"
+        assert json.loads(payload) == {"task_id": "t1"}
+        assert queue.claim() is None
+
+    def test_aged_low_task_jumps_ahead_of_high(self, fake_redis):
+        clock = FakeClock()
+        queue = TaskQueue(fake_redis, aging_seconds={"low": 30}, clock=clock)
+        _push(queue, "a", "low", "old-low")
+        clock.now += 31
+        _push(queue, "b", "high", "high-1")
+        _push(queue, "b", "high", "high-2")
+
+        assert _drain(queue) == ["old-low", "high-1", "high-2"]
+
+    def test_fresh_low_task_waits(self, fake_redis):
+        clock = FakeClock()
+        queue = TaskQueue(fake_redis, aging_seconds={"low": 30}, clock=clock)
+        _push(queue, "a", "low", "low-1")
+        _push(queue, "b", "high", "high-1")
+
+        assert _drain(queue) == ["high-1", "low-1"]
+
+    def test_depth_counts_each_lane(self, fake_redis):
+        queue = TaskQueue(fake_redis)
+        for i in range(3):
+            _push(queue, f"agent_{i}", "high", f"h{i}")
+        _push(queue, "agent_0", "low", "l0")
+        queue.claim()
+
+        assert queue.depth() == {"high": 2, "medium": 0, "low": 1}
+
+
+class TestFairness:
+    """Test deficit round-robin between agents inside a lane."""
+
+    def test_noisy_agent_cannot_starve_others(self, fake_redis):
+        queue = TaskQueue(fake_redis)
+        for i in range(100):
+            _push(queue, "noisy", "high", f"noisy-{i}")
+        for agent in ("quiet-1", "quiet-2", "quiet-3"):
+            _push(queue, agent, "high", agent)
+
+        first = _drain(queue)[:6]
+
+        assert {"quiet-1", "quiet-2", "quiet-3"} <= set(first)
+
+    def test_per_agent_order_is_fifo(self, fake_redis):
+        queue = TaskQueue(fake_redis)
+        for i in range(5):
+            _push(queue, "a", "high", f"a-{i}")
+
+        assert _drain(queue) == [f"a-{i}" for i in range(5)]
+
+    def test_deficit_weights_by_cost(self, fake_redis):
+        queue = TaskQueue(fake_redis, quantum=2)
+        for i in range(6):
+            _push(queue, "cheap", "high", f"cheap-{i}", cost=1)
+            _push(queue, "costly", "high", f"costly-{i}", cost=2)
+
+        first = _drain(queue)[:6]
+
+        assert sum(task.startswith("cheap") for task in first) == 4
+        assert sum(task.startswith("costly") for task in first) == 2
+
+    def test_emptied_agent_leaves_ring(self, fake_redis):
+        queue = TaskQueue(fake_redis)
+        _push(queue, "a", "high", "a-1")
+        _push(queue, "b", "high", "b-1")
+        _push(queue, "b", "high", "b-2")
+
+        queue.claim()
+        queue.claim()
+
+        assert queue.agents("high") == ["b"]
+
+
+def _push_due(
+    queue: TaskQueue,
+    priority: str,
+    task_id: str,
+    due_in: float,
+    service: float = 1.0,
+    on_miss: str = "downgrade",
+):
+    due_ms = int((queue.clock() + due_in) * 1000)
+    deadline = Deadline(
+        due_ms=due_ms,
+        latest_start_ms=due_ms - int(service * 1000),
+        task_type="generate_content",
+        on_miss=on_miss,
+    )
+    payload = json.dumps({"task_id": task_id})
+    queue.push("agent_1", priority, payload, deadline=deadline)
+
+
+class TestDeadlines:
+    """Test EDF ordering, urgency and miss handling."""
+
+    def test_earliest_deadline_first_ahead_of_fifo(self, fake_redis):
+        queue = TaskQueue(fake_redis, clock=FakeClock())
+        _push(queue, "agent_1", "high", "no_deadline")
+        _push_due(queue, "high", "late", due_in=60)
+        _push_due(queue, "high", "soon", due_in=30)
+
+        assert _drain(queue) == ["soon", "late", "no_deadline"]
+
+    def test_urgent_lower_lane_task_preempts_high(self, fake_redis):
+        queue = TaskQueue(fake_redis, clock=FakeClock(), urgency_seconds=1.0)
+        _push(queue, "agent_1", "high", "high")
+        _push_due(queue, "medium", "relaxed", due_in=30)
+        _push_due(queue, "medium", "urgent", due_in=1.5)
+
+        assert _drain(queue) == ["urgent", "high", "relaxed"]
+
+    def test_hopeless_task_is_shed(self, fake_redis):
+        clock = FakeClock()
+        queue = TaskQueue(fake_redis, clock=clock)
+        _push_due(queue, "high", "stale", due_in=2, service=1, on_miss="shed")
+        clock.now += 1.5
+
+        assert queue.claim() is None
+        assert json.loads(queue.shed_tasks()[0])["task_id"] == "stale"
+        stats = queue.deadline_stats()["generate_content"]
+        assert stats["shed"] == 1
+        assert stats["miss_rate"] == 1.0
+
+    def test_hopeless_task_is_downgraded(self, fake_redis):
+        clock = FakeClock()
+        queue = TaskQueue(fake_redis, clock=clock)
+        _push_due(queue, "high", "late", due_in=2, service=1)
+        clock.now += 1.5
+
+        lane, payload = queue.claim()
+
+        assert (lane, json.loads(payload)["task_id"]) == ("medium", "late")
+        assert queue.deadline_stats()["generate_content"]["downgraded"] == 1
+
+    def test_hopeless_low_task_is_requeued_without_its_deadline(self, fake_redis):
+        clock = FakeClock()
+        queue = TaskQueue(fake_redis, clock=clock)
+        _push_due(queue, "low", "parent", due_in=2, service=1)
+        clock.now += 1.5
+
+        lane, payload = queue.claim()
+
+        assert (lane, json.loads(payload)["task_id"]) == ("low", "parent")
+        assert queue.shed_tasks() == []
+        assert queue.deadline_stats()["generate_content"]["downgraded"] == 1
+
+    def test_depth_counts_deadline_tasks(self, fake_redis):
+        queue = TaskQueue(fake_redis, clock=FakeClock())
+        _push_due(queue, "low", "a", due_in=60)
+        _push_due(queue, "low", "b", due_in=90)
+
+        assert queue.depth()["low"] == 2
+
+
+def _ids(leases) -> list:
+    return [json.loads(lease.payload)["task_id"] for lease in leases]
+
+
+class TestDelayedRetries:
+    """Test the delay set and its promotion on claim."""
+
+    def test_deferred_task_is_promoted_when_due(self, fake_redis):
+        clock = FakeClock()
+        queue = TaskQueue(fake_redis, clock=clock)
+        route = queue.route("a", "high", json.dumps({"task_id": "later"}))
+        queue.defer(route, 5)
+        _push(queue, "b", "low", "now")
+
+        assert _drain(queue) == ["now"]
+        assert queue.retry_stats()["next_due_in_seconds"] == 5
+        clock.now += 5
+
+        assert _drain(queue) == ["later"]
+        assert queue.retry_stats() == {
+            "delayed": 0,
+            "promoted": 1,
+            "next_due_in_seconds": 0.0,
+        }
+
+    def test_retry_later_moves_lease_and_keeps_deadline(self, fake_redis):
+        clock = FakeClock()
+        queue = TaskQueue(fake_redis, clock=clock)
+        _push_due(queue, "medium", "due", due_in=600)
+        (lease,) = queue.claim_batch("worker_1", 1)
+
+        retried = json.dumps({"task_id": "due", "attempt": 1})
+        assert queue.retry_later("worker_1", lease.token, retried, 2) is True
+        assert queue.lease_stats()["leased"] == 0
+        clock.now += 2
+
+        lane, payload = queue.claim()
+        assert (lane, json.loads(payload)) == ("medium", json.loads(retried))
+
+    def test_retry_after_reap_is_not_scheduled_twice(self, fake_redis):
+        clock = FakeClock()
+        queue = TaskQueue(fake_redis, clock=clock)
+        _push(queue, "a", "high", "a1")
+        (lease,) = queue.claim_batch("worker_1", 1, lease_seconds=30)
+        clock.now += 31
+        queue.reap_expired()
+
+        assert queue.retry_later("worker_1", lease.token, lease.payload, 1) is False
+        assert queue.retry_stats()["delayed"] == 0
+
+
+class TestLeases:
+    """Test leased batch claims, heartbeats and the reaper."""
+
+    def test_batch_claim_matches_single_claim_order(self, fake_redis):
+        single = TaskQueue(fake_redis, prefix="{single}")
+        batched = TaskQueue(fake_redis, prefix="{batched}")
+        for queue in (single, batched):
+            for i in range(3):
+                _push(queue, "noisy", "high", f"n{i}")
+            _push(queue, "quiet", "high", "q0")
+            _push(queue, "quiet", "low", "low0")
+
+        leases = batched.claim_batch("worker_1", 4)
+
+        assert _ids(leases) == _drain(single)[:4]
+        assert batched.lease_stats() == {"leased": 4, "workers": 1, "reaped": 0}
+        assert len({lease.token for lease in leases}) == 4
+
+    def test_expired_lease_is_requeued_first(self, fake_redis):
+        clock = FakeClock()
+        queue = TaskQueue(fake_redis, clock=clock)
+        _push(queue, "a", "high", "a1")
+        _push(queue, "a", "high", "a2")
+        queue.claim_batch("dead_worker", 1, lease_seconds=30)
+
+        assert queue.reap_expired() == 0
+        clock.now += 31
+        assert queue.reap_expired() == 1
+
+        assert _drain(queue) == ["a1", "a2"]
+        assert queue.lease_stats() == {"leased": 0, "workers": 0, "reaped": 1}
+
+    def test_heartbeat_keeps_lease_alive(self, fake_redis):
+        clock = FakeClock()
+        queue = TaskQueue(fake_redis, clock=clock)
+        _push(queue, "a", "high", "a1")
+        (lease,) = queue.claim_batch("worker_1", 1, lease_seconds=30)
+
+        clock.now += 20
+        assert queue.extend_leases("worker_1", [lease.token], 30) == []
+        clock.now += 20
+        assert queue.reap_expired() == 0
+
+        clock.now += 20
+        assert queue.reap_expired() == 1
+        assert queue.extend_leases("worker_1", [lease.token], 30) == [lease.token]
+        assert queue.ack("worker_1", lease.token) is False
+
+    def test_ack_releases_lease(self, fake_redis):
+        clock = FakeClock()
+        queue = TaskQueue(fake_redis, clock=clock)
+        _push(queue, "a", "high", "a1")
+        (lease,) = queue.claim_batch("worker_1", 1, lease_seconds=30)
+
+        assert queue.ack("worker_1", lease.token) is True
+        clock.now += 60
+
+        assert queue.reap_expired() == 0
+        assert queue.claim() is None
+
+    def test_unclaim_hands_the_task_back_first(self, fake_redis):
+        clock = FakeClock()
+        queue = TaskQueue(fake_redis, clock=clock)
+        _push(queue, "a", "high", "a1")
+        _push(queue, "a", "high", "a2")
+        (lease,) = queue.claim_batch("worker_1", 1, lease_seconds=30)
+
+        assert queue.unclaim("worker_1", lease.token) is True
+        assert queue.unclaim("worker_1", lease.token) is False
+        clock.now += 60
+
+        assert queue.reap_expired() == 0
+        assert queue.lease_stats()["leased"] == 0
+        assert _drain(queue) == ["a1", "a2"]
+
+    def test_reaped_deadline_task_keeps_its_deadline(self, fake_redis):
+        clock = FakeClock()
+        queue = TaskQueue(fake_redis, clock=clock)
+        _push_due(queue, "medium", "due", due_in=600)
+        queue.claim_batch("worker_1", 1, lease_seconds=30)
+
+        clock.now += 31
+        queue.reap_expired()
+
+        assert fake_redis.zcard("{chimera}:tasks:medium:edf") == 0
+        assert queue.depth()["medium"] == 1
+        lane, payload = queue.claim()
+        assert (lane, json.loads(payload)["task_id"]) == ("medium", "due")
+
+
+def _task(agent_id: str, priority: TaskPriority, task_id: str) -> Task:
+    return Task(
+        task_id=task_id,
+        task_type="generate_content",
+        agent_id=agent_id,
+        priority=priority,
+        context={"topic": "fashion week"},
+        created_at=datetime.utcnow(),
+    )
+
+
+class TestQueueIntegration:
+    """Test planner enqueue and worker claim share the lanes."""
+
+    @pytest.mark.asyncio
+    async def test_planner_enqueues_into_priority_lane(self, fake_redis):
+        planner = AgentPlanner(
+            agent_id="agent_1", redis_client=fake_redis, llm_client=None
+        )
+
+        await planner.enqueue_task(_task("agent_1", TaskPriority.LOW, "low"))
+        await planner.enqueue_task(_task("agent_1", TaskPriority.HIGH, "high"))
+
+        assert _drain(planner.task_queue) == ["high", "low"]
+
+    @pytest.mark.asyncio
+    async def test_worker_claims_and_releases_dependents(
+        self, fake_redis, mock_mcp_client
+    ):
+        mock_mcp_client.call_tool = AsyncMock(return_value={"url": "https://cdn/x"})
+        planner = AgentPlanner(
+            agent_id="agent_1", redis_client=fake_redis, llm_client=None
+        )
+        tasks = await planner.decompose_goal("Promote sustainable fashion week")
+        await planner.enqueue_dag(tasks)
+        queue = TaskQueue(fake_redis)
+        worker = TaskWorker(
+            worker_id="worker_1",
+            mcp_client=mock_mcp_client,
+            judge_client=None,
+            task_queue=queue,
+            scheduler=DagScheduler(fake_redis, queue),
+        )
+
+        statuses = [await worker.run_once() for _ in range(3)]
+
+        assert [result.status for result in statuses] == ["complete"] * 3
+        assert await worker.run_once() is None
+        assert queue.lease_stats()["leased"] == 0
+
+    @pytest.mark.asyncio
+    async def test_worker_hands_retries_to_the_delay_set(
+        self, fake_redis, mock_mcp_client
+    ):
+        mock_mcp_client.call_tool = AsyncMock(side_effect=RateLimitError("twitter 429"))
+        clock = FakeClock()
+        queue = TaskQueue(fake_redis, clock=clock)
+        payload = {"task_id": "t1", "task_type": "research_trends", "context": {}}
+        queue.push("agent_1", "high", json.dumps(payload))
+        worker = TaskWorker(
+            worker_id="worker_1",
+            mcp_client=mock_mcp_client,
+            judge_client=None,
+            task_queue=queue,
+            retry_policy=RetryPolicy(jitter=0),
+        )
+
+        result = await worker.run_once()
+
+        assert result.status == "retry"
+        assert result.retry_after_seconds == 900
+        assert queue.lease_stats()["leased"] == 0
+        assert queue.retry_stats()["delayed"] == 1
+        assert await worker.run_once() is None
+
+        clock.now += 900
+        (lease,) = queue.claim_batch("worker_1", 1)
+        assert json.loads(lease.payload)["attempt"] == 1
+        assert queue.retry_stats()["promoted"] == 1
+
+    @pytest.mark.asyncio
+    async def test_unexpected_error_settles_the_lease(
+        self, fake_redis, mock_mcp_client
+    ):
+        mock_mcp_client.call_tool = AsyncMock(side_effect=RuntimeError("boom"))
+        queue = TaskQueue(fake_redis)
+        payload = {"task_id": "t1", "task_type": "research_trends", "context": {}}
+        queue.push("agent_1", "high", json.dumps(payload))
+        worker = TaskWorker(
+            worker_id="worker_1",
+            mcp_client=mock_mcp_client,
+            judge_client=None,
+            task_queue=queue,
+            lease_seconds=0.3,
+        )
+
+        runner = asyncio.create_task(worker.run())
+        await asyncio.sleep(1.0)
+        worker.stop()
+        await runner
+
+        assert worker._leases == {}
+        assert queue.lease_stats()["leased"] == 0
+        assert queue.retry_stats()["delayed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_spent_unexpected_errors_are_dead_lettered(
+        self, fake_redis, mock_mcp_client
+    ):
+        mock_mcp_client.call_tool = AsyncMock(side_effect=RuntimeError("boom"))
+        queue = TaskQueue(fake_redis)
+        payload = {
+            "task_id": "t1",
+            "task_type": "research_trends",
+            "context": {},
+            "attempt": 3,
+        }
+        queue.push("agent_1", "high", json.dumps(payload))
+        dead_letters = DeadLetterQueue(fake_redis, queue)
+        worker = TaskWorker(
+            worker_id="worker_1",
+            mcp_client=mock_mcp_client,
+            judge_client=None,
+            task_queue=queue,
+            dead_letters=dead_letters,
+        )
+
+        result = await worker.run_once()
+
+        assert result.status == "failed"
+        assert "RuntimeError" in result.error
+        assert queue.lease_stats()["leased"] == 0
+        assert dead_letters.ids() == ["t1"]
+
+    @pytest.mark.asyncio
+    async def test_dag_deadline_is_split_by_critical_path(self, fake_redis):
+        planner = AgentPlanner(
+            agent_id="agent_1", redis_client=fake_redis, llm_client=None
+        )
+        tasks = await planner.decompose_goal("Promote sustainable fashion week")
+        nairobi = timezone(timedelta(hours=3))
+        end = datetime.now(nairobi).replace(microsecond=0) + timedelta(days=7)
+
+        await planner.enqueue_dag(tasks, deadline=end)
+
+        research, generate, publish = tasks
+        assert publish.deadline == end
+        assert publish.deadline.tzinfo == timezone.utc
+        due_ms = planner._queue_deadline(publish).due_ms
+        assert due_ms == int(end.timestamp() * 1000)
+        assert generate.deadline == end - timedelta(seconds=1)
+        assert research.deadline == end - timedelta(seconds=6)
+        claimed = json.loads(planner.task_queue.claim()[1])
+        assert Task.from_dict(claimed).deadline == research.deadline
+
+    @pytest.mark.asyncio
+    async def test_worker_records_deadline_outcome(self, fake_redis, mock_mcp_client):
+        mock_mcp_client.call_tool = AsyncMock(return_value={"url": "https://cdn/x"})
+        planner = AgentPlanner(
+            agent_id="agent_1", redis_client=fake_redis, llm_client=None
+        )
+        planner.agent_status = "active"
+        await planner.handle_trends([{"topic": "fashion week", "relevance": 0.9}])
+        worker = TaskWorker(
+            worker_id="worker_1",
+            mcp_client=mock_mcp_client,
+            judge_client=None,
+            task_queue=planner.task_queue,
+        )
+
+        result = await worker.run_once()
+
+        assert result.status == "complete"
+        stats = planner.task_queue.deadline_stats()["generate_content"]
+        assert stats["met"] == 1
+        assert stats["miss_rate"] == 0.0
+
+
+class TestClusterSlots:
+    """Test that queue keys stay in one Redis Cluster slot."""
+
+    def test_hash_tag_follows_the_cluster_rules(self):
+        assert hash_tag("{chimera}:tasks:high:q:a1") == "chimera"
+        assert hash_tag("{a}{b}") == "a"
+        assert hash_tag("chimera:tasks") == "chimera:tasks"
+        assert hash_tag("{}:tasks{x}") == "{}:tasks{x}"
+
+    def test_prefixes_without_the_queue_tag_are_rejected(self, fake_redis):
+        queue = TaskQueue(fake_redis)
+
+        with pytest.raises(ValueError, match="hash tag"):
+            TaskQueue(fake_redis, prefix="chimera:tasks")
+        with pytest.raises(ValueError, match="hash tag"):
+            DagScheduler(fake_redis, queue, prefix="{other}:dag")
+        with pytest.raises(ValueError, match="hash tag"):
+            DeadLetterQueue(fake_redis, queue, prefix="chimera:dlq")
+
+    @pytest.mark.asyncio
+    async def test_every_written_key_shares_the_queue_slot(self, fake_redis):
+        clock = FakeClock()
+        queue = TaskQueue(fake_redis, clock=clock)
+        dag = DagScheduler(fake_redis, queue)
+        dead_letters = DeadLetterQueue(fake_redis, queue, clock=clock)
+        dag.submit("a", json.dumps({"task_id": "a"}), [], agent_id="a1")
+        dag.submit("b", json.dumps({"task_id": "b"}), ["a"], agent_id="a1")
+        dag.submit("c", json.dumps({"task_id": "c"}), ["b"], agent_id="a1")
+        lease = queue.claim_batch("worker_1", 1)[0]
+        queue.retry_later("worker_1", lease.token, lease.payload, 1)
+        clock.now += 2
+        lease = queue.claim_batch("worker_1", 1, lease_seconds=1)[0]
+        clock.now += 2
+        assert queue.reap_expired() == 1
+        dag.complete("a")
+        for _, route in dag.fail("b"):
+            dead_letters.add(json.loads(route), {"error": "Cancelled()"})
+        assert await dead_letters.replay(rate_per_second=1_000) == 1
+
+        keys = fake_redis.keys("*")
+
+        assert keys
+        assert {hash_tag(decode(key)) for key in keys} == {"chimera"}
+
+
+pytestmark = pytest.mark.unit
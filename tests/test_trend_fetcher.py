@@ -301,5 +301,120 @@ class TestTrendSourceEnum:
             f"Missing sources: {expected_sources - actual_sources}"
 
 
+class TestTrendSubscriptions:
+    """Test subscription fan-out: one upstream call per (region, niche, window)."""
+
+    @pytest.fixture
+    def mock_mcp_client(self):
+        from unittest.mock import AsyncMock, MagicMock
+
+        client = MagicMock()
+        client.call_tool = AsyncMock(
+            return_value={
+                "trends": [
+                    {
+                        "topic": "Ethiopian Fashion Week",
+                        "volume": 15000,
+                        "relevance_score": 0.92,
+                    },
+                    {"topic": "Minor trend", "volume": 10, "relevance_score": 0.40},
+                ]
+            }
+        )
+        return client
+
+    @pytest.mark.asyncio
+    async def test_refresh_calls_mcp_once_per_key(self, mock_mcp_client):
+        """Test fifty subscribers on two keys cost two MCP calls."""
+        if TrendFetcher is None:
+            pytest.skip("TrendFetcher not implemented yet")
+
+        fetcher = TrendFetcher(mcp_client=mock_mcp_client)
+        received = {}
+
+        def make_callback(agent_id):
+            async def callback(trends):
+                received[agent_id] = trends
+
+            return callback
+
+        for i in range(50):
+            region = "ET" if i < 40 else "KE"
+            fetcher.subscribe(
+                f"agent_{i}",
+                make_callback(f"agent_{i}"),
+                niche="fashion",
+                region=region,
+            )
+
+        delivered = await fetcher.refresh()
+
+        assert delivered == 50
+        assert mock_mcp_client.call_tool.call_count == 2
+        assert len(received) == 50
+        assert all(isinstance(t, Trend) for t in received["agent_0"])
+
+    @pytest.mark.asyncio
+    async def test_unsubscribe_drops_empty_keys(self, mock_mcp_client):
+        """Test keys without subscribers are no longer fetched."""
+        from unittest.mock import AsyncMock
+
+        if TrendFetcher is None:
+            pytest.skip("TrendFetcher not implemented yet")
+
+        fetcher = TrendFetcher(mcp_client=mock_mcp_client)
+        fetcher.subscribe("agent_1", AsyncMock(), niche="fashion", region="ET")
+        fetcher.unsubscribe("agent_1")
+
+        assert await fetcher.refresh() == 0
+        mock_mcp_client.call_tool.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_fetches_share_one_call(self, mock_mcp_client):
+        """Test simultaneous identical fetch_trends calls are coalesced."""
+        import asyncio
+
+        if TrendFetcher is None:
+            pytest.skip("TrendFetcher not implemented yet")
+
+        fetcher = TrendFetcher(mcp_client=mock_mcp_client)
+
+        results = await asyncio.gather(
+            *(fetcher.fetch_trends(niche="fashion", region="ET") for _ in range(20))
+        )
+
+        assert mock_mcp_client.call_tool.call_count == 1
+        assert all(len(trends) == 1 for trends in results)
+
+    @pytest.mark.asyncio
+    async def test_planner_subscription_enqueues_relevant_trends(
+        self, mock_mcp_client, mock_redis_client
+    ):
+        """Test a subscribed planner receives pushed trends and enqueues tasks."""
+        from src.planner.agent_planner import AgentPlanner
+
+        if TrendFetcher is None:
+            pytest.skip("TrendFetcher not implemented yet")
+
+        fetcher = TrendFetcher(mcp_client=mock_mcp_client)
+        planners = []
+        for i in range(3):
+            planner = AgentPlanner(
+                agent_id=f"agent_{i}",
+                redis_client=mock_redis_client,
+                llm_client=None,
+                niche="fashion",
+                region="ET",
+            )
+            planner.agent_status = "active"
+            planner.subscribe_trends(fetcher)
+            planners.append(planner)
+
+        await fetcher.refresh()
+
+        assert mock_mcp_client.call_tool.call_count == 1
+        assert mock_redis_client.lpush.call_count == 3
+
+
 # Mark all tests in this module as unit tests
 pytestmark = pytest.mark.unit